@@ -449,7 +449,16 @@ class Endpoint(APIView):
                     getattr(part, "__name__", None) or str(part) for part in (type(self), handler)
                 ),
             ) as span:
-                response = handler(request, *args, **kwargs)
+                from sentry.api.serializers.base import memoized_serialization
+                from sentry.features.manager import feature_evaluation_cache
+
+                # Requests which modify objects may serialize them both before and after, and
+                # change which features are enabled for them
+                if request.method in ("GET", "HEAD"):
+                    with memoized_serialization(), feature_evaluation_cache():
+                        response = handler(request, *args, **kwargs)
+                else:
+                    response = handler(request, *args, **kwargs)
 
         except Exception as exc:
             response = self.handle_exception(request, exc)
@@ -6,6 +6,7 @@ from sentry.api.api_publish_status import ApiPublishStatus
 from sentry.api.base import region_silo_endpoint
 from sentry.api.bases import ProjectEndpoint
 from sentry.api.exceptions import ResourceDoesNotExist
+from sentry.grouping.ingest import grouphash_cache
 from sentry.models.grouphash import GroupHash
 from sentry.models.grouptombstone import GroupTombstone
 
@@ -36,10 +37,18 @@ class GroupTombstoneDetailsEndpoint(ProjectEndpoint):
         except GroupTombstone.DoesNotExist:
             raise ResourceDoesNotExist
 
-        GroupHash.objects.filter(project_id=project.id, group_tombstone_id=tombstone_id).update(
+        grouphashes = GroupHash.objects.filter(
+            project_id=project.id, group_tombstone_id=tombstone_id
+        )
+        invalidate_grouphashes = grouphash_cache.is_invalidation_enabled()
+        if invalidate_grouphashes:
+            hashes = list(grouphashes.values_list("hash", flat=True))
+        grouphashes.update(
             # will allow new events to be captured
             group_tombstone_id=None
         )
+        if invalidate_grouphashes:
+            grouphash_cache.delete_many(project.id, hashes)
 
         tombstone.delete()
 
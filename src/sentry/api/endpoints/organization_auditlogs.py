@@ -2,13 +2,13 @@ from rest_framework import serializers
 from rest_framework.request import Request
 from rest_framework.response import Response
 
-from sentry import audit_log
+from sentry import audit_log, options
 from sentry.api.api_owners import ApiOwner
 from sentry.api.api_publish_status import ApiPublishStatus
 from sentry.api.base import control_silo_endpoint
 from sentry.api.bases import ControlSiloOrganizationEndpoint
 from sentry.api.bases.organization import OrganizationAuditPermission
-from sentry.api.paginator import DateTimePaginator
+from sentry.api.paginator import DateTimePaginator, KeysetPaginator
 from sentry.api.serializers import serialize
 from sentry.audit_log.manager import AuditLogEventNotRegistered
 from sentry.db.models.fields.bounded import BoundedIntegerField
@@ -17,6 +17,7 @@ from sentry.organizations.services.organization.model import (
     RpcOrganization,
     RpcUserOrganizationContext,
 )
+from sentry.utils.cursors import StringCursor
 
 
 class AuditLogQueryParamSerializer(serializers.Serializer):
@@ -65,11 +66,21 @@ class OrganizationAuditLogsEndpoint(ControlSiloOrganizationEndpoint):
             else:
                 queryset = queryset.filter(event=query["event"])
 
+        paginator_kwargs = {}
+        if options.get("api.pagination.keyset.enabled"):
+            paginator_kwargs.update(
+                paginator_cls=KeysetPaginator,
+                cursor_cls=StringCursor,
+                fallback=DateTimePaginator(queryset, order_by="-datetime"),
+            )
+        else:
+            paginator_kwargs["paginator_cls"] = DateTimePaginator
+
         response = self.paginate(
             request=request,
             queryset=queryset,
-            paginator_cls=DateTimePaginator,
             order_by="-datetime",
+            **paginator_kwargs,
             on_results=lambda x: serialize(x, request.user),
         )
         response.data = {"rows": response.data, "options": audit_log.get_api_names()}
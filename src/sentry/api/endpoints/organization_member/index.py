@@ -6,13 +6,13 @@ from rest_framework import serializers
 from rest_framework.request import Request
 from rest_framework.response import Response
 
-from sentry import audit_log, features, ratelimits, roles
+from sentry import audit_log, features, options, ratelimits, roles
 from sentry.api.api_owners import ApiOwner
 from sentry.api.api_publish_status import ApiPublishStatus
 from sentry.api.base import region_silo_endpoint
 from sentry.api.bases.organization import OrganizationEndpoint
 from sentry.api.bases.organizationmember import MemberAndStaffPermission
-from sentry.api.paginator import OffsetPaginator
+from sentry.api.paginator import KeysetPaginator, OffsetPaginator
 from sentry.api.serializers import serialize
 from sentry.api.serializers.models.organization_member import OrganizationMemberSerializer
 from sentry.api.serializers.models.organization_member.response import OrganizationMemberResponse
@@ -30,6 +30,7 @@ from sentry.search.utils import tokenize_query
 from sentry.signals import member_invited
 from sentry.users.services.user.service import user_service
 from sentry.utils import metrics
+from sentry.utils.cursors import StringCursor
 
 from . import get_allowed_org_roles, save_team_assignments
 
@@ -285,6 +286,17 @@ class OrganizationMemberIndexEndpoint(OrganizationEndpoint):
 
         expand = request.GET.getlist("expand", [])
 
+        paginator_kwargs = {}
+        if options.get("api.pagination.keyset.enabled"):
+            paginator_kwargs.update(
+                paginator_cls=KeysetPaginator,
+                cursor_cls=StringCursor,
+                order_by="id",
+                fallback=OffsetPaginator(queryset),
+            )
+        else:
+            paginator_kwargs["paginator_cls"] = OffsetPaginator
+
         return self.paginate(
             request=request,
             queryset=queryset,
@@ -293,7 +305,7 @@ class OrganizationMemberIndexEndpoint(OrganizationEndpoint):
                 request.user,
                 serializer=OrganizationMemberSerializer(expand=expand),
             ),
-            paginator_cls=OffsetPaginator,
+            **paginator_kwargs,
         )
 
     @extend_schema(
@@ -10,13 +10,13 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.serializers import ListField
 
-from sentry import analytics, release_health
+from sentry import analytics, options, release_health
 from sentry.api.api_publish_status import ApiPublishStatus
 from sentry.api.base import EnvironmentMixin, ReleaseAnalyticsMixin, region_silo_endpoint
 from sentry.api.bases import NoProjects
 from sentry.api.bases.organization import OrganizationReleasesBaseEndpoint
 from sentry.api.exceptions import ConflictError, InvalidRepository
-from sentry.api.paginator import MergingOffsetPaginator, OffsetPaginator
+from sentry.api.paginator import KeysetPaginator, MergingOffsetPaginator, OffsetPaginator
 from sentry.api.release_search import RELEASE_FREE_TEXT_KEY, parse_search_query
 from sentry.api.serializers import serialize
 from sentry.api.serializers.rest_framework import (
@@ -46,6 +46,7 @@ from sentry.signals import release_created
 from sentry.snuba.sessions import STATS_PERIODS
 from sentry.types.activity import ActivityType
 from sentry.utils.cache import cache
+from sentry.utils.cursors import StringCursor
 from sentry.utils.sdk import Scope, bind_organization_context
 
 ERR_INVALID_STATS_PERIOD = "Invalid %s. Valid choices are %s"
@@ -397,6 +398,18 @@ class OrganizationReleasesEndpoint(
         queryset = queryset.extra(select=select_extra)
         queryset = add_date_filter_to_queryset(queryset, filter_params)
 
+        # Flattened releases are repeated for every project, so their keys aren't unique
+        if (
+            sort in ("date", "build")
+            and not flatten
+            and options.get("api.pagination.keyset.enabled")
+        ):
+            paginator_cls = KeysetPaginator
+            paginator_kwargs.update(
+                cursor_cls=StringCursor,
+                fallback=OffsetPaginator(queryset, order_by=paginator_kwargs["order_by"]),
+            )
+
         return self.paginate(
             request=request,
             queryset=queryset,
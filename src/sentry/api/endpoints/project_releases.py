@@ -2,14 +2,15 @@ from __future__ import annotations
 
 from django.db import IntegrityError, router, transaction
 from django.db.models import Q
+from django.db.models.functions import Coalesce
 from rest_framework.request import Request
 from rest_framework.response import Response
 
-from sentry import analytics
+from sentry import analytics, options
 from sentry.api.api_publish_status import ApiPublishStatus
 from sentry.api.base import EnvironmentMixin, region_silo_endpoint
 from sentry.api.bases.project import ProjectEndpoint, ProjectReleasePermission
-from sentry.api.paginator import OffsetPaginator
+from sentry.api.paginator import KeysetPaginator, OffsetPaginator
 from sentry.api.serializers import serialize
 from sentry.api.serializers.rest_framework import ReleaseWithVersionSerializer
 from sentry.api.utils import get_auth_api_token_type
@@ -21,6 +22,7 @@ from sentry.plugins.interfaces.releasehook import ReleaseHook
 from sentry.ratelimits.config import SENTRY_RATELIMITER_GROUP_DEFAULTS, RateLimitConfig
 from sentry.signals import release_created
 from sentry.types.activity import ActivityType
+from sentry.utils.cursors import StringCursor
 from sentry.utils.sdk import Scope, bind_organization_context
 
 
@@ -69,13 +71,23 @@ class ProjectReleasesEndpoint(ProjectEndpoint, EnvironmentMixin):
         if query:
             queryset = queryset.filter(version__icontains=query)
 
-        queryset = queryset.extra(select={"sort": "COALESCE(date_released, date_added)"})
+        queryset = queryset.annotate(sort=Coalesce("date_released", "date_added"))
+
+        paginator_kwargs = {}
+        if options.get("api.pagination.keyset.enabled"):
+            paginator_kwargs.update(
+                paginator_cls=KeysetPaginator,
+                cursor_cls=StringCursor,
+                fallback=OffsetPaginator(queryset, order_by="-sort"),
+            )
+        else:
+            paginator_kwargs["paginator_cls"] = OffsetPaginator
 
         return self.paginate(
             request=request,
             queryset=queryset,
             order_by="-sort",
-            paginator_cls=OffsetPaginator,
+            **paginator_kwargs,
             on_results=lambda x: serialize(
                 x, request.user, project=project, environment=environment
             ),
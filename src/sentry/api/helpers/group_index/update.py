@@ -20,6 +20,7 @@ from sentry import analytics, features, options
 from sentry.api.serializers import serialize
 from sentry.api.serializers.models.actor import ActorSerializer, ActorSerializerResponse
 from sentry.db.models.query import create_or_update
+from sentry.grouping.ingest import grouphash_cache
 from sentry.hybridcloud.rpc import coerce_id_from
 from sentry.issues.grouptype import GroupCategory
 from sentry.issues.ignored import handle_archived_until_escalating, handle_ignored
@@ -92,9 +93,13 @@ def handle_discard(
             else:
                 groups_to_delete[group.project_id].append(group)
 
-                GroupHash.objects.filter(group=group).update(
-                    group=None, group_tombstone_id=tombstone.id
-                )
+                grouphashes = GroupHash.objects.filter(group=group)
+                invalidate_grouphashes = grouphash_cache.is_invalidation_enabled()
+                if invalidate_grouphashes:
+                    hashes = list(grouphashes.values_list("hash", flat=True))
+                grouphashes.update(group=None, group_tombstone_id=tombstone.id)
+                if invalidate_grouphashes:
+                    grouphash_cache.delete_many(group.project_id, hashes)
 
     for project in projects:
         delete_group_list(
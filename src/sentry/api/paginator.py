@@ -1,3 +1,5 @@
+import base64
+import binascii
 import bisect
 import functools
 import logging
@@ -7,10 +9,12 @@ from datetime import datetime, timezone
 from typing import Any
 from urllib.parse import quote
 
-from django.core.exceptions import EmptyResultSet, ObjectDoesNotExist
+from django.core.exceptions import EmptyResultSet, ObjectDoesNotExist, ValidationError
 from django.db import connections
+from django.db.models import Q
 from django.db.models.functions import Lower
 
+from sentry.utils import json
 from sentry.utils.cursors import Cursor, CursorResult, build_cursor
 from sentry.utils.pagination_factory import PaginatorLike
 
@@ -383,6 +387,159 @@ class MergingOffsetPaginator(OffsetPaginator):
         return CursorResult(results=results, next=next_cursor, prev=prev_cursor)
 
 
+class KeysetPaginator(PaginatorLike):
+    """
+    Paginates a queryset by the values of its sort keys instead of an offset, so that every page
+    is a range scan starting where the previous one stopped, however deep it is.
+
+    ``order_by`` is one or more field or annotation names, optionally prefixed with ``-`` for a
+    descending sort. The primary key is appended as the last key when it's not part of them, which
+    makes the order total: rows sharing every other key are never skipped nor repeated. Keys must
+    not be nullable.
+
+    The cursor value is an opaque token encoding the keys of the first or last row of a page, so
+    the paginator is used with ``StringCursor``. Cursors of another paginator (e.g. from a client
+    paginating while an endpoint is migrated) are handed over to ``fallback`` when one is given.
+    """
+
+    def __init__(self, queryset, order_by, max_limit=MAX_LIMIT, on_results=None, fallback=None):
+        keys = [order_by] if isinstance(order_by, str) else list(order_by)
+        if not keys:
+            raise ValueError("KeysetPaginator requires at least one key to order by")
+        self.keys = [(key[1:], True) if key.startswith("-") else (key, False) for key in keys]
+        pk_name = queryset.model._meta.pk.name
+        if not any(name in ("pk", pk_name) for name, _ in self.keys):
+            self.keys.append((pk_name, self.keys[-1][1]))
+        self.queryset = queryset
+        self.max_limit = max_limit
+        self.on_results = on_results
+        self.fallback = fallback
+
+    def _get_field(self, name):
+        annotations = self.queryset.query.annotations
+        if name in annotations:
+            return annotations[name].output_field
+        if name == "pk":
+            return self.queryset.model._meta.pk
+        return self.queryset.model._meta.get_field(name)
+
+    def get_item_key(self, item):
+        return [
+            item[name] if isinstance(item, dict) else getattr(item, name) for name, _ in self.keys
+        ]
+
+    def encode_cursor_value(self, values, inclusive=False):
+        payload = {
+            "k": [value.isoformat() if isinstance(value, datetime) else value for value in values]
+        }
+        if inclusive:
+            payload["i"] = 1
+        return (
+            base64.urlsafe_b64encode(json.dumps(payload).encode("utf-8"))
+            .decode("ascii")
+            .rstrip("=")
+        )
+
+    def decode_cursor_value(self, value):
+        """
+        Returns the keys and whether the row with these keys is part of the page, or ``None`` if
+        ``value`` isn't a token of this paginator.
+        """
+        try:
+            padded = value + "=" * (-len(value) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+            values = payload["k"]
+        except (TypeError, ValueError, KeyError, UnicodeError, binascii.Error):
+            return None
+        if not isinstance(values, list) or len(values) != len(self.keys):
+            return None
+        try:
+            keys = [self._get_field(name).to_python(v) for (name, _), v in zip(self.keys, values)]
+        except (ValidationError, ValueError, TypeError):
+            return None
+        return keys, bool(payload.get("i"))
+
+    def _filter_after(self, queryset, values, inclusive, is_prev):
+        """
+        Keeps the rows after ``values`` in the iteration order, which is the row value comparison
+        ``(a, b, c) > (x, y, z)`` spelled out as ``a > x OR (a = x AND b > y) OR ...`` since keys
+        can be sorted in different directions.
+        """
+        condition = Q()
+        for index, (name, desc) in enumerate(self.keys):
+            lookup = "lt" if desc != is_prev else "gt"
+            if inclusive and index == len(self.keys) - 1:
+                lookup += "e"
+            term = Q(**{f"{name}__{lookup}": values[index]})
+            for prior_index, (prior_name, _) in enumerate(self.keys[:index]):
+                term &= Q(**{prior_name: values[prior_index]})
+            condition |= term
+        return queryset.filter(condition)
+
+    def get_result(self, limit=100, cursor=None, count_hits=False, known_hits=None, max_hits=None):
+        limit = min(limit, self.max_limit)
+
+        values = None
+        inclusive = False
+        is_prev = bool(cursor and cursor.is_prev)
+        if cursor is not None and cursor.value not in (None, ""):
+            decoded = self.decode_cursor_value(str(cursor.value))
+            if decoded is None:
+                if self.fallback is None:
+                    raise BadPaginationError("Invalid cursor")
+                try:
+                    legacy_cursor = Cursor.from_string(str(cursor))
+                except ValueError:
+                    raise BadPaginationError("Invalid cursor")
+                return self.fallback.get_result(limit=limit, cursor=legacy_cursor)
+            values, inclusive = decoded
+        if values is None:
+            is_prev = False
+
+        queryset = self.queryset.order_by(
+            *(f"-{name}" if desc != is_prev else name for name, desc in self.keys)
+        )
+        if values is not None:
+            queryset = self._filter_after(queryset, values, inclusive, is_prev)
+
+        results = list(queryset[: limit + 1])
+        has_more = len(results) > limit
+        results = results[:limit]
+        if is_prev:
+            results.reverse()
+
+        if results:
+            first = self.encode_cursor_value(self.get_item_key(results[0]))
+            last = self.encode_cursor_value(self.get_item_key(results[-1]))
+        else:
+            # An empty page keeps the boundary, including its row in the page the other way
+            first = last = (
+                self.encode_cursor_value(values, inclusive=True) if values is not None else ""
+            )
+
+        if is_prev:
+            next_cursor = Cursor(last, 0, False, True)
+            prev_cursor = Cursor(first, 0, True, has_more)
+        else:
+            next_cursor = Cursor(last, 0, False, has_more)
+            prev_cursor = Cursor(first, 0, True, values is not None)
+
+        if self.on_results:
+            results = self.on_results(results)
+
+        if count_hits:
+            hits = self.count_hits(max_hits=max_hits or MAX_HITS_LIMIT)
+        elif known_hits is not None:
+            hits = known_hits
+        else:
+            hits = None
+
+        return CursorResult(results=results, next=next_cursor, prev=prev_cursor, hits=hits)
+
+    def count_hits(self, max_hits):
+        return count_hits(self.queryset, max_hits)
+
+
 def reverse_bisect_left(a, x, lo=0, hi=None):
     """\
     Similar to ``bisect.bisect_left``, but expects the data in the array ``a``
@@ -1,18 +1,33 @@
 from __future__ import annotations
 
+import functools
 import logging
-from collections.abc import Callable, Mapping, MutableMapping, Sequence
+from collections.abc import Callable, Generator, Mapping, MutableMapping, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from copy import deepcopy
 from typing import Any, TypeVar
 
 import sentry_sdk
 from django.contrib.auth.models import AnonymousUser
 
+from sentry import options
+
 logger = logging.getLogger(__name__)
 
 K = TypeVar("K")
 
 registry: MutableMapping[Any, Any] = {}
 
+# Placeholder for the values of keys which are left out of some of the serialized objects, see
+# `Serializer.serialize_columns`.
+OMIT: Any = object()
+
+# Serialized objects of memoizing serializers, for the current `memoized_serialization` block
+_memoized_results: ContextVar[dict[Any, Any] | None] = ContextVar(
+    "serializer_memoized_results", default=None
+)
+
 
 def register(type: Any) -> Callable[[type[K]], type[K]]:
     """A wrapper that adds the wrapped Serializer to the Serializer registry (see above) for the key `type`."""
@@ -61,24 +76,150 @@ def serialize(
                 pass
         else:
             return objects
+    memoized_results = _memoized_results.get()
+    if memoized_results is not None and serializer.memoize:
+        return _serialize_memoized(memoized_results, objects, user, serializer, **kwargs)
+    return _serialize(objects, user, serializer, **kwargs)
+
+
+@contextmanager
+def memoized_serialization() -> Generator[None, None, None]:
+    """
+    Within this block, objects which were already serialized by a serializer with `memoize` set
+    are not serialized again, as long as the serializer, its arguments and the user are the same.
+    This is meant to wrap a request, in which the same users, teams or projects tend to be
+    serialized many times over as parts of other objects.
+
+    Disabled unless `api.serializers.memoize` is set.
+    """
+    if _memoized_results.get() is not None or not options.get("api.serializers.memoize"):
+        yield
+        return
+
+    token = _memoized_results.set({})
+    try:
+        yield
+    finally:
+        _memoized_results.reset(token)
+
+
+def _memoization_key(serializer: Any, user: Any, kwargs: Mapping[str, Any]) -> Any:
+    return (
+        type(serializer),
+        repr(sorted(vars(serializer).items())),
+        getattr(user, "id", None),
+        repr(sorted(kwargs.items())),
+    )
+
+
+def _serialize_memoized(
+    memoized_results: dict[Any, Any],
+    objects: Sequence[Any],
+    user: Any,
+    serializer: Any,
+    **kwargs: Any,
+) -> list[Any]:
+    base_key = _memoization_key(serializer, user, kwargs)
+    keys = [
+        (base_key, type(o), o.id) if getattr(o, "id", None) is not None else None for o in objects
+    ]
+
+    missing = [o for o, key in zip(objects, keys) if key is None or key not in memoized_results]
+    serialized = iter(_serialize(missing, user, serializer, **kwargs) if missing else ())
+
+    results = []
+    for key in keys:
+        if key is not None and key in memoized_results:
+            # Callers are free to modify what they get back
+            results.append(deepcopy(memoized_results[key]))
+            continue
+        result = next(serialized)
+        if key is not None:
+            memoized_results[key] = deepcopy(result)
+        results.append(result)
+    return results
+
+
+@functools.cache
+def _is_columnar(serializer_type: type) -> bool:
+    """
+    Whether `serialize_columns` is the most specific way the serializer has of serializing
+    objects. Subclasses of columnar serializers which override `serialize` are serialized one
+    object at a time.
+    """
+    for cls in serializer_type.__mro__:
+        if "serialize_columns" in vars(cls):
+            return True
+        if {"serialize", "_serialize", "__call__"} & vars(cls).keys():
+            return False
+    return False
+
+
+def _serialize_columns(
+    objects: Sequence[Any],
+    item_list: Sequence[Any],
+    attrs: Mapping[Any, Any],
+    user: Any,
+    serializer: Any,
+    **kwargs: Any,
+) -> list[Any]:
+    try:
+        columns = serializer.serialize_columns(item_list, attrs, user, **kwargs)
+    except Exception:
+        logger.exception("Failed to serialize columns", extra={"serializer": type(serializer)})
+        return [serializer(o, attrs=attrs.get(o, {}), user=user, **kwargs) for o in objects]
+
+    names = list(columns)
+    rows = [dict(zip(names, values)) for values in zip(*columns.values())] or [
+        {} for _ in item_list
+    ]
+    for name, values in columns.items():
+        if any(value is OMIT for value in values):
+            for row in rows:
+                if row[name] is OMIT:
+                    del row[name]
+
+    serialized = iter(rows)
+    return [next(serialized) if o is not None else None for o in objects]
+
+
+def _serialize(objects: Sequence[Any], user: Any, serializer: Any, **kwargs: Any) -> list[Any]:
     with sentry_sdk.start_span(op="serialize", description=type(serializer).__name__) as span:
         span.set_data("Object Count", len(objects))
 
         with sentry_sdk.start_span(op="serialize.get_attrs", description=type(serializer).__name__):
-            attrs = serializer.get_attrs(
-                # avoid passing NoneType's to the serializer as they're allowed and
-                # filtered out of serialize()
-                item_list=[o for o in objects if o is not None],
-                user=user,
-                **kwargs,
-            )
+            # avoid passing NoneType's to the serializer as they're allowed and
+            # filtered out of serialize()
+            item_list = [o for o in objects if o is not None]
+            attrs = serializer.get_attrs(item_list=item_list, user=user, **kwargs)
+
+        if _is_columnar(type(serializer)):
+            with sentry_sdk.start_span(
+                op="serialize.columns", description=type(serializer).__name__
+            ):
+                return _serialize_columns(objects, item_list, attrs, user, serializer, **kwargs)
 
         with sentry_sdk.start_span(op="serialize.iterate", description=type(serializer).__name__):
             return [serializer(o, attrs=attrs.get(o, {}), user=user, **kwargs) for o in objects]
 
 
 class Serializer:
-    """A Serializer class contains the logic to serialize a specific type of object."""
+    """A Serializer class contains the logic to serialize a specific type of object.
+
+    Instead of `serialize`, a serializer can implement
+
+        def serialize_columns(self, item_list, attrs, user, **kwargs) -> Mapping[str, Sequence]
+
+    to serialize all of the objects at once. It returns the values of every key of the
+    serialized objects as a column, in the order of `item_list`. Keys which some objects don't
+    have take the value `OMIT` for those. If it raises, the objects are serialized one by one
+    with `serialize` instead, which columnar serializers therefore still have to implement.
+    """
+
+    # Whether the serialized objects can be reused within `memoized_serialization`. Only set this
+    # on serializers whose output depends on nothing but the object, the user, the serializer's
+    # arguments and the database.
+    memoize = False
 
     def __call__(
         self, obj: Any, attrs: Mapping[Any, Any], user: Any, **kwargs: Any
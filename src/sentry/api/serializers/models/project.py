@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from collections.abc import Iterable, Mapping, MutableMapping, Sequence
+from collections.abc import Callable, Iterable, Mapping, MutableMapping, Sequence
 from datetime import datetime, timedelta
 from typing import Any, Final, TypedDict, cast
 
@@ -14,6 +14,7 @@ from django.utils import timezone
 
 from sentry import features, options, projectoptions, release_health, roles
 from sentry.api.serializers import Serializer, register, serialize
+from sentry.api.serializers.base import OMIT
 from sentry.api.serializers.models.plugin import PluginSerializer
 from sentry.api.serializers.models.team import get_org_roles
 from sentry.api.serializers.types import OrganizationSerializerResponse, SerializedAvatarFields
@@ -277,6 +278,62 @@ class ProjectSerializerResponse(ProjectSerializerBaseResponse):
     status: str  # TODO enum/literal
 
 
+# Serialized project keys which mirror a project flag
+PROJECT_FLAG_KEYS = (
+    ("hasCustomMetrics", "has_custom_metrics"),
+    ("hasMinifiedStackTrace", "has_minified_stack_trace"),
+    ("hasMonitors", "has_cron_monitors"),
+    ("hasProfiles", "has_profiles"),
+    ("hasReplays", "has_replays"),
+    ("hasFeedbacks", "has_feedbacks"),
+    ("hasNewFeedbacks", "has_new_feedbacks"),
+    ("hasSessions", "has_sessions"),
+    # whether first span has been sent for each insight module
+    ("hasInsightsHttp", "has_insights_http"),
+    ("hasInsightsDb", "has_insights_db"),
+    ("hasInsightsAssets", "has_insights_assets"),
+    ("hasInsightsAppStart", "has_insights_app_start"),
+    ("hasInsightsScreenLoad", "has_insights_screen_load"),
+    ("hasInsightsVitals", "has_insights_vitals"),
+    ("hasInsightsCaches", "has_insights_caches"),
+    ("hasInsightsQueues", "has_insights_queues"),
+    ("hasInsightsLlmMonitoring", "has_insights_llm_monitoring"),
+)
+
+
+def _project_flag_getter(flag: str) -> Callable[[Project, Mapping[str, Any]], bool]:
+    return lambda obj, attrs: bool(getattr(obj.flags, flag))
+
+
+# Serialized project keys, in payload order, with how each is computed from a project and its
+# attrs. Shared by the per-object and the columnar serialization of ProjectSerializer.
+PROJECT_FIELDS: tuple[tuple[str, Callable[[Project, Mapping[str, Any]], Any]], ...] = (
+    ("id", lambda obj, attrs: str(obj.id)),
+    ("slug", lambda obj, attrs: obj.slug),
+    ("name", lambda obj, attrs: obj.name),  # Deprecated
+    ("platform", lambda obj, attrs: obj.platform),
+    ("dateCreated", lambda obj, attrs: obj.date_added),
+    ("isBookmarked", lambda obj, attrs: attrs["is_bookmarked"]),
+    ("isMember", lambda obj, attrs: attrs["is_member"]),
+    ("features", lambda obj, attrs: attrs["features"]),
+    ("firstEvent", lambda obj, attrs: obj.first_event),
+    ("firstTransactionEvent", lambda obj, attrs: bool(obj.flags.has_transactions)),
+    ("access", lambda obj, attrs: attrs["access"]),
+    ("hasAccess", lambda obj, attrs: attrs["has_access"]),
+    *((key, _project_flag_getter(flag)) for key, flag in PROJECT_FLAG_KEYS),
+    ("isInternal", lambda obj, attrs: obj.is_internal_project()),
+    ("isPublic", lambda obj, attrs: obj.public),
+    # Projects don't have avatar uploads, but we need to maintain the payload shape for
+    # compatibility.
+    ("avatar", lambda obj, attrs: {"avatarType": "letter_avatar", "avatarUuid": None}),
+    ("color", lambda obj, attrs: obj.color),
+    ("status", lambda obj, attrs: STATUS_LABELS.get(obj.status, "unknown")),
+)
+
+# Serialized project keys which are only present when they were computed in get_attrs
+PROJECT_OPTIONAL_KEYS = ("stats", "transactionStats", "sessionStats")
+
+
 @register(Project)
 class ProjectSerializer(Serializer):
     """
@@ -284,6 +341,8 @@ class ProjectSerializer(Serializer):
     such as "show all projects for this organization", and its attributes be kept to a minimum.
     """
 
+    memoize = True
+
     def __init__(
         self,
         environment_id: str | None = None,
@@ -494,54 +553,24 @@ class ProjectSerializer(Serializer):
     def serialize(
         self, obj: Project, attrs: Mapping[str, Any], user: User
     ) -> ProjectSerializerResponse:
-        status_label = STATUS_LABELS.get(obj.status, "unknown")
-
-        context: ProjectSerializerResponse = {
-            "id": str(obj.id),
-            "slug": obj.slug,
-            "name": obj.name,  # Deprecated
-            "platform": obj.platform,
-            "dateCreated": obj.date_added,
-            "isBookmarked": attrs["is_bookmarked"],
-            "isMember": attrs["is_member"],
-            "features": attrs["features"],
-            "firstEvent": obj.first_event,
-            "firstTransactionEvent": bool(obj.flags.has_transactions),
-            "access": attrs["access"],
-            "hasAccess": attrs["has_access"],
-            "hasCustomMetrics": bool(obj.flags.has_custom_metrics),
-            "hasMinifiedStackTrace": bool(obj.flags.has_minified_stack_trace),
-            "hasMonitors": bool(obj.flags.has_cron_monitors),
-            "hasProfiles": bool(obj.flags.has_profiles),
-            "hasReplays": bool(obj.flags.has_replays),
-            "hasFeedbacks": bool(obj.flags.has_feedbacks),
-            "hasNewFeedbacks": bool(obj.flags.has_new_feedbacks),
-            "hasSessions": bool(obj.flags.has_sessions),
-            # whether first span has been sent for each insight module
-            "hasInsightsHttp": bool(obj.flags.has_insights_http),
-            "hasInsightsDb": bool(obj.flags.has_insights_db),
-            "hasInsightsAssets": bool(obj.flags.has_insights_assets),
-            "hasInsightsAppStart": bool(obj.flags.has_insights_app_start),
-            "hasInsightsScreenLoad": bool(obj.flags.has_insights_screen_load),
-            "hasInsightsVitals": bool(obj.flags.has_insights_vitals),
-            "hasInsightsCaches": bool(obj.flags.has_insights_caches),
-            "hasInsightsQueues": bool(obj.flags.has_insights_queues),
-            "hasInsightsLlmMonitoring": bool(obj.flags.has_insights_llm_monitoring),
-            "isInternal": obj.is_internal_project(),
-            "isPublic": obj.public,
-            # Projects don't have avatar uploads, but we need to maintain the payload shape for
-            # compatibility.
-            "avatar": {"avatarType": "letter_avatar", "avatarUuid": None},
-            "color": obj.color,
-            "status": status_label,
+        context = {key: get(obj, attrs) for key, get in PROJECT_FIELDS}
+        for key in PROJECT_OPTIONAL_KEYS:
+            if key in attrs:
+                context[key] = attrs[key]
+        return cast(ProjectSerializerResponse, context)
+
+    def serialize_columns(
+        self, item_list: Sequence[Project], attrs: Mapping[Project, Any], user: User, **kwargs: Any
+    ) -> dict[str, list[Any]]:
+        item_attrs = [attrs[obj] for obj in item_list]
+        columns = {
+            key: [get(obj, a) for obj, a in zip(item_list, item_attrs)]
+            for key, get in PROJECT_FIELDS
         }
-        if "stats" in attrs:
-            context["stats"] = attrs["stats"]
-        if "transactionStats" in attrs:
-            context["transactionStats"] = attrs["transactionStats"]
-        if "sessionStats" in attrs:
-            context["sessionStats"] = attrs["sessionStats"]
-        return context
+        for key in PROJECT_OPTIONAL_KEYS:
+            if any(key in a for a in item_attrs):
+                columns[key] = [a.get(key, OMIT) for a in item_attrs]
+        return columns
 
 
 class ProjectWithOrganizationSerializer(ProjectSerializer):
@@ -152,6 +152,8 @@ class TeamSerializerResponse(BaseTeamSerializerResponse, _TeamSerializerResponse
 
 @register(Team)
 class BaseTeamSerializer(Serializer):
+    memoize = True
+
     expand: Sequence[str] | None
     collapse: Sequence[str] | None
     access: Access | None
@@ -112,6 +112,8 @@ class UserSerializerResponseSelf(UserSerializerResponse):
 
 @register(User)
 class UserSerializer(Serializer):
+    memoize = True
+
     def _user_is_requester(self, obj: User, requester: User | AnonymousUser | RpcUser) -> bool:
         if isinstance(requester, User):
             return bool(requester == obj)
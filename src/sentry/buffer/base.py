@@ -1,13 +1,114 @@
+from collections import defaultdict
+from collections.abc import Sequence
 from datetime import datetime
-from typing import Any
+from typing import Any, NamedTuple
 
+from django.db import connections, router
 from django.db.models import Expression, F
+from django.db.models.signals import post_save
 
 from sentry.db import models
 from sentry.signals import buffer_incr_complete
 from sentry.tasks.process_buffer import process_incr
+from sentry.utils import metrics
 from sentry.utils.services import Service
 
+# Maximum number of rows written by a single ``UPDATE ... FROM (VALUES ...)`` statement.
+BULK_UPDATE_CHUNK_SIZE = 500
+
+
+class BufferedIncr(NamedTuple):
+    """
+    A single pending increment, as passed to `Buffer.process`.
+    """
+
+    model: type[models.Model]
+    columns: dict[str, int]
+    filters: dict[str, Any]
+    extra: dict[str, Any] | None = None
+    signal_only: bool | None = None
+
+
+def _get_pk_filter(model: type[models.Model], filters: dict[str, Any]) -> int | None:
+    """
+    Returns the primary key if ``filters`` select a single row by primary key only.
+    """
+    if len(filters) != 1:
+        return None
+    ((name, value),) = filters.items()
+    if name not in ("pk", model._meta.pk.name):
+        return None
+    if isinstance(value, models.Model):
+        value = value.pk
+    return value if isinstance(value, int) else None
+
+
+def _bulk_update(
+    model: type[models.Model],
+    incr_names: Sequence[str],
+    extra_names: Sequence[str],
+    rows: Sequence[tuple[int, dict[str, int], dict[str, Any]]],
+) -> set[int]:
+    """
+    Applies ``rows`` of ``(pk, columns, extra)`` with a single multi-row UPDATE and returns the
+    primary keys of the rows that were matched.
+
+    Counters in ``incr_names`` are added to the current column value, values in ``extra_names``
+    overwrite it (last write wins), mirroring what `Buffer.process` does one row at a time.
+    """
+    from sentry.models.group import Group
+
+    using = router.db_for_write(model)
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    opts = model._meta
+    pk_field = opts.pk
+    incr_fields = [opts.get_field(name) for name in incr_names]
+    extra_fields = [opts.get_field(name) for name in extra_names]
+
+    assignments = [f"{qn(f.column)} = t.{qn(f.column)} + v.{qn(f.column)}" for f in incr_fields]
+    assignments.extend(f"{qn(f.column)} = v.{qn(f.column)}" for f in extra_fields)
+    if model is Group and "times_seen" in incr_names and "last_seen" in extra_names:
+        # Same formula as `ScoreClause`, evaluated against the pre-update `times_seen`.
+        assignments.append(
+            'score = log(t."times_seen" + v."times_seen") * 600'
+            ' + floor(extract(epoch from v."last_seen"))::int'
+        )
+
+    casts = [
+        pk_field.rel_db_type(connection),
+        *("bigint" for _ in incr_fields),
+        *(f.db_type(connection) for f in extra_fields),
+    ]
+    placeholder = "({})".format(", ".join(f"%s::{cast}" for cast in casts))
+    value_columns = ", ".join(qn(f.column) for f in (pk_field, *incr_fields, *extra_fields))
+
+    params: list[Any] = []
+    for pk, columns, extra in rows:
+        params.append(pk)
+        params.extend(columns[name] for name in incr_names)
+        params.extend(
+            f.get_db_prep_save(extra[name], connection)
+            for f, name in zip(extra_fields, extra_names)
+        )
+
+    sql = (
+        f"UPDATE {qn(opts.db_table)} AS t SET {', '.join(assignments)} "
+        f"FROM (VALUES {', '.join([placeholder] * len(rows))}) AS v ({value_columns}) "
+        f"WHERE t.{qn(pk_field.column)} = v.{qn(pk_field.column)} "
+        f"RETURNING t.{qn(pk_field.column)}"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        updated = {row[0] for row in cursor.fetchall()}
+
+    metrics.distribution(
+        "buffer.process_many.rows_per_statement",
+        len(rows),
+        tags={"model": model.__name__},
+    )
+    return updated
+
 
 class Buffer(Service):
     """
@@ -28,6 +129,7 @@ class Buffer(Service):
         "incr",
         "process",
         "process_pending",
+        "process_many",
         "process_batch",
         "validate",
         "push_to_sorted_set",
@@ -163,3 +265,89 @@ class Buffer(Service):
             created=created,
             sender=model,
         )
+
+    def process_many(self, incrs: Sequence[BufferedIncr]) -> None:
+        """
+        Applies a batch of pending increments at once.
+
+        Increments that select a single row by primary key are coalesced per row and written
+        with one multi-row UPDATE per (model, column set). Everything else (``signal_only``,
+        arbitrary filters, expressions in ``extra``) goes through `process` one at a time.
+        """
+        from sentry.models.group import Group
+
+        # (model, pk) -> (columns, extra), merged across increments hitting the same row
+        coalesced: dict[tuple[type[models.Model], int], tuple[dict[str, int], dict[str, Any]]] = {}
+        bulk_incrs: list[BufferedIncr] = []
+
+        for incr in incrs:
+            pk = _get_pk_filter(incr.model, incr.filters)
+            extra = incr.extra or {}
+            if (
+                incr.signal_only
+                or pk is None
+                or any(isinstance(v, Expression) for v in extra.values())
+                # `score` is only derived when `times_seen` is a counter and `last_seen` is set.
+                or (incr.model is Group and "times_seen" in extra)
+            ):
+                self.process(*incr)
+                continue
+
+            columns, merged_extra = coalesced.setdefault((incr.model, pk), ({}, {}))
+            for name, amount in incr.columns.items():
+                columns[name] = columns.get(name, 0) + amount
+            merged_extra.update(extra)
+            bulk_incrs.append(incr)
+
+        groups: dict[
+            tuple[type[models.Model], tuple[str, ...], tuple[str, ...]],
+            list[tuple[int, dict[str, int], dict[str, Any]]],
+        ] = defaultdict(list)
+        for (model, pk), (columns, extra) in coalesced.items():
+            groups[(model, tuple(sorted(columns)), tuple(sorted(extra)))].append(
+                (pk, columns, extra)
+            )
+
+        updated: set[tuple[type[models.Model], int]] = set()
+        for (model, incr_names, extra_names), rows in groups.items():
+            if not incr_names and not extra_names:
+                continue
+            for i in range(0, len(rows), BULK_UPDATE_CHUNK_SIZE):
+                chunk = rows[i : i + BULK_UPDATE_CHUNK_SIZE]
+                updated.update(
+                    (model, pk) for pk in _bulk_update(model, incr_names, extra_names, chunk)
+                )
+            metrics.incr(
+                "buffer.process_many.statements",
+                amount=(len(rows) - 1) // BULK_UPDATE_CHUNK_SIZE + 1,
+                tags={"model": model.__name__},
+            )
+
+        # `Buffer.process` updates groups through `Model.update`, which sends `post_save` so that
+        # the group cache is refreshed. Do the same here with a single read of the updated rows.
+        group_ids = [pk for model, pk in updated if model is Group]
+        for group in Group.objects.filter(id__in=group_ids):
+            post_save.send(
+                sender=Group,
+                instance=group,
+                created=False,
+                update_fields=list(
+                    {*coalesced[(Group, group.id)][0], *coalesced[(Group, group.id)][1]}
+                ),
+            )
+
+        for incr in bulk_incrs:
+            pk = _get_pk_filter(incr.model, incr.filters)
+            if (incr.model, pk) not in updated and incr.model is not Group:
+                # The row doesn't exist (yet), let `create_or_update` deal with it. Deleted groups
+                # are dropped, just like in `process`.
+                self.process(*incr)
+                continue
+            buffer_incr_complete.send_robust(
+                model=incr.model,
+                columns=incr.columns,
+                filters=incr.filters,
+                extra=incr.extra,
+                created=False,
+                sender=incr.model,
+            )
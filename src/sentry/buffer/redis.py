@@ -3,7 +3,7 @@ from __future__ import annotations
 import logging
 import pickle
 import threading
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 from datetime import date, datetime, timezone
 from enum import Enum
 from time import time
@@ -13,7 +13,7 @@ import rb
 from django.utils.encoding import force_bytes, force_str
 from rediscluster import RedisCluster
 
-from sentry.buffer.base import Buffer
+from sentry.buffer.base import Buffer, BufferedIncr
 from sentry.db import models
 from sentry.tasks.process_buffer import process_incr
 from sentry.utils import json, metrics
@@ -121,11 +121,17 @@ class RedisBuffer(Buffer):
     key_expire = 60 * 60  # 1 hour
     pending_key = "b:p"
 
-    def __init__(self, incr_batch_size: int = 2, **options: object):
+    def __init__(self, incr_batch_size: int = 2, batch_flush: bool = False, **options: object):
+        """
+        ``batch_flush`` makes `process` drain all keys of a batch in a single round trip per Redis
+        node and write them with `Buffer.process_many` instead of one lock, one read and one
+        UPDATE per key. Combine it with a larger ``incr_batch_size``.
+        """
         self.is_redis_cluster, self.cluster, options = get_dynamic_cluster_from_options(
             "SENTRY_BUFFER_OPTIONS", options
         )
         self.incr_batch_size = incr_batch_size
+        self.batch_flush = batch_flush
         assert self.incr_batch_size > 0
 
     def validate(self) -> None:
@@ -429,6 +435,9 @@ class RedisBuffer(Buffer):
             batch_keys = [key]
 
         if batch_keys is not None:
+            if self.batch_flush and len(batch_keys) > 1:
+                self._process_batch_incr(batch_keys)
+                return
             for key in batch_keys:
                 self._process_single_incr(key)
 
@@ -442,6 +451,60 @@ class RedisBuffer(Buffer):
     ) -> Any:
         return super().process(model, columns, filters, extra, signal_only)
 
+    def _execute_many(
+        self, commands: Sequence[tuple[str, str, tuple[Any, ...], dict[str, Any]]]
+    ) -> list[Any]:
+        """
+        Runs ``(route_key, command, args, kwargs)`` tuples with one round trip per Redis node.
+        Each command is sent to the node that owns ``route_key``, which is what a per-key
+        pipeline from `get_redis_connection` would have used.
+        """
+        if is_instance_redis_cluster(self.cluster, self.is_redis_cluster):
+            pipe = self.cluster.pipeline(transaction=False)
+            for _, command, args, kwargs in commands:
+                getattr(pipe, command)(*args, **kwargs)
+            return pipe.execute()
+        elif is_instance_rb_cluster(self.cluster, self.is_redis_cluster):
+            with self.cluster.fanout() as client:
+                promises = [
+                    getattr(client.target_key(route_key), command)(*args, **kwargs)
+                    for route_key, command, args, kwargs in commands
+                ]
+            return [promise.value for promise in promises]
+        else:
+            raise AssertionError("unreachable")
+
+    def _load_incr(self, values: dict[Any, Any]) -> BufferedIncr:
+        # XXX(python3): In python2 this isn't as important since redis will
+        # return string tyes (be it, byte strings), but in py3 we get bytes
+        # back, and really we just want to deal with keys as strings.
+        values = {force_str(k): v for k, v in values.items()}
+
+        model = import_string(force_str(values.pop("m")))
+
+        if values["f"].startswith(b"{" if not self.is_redis_cluster else "{"):
+            filters = self._load_values(json.loads(force_str(values.pop("f"))))
+        else:
+            # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
+            filters = pickle.loads(force_bytes(values.pop("f")))
+
+        incr_values = {}
+        extra_values = {}
+        signal_only = None
+        for k, v in values.items():
+            if k.startswith("i+"):
+                incr_values[k[2:]] = int(v)
+            elif k.startswith("e+"):
+                if v.startswith(b"[" if not self.is_redis_cluster else "["):
+                    extra_values[k[2:]] = self._load_value(json.loads(force_str(v)))
+                else:
+                    # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
+                    extra_values[k[2:]] = pickle.loads(force_bytes(v))
+            elif k == "s":
+                signal_only = bool(int(v))  # Should be 1 if set
+
+        return BufferedIncr(model, incr_values, filters, extra_values, signal_only)
+
     def _process_single_incr(self, key: str) -> None:
         client = get_cluster_routing_client(self.cluster, self.is_redis_cluster)
         lock_key = self._lock_key(client, key, ex=10)
@@ -457,39 +520,54 @@ class RedisBuffer(Buffer):
             pipe.delete(key)
             values = pipe.execute()[0]
 
-            # XXX(python3): In python2 this isn't as important since redis will
-            # return string tyes (be it, byte strings), but in py3 we get bytes
-            # back, and really we just want to deal with keys as strings.
-            values = {force_str(k): v for k, v in values.items()}
-
             if not values:
                 metrics.incr("buffer.revoked", tags={"reason": "empty"}, skip_internal=False)
                 logger.debug("buffer.revoked.empty", extra={"redis_key": key})
                 return
 
-            model = import_string(force_str(values.pop("m")))
-
-            if values["f"].startswith(b"{" if not self.is_redis_cluster else "{"):
-                filters = self._load_values(json.loads(force_str(values.pop("f"))))
-            else:
-                # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
-                filters = pickle.loads(force_bytes(values.pop("f")))
-
-            incr_values = {}
-            extra_values = {}
-            signal_only = None
-            for k, v in values.items():
-                if k.startswith("i+"):
-                    incr_values[k[2:]] = int(v)
-                elif k.startswith("e+"):
-                    if v.startswith(b"[" if not self.is_redis_cluster else "["):
-                        extra_values[k[2:]] = self._load_value(json.loads(force_str(v)))
-                    else:
-                        # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
-                        extra_values[k[2:]] = pickle.loads(force_bytes(v))
-                elif k == "s":
-                    signal_only = bool(int(v))  # Should be 1 if set
-
-            self._process(model, incr_values, filters, extra_values, signal_only)
+            self._process(*self._load_incr(values))
         finally:
             client.delete(lock_key)
+
+    def _process_batch_incr(self, keys: list[str]) -> None:
+        lock_keys = [self._make_lock_key(key) for key in keys]
+        # prevent a stampede due to celerybeat + periodic task, same as `_lock_key`
+        acquired = self._execute_many(
+            [(lock_key, "set", (lock_key, "1"), {"nx": True, "ex": 10}) for lock_key in lock_keys]
+        )
+        locked_keys = [key for key, ok in zip(keys, acquired) if ok]
+        if len(locked_keys) < len(keys):
+            metrics.incr(
+                "buffer.revoked",
+                amount=len(keys) - len(locked_keys),
+                tags={"reason": "locked"},
+                skip_internal=False,
+            )
+
+        try:
+            commands: list[tuple[str, str, tuple[Any, ...], dict[str, Any]]] = []
+            for key in locked_keys:
+                commands.append((key, "hgetall", (key,), {}))
+                commands.append((key, "zrem", (self.pending_key, key), {}))
+                commands.append((key, "delete", (key,), {}))
+            results = self._execute_many(commands)
+
+            incrs = []
+            for key, values in zip(locked_keys, results[::3]):
+                if not values:
+                    metrics.incr("buffer.revoked", tags={"reason": "empty"}, skip_internal=False)
+                    logger.debug("buffer.revoked.empty", extra={"redis_key": key})
+                    continue
+                incrs.append(self._load_incr(values))
+
+            metrics.distribution("buffer.process_many.batch_size", len(incrs))
+            with metrics.timer("buffer.process_many.duration"):
+                self.process_many(incrs)
+        finally:
+            self._execute_many(
+                [
+                    (lock_key, "delete", (lock_key,), {})
+                    for key, lock_key in zip(keys, lock_keys)
+                    if key in locked_keys
+                ]
+            )
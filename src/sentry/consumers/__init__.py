@@ -152,6 +152,23 @@ def ingest_events_options() -> list[click.Option]:
             default=False,
         )
     )
+    options.append(
+        click.Option(
+            ["--micro-batch-size", "micro_batch_size"],
+            type=int,
+            default=1,
+            help="Number of events processed together, sharing their round trips to the "
+            "deduplication cache and the processing store. Attachments are not batched.",
+        )
+    )
+    options.append(
+        click.Option(
+            ["--micro-batch-time-ms", "micro_batch_time"],
+            type=int,
+            default=50,
+            help="Maximum time (in milliseconds) to wait for a batch of events to fill up.",
+        )
+    )
     return options
 
 
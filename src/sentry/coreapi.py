@@ -55,7 +55,7 @@ def insert_data_to_database_legacy(
     if not isinstance(data, dict):
         data = dict(data.items())
 
-    cache_key = event_processing_store.store(data)
+    cache_key = event_processing_store.store(data, stage="store")
 
     # Attachments will be empty or None if the "event-attachments" feature
     # is turned off. For native crash reports it will still contain the
@@ -131,11 +131,34 @@ class NodeData(MutableMapping[str, Any]):
             currently only {"unprocessed": {...}} is added for reprocessing.
             See documentation of nodestore.
         """
+        to_write = self._get_subkeys_to_write(subkeys)
+        if to_write is None:
+            return
+
+        nodestore.backend.set_subkeys(self.id, to_write)
+
+    @classmethod
+    def save_many(cls, nodes):
+        """
+        Write the data of multiple nodes back to nodestore in one batch.
+
+        :param nodes: A sequence of ``(node_data, subkeys)`` tuples, where
+            ``subkeys`` is the same as for ``save``.
+        """
+        items = {}
+        for node_data, subkeys in nodes:
+            to_write = node_data._get_subkeys_to_write(subkeys)
+            if to_write is not None:
+                items[node_data.id] = to_write
+
+        if items:
+            nodestore.backend.set_many(items)
 
+    def _get_subkeys_to_write(self, subkeys):
         # We never loaded any data for reading or writing, so there
         # is nothing to save.
         if self._node_data is None:
-            return
+            return None
 
         # We can't put our wrappers into the nodestore, so we need to
         # ensure that the data is converted into a plain old dict
@@ -145,8 +168,7 @@ class NodeData(MutableMapping[str, Any]):
 
         subkeys = subkeys or {}
         subkeys[None] = to_write
-
-        nodestore.backend.set_subkeys(self.id, subkeys)
+        return subkeys
 
 
 class NodeField(GzippedDictField):
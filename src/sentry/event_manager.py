@@ -41,6 +41,7 @@ from sentry.constants import (
     InsightModules,
 )
 from sentry.culprit import generate_culprit
+from sentry.db.models.fields.node import NodeData
 from sentry.dynamic_sampling import LatestReleaseBias, LatestReleaseParams
 from sentry.eventstore.processing import event_processing_store
 from sentry.eventstream.base import GroupState
@@ -53,6 +54,7 @@ from sentry.grouping.api import (
     GroupingConfig,
     get_grouping_config_dict_for_project,
 )
+from sentry.grouping.ingest import grouphash_cache
 from sentry.grouping.ingest.config import (
     is_in_transition,
     project_uses_optimized_grouping,
@@ -853,6 +855,15 @@ def _get_event_user_many(jobs: Sequence[Job], projects: ProjectsMapping) -> None
         job["user"] = user
 
 
+def _get_project_key_many(jobs: Sequence[Job]) -> None:
+    key_ids = {job["key_id"] for job in jobs if job["key_id"] is not None}
+    project_keys = (
+        {key.id: key for key in ProjectKey.objects.get_many_from_cache(key_ids)} if key_ids else {}
+    )
+    for job in jobs:
+        job["project_key"] = project_keys.get(job["key_id"])
+
+
 @sentry_sdk.tracing.trace
 def _derive_plugin_tags_many(jobs: Sequence[Job], projects: ProjectsMapping) -> None:
     # XXX: We ought to inline or remove this one for sure
@@ -968,16 +979,31 @@ def _get_group_processing_kwargs(job: Job) -> dict[str, Any]:
 
 @sentry_sdk.tracing.trace
 def _get_or_create_environment_many(jobs: Sequence[Job], projects: ProjectsMapping) -> None:
+    environments: dict[tuple[int, str | None], Environment] = {}
     for job in jobs:
-        job["environment"] = Environment.get_or_create(
-            project=projects[job["project_id"]], name=job["environment"]
-        )
+        key = (job["project_id"], job["environment"])
+        if key not in environments:
+            environments[key] = Environment.get_or_create(
+                project=projects[job["project_id"]], name=job["environment"]
+            )
+        job["environment"] = environments[key]
 
 
 @sentry_sdk.tracing.trace
 def _get_or_create_group_environment_many(jobs: Sequence[Job]) -> None:
+    seen: set[tuple[int, int]] = set()
     for job in jobs:
-        _get_or_create_group_environment(job["environment"], job["release"], job["groups"])
+        environment = job["environment"]
+        groups = []
+        for group_info in job["groups"]:
+            key = (group_info.group.id, environment.id)
+            # Only the first event of a batch can be the first one of a group in an environment
+            if key in seen:
+                group_info.is_new_group_environment = False
+            else:
+                seen.add(key)
+                groups.append(group_info)
+        _get_or_create_group_environment(environment, job["release"], groups)
 
 
 def _get_or_create_group_environment(
@@ -997,22 +1023,42 @@ def _get_or_create_release_associated_models(
     # XXX: This is possibly unnecessarily detached from
     # _get_or_create_release_many, but we do not want to destroy order of
     # execution right now
+    models: dict[tuple[int, int, int], tuple[Project, Release, Environment]] = {}
+    seen: dict[tuple[int, int, int], tuple[datetime, datetime]] = {}
     for job in jobs:
         release = job["release"]
         if not release:
             continue
 
-        project = projects[job["project_id"]]
         environment = job["environment"]
-        date = job["event"].datetime
+        key = (job["project_id"], release.id, environment.id)
+        models[key] = (projects[job["project_id"]], release, environment)
+        seen[key] = _extend_seen(seen.get(key), job["event"].datetime)
+
+    for key, (project, release, environment) in models.items():
+        # Rows are created with the oldest event of the batch as `first_seen`, and then
+        # bumped to its newest event
+        for date in _unique_dates(seen[key]):
+            ReleaseEnvironment.get_or_create(
+                project=project, release=release, environment=environment, datetime=date
+            )
 
-        ReleaseEnvironment.get_or_create(
-            project=project, release=release, environment=environment, datetime=date
-        )
+            ReleaseProjectEnvironment.get_or_create(
+                project=project, release=release, environment=environment, datetime=date
+            )
 
-        ReleaseProjectEnvironment.get_or_create(
-            project=project, release=release, environment=environment, datetime=date
-        )
+
+def _extend_seen(
+    seen: tuple[datetime, datetime] | None, date: datetime
+) -> tuple[datetime, datetime]:
+    if seen is None:
+        return date, date
+    return min(seen[0], date), max(seen[1], date)
+
+
+def _unique_dates(seen: tuple[datetime, datetime]) -> tuple[datetime, ...]:
+    first_seen, last_seen = seen
+    return (first_seen,) if first_seen == last_seen else (first_seen, last_seen)
 
 
 def _increment_release_associated_counts_many(
@@ -1059,10 +1105,29 @@ def _increment_release_associated_counts(
 
 
 def _get_or_create_group_release_many(jobs: Sequence[Job]) -> None:
+    seen: dict[tuple[int, int, int], tuple[datetime, datetime]] = {}
     for job in jobs:
-        _get_or_create_group_release(
-            job["environment"], job["release"], job["event"], job["groups"]
-        )
+        if not job["release"]:
+            continue
+        for group_info in job["groups"]:
+            key = (group_info.group.id, job["release"].id, job["environment"].id)
+            seen[key] = _extend_seen(seen.get(key), job["event"].datetime)
+
+    group_releases: dict[tuple[int, int, int], GroupRelease] = {}
+    for job in jobs:
+        if not job["release"]:
+            continue
+        for group_info in job["groups"]:
+            key = (group_info.group.id, job["release"].id, job["environment"].id)
+            if key not in group_releases:
+                for date in _unique_dates(seen[key]):
+                    group_releases[key] = GroupRelease.get_or_create(
+                        group=group_info.group,
+                        release=job["release"],
+                        environment=job["environment"],
+                        datetime=date,
+                    )
+            group_info.group_release = group_releases[key]
 
 
 def _get_or_create_group_release(
@@ -1141,6 +1206,7 @@ def _tsdb_record_all_metrics(jobs: Sequence[Job]) -> None:
 
 def _nodestore_save_many(jobs: Sequence[Job], app_feature: str) -> None:
     inserted_time = datetime.now(timezone.utc).timestamp()
+    nodes = []
     for job in jobs:
         # Write the event to Nodestore
         subkeys = {}
@@ -1167,7 +1233,9 @@ def _nodestore_save_many(jobs: Sequence[Job], app_feature: str) -> None:
                 usage_type=UsageUnit.BYTES,
             )
         job["event"].data["nodestore_insert"] = inserted_time
-        job["event"].data.save(subkeys=subkeys)
+        nodes.append((job["event"].data, subkeys))
+
+    NodeData.save_many(nodes)
 
 
 def _eventstream_insert_many(jobs: Sequence[Job]) -> None:
@@ -1415,9 +1483,7 @@ def _save_aggregate(
         and not primary_hashes.hierarchical_hashes
     )
 
-    flat_grouphashes = [
-        GroupHash.objects.get_or_create(project=project, hash=hash)[0] for hash in hashes.hashes
-    ]
+    flat_grouphashes = _get_or_create_grouphashes(project, hashes.hashes, use_cache=False)
 
     # The root_hierarchical_hash is the least specific hash within the tree, so
     # typically hierarchical_hashes[0], unless a hash `n` has been split in
@@ -1589,6 +1655,7 @@ def _save_aggregate(
                 GroupHash.objects.filter(id__in=[h.id for h in new_hashes]).exclude(
                     state=GroupHash.State.LOCKED_IN_MIGRATION
                 ).update(group=group)
+                grouphash_cache.delete_many(project.id, [h.hash for h in new_hashes])
 
                 is_new = not seer_matched_group
                 is_regression = (
@@ -1719,6 +1786,7 @@ def _save_aggregate(
         GroupHash.objects.filter(id__in=[h.id for h in new_hashes]).exclude(
             state=GroupHash.State.LOCKED_IN_MIGRATION
         ).update(group=group)
+        grouphash_cache.delete_many(project.id, [h.hash for h in new_hashes])
 
     is_regression = _process_existing_aggregate(
         group=group,
@@ -1818,10 +1886,9 @@ def get_hashes_and_grouphashes(
     grouping_config, hashes = hash_calculation_function(project, job, metric_tags)
 
     if extract_hashes(hashes):
-        grouphashes = [
-            GroupHash.objects.get_or_create(project=project, hash=hash)[0]
-            for hash in extract_hashes(hashes)
-        ]
+        grouphashes = _get_or_create_grouphashes(
+            project, extract_hashes(hashes), job.get("batch_grouphashes")
+        )
 
         existing_grouphash = find_existing_grouphash_new(grouphashes)
 
@@ -1830,6 +1897,55 @@ def get_hashes_and_grouphashes(
         return NULL_GROUPHASH_INFO
 
 
+def _get_or_create_grouphashes(
+    project: Project,
+    hashes: Sequence[str],
+    batch_grouphashes: dict[str, GroupHash] | None = None,
+    use_cache: bool = True,
+) -> list[GroupHash]:
+    """
+    Get or create the `GroupHash` for each of the given hashes.
+
+    Grouphashes are looked up in `batch_grouphashes` (shared by all events saved through
+    `save_error_events_batch`) and the grouphash cache first. The remaining ones are fetched with a
+    single query, and only hashes which have never been seen before are created one by one.
+
+    Grouphashes without a group are never put into `batch_grouphashes`, as the current event may be
+    about to assign one.
+    """
+    found: dict[str, GroupHash] = {}
+    if batch_grouphashes:
+        found.update(
+            (hash, batch_grouphashes[hash]) for hash in hashes if hash in batch_grouphashes
+        )
+
+    missing = [hash for hash in hashes if hash not in found]
+    if missing and use_cache:
+        found.update(grouphash_cache.get_many(project.id, missing))
+        missing = [hash for hash in missing if hash not in found]
+
+    if missing:
+        fetched = {
+            grouphash.hash: grouphash
+            for grouphash in GroupHash.objects.filter(project=project, hash__in=missing)
+        }
+        for hash in missing:
+            if hash not in fetched:
+                fetched[hash] = GroupHash.objects.get_or_create(project=project, hash=hash)[0]
+        if use_cache:
+            grouphash_cache.set_many(fetched.values())
+        found.update(fetched)
+
+    grouphashes = [found[hash] for hash in hashes]
+
+    if batch_grouphashes is not None:
+        for grouphash in grouphashes:
+            if grouphash.group_id is not None or grouphash.group_tombstone_id is not None:
+                batch_grouphashes[grouphash.hash] = grouphash
+
+    return grouphashes
+
+
 def handle_existing_grouphash(
     job: Job,
     existing_grouphash: GroupHash,
@@ -1859,7 +1975,23 @@ def handle_existing_grouphash(
     # _save_aggregate had races around group creation which made this race
     # more user visible. For more context, see 84c6f75a and d0e22787, as
     # well as GH-5085.
-    group = Group.objects.get(id=existing_grouphash.group_id)
+    try:
+        group = Group.objects.get(id=existing_grouphash.group_id)
+    except Group.DoesNotExist:
+        # The grouphash may have come from the grouphash cache, pointing at a group which has since
+        # been merged into another one or deleted. Resolve the hashes again from postgres.
+        project = job["event"].project
+        hashes = [grouphash.hash for grouphash in all_grouphashes]
+        grouphash_cache.delete_many(project.id, hashes)
+        for hash in hashes:
+            job.get("batch_grouphashes", {}).pop(hash, None)
+
+        all_grouphashes = _get_or_create_grouphashes(project, hashes, use_cache=False)
+        fresh_existing_grouphash = find_existing_grouphash_new(all_grouphashes)
+        if fresh_existing_grouphash is None:
+            return create_group_with_grouphashes(job, all_grouphashes, group_processing_kwargs)
+
+        group = Group.objects.get(id=fresh_existing_grouphash.group_id)
 
     if check_for_category_mismatch(group):
         return None
@@ -3072,6 +3204,215 @@ def save_transaction_events(jobs: Sequence[Job], projects: ProjectsMapping) -> S
     return jobs
 
 
+@dataclass
+class ErrorEventsBatchResult:
+    # Jobs of the events which were saved
+    saved: list[Job]
+    # Jobs which failed before anything was recorded for their events, and can be saved again
+    failed: list[Job]
+
+
+@sentry_sdk.tracing.trace
+def save_error_events_batch(
+    jobs: Sequence[Job], projects: ProjectsMapping
+) -> ErrorEventsBatchResult:
+    """
+    Batch counterpart of `EventManager.save_error_events`, meant for saving all error events of a
+    project (e.g. from one consumer batch) at once.
+
+    Jobs need to have gone through `_pull_out_data` and may carry the `cache_key` and
+    `has_attachments` arguments of `EventManager.save`. Release, environment, group environment,
+    group release and project key lookups are shared by the whole batch, grouphashes are fetched
+    in bulk and reused between events, and all events are written to nodestore at once.
+
+    Errors are isolated so that nothing is counted twice when failed events are saved again:
+
+    - Errors in the lookups shared by the batch are raised, nothing was counted yet.
+    - An event whose grouping fails is returned in `failed`, without affecting the others.
+    - Once events are grouped, their groups have been counted, so an error in a later step is
+      logged and the events are dropped, as `EventManager.save` would.
+
+    Events which are discarded or end up without a group are not saved. Removing the processing
+    store payloads of the events which weren't saved or failed is up to the caller.
+
+    Note: Nothing calls this in production yet, the `save_event` task still saves one event at a
+    time through `EventManager.save`.
+    """
+    organization_ids = {project.organization_id for project in projects.values()}
+    organizations = {o.id: o for o in Organization.objects.get_many_from_cache(organization_ids)}
+
+    for project in projects.values():
+        try:
+            project.set_cached_field_value("organization", organizations[project.organization_id])
+        except KeyError:
+            continue
+
+    set_measurement(measurement_name="jobs", value=len(jobs))
+    set_measurement(measurement_name="projects", value=len(projects))
+
+    grouping_flags = {
+        project.id: (project_uses_optimized_grouping(project), is_in_transition(project))
+        for project in projects.values()
+    }
+    batch_grouphashes: dict[int, dict[str, GroupHash]] = {project_id: {} for project_id in projects}
+
+    for job in jobs:
+        job["optimized_grouping"], job["in_grouping_transition"] = grouping_flags[job["project_id"]]
+        job["batch_grouphashes"] = batch_grouphashes[job["project_id"]]
+
+    _get_or_create_release_many(jobs, projects)
+    _get_event_user_many(jobs, projects)
+    _get_project_key_many(jobs)
+    _derive_plugin_tags_many(jobs, projects)
+    _derive_interface_tags_many(jobs)
+
+    saved_jobs = []
+    failed_jobs: list[Job] = []
+    attachments_by_event: dict[str, list[Attachment]] = {}
+    for job in jobs:
+        event = job["event"]
+        metric_tags: MutableTags = {
+            "platform": event.platform or "unknown",
+            "sdk": normalized_sdk_tag_from_event(event.data),
+            "using_transition_optimization": job["optimized_grouping"],
+            "in_transition": job["in_grouping_transition"],
+        }
+
+        # See `EventManager.save_error_events` on why attachments are loaded before grouping
+        if job.get("has_attachments"):
+            attachments = get_attachments(job.get("cache_key"), job)
+        else:
+            attachments = []
+
+        try:
+            group_info = assign_event_to_group(event=event, job=job, metric_tags=metric_tags)
+        except HashDiscarded as e:
+            logger.info(
+                "save_error_events_batch.discarded",
+                extra={
+                    "event_id": event.event_id,
+                    "project_id": job["project_id"],
+                    "reason": e.reason,
+                    "tombstone_id": e.tombstone_id,
+                },
+            )
+            discard_event(job, attachments)
+            continue
+        except Exception:
+            logger.exception(
+                "save_error_events_batch.grouping_failed",
+                extra={"event_id": event.event_id, "project_id": job["project_id"]},
+            )
+            failed_jobs.append(job)
+            continue
+
+        if not group_info:
+            continue
+
+        event.data.bind_ref(event)
+        attachments_by_event[event.event_id] = attachments
+        saved_jobs.append(job)
+
+    if len(saved_jobs) + len(failed_jobs) < len(jobs):
+        metrics.incr(
+            "event_manager.save_error_events_batch.discarded",
+            amount=len(jobs) - len(saved_jobs) - len(failed_jobs),
+        )
+    if failed_jobs:
+        metrics.incr("event_manager.save_error_events_batch.failed", amount=len(failed_jobs))
+    if not saved_jobs:
+        return ErrorEventsBatchResult(saved=saved_jobs, failed=failed_jobs)
+
+    try:
+        _save_grouped_error_events(saved_jobs, projects, attachments_by_event)
+    except Exception:
+        logger.exception("save_error_events_batch.save_failed", extra={"events": len(saved_jobs)})
+        metrics.incr("event_manager.save_error_events_batch.dropped", amount=len(saved_jobs))
+        return ErrorEventsBatchResult(saved=[], failed=failed_jobs)
+
+    return ErrorEventsBatchResult(saved=saved_jobs, failed=failed_jobs)
+
+
+def _save_grouped_error_events(
+    saved_jobs: Sequence[Job],
+    projects: ProjectsMapping,
+    attachments_by_event: dict[str, list[Attachment]],
+) -> None:
+    _get_or_create_environment_many(saved_jobs, projects)
+    _get_or_create_group_environment_many(saved_jobs)
+    _get_or_create_release_associated_models(saved_jobs, projects)
+    _increment_release_associated_counts_many(saved_jobs, projects)
+    _get_or_create_group_release_many(saved_jobs)
+    _tsdb_record_all_metrics(saved_jobs)
+
+    for job in saved_jobs:
+        event_id = job["event"].event_id
+        if attachments_by_event[event_id]:
+            attachments_by_event[event_id] = filter_attachments_for_group(
+                attachments_by_event[event_id], job
+            )
+
+    # XXX: DO NOT MUTATE THE EVENT PAYLOADS AFTER THIS POINT
+    _materialize_event_metrics(saved_jobs)
+
+    for job in saved_jobs:
+        for attachment in attachments_by_event[job["event"].event_id]:
+            key = f"bytes.stored.{attachment.type}"
+            old_bytes = job["event_metrics"].get(key) or 0
+            job["event_metrics"][key] = old_bytes + attachment.size
+
+    _nodestore_save_many(jobs=saved_jobs, app_feature="errors")
+
+    for job in saved_jobs:
+        event = job["event"]
+        project = projects[job["project_id"]]
+
+        if not job["raw"]:
+            if not project.first_event:
+                project.update(first_event=event.datetime)
+                first_event_received.send_robust(project=project, event=event, sender=Project)
+
+            if has_event_minified_stack_trace(event) and not project.flags.has_minified_stack_trace:
+                first_event_with_minified_stack_trace_received.send_robust(
+                    project=project, event=event, sender=Project
+                )
+
+        if is_reprocessed_event(job["data"]):
+            safe_execute(
+                reprocessing2.buffered_delete_old_primary_hash,
+                project_id=event.project_id,
+                group_id=reprocessing2.get_original_group_id(event),
+                event_id=event.event_id,
+                datetime=event.datetime,
+                old_primary_hash=reprocessing2.get_original_primary_hash(event),
+                current_primary_hash=event.get_primary_hash(),
+            )
+
+    _eventstream_insert_many(saved_jobs)
+
+    for job in saved_jobs:
+        attachments = attachments_by_event[job["event"].event_id]
+        if not is_reprocessed_event(job["data"]) and attachments:
+            save_attachments(job.get("cache_key"), attachments, job)
+
+        metric_tags = {"from_relay": str("_relay_processed" in job["data"])}
+        metrics.timing(
+            "events.latency",
+            job["received_timestamp"] - job["recorded_timestamp"],
+            tags=metric_tags,
+        )
+        metrics.distribution(
+            "events.size.data.post_save", job["event"].size, tags=metric_tags, unit="byte"
+        )
+        metrics.incr(
+            "events.post_save.normalize.errors",
+            amount=len(job["data"].get("errors") or ()),
+            tags=metric_tags,
+        )
+
+    _track_outcome_accepted_many(saved_jobs)
+
+
 @sentry_sdk.tracing.trace
 def save_generic_events(jobs: Sequence[Job], projects: ProjectsMapping) -> Sequence[Job]:
     organization_ids = {project.organization_id for project in projects.values()}
@@ -3,7 +3,8 @@ Eventstore compressor is responsible for pulling out repeating data across
 events such that they can be stored only once. For example SDK modules list, or
 debug_meta.
 
-This is not used in production yet, we are still collecting metrics there.
+The processing store uses it with `eventstore.processing.deduplicate`, and
+nodestore with `nodestore.deduplicate`.
 """
 from __future__ import annotations
 
@@ -14,6 +15,8 @@ import orjson
 
 _INTERFACES = {}
 
+PATCHSETS_KEY = "__nodestore_patchsets"
+
 
 def _deduplicate_interface(*keys):
     def inner(f):
@@ -33,11 +36,15 @@ class DebugMeta:
     def encode(data):
         dedup: dict[str, list[str | Any]] = {}
 
-        if data:
-            for image in data.get("images") or []:
-                image = image or {}
+        if data and data.get("images"):
+            images = []
+            for image in data["images"]:
+                # Copied, so that the event passed in is left untouched
+                image = dict(image) if image else image
                 for name in DebugMeta._DEDUP_FIELDS:
-                    dedup.setdefault(name, []).append(image.pop(name, None))
+                    dedup.setdefault(name, []).append(image.pop(name, None) if image else None)
+                images.append(image)
+            data = {**data, "images": images}
 
         return dedup, data
 
@@ -53,6 +60,17 @@ class DebugMeta:
         return data
 
 
+@_deduplicate_interface("modules")
+class Modules:
+    @staticmethod
+    def encode(data):
+        return data, None
+
+    @staticmethod
+    def decode(dedup, data):
+        return dedup
+
+
 def deduplicate(data):
     patchsets = []
     extra_keys = {}
@@ -68,24 +86,24 @@ def deduplicate(data):
         patchsets.append([key, checksum, to_inline])
 
     if patchsets:
-        data["__nodestore_patchsets"] = patchsets
+        data[PATCHSETS_KEY] = patchsets
 
     return data, extra_keys
 
 
 def assemble(data, get_extra_keys):
-    if not data.get("__nodestore_patchsets"):
+    if not data.get(PATCHSETS_KEY):
         return data
 
     checksums = []
-    for key, checksum, inlined in data["__nodestore_patchsets"]:
+    for key, checksum, inlined in data[PATCHSETS_KEY]:
         checksums.append(checksum)
 
     deduplicated_interfaces = get_extra_keys(checksums)
 
-    for key, checksum, inlined in data["__nodestore_patchsets"]:
+    for key, checksum, inlined in data[PATCHSETS_KEY]:
         deduplicated = deduplicated_interfaces[checksum]
         data[key] = _INTERFACES[key].decode(deduplicated, inlined)
 
-    del data["__nodestore_patchsets"]
+    del data[PATCHSETS_KEY]
     return data
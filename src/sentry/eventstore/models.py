@@ -38,7 +38,7 @@ SEARCH_MESSAGE_SKIPPED_KEYS = frozenset(["in_app_frame_mix"])
 
 if TYPE_CHECKING:
     from sentry.grouping.api import GroupingConfig
-    from sentry.grouping.strategies.base import StrategyConfiguration
+    from sentry.grouping.strategies.base import ComponentCache, StrategyConfiguration
     from sentry.interfaces.user import User
     from sentry.models.environment import Environment
     from sentry.models.group import Group
@@ -325,7 +325,11 @@ class BaseEvent(metaclass=abc.ABCMeta):
 
         return get_grouping_config_dict_for_event_data(self.data, self.project)
 
-    def get_hashes(self, force_config: StrategyConfiguration | None = None) -> CalculatedHashes:
+    def get_hashes(
+        self,
+        force_config: StrategyConfiguration | None = None,
+        component_cache: ComponentCache | None = None,
+    ) -> CalculatedHashes:
         """
         Returns _all_ information that is necessary to group an event into
         issues. It returns two lists of hashes, `(flat_hashes, hierarchical_hashes)`:
@@ -364,7 +368,7 @@ class BaseEvent(metaclass=abc.ABCMeta):
         # Create fresh hashes
         from sentry.grouping.api import sort_grouping_variants
 
-        variants = self.get_grouping_variants(force_config)
+        variants = self.get_grouping_variants(force_config, component_cache=component_cache)
         flat_variants, hierarchical_variants = sort_grouping_variants(variants)
         flat_hashes, _ = self._hashes_from_sorted_grouping_variants(flat_variants)
         hierarchical_hashes, tree_labels = self._hashes_from_sorted_grouping_variants(
@@ -428,6 +432,7 @@ class BaseEvent(metaclass=abc.ABCMeta):
         self,
         force_config: StrategyConfiguration | GroupingConfig | str | None = None,
         normalize_stacktraces: bool = False,
+        component_cache: ComponentCache | None = None,
     ) -> dict[str, BaseVariant]:
         """
         This is similar to `get_hashes` but will instead return the
@@ -474,7 +479,9 @@ class BaseEvent(metaclass=abc.ABCMeta):
             span.set_tag("project", self.project_id)
             span.set_tag("event_id", self.event_id)
 
-            return get_grouping_variants_for_event(self, loaded_grouping_config)
+            return get_grouping_variants_for_event(
+                self, loaded_grouping_config, component_cache=component_cache
+            )
 
     def get_primary_hash(self) -> str | None:
         hashes = self.get_hashes()
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
-from collections.abc import MutableMapping
+from collections.abc import MutableMapping, Sequence
 from datetime import timedelta
 from typing import Any
 
+from sentry import options
+from sentry.eventstore import compressor
+from sentry.eventstore.processing import encoding
+from sentry.utils import metrics
 from sentry.utils.cache import cache_key_for_event
 from sentry.utils.kvstore.abstract import KVStorage
 from sentry.utils.services import Service
@@ -25,30 +29,110 @@ class EventProcessingStore(Service):
 
     Separating processing store from the cache allows use of different
     implementations.
+
+    Payloads are encoded by the store itself (see
+    `sentry.eventstore.processing.encoding`), the inner storage only holds
+    bytes. With `eventstore.processing.deduplicate`, the parts of an event
+    which `sentry.eventstore.compressor` deduplicates are stored once under
+    their checksum, and shared between all events containing them.
     """
 
-    def __init__(self, inner: KVStorage[str, Event]):
+    def __init__(self, inner: KVStorage[str, bytes]):
         self.inner = inner
         self.timeout = timedelta(seconds=DEFAULT_TIMEOUT)
 
     def __get_unprocessed_key(self, key: str) -> str:
         return key + ":u"
 
-    def exists(self, event: Event) -> bool:
-        key = cache_key_for_event(event)
-        return self.get(key) is not None
+    def __get_shared_key(self, checksum: str) -> str:
+        return f"e:shared:{checksum}"
 
-    def store(self, event: Event, unprocessed: bool = False) -> str:
+    def exists(self, event: Event) -> bool:
         key = cache_key_for_event(event)
+        # No need to decode the payload to know it's there
+        return self.inner.get(key) is not None
+
+    def store(self, event: Event, unprocessed: bool = False, stage: str = "unknown") -> str:
+        return self.store_many([event], unprocessed=unprocessed, stage=stage)[0]
+
+    def store_many(
+        self, events: Sequence[Event], unprocessed: bool = False, stage: str = "unknown"
+    ) -> list[str]:
+        """
+        Stores several events at once, and returns their keys in the same order.
+        `stage` is the processing stage storing the events, for metrics.
+        """
+        keys = [cache_key_for_event(event) for event in events]
         if unprocessed:
-            key = self.__get_unprocessed_key(key)
-        self.inner.set(key, event, self.timeout)
-        return key
+            keys = [self.__get_unprocessed_key(key) for key in keys]
+
+        compress = options.get("eventstore.processing.compress")
+        deduplicate = options.get("eventstore.processing.deduplicate")
+        encoding_tag = "zstd" if compress else "json"
+
+        items = []
+        shared: dict[str, Any] = {}
+        for key, event in zip(keys, events):
+            if deduplicate:
+                event, extra_keys = _deduplicate(event)
+                shared.update(extra_keys)
+
+            value = encoding.encode(event, compress=compress)
+            metrics.distribution(
+                "eventstore.processing.bytes_written",
+                len(value),
+                tags={"stage": stage, "encoding": encoding_tag},
+                unit="byte",
+            )
+            items.append((key, value))
+
+        if shared:
+            # Shared parts are written again with every event referencing them, so that they never
+            # expire before the events do.
+            shared_items = [
+                (self.__get_shared_key(checksum), encoding.encode(value, compress=compress))
+                for checksum, value in shared.items()
+            ]
+            metrics.distribution(
+                "eventstore.processing.shared_bytes_written",
+                sum(len(value) for _, value in shared_items),
+                tags={"stage": stage, "encoding": encoding_tag},
+                unit="byte",
+            )
+            self.inner.set_many(shared_items, self.timeout)
+
+        self.inner.set_many(items, self.timeout)
+        return keys
 
     def get(self, key: str, unprocessed: bool = False) -> MutableMapping[str, Any] | None:
         if unprocessed:
             key = self.__get_unprocessed_key(key)
-        return self.inner.get(key)
+        value = self.inner.get(key)
+        if value is None:
+            return None
+
+        data = encoding.decode(value)
+        if isinstance(data, dict) and data.get(compressor.PATCHSETS_KEY):
+            return self._assemble(data)
+        return data
+
+    def _assemble(self, data: MutableMapping[str, Any]) -> MutableMapping[str, Any] | None:
+        """
+        Puts the shared parts of a deduplicated event back in. Returns `None` if a shared part
+        is missing, the same as if the event itself had expired.
+        """
+        keys = {
+            self.__get_shared_key(checksum): checksum
+            for _, checksum, _ in data[compressor.PATCHSETS_KEY]
+        }
+        shared = {
+            keys[key]: encoding.decode(value) for key, value in self.inner.get_many(list(keys))
+        }
+        if len(shared) < len(keys):
+            metrics.incr("eventstore.processing.missing_shared")
+            return None
+
+        return compressor.assemble(data, lambda checksums: shared)
 
     def delete_by_key(self, key: str) -> None:
         self.inner.delete(key)
@@ -57,3 +141,10 @@ class EventProcessingStore(Service):
     def delete(self, event: Event) -> None:
         key = cache_key_for_event(event)
         self.delete_by_key(key)
+
+
+def _deduplicate(event: Event) -> tuple[Event, dict[str, Any]]:
+    if not isinstance(event, MutableMapping):
+        return event, {}
+    # The compressor pops what it deduplicates, and the caller keeps using the event
+    return compressor.deduplicate(dict(event))
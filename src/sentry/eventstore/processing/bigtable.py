@@ -1,6 +1,4 @@
-from sentry.utils.codecs import BytesCodec, JSONCodec
 from sentry.utils.kvstore.bigtable import BigtableKVStorage
-from sentry.utils.kvstore.encoding import KVStorageCodecWrapper
 
 from .base import EventProcessingStore
 
@@ -14,9 +12,4 @@ class BigtableEventProcessingStore(EventProcessingStore):
     """
 
     def __init__(self, **options):
-        super().__init__(
-            KVStorageCodecWrapper(
-                BigtableKVStorage(**options),
-                JSONCodec() | BytesCodec(),  # maintains functional parity with cache backend
-            )
-        )
+        super().__init__(BigtableKVStorage(**options))
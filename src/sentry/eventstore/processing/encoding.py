@@ -0,0 +1,31 @@
+"""
+Encoding of event payloads in the processing store.
+
+Payloads used to be written as plain JSON. With `eventstore.processing.compress` they're written
+as zstd compressed JSON, prefixed with `MAGIC` so that the two can be told apart. Both formats
+are always readable, so that the option can be flipped while events are being processed.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import zstandard
+
+from sentry.utils import json
+
+MAGIC = b"\xffEPZ"
+COMPRESSION_LEVEL = 3
+
+
+def encode(value: Any, compress: bool = False) -> bytes:
+    serialized = json.dumps(value).encode("utf8")
+    if not compress:
+        return serialized
+    return MAGIC + zstandard.compress(serialized, level=COMPRESSION_LEVEL)
+
+
+def decode(value: bytes) -> Any:
+    if value[: len(MAGIC)] == MAGIC:
+        return json.loads(zstandard.decompress(value[len(MAGIC) :]).decode("utf8"))
+    return json.loads(value.decode("utf8"))
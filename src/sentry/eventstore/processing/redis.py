@@ -1,5 +1,3 @@
-from sentry.utils.codecs import JSONCodec
-from sentry.utils.kvstore.encoding import KVStorageCodecWrapper
 from sentry.utils.kvstore.redis import RedisKVStorage
 from sentry.utils.redis import redis_clusters
 
@@ -14,7 +12,5 @@ class RedisClusterEventProcessingStore(EventProcessingStore):
 
     def __init__(self, **options):
         super().__init__(
-            KVStorageCodecWrapper(
-                RedisKVStorage(redis_clusters.get(options.pop("cluster", "default"))), JSONCodec()
-            )
+            RedisKVStorage(redis_clusters.get_binary(options.pop("cluster", "default")))
         )
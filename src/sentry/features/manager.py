@@ -2,11 +2,15 @@ from __future__ import annotations
 
 import logging
 
-__all__ = ["FeatureManager"]
+__all__ = ["FeatureManager", "feature_evaluation_cache"]
 
 import abc
+import dataclasses
+import time
 from collections import defaultdict
-from collections.abc import Iterable, Mapping, MutableMapping, MutableSet, Sequence
+from collections.abc import Generator, Iterable, Mapping, MutableMapping, MutableSet, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import TYPE_CHECKING, Any
 
 import sentry_sdk
@@ -16,7 +20,7 @@ from sentry.options import FLAG_AUTOMATOR_MODIFIABLE, register
 from sentry.utils import metrics
 from sentry.utils.types import Dict
 
-from .base import Feature, FeatureHandlerStrategy
+from .base import Feature, FeatureHandlerStrategy, ProjectFeature
 from .exceptions import FeatureNotRegistered
 
 if TYPE_CHECKING:
@@ -28,6 +32,91 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+FEATURE_METRICS_SAMPLE_RATE = 0.01
+
+
+@dataclasses.dataclass
+class _EvaluationCache:
+    # (feature name, entities, actor) -> result
+    results: dict[Any, bool] = dataclasses.field(default_factory=dict)
+    # Projects checked so far, by organization id, which are batched together on a miss
+    projects: defaultdict[int, dict[int, Project]] = dataclasses.field(
+        default_factory=lambda: defaultdict(dict)
+    )
+    # (feature name, entities, actor) of the projects which were part of a batch, including those
+    # which no handler decided, so that they aren't batched again on every miss
+    batched: set[Any] = dataclasses.field(default_factory=set)
+    # Time spent evaluating each feature, in seconds
+    durations: defaultdict[str, float] = dataclasses.field(
+        default_factory=lambda: defaultdict(float)
+    )
+    hits: int = 0
+    misses: int = 0
+
+
+_evaluation_cache: ContextVar[_EvaluationCache | None] = ContextVar(
+    "feature_evaluation_cache", default=None
+)
+
+
+@contextmanager
+def feature_evaluation_cache() -> Generator[None, None, None]:
+    """
+    Within this block, the result of checking a feature for the same entities and actor is reused,
+    and project features are checked for every project of the organization seen so far at once.
+    This is meant to wrap a request or a task, which tend to check the same features many times.
+
+    Disabled unless `features.evaluation-cache.enabled` is set.
+    """
+    from sentry import options
+
+    if _evaluation_cache.get() is not None or not options.get("features.evaluation-cache.enabled"):
+        yield
+        return
+
+    cache = _EvaluationCache()
+    token = _evaluation_cache.set(cache)
+    try:
+        yield
+    finally:
+        _evaluation_cache.reset(token)
+        metrics.incr(
+            "features.evaluation_cache.checks",
+            cache.hits,
+            tags={"result": "hit"},
+            sample_rate=FEATURE_METRICS_SAMPLE_RATE,
+        )
+        metrics.incr(
+            "features.evaluation_cache.checks",
+            cache.misses,
+            tags={"result": "miss"},
+            sample_rate=FEATURE_METRICS_SAMPLE_RATE,
+        )
+        for name, duration in cache.durations.items():
+            metrics.distribution(
+                "features.evaluation_cache.duration",
+                duration * 1000,
+                tags={"feature": name},
+                sample_rate=FEATURE_METRICS_SAMPLE_RATE,
+                unit="millisecond",
+            )
+
+
+def _actor_key(actor: Any) -> Any:
+    if actor is None:
+        return None
+    return type(actor).__name__, getattr(actor, "id", None)
+
+
+def _evaluation_key(name: str, args: Sequence[Any], actor: Any) -> Any:
+    entities = []
+    for arg in args:
+        entity_id = getattr(arg, "id", None)
+        if entity_id is None:
+            return None
+        entities.append((type(arg).__name__, entity_id))
+    return name, tuple(entities), _actor_key(actor)
+
 
 class RegisteredFeatureManager:
     """
@@ -53,7 +142,12 @@ class RegisteredFeatureManager:
 
     def _get_handler(self, feature: Feature, actor: User) -> bool | None:
         for handler in self._handler_registry[feature.name]:
-            rv = handler(feature, actor)
+            with metrics.timer(
+                "features.has.handler",
+                tags={"feature": feature.name, "handler": type(handler).__name__},
+                sample_rate=FEATURE_METRICS_SAMPLE_RATE,
+            ):
+                rv = handler(feature, actor)
             if rv is not None:
                 return rv
         return None
@@ -95,7 +189,39 @@ class RegisteredFeatureManager:
 
         >>> FeatureManager.has_for_batch('projects:feature', organization, [project1, project2], actor=request.user)
         """
+        result = self._get_batch_handler_results(name, organization, objects, actor)
+
+        cache = _evaluation_cache.get()
+        if cache is not None:
+            # Only what handlers returned is cached, as ``has`` checks the
+            # entity handler before falling back to the default
+            for obj in objects:
+                cache.projects[obj.organization_id][obj.id] = obj
+                key = _evaluation_key(name, (obj,), actor)
+                if key is None:
+                    continue
+                cache.batched.add(key)
+                if obj in result:
+                    cache.results[key] = result[obj]
+
+        default_flag = settings.SENTRY_FEATURES.get(name, False)
+        for obj in objects:
+            if obj not in result:
+                result[obj] = default_flag
 
+        return result
+
+    def _get_batch_handler_results(
+        self,
+        name: str,
+        organization: Organization,
+        objects: Iterable[Project],
+        actor: User | None = None,
+    ) -> dict[Project, bool]:
+        """
+        Returns the result of the registered feature handlers for the objects
+        which any of them handled.
+        """
         result = dict()
         remaining = set(objects)
 
@@ -121,10 +247,6 @@ class RegisteredFeatureManager:
                         result[obj] = flag
                 span.set_data("Flags Found", batch_size - len(remaining))
 
-        default_flag = settings.SENTRY_FEATURES.get(name, False)
-        for obj in remaining:
-            result[obj] = default_flag
-
         return result
 
 
@@ -248,8 +370,84 @@ class FeatureManager(RegisteredFeatureManager):
 
         >>> FeatureManager.has('organizations:feature', organization, actor=request.user)
 
+        Within ``feature_evaluation_cache``, results are reused for the rest
+        of the request or task.
+        """
+        cache = _evaluation_cache.get()
+        if cache is None or skip_entity or kwargs.keys() - {"actor"}:
+            return self._has(name, *args, skip_entity=skip_entity, **kwargs)
+
+        actor = kwargs.get("actor")
+        key = _evaluation_key(name, args, actor)
+        if key is None:
+            return self._has(name, *args, skip_entity=skip_entity, **kwargs)
+
+        try:
+            rv = cache.results[key]
+        except KeyError:
+            pass
+        else:
+            cache.hits += 1
+            return rv
+
+        cache.misses += 1
+        start = time.perf_counter()
+        rv = None
+        if len(args) == 1 and hasattr(args[0], "organization_id"):
+            rv = self._check_project_batch(cache, name, args[0], actor)
+        if rv is None:
+            rv = self._has(name, *args, **kwargs)
+        cache.durations[name] += time.perf_counter() - start
+        cache.results[key] = rv
+        return rv
+
+    def _check_project_batch(
+        self, cache: _EvaluationCache, name: str, project: Project, actor: User | None
+    ) -> bool | None:
+        """
+        Checks a project feature for every project of the organization seen so
+        far which it wasn't checked or batched for yet, and returns the result
+        of the feature handlers for ``project``, if any. Projects which no
+        handler decided are left to ``_has``, which also consults the entity
+        handler.
         """
-        sample_rate = 0.01
+        try:
+            if not issubclass(self._get_feature_class(name), ProjectFeature):
+                return None
+        except FeatureNotRegistered:
+            return None
+
+        seen = cache.projects[project.organization_id]
+        seen[project.id] = project
+        if not self._handler_registry[name]:
+            return None
+
+        pending = {
+            key: other
+            for other in seen.values()
+            if (key := _evaluation_key(name, (other,), actor)) not in cache.results
+            and key not in cache.batched
+        }
+        if len(pending) < 2:
+            return None
+
+        cache.batched.update(pending)
+
+        try:
+            result = self._get_batch_handler_results(
+                name, project.organization, list(pending.values()), actor
+            )
+        except Exception:
+            logger.exception("Failed to run batched feature check")
+            return None
+
+        for other, flag in result.items():
+            if other is not project:
+                cache.results[_evaluation_key(name, (other,), actor)] = flag
+        return result.get(project)
+
+    def _has(self, name: str, *args: Any, skip_entity: bool | None = False, **kwargs: Any) -> bool:
+        sample_rate = FEATURE_METRICS_SAMPLE_RATE
         try:
             with metrics.timer("features.has", tags={"feature": name}, sample_rate=sample_rate):
                 actor = kwargs.pop("actor", None)
@@ -266,7 +464,12 @@ class FeatureManager(RegisteredFeatureManager):
                     return rv
 
                 if self._entity_handler and not skip_entity:
-                    rv = self._entity_handler.has(feature, actor)
+                    with metrics.timer(
+                        "features.has.handler",
+                        tags={"feature": name, "handler": type(self._entity_handler).__name__},
+                        sample_rate=sample_rate,
+                    ):
+                        rv = self._entity_handler.has(feature, actor)
                     if rv is not None:
                         metrics.incr(
                             "feature.has.result",
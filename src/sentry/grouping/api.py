@@ -13,7 +13,11 @@ from sentry.grouping.component import GroupingComponent
 from sentry.grouping.enhancer import LATEST_VERSION, Enhancements
 from sentry.grouping.enhancer.exceptions import InvalidEnhancerConfig
 from sentry.grouping.result import CalculatedHashes
-from sentry.grouping.strategies.base import DEFAULT_GROUPING_ENHANCEMENTS_BASE, GroupingContext
+from sentry.grouping.strategies.base import (
+    DEFAULT_GROUPING_ENHANCEMENTS_BASE,
+    ComponentCache,
+    GroupingContext,
+)
 from sentry.grouping.strategies.configurations import CONFIGURATIONS
 from sentry.grouping.utils import (
     expand_title_template,
@@ -319,9 +323,15 @@ def _get_calculated_grouping_variants_for_event(
 
 
 def get_grouping_variants_for_event(
-    event: Event, config: StrategyConfiguration | None = None
+    event: Event,
+    config: StrategyConfiguration | None = None,
+    component_cache: ComponentCache | None = None,
 ) -> dict[str, BaseVariant]:
-    """Returns a dict of all grouping variants for this event."""
+    """Returns a dict of all grouping variants for this event.
+
+    Frame components are looked up in and added to `component_cache` if one
+    is given, see `ComponentCache`.
+    """
     # If a checksum is set the only variant that comes back from this
     # event is the checksum variant.
     checksum = event.data.get("checksum")
@@ -350,7 +360,7 @@ def get_grouping_variants_for_event(
 
     if config is None:
         config = load_default_grouping_config()
-    context = GroupingContext(config)
+    context = GroupingContext(config, component_cache=component_cache)
 
     # At this point we need to calculate the default event values.  If the
     # fingerprint is salted we will wrap it.
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from collections.abc import Generator, Iterable, Iterator, Sequence
-from typing import Any
+from typing import Any, ClassVar
 
 from sentry.grouping.utils import hash_from_values
 
@@ -41,8 +41,33 @@ def calculate_tree_label(
 class GroupingComponent:
     """A grouping component is a recursive structure that is flattened
     into components to make a hash for grouping purposes.
+
+    The flattened values, the hash and the description of a component are
+    cached. As they depend on the whole subtree and components don't know
+    their parents, cached values are only used as long as no component at
+    all has been modified since they were computed. Components therefore
+    have to be modified through `update` (or by building new ones), which
+    takes care of this.
     """
 
+    __slots__ = (
+        "id",
+        "hint",
+        "contributes",
+        "variant_provider",
+        "values",
+        "tree_label",
+        "is_prefix_frame",
+        "is_sentinel_frame",
+        "_cache_generation",
+        "_flattened_values",
+        "_hash",
+        "_description",
+    )
+
+    # Incremented whenever any component is modified, see `_drop_stale_cache`
+    _generation: ClassVar[int] = 0
+
     def __init__(
         self,
         id: str,
@@ -65,7 +90,14 @@ class GroupingComponent:
         self.is_prefix_frame = is_prefix_frame
         self.is_sentinel_frame = is_sentinel_frame
 
-        self.update(
+        self._cache_generation = -1
+        self._flattened_values: tuple[str | int, ...] | None = None
+        self._hash: str | None = None
+        self._description: str | None = None
+
+        # A new component can't be part of a tree with cached values yet, so
+        # there is nothing to invalidate
+        self._update(
             hint=hint,
             contributes=contributes,
             values=values,
@@ -74,12 +106,29 @@ class GroupingComponent:
             is_sentinel_frame=is_sentinel_frame,
         )
 
+    def _drop_stale_cache(self) -> None:
+        """Drops cached values if any component was modified since they were
+        computed.
+        """
+        generation = GroupingComponent._generation
+        if self._cache_generation != generation:
+            self._cache_generation = generation
+            self._flattened_values = None
+            self._hash = None
+            self._description = None
+
     @property
     def name(self) -> str | None:
         return KNOWN_MAJOR_COMPONENT_NAMES.get(self.id)
 
     @property
     def description(self) -> str:
+        self._drop_stale_cache()
+        if self._description is None:
+            self._description = self._calculate_description()
+        return self._description
+
+    def _calculate_description(self) -> str:
         items = []
 
         def _walk_components(c: GroupingComponent, stack: list[str | None]) -> None:
@@ -130,6 +179,25 @@ class GroupingComponent:
         is_sentinel_frame: bool | None = None,
     ) -> None:
         """Updates an already existing component with new values."""
+        self._update(
+            hint=hint,
+            contributes=contributes,
+            values=values,
+            tree_label=tree_label,
+            is_prefix_frame=is_prefix_frame,
+            is_sentinel_frame=is_sentinel_frame,
+        )
+        GroupingComponent._generation += 1
+
+    def _update(
+        self,
+        hint: str | None = None,
+        contributes: bool | None = None,
+        values: Sequence[str | GroupingComponent] | None = None,
+        tree_label: dict[str, str | GroupingComponent | None] | None = None,
+        is_prefix_frame: bool | None = None,
+        is_sentinel_frame: bool | None = None,
+    ) -> None:
         if hint is not None:
             self.hint = hint
         if values is not None:
@@ -150,27 +218,51 @@ class GroupingComponent:
     def shallow_copy(self) -> GroupingComponent:
         """Creates a shallow copy."""
         rv = object.__new__(self.__class__)
-        rv.__dict__.update(self.__dict__)
+        for attr in self.__slots__:
+            setattr(rv, attr, getattr(self, attr))
         rv.values = list(self.values)
         return rv
 
+    def deep_copy(self) -> GroupingComponent:
+        """Creates a copy of the whole tree, which can be modified without
+        affecting this one.
+        """
+        rv = self.shallow_copy()
+        rv.values = [
+            value.deep_copy() if isinstance(value, GroupingComponent) else value
+            for value in self.values
+        ]
+        if rv.tree_label is not None:
+            rv.tree_label = dict(rv.tree_label)
+        return rv
+
+    def _get_flattened_values(self) -> tuple[str | int, ...]:
+        self._drop_stale_cache()
+        if self._flattened_values is None:
+            flattened: list[str | int] = []
+            if self.contributes:
+                for value in self.values:
+                    if isinstance(value, GroupingComponent):
+                        flattened.extend(value._get_flattened_values())
+                    else:
+                        flattened.append(value)
+            self._flattened_values = tuple(flattened)
+        return self._flattened_values
+
     def iter_values(self) -> Generator[str | GroupingComponent, None, None]:
         """Recursively walks the component and flattens it into a list of
         values.
         """
-        if self.contributes:
-            for value in self.values:
-                if isinstance(value, GroupingComponent):
-                    yield from value.iter_values()
-                else:
-                    yield value
-        yield from ()  # yield an empty generator
+        yield from self._get_flattened_values()
 
     def get_hash(self) -> str | None:
         """Returns the hash of the values if it contributes."""
-        if self.contributes:
-            return hash_from_values(self.iter_values())
-        return None
+        if not self.contributes:
+            return None
+        self._drop_stale_cache()
+        if self._hash is None:
+            self._hash = hash_from_values(self._get_flattened_values())
+        return self._hash
 
     def as_dict(self) -> dict[str, Any]:
         """Converts the component tree into a dictionary."""
@@ -1,15 +1,18 @@
 from __future__ import annotations
 
 import base64
+import functools
 import logging
 import os
+import threading
 import zlib
-from collections.abc import Sequence
+from collections.abc import Hashable, Sequence
 from typing import Any, Literal
 
 import msgpack
 import sentry_sdk
 import zstandard
+from cachetools import LRUCache
 from sentry_ophio.enhancers import Cache as RustCache
 from sentry_ophio.enhancers import Component as RustComponent
 from sentry_ophio.enhancers import Enhancements as RustEnhancements
@@ -17,10 +20,19 @@ from sentry_ophio.enhancers import Enhancements as RustEnhancements
 from sentry import projectoptions
 from sentry.grouping.component import GroupingComponent
 from sentry.stacktraces.functions import set_in_app
+from sentry.utils import metrics
+from sentry.utils.hashlib import md5_text
 from sentry.utils.safe import get_path, set_path
 
 from .exceptions import InvalidEnhancerConfig
-from .matchers import create_match_frame
+from .matchers import (
+    CalleeMatch,
+    CallerMatch,
+    ExceptionMechanismMatch,
+    ExceptionTypeMatch,
+    ExceptionValueMatch,
+    create_match_frame,
+)
 from .parser import parse_enhancements
 from .rules import Rule
 
@@ -30,10 +42,79 @@ logger = logging.getLogger(__name__)
 # So this leaves quite a bit of headroom for custom enhancement rules as well.
 RUST_CACHE = RustCache(1_000)
 
+# Number of distinct serialized configs whose loaded `Enhancements` are kept around. Every grouping
+# config of every project loads its enhancements once per event, but there are only few distinct
+# ones in practice (the bases plus custom project rules).
+LOADED_ENHANCEMENTS_CACHE_SIZE = 500
+
+# Upper bound for the approximate size of the keys and values in `MATCH_CACHE`, in bytes.
+MATCH_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
 VERSIONS = [2]
 LATEST_VERSION = VERSIONS[-1]
 
 
+def _approximate_size(value: Any) -> int:
+    """
+    Roughly what ``value`` takes up in memory, counting the contents of nested tuples. Strings
+    shared between values are counted every time, so this errs on the large side.
+    """
+    if isinstance(value, (str, bytes)):
+        return 48 + len(value)
+    if isinstance(value, tuple):
+        return 40 + 8 * len(value) + sum(_approximate_size(item) for item in value)
+    return 28
+
+
+class MatchCache:
+    """
+    A process-wide LRU of rule matching results, shared between events.
+
+    The same stack traces recur over and over, so there is no need to run them through the rules
+    again. Results are keyed by the config and the match frames of the *whole* stack trace, as
+    caller and callee matchers make the result for a frame depend on its neighbours. Entries are
+    sized by their keys and values, so that huge stack traces or exception values don't get an
+    unfair share.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self._lock = threading.Lock()
+        # key -> (value, approximate size of key and value)
+        self._cache: LRUCache[Hashable, tuple[tuple[Any, ...], int]] = LRUCache(
+            maxsize=max_bytes, getsizeof=lambda entry: entry[1]
+        )
+
+    @property
+    def currsize(self) -> int:
+        return self._cache.currsize
+
+    def get(self, key: Hashable) -> tuple[Any, ...] | None:
+        with self._lock:
+            entry = self._cache.get(key)
+        metrics.incr(
+            "grouping.enhancer.match_cache",
+            tags={"result": "miss" if entry is None else "hit"},
+            sample_rate=0.01,
+        )
+        return entry[0] if entry is not None else None
+
+    def set(self, key: Hashable, value: tuple[Any, ...]) -> None:
+        entry = (value, _approximate_size(key) + _approximate_size(value))
+        with self._lock:
+            try:
+                self._cache[key] = entry
+            except ValueError:
+                # The entry alone exceeds the size of the cache
+                pass
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+MATCH_CACHE = MatchCache(MATCH_CACHE_MAX_BYTES)
+
+
 def merge_rust_enhancements(
     bases: list[str], rust_enhancements: RustEnhancements
 ) -> RustEnhancements:
@@ -72,6 +153,11 @@ def parse_rust_enhancements(
 RustExceptionData = dict[str, bytes | None]
 
 
+def _match_frames_key(match_frames: Sequence[dict[str, Any]]) -> tuple[tuple[Any, ...], ...]:
+    # `create_match_frame` always builds the dict in the same order
+    return tuple(tuple(match_frame.values()) for match_frame in match_frames)
+
+
 def make_rust_exception_data(
     exception_data: dict[str, Any],
 ) -> RustExceptionData:
@@ -108,6 +194,45 @@ class Enhancements:
 
         self.rust_enhancements = merge_rust_enhancements(bases, rust_enhancements)
 
+    @functools.cached_property
+    def _match_cache_key(self) -> str:
+        """
+        Identifies the rules of this config in `MATCH_CACHE`. Set upfront by `loads`.
+        """
+        return md5_text(self.dumps()).hexdigest()
+
+    @functools.cached_property
+    def _match_cache_exception_keys(self) -> tuple[str, ...]:
+        """
+        The keys of `make_rust_exception_data` which the rules of this config, including the
+        bases, match on. Only those are part of `MATCH_CACHE` keys, as exception values are
+        unique far more often than stack traces.
+        """
+        matcher_keys = {
+            ExceptionTypeMatch: "ty",
+            ExceptionValueMatch: "value",
+            ExceptionMechanismMatch: "mechanism",
+        }
+        keys = set()
+        for base_id in self.bases:
+            base = ENHANCEMENT_BASES.get(base_id)
+            if base:
+                keys.update(base._match_cache_exception_keys)
+
+        for rule in self.rules:
+            for matcher in rule.matchers:
+                if isinstance(matcher, (CallerMatch, CalleeMatch)):
+                    matcher = matcher.inner
+                for matcher_type, key in matcher_keys.items():
+                    if isinstance(matcher, matcher_type):
+                        keys.add(key)
+        return tuple(sorted(keys))
+
+    def _match_cache_exception_data(
+        self, rust_exception_data: RustExceptionData
+    ) -> tuple[bytes | None, ...]:
+        return tuple(rust_exception_data[key] for key in self._match_cache_exception_keys)
+
     def apply_modifications_to_frame(
         self,
         frames: Sequence[dict[str, Any]],
@@ -118,10 +243,25 @@ class Enhancements:
         This applies the frame modifications to the frames itself. This does not affect grouping.
         """
         match_frames = [create_match_frame(frame, platform) for frame in frames]
+        rust_exception_data = make_rust_exception_data(exception_data)
 
-        rust_enhanced_frames = self.rust_enhancements.apply_modifications_to_frames(
-            match_frames, make_rust_exception_data(exception_data)
+        cache_key = (
+            self._match_cache_key,
+            "modifications",
+            _match_frames_key(match_frames),
+            self._match_cache_exception_data(rust_exception_data),
         )
+        cached = MATCH_CACHE.get(cache_key)
+        if cached is None:
+            cached = (
+                tuple(
+                    self.rust_enhancements.apply_modifications_to_frames(
+                        match_frames, rust_exception_data
+                    )
+                ),
+            )
+            MATCH_CACHE.set(cache_key, cached)
+        (rust_enhanced_frames,) = cached
 
         for frame, (category, in_app) in zip(frames, rust_enhanced_frames):
             if in_app is not None:
@@ -137,36 +277,68 @@ class Enhancements:
         This also handles cases where the entire stacktrace should be discarded.
         """
         match_frames = [create_match_frame(frame, platform) for frame in frames]
-
-        rust_components = [
-            RustComponent(
-                is_prefix_frame=c.is_prefix_frame or False,
-                is_sentinel_frame=c.is_sentinel_frame or False,
-                contributes=c.contributes,
-            )
+        rust_exception_data = make_rust_exception_data(exception_data)
+        component_flags = tuple(
+            (c.is_prefix_frame or False, c.is_sentinel_frame or False, c.contributes)
             for c in components
-        ]
+        )
 
-        rust_results = self.rust_enhancements.assemble_stacktrace_component(
-            match_frames, make_rust_exception_data(exception_data), rust_components
+        cache_key = (
+            self._match_cache_key,
+            "assemble",
+            _match_frames_key(match_frames),
+            self._match_cache_exception_data(rust_exception_data),
+            component_flags,
         )
+        cached = MATCH_CACHE.get(cache_key)
+        if cached is None:
+            rust_components = [
+                RustComponent(
+                    is_prefix_frame=is_prefix_frame,
+                    is_sentinel_frame=is_sentinel_frame,
+                    contributes=contributes,
+                )
+                for is_prefix_frame, is_sentinel_frame, contributes in component_flags
+            ]
+
+            rust_results = self.rust_enhancements.assemble_stacktrace_component(
+                match_frames, rust_exception_data, rust_components
+            )
+
+            cached = (
+                tuple(
+                    (c.contributes, c.hint, c.is_prefix_frame, c.is_sentinel_frame)
+                    for c in rust_components
+                ),
+                rust_results.hint,
+                rust_results.contributes,
+                rust_results.invert_stacktrace,
+            )
+            MATCH_CACHE.set(cache_key, cached)
 
-        for py_component, rust_component in zip(components, rust_components):
+        component_results, hint, contributes, invert_stacktrace = cached
+
+        for py_component, (
+            component_contributes,
+            component_hint,
+            is_prefix_frame,
+            is_sentinel_frame,
+        ) in zip(components, component_results):
             py_component.update(
-                contributes=rust_component.contributes,
-                hint=rust_component.hint,
-                is_prefix_frame=rust_component.is_prefix_frame,
-                is_sentinel_frame=rust_component.is_sentinel_frame,
+                contributes=component_contributes,
+                hint=component_hint,
+                is_prefix_frame=is_prefix_frame,
+                is_sentinel_frame=is_sentinel_frame,
             )
 
         component = GroupingComponent(
             id="stacktrace",
             values=components,
-            hint=rust_results.hint,
-            contributes=rust_results.contributes,
+            hint=hint,
+            contributes=contributes,
         )
 
-        return component, rust_results.invert_stacktrace
+        return component, invert_stacktrace
 
     def as_dict(self, with_rules=False):
         rv = {
@@ -207,6 +379,16 @@ class Enhancements:
 
     @classmethod
     def loads(cls, data) -> Enhancements:
+        """
+        Loads enhancements serialized with `dumps`. Loaded configs are cached by their serialized
+        form, so the returned instance is shared and must not be modified.
+        """
+        if isinstance(data, bytes):
+            data = data.decode("ascii", "ignore")
+        return _loads_cached(cls, data)
+
+    @classmethod
+    def _loads_uncached(cls, data) -> Enhancements:
         if isinstance(data, str):
             data = data.encode("ascii", "ignore")
         padded = data + b"=" * (4 - (len(data) % 4))
@@ -253,5 +435,13 @@ def _load_configs() -> dict[str, Enhancements]:
     return rv
 
 
+@functools.lru_cache(maxsize=LOADED_ENHANCEMENTS_CACHE_SIZE)
+def _loads_cached(cls: type[Enhancements], data: str) -> Enhancements:
+    enhancements = cls._loads_uncached(data)
+    # Saves re-serializing the config to compute the key
+    enhancements._match_cache_key = md5_text(data).hexdigest()
+    return enhancements
+
+
 ENHANCEMENT_BASES = _load_configs()
 del _load_configs
@@ -0,0 +1,138 @@
+"""
+Redis cache of `GroupHash` rows, used to resolve the grouphashes of incoming events to groups
+without reading from postgres.
+
+Grouphashes which point at a group (or tombstone) are cached for `grouping.grouphash-cache.ttl`
+seconds. Grouphashes without a group are cached as well, but only for the much shorter
+`grouping.grouphash-cache.negative-ttl`: an event finding such a grouphash goes on to create a
+group, which re-reads the grouphashes under a row lock anyway.
+
+Everything that changes the group of an existing grouphash (group creation, merge, unmerge,
+discarding and undiscarding) has to call `delete_many` afterwards. Entries pointing at deleted
+groups are not invalidated, and are instead detected when the group can't be loaded.
+
+Invalidation runs with either `grouping.grouphash-cache.enabled` or
+`grouping.grouphash-cache.invalidate` set. The latter is turned on before the cache is enabled
+(and turned off after it is disabled), so that no stale entries are left behind when the cache
+is toggled.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable, Sequence
+
+from django.conf import settings
+from django.db import router, transaction
+
+from sentry import options
+from sentry.models.grouphash import GroupHash
+from sentry.utils import json, metrics, redis
+
+logger = logging.getLogger(__name__)
+
+
+def _get_cluster():
+    return redis.redis_clusters.get(settings.SENTRY_GROUPHASH_CACHE_REDIS_CLUSTER)
+
+
+def _get_key(project_id: int, hash: str) -> str:
+    return f"grouphash:{project_id}:{hash}"
+
+
+def is_enabled() -> bool:
+    return options.get("grouping.grouphash-cache.enabled")
+
+
+def get_many(project_id: int, hashes: Sequence[str]) -> dict[str, GroupHash]:
+    if not hashes or not is_enabled():
+        return {}
+
+    try:
+        with _get_cluster().pipeline(transaction=False) as pipeline:
+            for hash in hashes:
+                pipeline.get(_get_key(project_id, hash))
+            values = pipeline.execute()
+    except Exception:
+        logger.exception("grouphash_cache.get_failed")
+        return {}
+
+    found = {}
+    for hash, value in zip(hashes, values):
+        if value is None:
+            continue
+        grouphash_id, group_id, group_tombstone_id, state = json.loads(value)
+        found[hash] = GroupHash(
+            id=grouphash_id,
+            project_id=project_id,
+            hash=hash,
+            group_id=group_id,
+            group_tombstone_id=group_tombstone_id,
+            state=state,
+        )
+
+    if found:
+        metrics.incr("grouping.grouphash_cache", amount=len(found), tags={"result": "hit"})
+    if len(found) < len(hashes):
+        metrics.incr(
+            "grouping.grouphash_cache", amount=len(hashes) - len(found), tags={"result": "miss"}
+        )
+    return found
+
+
+def set_many(grouphashes: Iterable[GroupHash]) -> None:
+    if not is_enabled():
+        return
+
+    ttl = options.get("grouping.grouphash-cache.ttl")
+    negative_ttl = options.get("grouping.grouphash-cache.negative-ttl")
+
+    try:
+        with _get_cluster().pipeline(transaction=False) as pipeline:
+            for grouphash in grouphashes:
+                value = json.dumps(
+                    [
+                        grouphash.id,
+                        grouphash.group_id,
+                        grouphash.group_tombstone_id,
+                        grouphash.state,
+                    ]
+                )
+                is_negative = grouphash.group_id is None and grouphash.group_tombstone_id is None
+                pipeline.set(
+                    _get_key(grouphash.project_id, grouphash.hash),
+                    value,
+                    ex=negative_ttl if is_negative else ttl,
+                )
+            pipeline.execute()
+    except Exception:
+        logger.exception("grouphash_cache.set_failed")
+
+
+def is_invalidation_enabled() -> bool:
+    return is_enabled() or options.get("grouping.grouphash-cache.invalidate")
+
+
+def delete_many(project_id: int, hashes: Iterable[str]) -> None:
+    """
+    Invalidates the given hashes once the current transaction commits. Invalidating any earlier
+    would let a concurrent event cache the old group of a hash again before the commit.
+    """
+    if not is_invalidation_enabled():
+        return
+
+    keys = [_get_key(project_id, hash) for hash in hashes]
+    if not keys:
+        return
+
+    transaction.on_commit(lambda: _delete_keys(keys), router.db_for_write(GroupHash))
+
+
+def _delete_keys(keys: Sequence[str]) -> None:
+    try:
+        with _get_cluster().pipeline(transaction=False) as pipeline:
+            for key in keys:
+                pipeline.delete(key)
+            pipeline.execute()
+    except Exception:
+        logger.exception("grouphash_cache.delete_failed")
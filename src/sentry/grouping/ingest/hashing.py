@@ -7,6 +7,7 @@ from typing import TYPE_CHECKING
 
 import sentry_sdk
 
+from sentry import options
 from sentry.exceptions import HashDiscarded
 from sentry.features.rollout import in_random_rollout
 from sentry.grouping.api import (
@@ -27,6 +28,7 @@ from sentry.grouping.ingest.config import _config_update_happened_recently, is_i
 from sentry.grouping.ingest.metrics import record_hash_calculation_metrics
 from sentry.grouping.ingest.utils import extract_hashes
 from sentry.grouping.result import CalculatedHashes
+from sentry.grouping.strategies.base import ComponentCache
 from sentry.models.grouphash import GroupHash
 from sentry.models.project import Project
 from sentry.reprocessing2 import is_reprocessed_event
@@ -41,8 +43,26 @@ if TYPE_CHECKING:
 logger = logging.getLogger("sentry.events.grouping")
 
 
+def _get_component_cache(project: Project, job: Job) -> ComponentCache | None:
+    """
+    Returns the cache of frame components shared by all grouping configs the job's event is
+    grouped with. Filling it only pays off if there's more than one config, which is only known
+    upfront for projects transitioning between configs.
+    """
+    if "grouping_component_cache" not in job:
+        job["grouping_component_cache"] = (
+            ComponentCache()
+            if options.get("grouping.shared-component-cache.enabled") and is_in_transition(project)
+            else None
+        )
+    return job["grouping_component_cache"]
+
+
 def _calculate_event_grouping(
-    project: Project, event: Event, grouping_config: GroupingConfig
+    project: Project,
+    event: Event,
+    grouping_config: GroupingConfig,
+    component_cache: ComponentCache | None = None,
 ) -> CalculatedHashes:
     """
     Main entrypoint for modifying/enhancing and grouping an event, writes
@@ -84,7 +104,7 @@ def _calculate_event_grouping(
             # default long before we get here. Should we consolidate bogus config handling into the
             # code actually getting the config?
             try:
-                hashes = event.get_hashes(loaded_grouping_config)
+                hashes = event.get_hashes(loaded_grouping_config, component_cache=component_cache)
             except GroupingConfigNotFound:
                 event.data["grouping_config"] = get_grouping_config_dict_for_project(project)
                 hashes = event.get_hashes()
@@ -105,13 +125,21 @@ def maybe_run_background_grouping(project: Project, job: Job) -> None:
             config = BackgroundGroupingConfigLoader().get_config_dict(project)
             if config["id"]:
                 copied_event = copy.deepcopy(job["event"])
-                _calculate_background_grouping(project, copied_event, config)
+                _calculate_background_grouping(
+                    project,
+                    copied_event,
+                    config,
+                    component_cache=job.get("grouping_component_cache"),
+                )
     except Exception as err:
         sentry_sdk.capture_exception(err)
 
 
 def _calculate_background_grouping(
-    project: Project, event: Event, config: GroupingConfig
+    project: Project,
+    event: Event,
+    config: GroupingConfig,
+    component_cache: ComponentCache | None = None,
 ) -> CalculatedHashes:
     metric_tags: MutableTags = {
         "grouping_config": config["id"],
@@ -119,7 +147,7 @@ def _calculate_background_grouping(
         "sdk": normalized_sdk_tag_from_event(event.data),
     }
     with metrics.timer("event_manager.background_grouping", tags=metric_tags):
-        return _calculate_event_grouping(project, event, config)
+        return _calculate_event_grouping(project, event, config, component_cache=component_cache)
 
 
 def maybe_run_secondary_grouping(
@@ -159,7 +187,10 @@ def _calculate_secondary_hash(
             # of grouping info and we don't want the backup grouping data in there
             event_copy = copy.deepcopy(job["event"])
             secondary_hashes = _calculate_event_grouping(
-                project, event_copy, secondary_grouping_config
+                project,
+                event_copy,
+                secondary_grouping_config,
+                component_cache=_get_component_cache(project, job),
             )
     except Exception as err:
         sentry_sdk.capture_exception(err)
@@ -232,7 +263,12 @@ def _calculate_primary_hash(
 
     This is pulled out into a separate function mostly in order to make testing easier.
     """
-    return _calculate_event_grouping(project, job["event"], grouping_config)
+    return _calculate_event_grouping(
+        project,
+        job["event"],
+        grouping_config,
+        component_cache=_get_component_cache(project, job),
+    )
 
 
 def find_existing_grouphash(
@@ -5,6 +5,7 @@ from collections.abc import MutableMapping
 from typing import TYPE_CHECKING, Any
 
 from sentry.exceptions import HashDiscarded
+from sentry.grouping.ingest import grouphash_cache
 from sentry.grouping.result import CalculatedHashes
 from sentry.issues.grouptype import GroupCategory
 from sentry.killswitches import killswitch_matches_context
@@ -33,11 +34,12 @@ def add_group_id_to_grouphashes(
     Link the given group to any grouphash which doesn't yet have a group assigned.
     """
 
-    new_grouphash_ids = [gh.id for gh in grouphashes if gh.group_id is None]
+    new_grouphashes = [gh for gh in grouphashes if gh.group_id is None]
 
-    GroupHash.objects.filter(id__in=new_grouphash_ids).exclude(
+    GroupHash.objects.filter(id__in=[gh.id for gh in new_grouphashes]).exclude(
         state=GroupHash.State.LOCKED_IN_MIGRATION
     ).update(group=group)
+    grouphash_cache.delete_many(group.project_id, [gh.hash for gh in new_grouphashes])
 
 
 def check_for_group_creation_load_shed(project: Project, event: Event):
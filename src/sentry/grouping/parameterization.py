@@ -17,6 +17,17 @@ __all__ = [
 ]
 
 
+_DIGIT_RE = re.compile(r"\d")
+
+
+def _contains_digit(content: str) -> bool:
+    return _DIGIT_RE.search(content) is not None
+
+
+def _contains(*needles: str) -> Callable[[str], bool]:
+    return lambda content: any(needle in content for needle in needles)
+
+
 @dataclasses.dataclass
 class ParameterizationRegex:
 
@@ -25,6 +36,9 @@ class ParameterizationRegex:
     lookbehind: str | None = None  # positive lookbehind prefix if needed
     lookahead: str | None = None  # positive lookahead postfix if needed
     counter: int = 0
+    # Cheap check which every string the pattern matches anywhere in has to pass. Patterns are
+    # left out of the combined regex for content failing it.
+    prefilter: Callable[[str], bool] = lambda _: True
 
     # These need to be used with `(?x)` tells the regex compiler to ignore comments
     # and unescaped whitespace, so we can use newlines and indentation for better legibility.
@@ -52,8 +66,13 @@ DEFAULT_PARAMETERIZATION_REGEXES = [
     ParameterizationRegex(
         name="email",
         raw_pattern=r"""[a-zA-Z0-9.!#$%&'*+/=?^_`{|}~-]+@[a-zA-Z0-9-]+(?:\.[a-zA-Z0-9-]+)*""",
+        prefilter=_contains("@"),
+    ),
+    ParameterizationRegex(
+        name="url",
+        raw_pattern=r"""\b(wss?|https?|ftp)://[^\s/$.?#].[^\s]*""",
+        prefilter=_contains("://"),
     ),
-    ParameterizationRegex(name="url", raw_pattern=r"""\b(wss?|https?|ftp)://[^\s/$.?#].[^\s]*"""),
     ParameterizationRegex(
         name="hostname",
         raw_pattern=r"""
@@ -66,6 +85,7 @@ DEFAULT_PARAMETERIZATION_REGEXES = [
             )
             \b
         """,
+        prefilter=_contains("."),
     ),
     ParameterizationRegex(
         name="ip",
@@ -93,13 +113,23 @@ DEFAULT_PARAMETERIZATION_REGEXES = [
                 (25[0-5]|(2[0-4]|1{0,1}[0-9]){0,1}[0-9])\b
             )
         """,
+        prefilter=_contains(":", "."),
     ),
     ParameterizationRegex(
         name="uuid",
         raw_pattern=r"""\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b""",
+        prefilter=_contains("-"),
+    ),
+    ParameterizationRegex(
+        name="sha1",
+        raw_pattern=r"""\b[0-9a-fA-F]{40}\b""",
+        prefilter=lambda content: len(content) >= 40,
+    ),
+    ParameterizationRegex(
+        name="md5",
+        raw_pattern=r"""\b[0-9a-fA-F]{32}\b""",
+        prefilter=lambda content: len(content) >= 32,
     ),
-    ParameterizationRegex(name="sha1", raw_pattern=r"""\b[0-9a-fA-F]{40}\b"""),
-    ParameterizationRegex(name="md5", raw_pattern=r"""\b[0-9a-fA-F]{32}\b"""),
     ParameterizationRegex(
         name="date",
         raw_pattern=r"""
@@ -152,11 +182,23 @@ DEFAULT_PARAMETERIZATION_REGEXES = [
             ) |
             (datetime.datetime\(.*?\))
         """,
+        # Only the `datetime.datetime(...)` alternative does not need a digit
+        prefilter=lambda content: _contains_digit(content) or "datetime" in content,
+    ),
+    ParameterizationRegex(
+        name="duration",
+        raw_pattern=r"""\b(\d+ms) | (\d(\.\d+)?s)\b""",
+        prefilter=_contains_digit,
+    ),
+    ParameterizationRegex(
+        name="hex", raw_pattern=r"""\b0[xX][0-9a-fA-F]+\b""", prefilter=_contains("0x", "0X")
+    ),
+    ParameterizationRegex(
+        name="float", raw_pattern=r"""-\d+\.\d+\b | \b\d+\.\d+\b""", prefilter=_contains_digit
+    ),
+    ParameterizationRegex(
+        name="int", raw_pattern=r"""-\d+\b | \b\d+\b""", prefilter=_contains_digit
     ),
-    ParameterizationRegex(name="duration", raw_pattern=r"""\b(\d+ms) | (\d(\.\d+)?s)\b"""),
-    ParameterizationRegex(name="hex", raw_pattern=r"""\b0[xX][0-9a-fA-F]+\b"""),
-    ParameterizationRegex(name="float", raw_pattern=r"""-\d+\.\d+\b | \b\d+\.\d+\b"""),
-    ParameterizationRegex(name="int", raw_pattern=r"""-\d+\b | \b\d+\b"""),
     ParameterizationRegex(
         name="quoted_str",
         raw_pattern=r"""# Using `=`lookbehind which guarantees we'll only match the value half of key-value pairs,
@@ -164,6 +206,7 @@ DEFAULT_PARAMETERIZATION_REGEXES = [
             '([^']+)' | "([^"]+)"
         """,
         lookbehind="=",
+        prefilter=_contains("="),
     ),
     ParameterizationRegex(
         name="bool",
@@ -175,11 +218,19 @@ DEFAULT_PARAMETERIZATION_REGEXES = [
             false
         """,
         lookbehind="=",
+        prefilter=_contains("="),
     ),
 ]
 
 
 DEFAULT_PARAMETERIZATION_REGEXES_MAP = {r.name: r.pattern for r in DEFAULT_PARAMETERIZATION_REGEXES}
+DEFAULT_PARAMETERIZATION_PREFILTERS_MAP = {
+    r.name: r.prefilter for r in DEFAULT_PARAMETERIZATION_REGEXES
+}
+
+# Number of parameterized messages remembered by `Parameterizer.parametrize_w_regex`. The same
+# messages are seen over and over again, so most of them don't need to be run through the regex.
+PARAMETERIZATION_CACHE_SIZE = 1_000
 
 
 @dataclasses.dataclass
@@ -223,6 +274,7 @@ class _UniqueId:
         return tiktoken.get_encoding("cl100k_base")
 
     @staticmethod
+    @lru_cache(maxsize=10_000)
     def num_tokens_from_string(token_str: str) -> int:
         """Returns the number of tokens in a text string."""
         num_tokens = len(_UniqueId.tiktoken_encoding().encode(token_str))
@@ -281,7 +333,10 @@ class Parameterizer:
         regex_pattern_keys: Sequence[str],
         experiments: Sequence[ParameterizationExperiment] = (),
     ):
-        self._parameterization_regex = self._make_regex_from_patterns(regex_pattern_keys)
+        for key in regex_pattern_keys:
+            if key not in DEFAULT_PARAMETERIZATION_REGEXES_MAP:
+                raise KeyError(key)
+        self._regex_pattern_keys = tuple(regex_pattern_keys)
         self._experiments = experiments
 
         self.matches_counter: defaultdict[str, int] = defaultdict(int)
@@ -312,19 +367,16 @@ class Parameterizer:
         @param match_callback: An optional callback function to call with the key of the matched pattern.
 
         @returns: The content with all matches replaced with placeholders.
-        """
-
-        def _handle_regex_match(match: re.Match[str]) -> str:
-            # Find the first (should be only) non-None match entry, and sub in the placeholder. For
-            # example, given the groupdict item `('hex', '0x40000015')`, this returns '<hex>' as a
-            # replacement for the original value in the string.
-            for key, value in match.groupdict().items():
-                if value is not None:
-                    self.matches_counter[key] += 1
-                    return f"<{key}>"
-            return ""
 
-        return self._parameterization_regex.sub(_handle_regex_match, content)
+        Results are cached, and only patterns whose prefilter passes for the content are combined
+        into the regex. Patterns that can't match anywhere in the content don't change which
+        alternative matches at any position, so this gives the same result as the regex combining
+        all of them.
+        """
+        parameterized, matches = _parametrize_w_regex(self._regex_pattern_keys, content)
+        for key, count in matches:
+            self.matches_counter[key] += count
+        return parameterized
 
     def parametrize_w_experiments(
         self, content: str, should_run: Callable[[str], bool] = lambda _: True
@@ -366,3 +418,39 @@ class Parameterizer:
         self, content: str, should_run: Callable[[str], bool] = lambda _: True
     ) -> str:
         return self.parametrize_w_experiments(self.parametrize_w_regex(content), should_run)
+
+
+@lru_cache(maxsize=256)
+def _make_regex_from_candidate_patterns(pattern_keys: tuple[str, ...]) -> re.Pattern[str]:
+    return Parameterizer._make_regex_from_patterns(pattern_keys)
+
+
+@lru_cache(maxsize=PARAMETERIZATION_CACHE_SIZE)
+def _parametrize_w_regex(
+    pattern_keys: tuple[str, ...], content: str
+) -> tuple[str, tuple[tuple[str, int], ...]]:
+    """
+    Returns the parameterized content along with the number of replacements for every pattern.
+    """
+    candidate_keys = tuple(
+        key for key in pattern_keys if DEFAULT_PARAMETERIZATION_PREFILTERS_MAP[key](content)
+    )
+    if not candidate_keys:
+        return content, ()
+
+    matches: defaultdict[str, int] = defaultdict(int)
+
+    def _handle_regex_match(match: re.Match[str]) -> str:
+        # Every pattern is wrapped in a single named group, which is closed last and thus is the
+        # `lastgroup` of the match. For example, given a match of `0x40000015` by the `hex` group,
+        # this returns '<hex>' as a replacement for the original value in the string.
+        key = match.lastgroup
+        if key is None:
+            return ""
+        matches[key] += 1
+        return f"<{key}>"
+
+    parameterized = _make_regex_from_candidate_patterns(candidate_keys).sub(
+        _handle_regex_match, content
+    )
+    return parameterized, tuple(matches.items())
@@ -2,6 +2,8 @@ import inspect
 from collections.abc import Callable, Iterator, Sequence
 from typing import Any, Generic, Protocol, TypeVar
 
+import orjson
+
 from sentry import projectoptions
 from sentry.eventstore.models import Event
 from sentry.grouping.component import GroupingComponent
@@ -80,10 +82,87 @@ def strategy(
     return decorator
 
 
+class ComponentCache:
+    """
+    Frame components shared between the grouping configs an event is grouped
+    with, e.g. the primary and the secondary config while a project is
+    transitioning from one to the other.
+
+    Frame strategies only look at the frame, the platform of the event and the
+    grouping context. Entries are keyed by the first two (plus the strategy),
+    leaving out frame fields strategies don't read, and remember the context
+    values the strategy actually read, so that they are reused by configs
+    which only differ in context values irrelevant to frames. Callers modify the components they get (for instance to mark
+    non-app frames), so every lookup returns a fresh copy.
+    """
+
+    # Interfaces whose strategies are known to only depend on the above
+    INTERFACES = frozenset(["frame"])
+    # Frame fields which frame strategies don't read, and which can be large. Of the frame's
+    # `data`, only whether a source map was used matters.
+    UNUSED_FIELDS = frozenset(["vars", "pre_context", "post_context", "data"])
+
+    def __init__(self) -> None:
+        self._entries: dict[bytes, list[tuple[ContextDict, ReturnedVariants]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_key(
+        self,
+        strategy: "Strategy[Any]",
+        interface: Interface,
+        event: Event,
+        meta: dict[str, Any],
+    ) -> bytes | None:
+        if interface.path not in self.INTERFACES:
+            return None
+        data = interface.get_raw_data()
+        try:
+            return orjson.dumps(
+                [
+                    strategy.id,
+                    event.platform,
+                    {k: v for k, v in data.items() if k not in self.UNUSED_FIELDS},
+                    bool(data.get("data") and data["data"].get("sourcemap") is not None),
+                    interface.datapath,
+                    {k: v for k, v in meta.items() if k != "strategy"},
+                ],
+                option=orjson.OPT_SORT_KEYS,
+            )
+        except TypeError:
+            return None
+
+    def get(self, key: bytes, context: "GroupingContext") -> ReturnedVariants | None:
+        for context_values, components in self._entries.get(key, ()):
+            if all(context.get(k, _MISSING) == v for k, v in context_values.items()):
+                self.hits += 1
+                return {variant: component.deep_copy() for variant, component in components.items()}
+        self.misses += 1
+        return None
+
+    def set(self, key: bytes, context_values: ContextDict, components: ReturnedVariants) -> None:
+        self._entries.setdefault(key, []).append(
+            (
+                context_values,
+                {variant: component.deep_copy() for variant, component in components.items()},
+            )
+        )
+
+
+_MISSING = object()
+
+
 class GroupingContext:
-    def __init__(self, strategy_config: "StrategyConfiguration"):
+    def __init__(
+        self,
+        strategy_config: "StrategyConfiguration",
+        component_cache: ComponentCache | None = None,
+    ):
         self._stack = [strategy_config.initial_context]
         self.config = strategy_config
+        self.component_cache = component_cache
+        # Context values read while computing a component for `component_cache`
+        self._read_values: ContextDict | None = None
         self.push()
         self["variant"] = None
 
@@ -93,9 +172,17 @@ class GroupingContext:
     def __getitem__(self, key: str) -> ContextValue:
         for d in reversed(self._stack):
             if key in d:
+                if self._read_values is not None:
+                    self._read_values[key] = d[key]
                 return d[key]
         raise KeyError(key)
 
+    def get(self, key: str, default: Any = None) -> ContextValue:
+        for d in reversed(self._stack):
+            if key in d:
+                return d[key]
+        return default
+
     def __enter__(self) -> "GroupingContext":
         self.push()
         return self
@@ -136,11 +223,34 @@ class GroupingContext:
         if strategy is None:
             raise RuntimeError(f"failed to dispatch interface {path} to strategy")
 
+        cache_key = None
+        if self.component_cache is not None:
+            cache_key = self.component_cache.get_key(strategy, interface, event, kwargs)
+            if cache_key is not None:
+                cached = self.component_cache.get(cache_key, self)
+                if cached is not None:
+                    return cached
+
         kwargs["context"] = self
         kwargs["event"] = event
-        rv = strategy(interface, **kwargs)
+
+        if cache_key is None:
+            rv = strategy(interface, **kwargs)
+            assert isinstance(rv, dict)
+            return rv
+
+        assert self.component_cache is not None
+        outer_read_values = self._read_values
+        self._read_values = read_values = {}
+        try:
+            rv = strategy(interface, **kwargs)
+        finally:
+            self._read_values = outer_read_values
+            if outer_read_values is not None:
+                outer_read_values.update(read_values)
         assert isinstance(rv, dict)
 
+        self.component_cache.set(cache_key, read_values, rv)
         return rv
 
 
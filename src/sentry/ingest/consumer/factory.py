@@ -12,6 +12,7 @@ from arroyo.processing.strategies import (
     ProcessingStrategyFactory,
     RunTask,
 )
+from arroyo.processing.strategies.batching import BatchStep
 from arroyo.types import Commit, FilteredPayload, Message, Partition
 
 from sentry.ingest.types import ConsumerType
@@ -19,7 +20,12 @@ from sentry.processing.backpressure.arroyo import HealthChecker, create_backpres
 from sentry.utils.arroyo import MultiprocessingPool, run_task_with_multiprocessing
 
 from .attachment_event import decode_and_process_chunks, process_attachments_and_events
-from .simple_event import process_simple_event_message
+from .simple_event import (
+    ForwardInvalidMessages,
+    process_simple_event_batch,
+    process_simple_event_message,
+    unpack_simple_event_message,
+)
 
 
 class MultiProcessConfig(NamedTuple):
@@ -68,10 +74,16 @@ class IngestStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
         max_batch_time: int,
         input_block_size: int | None,
         output_block_size: int | None,
+        micro_batch_size: int = 1,
+        micro_batch_time: int = 50,
     ):
         self.consumer_type = consumer_type
         self.is_attachment_topic = consumer_type == ConsumerType.Attachments
         self.reprocess_only_stuck_events = reprocess_only_stuck_events
+        # Events are processed in batches of up to `micro_batch_size`, waiting for up to
+        # `micro_batch_time` milliseconds. Attachments are always processed one at a time.
+        self.micro_batch_size = micro_batch_size
+        self.micro_batch_time = micro_batch_time
 
         self.multi_process = None
         self._pool = MultiprocessingPool(num_processes)
@@ -98,6 +110,30 @@ class IngestStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
 
         final_step = CommitOffsets(commit)
 
+        if not self.is_attachment_topic and self.micro_batch_size > 1:
+            batch_function = partial(
+                process_simple_event_batch,
+                reprocess_only_stuck_events=self.reprocess_only_stuck_events,
+            )
+            batch_step = BatchStep(
+                max_batch_size=self.micro_batch_size,
+                max_batch_time=self.micro_batch_time / 1000.0,
+                next_step=maybe_multiprocess_step(
+                    mp, batch_function, ForwardInvalidMessages(final_step), self._pool
+                ),
+            )
+            # Messages are decoded one at a time, so that invalid ones are sent to the DLQ
+            # without holding up the rest of their batch. This runs in the main process, event
+            # payloads are only parsed by the batch function in the worker processes, which
+            # returns the invalid ones for `ForwardInvalidMessages` to send them to the DLQ.
+            unpack_step = RunTask(
+                function=partial(unpack_simple_event_message, consumer_type=self.consumer_type),
+                next_step=batch_step,
+            )
+            return create_backpressure_step(
+                health_checker=self.health_checker, next_step=unpack_step
+            )
+
         if not self.is_attachment_topic:
             event_function = partial(
                 process_simple_event_message,
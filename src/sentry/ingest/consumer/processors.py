@@ -1,7 +1,8 @@
 import functools
 import logging
 import random
-from collections.abc import Mapping
+from collections.abc import Mapping, MutableMapping, Sequence
+from dataclasses import dataclass
 from typing import Any
 
 import orjson
@@ -60,48 +61,46 @@ def process_event(
     """
     Perform some initial filtering and deserialize the message payload.
     """
+    sentry_sdk.set_extra("event_id", message["event_id"])
+    sentry_sdk.set_extra("len_attachments", len(message.get("attachments") or ()))
+
+    event = parse_event_message(message, project)
+    if event is not None:
+        _process_events([event], reprocess_only_stuck_events)
+
+
+@dataclass(frozen=True)
+class ParsedEventMessage:
+    """
+    An event message of which the payload was parsed by `parse_event_message`, to be processed in
+    a batch by `process_event_batch`.
+    """
+
+    project: Project
+    data: MutableMapping[str, Any]
+    event_id: str
+    project_id: int
+    start_time: float
+    remote_addr: str | None
+    attachments: Sequence[MutableMapping[str, Any]]
+    payload_size: int
+    deduplication_key: str
+
+
+def parse_event_message(message: IngestMessage, project: Project) -> ParsedEventMessage | None:
+    """
+    Does the part of `process_event` which only depends on the message itself: load shedding and
+    parsing the payload. Returns `None` for messages which are shed.
+    """
     payload = message["payload"]
     start_time = float(message["start_time"])
     event_id = message["event_id"]
     project_id = int(message["project_id"])
-    remote_addr = message.get("remote_addr")
     attachments = message.get("attachments") or ()
 
-    sentry_sdk.set_extra("event_id", event_id)
-    sentry_sdk.set_extra("len_attachments", len(attachments))
-
     if project_id == settings.SENTRY_PROJECT:
         metrics.incr("internal.captured.ingest_consumer.unparsed")
 
-    # check that we haven't already processed this event (a previous instance of the forwarder
-    # died before it could commit the event queue offset)
-    #
-    # XXX(markus): I believe this code is extremely broken:
-    #
-    # * it practically uses memcached in prod which has no consistency
-    #   guarantees (no idea how we don't run into issues there)
-    #
-    # * a TTL of 1h basically doesn't guarantee any deduplication at all. It
-    #   just guarantees a good error message... for one hour.
-    #
-    # This code has been ripped from the old python store endpoint. We're
-    # keeping it around because it does provide some protection against
-    # reprocessing good events if a single consumer is in a restart loop.
-    deduplication_key = f"ev:{project_id}:{event_id}"
-
-    try:
-        cached_value = cache.get(deduplication_key)
-    except Exception as exc:
-        raise Retriable(exc)
-
-    if cached_value is not None:
-        logger.warning(
-            "pre-process-forwarder detected a duplicated event" " with id:%s for project:%s.",
-            event_id,
-            project_id,
-        )
-        return  # message already processed do not reprocess
-
     if killswitch_matches_context(
         "store.load-shed-pipeline-projects",
         {
@@ -112,7 +111,7 @@ def process_event(
     ):
         # This killswitch is for the worst of scenarios and should probably not
         # cause additional load on our logging infrastructure
-        return
+        return None
 
     # Parse the JSON payload. This is required to compute the cache key and
     # call process_event. The payload will be put into Kafka raw, to avoid
@@ -135,90 +134,194 @@ def process_event(
             "event_id": event_id,
         },
     ):
-        return
+        return None
+
+    # Fails for payloads without an event id, which have to be rejected before they're batched
+    cache_key_for_event(data)
+
+    return ParsedEventMessage(
+        project=project,
+        data=data,
+        event_id=event_id,
+        project_id=project_id,
+        start_time=start_time,
+        remote_addr=message.get("remote_addr"),
+        attachments=attachments,
+        payload_size=len(payload),
+        deduplication_key=f"ev:{project_id}:{event_id}",
+    )
 
-    # Raise the retriable exception and skip DLQ if anything below this point fails as it may be caused by
-    # intermittent network issue
-    try:
-        # If we only want to reprocess "stuck" events, we check if this event is already in the
-        # `processing_store`. We only continue here if the event *is* present, as that will eventually
-        # process and consume the event from the `processing_store`, whereby getting it "unstuck".
-        if reprocess_only_stuck_events and not event_processing_store.exists(data):
-            return
 
-        with metrics.timer("ingest_consumer._store_event"):
-            cache_key = event_processing_store.store(data)
+@trace_func(name="ingest_consumer.process_event_batch")
+@metrics.wraps("ingest_consumer.process_event_batch")
+def process_event_batch(
+    events: Sequence[ParsedEventMessage], reprocess_only_stuck_events: bool = False
+) -> None:
+    """
+    Processes events like `process_event`, with a single round trip to the deduplication cache
+    and to the processing store for the whole batch.
 
-        try:
-            # Records rc-processing usage broken down by
-            # event type.
-            event_type = data.get("type")
-            if event_type == "error":
-                app_feature = "errors"
-            elif event_type == "transaction":
-                app_feature = "transactions"
-            else:
-                app_feature = None
-
-            if app_feature is not None:
-                record(settings.EVENT_PROCESSING_STORE, app_feature, len(payload), UsageUnit.BYTES)
-        except Exception:
-            pass
-
-        if attachments:
-            with sentry_sdk.start_span(op="ingest_consumer.set_attachment_cache"):
-                attachment_objects = [
-                    CachedAttachment(type=attachment.pop("attachment_type"), **attachment)
-                    for attachment in attachments
-                ]
-
-                attachment_cache.set(
-                    cache_key, attachments=attachment_objects, timeout=CACHE_TIMEOUT
-                )
+    When processing fails part way through, the events which were handed over to their tasks are
+    still remembered for deduplication, and the batch is retried.
+    """
+    metrics.distribution("ingest_consumer.process_event_batch.size", len(events))
+    _process_events(events, reprocess_only_stuck_events)
 
-        if data.get("type") == "transaction":
-            # No need for preprocess/process for transactions thus submit
-            # directly transaction specific save_event task.
-            save_event_transaction.delay(
-                cache_key=cache_key,
-                data=None,
-                start_time=start_time,
-                event_id=event_id,
-                project_id=project_id,
+
+def _process_events(
+    events: Sequence[ParsedEventMessage], reprocess_only_stuck_events: bool
+) -> None:
+    # check that we haven't already processed these events (a previous instance of the forwarder
+    # died before it could commit the event queue offset)
+    #
+    # XXX(markus): I believe this code is extremely broken:
+    #
+    # * it practically uses memcached in prod which has no consistency
+    #   guarantees (no idea how we don't run into issues there)
+    #
+    # * a TTL of 1h basically doesn't guarantee any deduplication at all. It
+    #   just guarantees a good error message... for one hour.
+    #
+    # This code has been ripped from the old python store endpoint. We're
+    # keeping it around because it does provide some protection against
+    # reprocessing good events if a single consumer is in a restart loop.
+    try:
+        cached_values = cache.get_many([event.deduplication_key for event in events])
+    except Exception as exc:
+        raise Retriable(exc)
+
+    pending = []
+    seen = set()
+    for event in events:
+        if event.deduplication_key in cached_values or event.deduplication_key in seen:
+            logger.warning(
+                "pre-process-forwarder detected a duplicated event" " with id:%s for project:%s.",
+                event.event_id,
+                event.project_id,
             )
-        elif data.get("type") == "feedback":
-            if features.has("organizations:user-feedback-ingest", project.organization, actor=None):
-                save_event_feedback.delay(
-                    cache_key=None,  # no need to cache as volume is low
-                    data=data,
-                    start_time=start_time,
-                    event_id=event_id,
-                    project_id=project_id,
-                )
-        else:
-            # Preprocess this event, which spawns either process_event or
-            # save_event. Pass data explicitly to avoid fetching it again from the
-            # cache.
-            with sentry_sdk.start_span(op="ingest_consumer.process_event.preprocess_event"):
-                preprocess_event(
-                    cache_key=cache_key,
-                    data=data,
-                    start_time=start_time,
-                    event_id=event_id,
-                    project=project,
-                    has_attachments=bool(attachments),
+            continue
+        seen.add(event.deduplication_key)
+        pending.append(event)
+    if len(pending) < len(events):
+        metrics.incr("ingest_consumer.duplicates", len(events) - len(pending))
+
+    # Raise the retriable exception and skip DLQ if anything below this point fails as it may be
+    # caused by intermittent network issue
+    dispatched: list[ParsedEventMessage] = []
+    try:
+        try:
+            # If we only want to reprocess "stuck" events, we check if they are already in the
+            # `processing_store`. We only continue with the events which *are* present, as that
+            # will eventually process and consume them from the `processing_store`, whereby
+            # getting them "unstuck".
+            if reprocess_only_stuck_events:
+                pending = [event for event in pending if event_processing_store.exists(event.data)]
+
+            with metrics.timer("ingest_consumer._store_event_batch"):
+                cache_keys = event_processing_store.store_many(
+                    [event.data for event in pending], stage="ingest"
                 )
 
-        # remember for an 1 hour that we saved this event (deduplication protection)
-        cache.set(deduplication_key, "", CACHE_TIMEOUT)
-
-        # emit event_accepted once everything is done
-        event_accepted.send_robust(ip=remote_addr, data=data, project=project, sender=process_event)
+            for event, cache_key in zip(pending, cache_keys):
+                _dispatch_event(
+                    event.data,
+                    cache_key,
+                    event.project,
+                    event_id=event.event_id,
+                    project_id=event.project_id,
+                    start_time=event.start_time,
+                    attachments=event.attachments,
+                    payload_size=event.payload_size,
+                )
+                dispatched.append(event)
+        finally:
+            # remember for an 1 hour that we saved these events (deduplication protection)
+            if dispatched:
+                cache.set_many({event.deduplication_key: "" for event in dispatched}, CACHE_TIMEOUT)
     except Exception as exc:
-        if isinstance(exc, KeyError):  # ex: missing event_id in message["payload"]
+        if isinstance(exc, KeyError):  # ex: missing attachment_type in message["attachments"]
             raise
         raise Retriable(exc)
 
+    # emit event_accepted once everything is done
+    for event in dispatched:
+        event_accepted.send_robust(
+            ip=event.remote_addr, data=event.data, project=event.project, sender=process_event
+        )
+
+
+def _dispatch_event(
+    data: MutableMapping[str, Any],
+    cache_key: str,
+    project: Project,
+    *,
+    event_id: str,
+    project_id: int,
+    start_time: float,
+    attachments: Sequence[MutableMapping[str, Any]],
+    payload_size: int,
+) -> None:
+    """
+    Hands an event which was written to the processing store over to the tasks processing it.
+    """
+    try:
+        # Records rc-processing usage broken down by
+        # event type.
+        event_type = data.get("type")
+        if event_type == "error":
+            app_feature = "errors"
+        elif event_type == "transaction":
+            app_feature = "transactions"
+        else:
+            app_feature = None
+
+        if app_feature is not None:
+            record(settings.EVENT_PROCESSING_STORE, app_feature, payload_size, UsageUnit.BYTES)
+    except Exception:
+        pass
+
+    if attachments:
+        with sentry_sdk.start_span(op="ingest_consumer.set_attachment_cache"):
+            attachment_objects = [
+                CachedAttachment(type=attachment.pop("attachment_type"), **attachment)
+                for attachment in attachments
+            ]
+
+            attachment_cache.set(cache_key, attachments=attachment_objects, timeout=CACHE_TIMEOUT)
+
+    if data.get("type") == "transaction":
+        # No need for preprocess/process for transactions thus submit
+        # directly transaction specific save_event task.
+        save_event_transaction.delay(
+            cache_key=cache_key,
+            data=None,
+            start_time=start_time,
+            event_id=event_id,
+            project_id=project_id,
+        )
+    elif data.get("type") == "feedback":
+        if features.has("organizations:user-feedback-ingest", project.organization, actor=None):
+            save_event_feedback.delay(
+                cache_key=None,  # no need to cache as volume is low
+                data=data,
+                start_time=start_time,
+                event_id=event_id,
+                project_id=project_id,
+            )
+    else:
+        # Preprocess this event, which spawns either process_event or
+        # save_event. Pass data explicitly to avoid fetching it again from the
+        # cache.
+        with sentry_sdk.start_span(op="ingest_consumer.process_event.preprocess_event"):
+            preprocess_event(
+                cache_key=cache_key,
+                data=data,
+                start_time=start_time,
+                event_id=event_id,
+                project=project,
+                has_attachments=bool(attachments),
+            )
+
 
 @trace_func(name="ingest_consumer.process_attachment_chunk")
 @metrics.wraps("ingest_consumer.process_attachment_chunk")
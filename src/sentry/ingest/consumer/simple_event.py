@@ -1,18 +1,58 @@
 import logging
+from collections import deque
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import cast
 
 import msgpack
 from arroyo.backends.kafka.consumer import KafkaPayload
 from arroyo.dlq import InvalidMessage
-from arroyo.types import BrokerValue, Message
+from arroyo.processing.strategies import MessageRejected, ProcessingStrategy
+from arroyo.processing.strategies.batching import ValuesBatch
+from arroyo.types import BrokerValue, FilteredPayload, Message, Partition
 
 from sentry.models.project import Project
 from sentry.utils import metrics
 
-from .processors import IngestMessage, Retriable, process_event
+from .processors import (
+    IngestMessage,
+    ParsedEventMessage,
+    Retriable,
+    parse_event_message,
+    process_event,
+    process_event_batch,
+)
 
 logger = logging.getLogger(__name__)
 
 
+def _unpack_message(raw_message: Message[KafkaPayload], consumer_type: str) -> IngestMessage:
+    """
+    Decodes the msgpack payload of a Kafka message, and checks that it contains an event.
+    """
+    raw_payload = raw_message.payload.value
+    metrics.distribution(
+        "ingest_consumer.payload_size",
+        len(raw_payload),
+        tags={"consumer": consumer_type},
+        unit="byte",
+    )
+
+    message: IngestMessage = msgpack.unpackb(raw_payload, use_list=False)
+
+    message_type = message["type"]
+    if message_type != "event":
+        raise ValueError(f"Unsupported message type: {message_type}")
+
+    return message
+
+
+def _invalid_message(raw_message: Message[KafkaPayload]) -> InvalidMessage:
+    raw_value = raw_message.value
+    assert isinstance(raw_value, BrokerValue)
+    return InvalidMessage(raw_value.partition, raw_value.offset)
+
+
 def process_simple_event_message(
     raw_message: Message[KafkaPayload], consumer_type: str, reprocess_only_stuck_events: bool
 ) -> None:
@@ -30,29 +70,16 @@ def process_simple_event_message(
       `symbolicate_event` or `process_event`.
     """
 
-    raw_payload = raw_message.payload.value
-    metrics.distribution(
-        "ingest_consumer.payload_size",
-        len(raw_payload),
-        tags={"consumer": consumer_type},
-        unit="byte",
-    )
-
     try:
-        message: IngestMessage = msgpack.unpackb(raw_payload, use_list=False)
-
-        message_type = message["type"]
+        message = _unpack_message(raw_message, consumer_type)
         project_id = message["project_id"]
 
-        if message_type != "event":
-            raise ValueError(f"Unsupported message type: {message_type}")
-
         try:
             with metrics.timer("ingest_consumer.fetch_project"):
                 project = Project.objects.get_from_cache(id=project_id)
         except Project.DoesNotExist:
             logger.exception("Project for ingested event does not exist: %s", project_id)
-            return
+            return None
 
         return process_event(message, project, reprocess_only_stuck_events)
 
@@ -61,6 +88,152 @@ def process_simple_event_message(
         if isinstance(exc, Retriable):
             raise
 
-        raw_value = raw_message.value
-        assert isinstance(raw_value, BrokerValue)
-        raise InvalidMessage(raw_value.partition, raw_value.offset) from exc
+        raise _invalid_message(raw_message) from exc
+
+
+@dataclass(frozen=True)
+class UnpackedEventMessage:
+    """
+    An event message decoded by `unpack_simple_event_message`, along with the position of its
+    Kafka message, so that it can still be sent to the DLQ once it's part of a batch.
+    """
+
+    message: IngestMessage
+    partition: Partition
+    offset: int
+
+
+def unpack_simple_event_message(
+    raw_message: Message[KafkaPayload], consumer_type: str
+) -> UnpackedEventMessage:
+    """
+    Decodes a Kafka Message containing a "simple" Event payload, for it to be processed in a
+    batch by `process_simple_event_batch`. This runs in the main consumer process, so it only
+    does the cheap checks. The Event payload is parsed by the batch, in the worker processes.
+
+    Messages which can't be decoded are sent to the DLQ from here, one at a time.
+    """
+    raw_value = raw_message.value
+    assert isinstance(raw_value, BrokerValue)
+    try:
+        message = _unpack_message(raw_message, consumer_type)
+        # The batch looks up all projects at once, and can't reject a single message for this
+        int(message["project_id"])
+    except Exception as exc:
+        raise _invalid_message(raw_message) from exc
+
+    return UnpackedEventMessage(message, raw_value.partition, raw_value.offset)
+
+
+def process_simple_event_batch(
+    message: Message[ValuesBatch[UnpackedEventMessage]], reprocess_only_stuck_events: bool
+) -> list[InvalidMessage]:
+    """
+    Processes a batch of Events decoded by `unpack_simple_event_message`: fetches their projects,
+    parses their payloads and processes them with `process_event_batch`. A processing failure
+    raises `Retriable` for the whole batch, so that none of its offsets are committed.
+
+    Events of which the payload can't be parsed are left out of the batch, and returned for
+    `ForwardInvalidMessages` to send them to the DLQ.
+    """
+    items = [item.payload for item in message.payload]
+
+    with metrics.timer("ingest_consumer.fetch_project"):
+        projects = {
+            project.id: project
+            for project in Project.objects.get_many_from_cache(
+                {int(item.message["project_id"]) for item in items}
+            )
+        }
+
+    events: list[ParsedEventMessage] = []
+    invalid: list[UnpackedEventMessage] = []
+    for item in items:
+        project_id = int(item.message["project_id"])
+        project = projects.get(project_id)
+        if project is None:
+            logger.error("Project for ingested event does not exist: %s", project_id)
+            continue
+
+        try:
+            parsed = parse_event_message(item.message, project)
+        except Exception:
+            logger.exception(
+                "Invalid event message at offset %s of %s", item.offset, item.partition
+            )
+            invalid.append(item)
+            continue
+
+        if parsed is not None:
+            events.append(parsed)
+
+    if events:
+        process_event_batch(events, reprocess_only_stuck_events)
+
+    if invalid:
+        metrics.incr("ingest_consumer.process_event_batch.invalid", len(invalid))
+    return [InvalidMessage(item.partition, item.offset) for item in invalid]
+
+
+class ForwardInvalidMessages(ProcessingStrategy[FilteredPayload | Sequence[InvalidMessage]]):
+    """
+    Sends the messages which `process_simple_event_batch` found to be invalid to the DLQ, before
+    committing their batch. Arroyo sends one message to the DLQ per raised `InvalidMessage`, so
+    they are raised one per poll.
+
+    If the consumer shuts down before all of them were raised, the batch isn't committed and is
+    consumed again, its valid events being deduplicated.
+    """
+
+    def __init__(
+        self, next_step: ProcessingStrategy[FilteredPayload | Sequence[InvalidMessage]]
+    ) -> None:
+        self.__next_step = next_step
+        self.__pending: Message[Sequence[InvalidMessage]] | None = None
+        self.__invalid: deque[InvalidMessage] = deque()
+        self.__closed = False
+
+    def submit(self, message: Message[FilteredPayload | Sequence[InvalidMessage]]) -> None:
+        assert not self.__closed
+        if self.__pending is not None:
+            raise MessageRejected
+
+        if isinstance(message.payload, FilteredPayload) or not message.payload:
+            self.__next_step.submit(message)
+            return
+
+        self.__pending = cast(Message[Sequence[InvalidMessage]], message)
+        self.__invalid.extend(message.payload)
+
+    def poll(self) -> None:
+        if self.__invalid:
+            raise self.__invalid.popleft()
+
+        if self.__pending is not None:
+            try:
+                self.__next_step.submit(self.__pending)
+            except MessageRejected:
+                pass
+            else:
+                self.__pending = None
+
+        self.__next_step.poll()
+
+    def close(self) -> None:
+        self.__closed = True
+
+    def terminate(self) -> None:
+        self.__closed = True
+        self.__next_step.terminate()
+
+    def join(self, timeout: float | None = None) -> None:
+        if self.__pending is not None and not self.__invalid:
+            try:
+                self.__next_step.submit(self.__pending)
+            except MessageRejected:
+                pass
+            else:
+                self.__pending = None
+
+        self.__next_step.close()
+        self.__next_step.join(timeout)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import copy
 from collections.abc import Mapping
 from datetime import datetime, timedelta
 from threading import local
@@ -10,6 +11,8 @@ from django.core.cache import BaseCache, InvalidCacheBackendError, caches
 from django.utils.functional import cached_property
 
 from sentry import options
+from sentry.nodestore import encoding
+from sentry.nodestore.local_cache import local_node_cache
 from sentry.utils import json, metrics
 from sentry.utils.services import Service
 
@@ -29,6 +32,10 @@ json_dumps = json.JSONEncoder(
 json_loads = json.loads
 
 
+def _shared_node_id(checksum: str) -> str:
+    return f"shared:{checksum}"
+
+
 class NodeStorage(local, Service):
     """
     Nodestore is a key-value store that is used to store event payloads. It comes in two flavors:
@@ -62,6 +69,14 @@ class NodeStorage(local, Service):
 
     This is used in reprocessing to store a snapshot of the event from multiple
     stages of the pipeline.
+
+    With `nodestore.deduplicate`, the parts of a value which
+    `sentry.eventstore.compressor` deduplicates (such as the debug images of
+    native events) are written once to a shared node, whose id is derived from
+    their content, and are put back in transparently on reads. Shared nodes are
+    not reference counted: they are written again with every value referencing
+    them, so that they expire no earlier than the last of those values, and are
+    never deleted together with them.
     """
 
     __all__ = (
@@ -73,6 +88,7 @@ class NodeStorage(local, Service):
         "set",
         "set_bytes",
         "set_subkeys",
+        "set_many",
         "cleanup",
         "validate",
         "bootstrap",
@@ -100,6 +116,10 @@ class NodeStorage(local, Service):
         if value is None:
             return None
 
+        if encoding.is_container(value):
+            data = encoding.decode_subkey(value, subkey)
+            return json_loads(data) if data is not None else None
+
         lines_iter = iter(value.splitlines())
         try:
             if subkey is not None:
@@ -147,7 +167,7 @@ class NodeStorage(local, Service):
 
             span.set_tag("subkey", str(subkey))
             bytes_data = self._get_bytes(id)
-            rv = self._decode(bytes_data, subkey=subkey)
+            rv = self._assemble({id: self._decode(bytes_data, subkey=subkey)})[id]
             if subkey is None:
                 # set cache item only after we know decoding did not fail
                 self._set_cache_item(id, rv)
@@ -197,6 +217,7 @@ class NodeStorage(local, Service):
                     id: self._decode(value, subkey=subkey)
                     for id, value in self._get_bytes_multi(uncached_ids).items()
                 }
+                items = self._assemble(items)
             if subkey is None:
                 self._set_cache_items(items)
                 items.update(cache_items)
@@ -214,7 +235,18 @@ class NodeStorage(local, Service):
 
         >>> _encode({"unprocessed": {}, None: {"stacktrace": {}}})
         b'{"stacktrace": {}}\nunprocessed\n{}'
+
+        With `nodestore.encoding.write-container` enabled, the subkeys are written
+        into the indexed container format from `sentry.nodestore.encoding` instead.
+        Both formats are always readable.
         """
+        if options.get("nodestore.encoding.write-container"):
+            items = {None: json_dumps(data.pop(None)).encode("utf8")}
+            for key, value in data.items():
+                if key is not None:
+                    items[key] = json_dumps(value).encode("utf8")
+            return encoding.encode(items)
+
         lines = [json_dumps(data.pop(None)).encode("utf8")]
         for key, value in data.items():
             if key is not None:
@@ -260,11 +292,157 @@ class NodeStorage(local, Service):
         {'foo': 'bam'}
         """
         cache_item = data.get(None)
+        if ttl is None and options.get("nodestore.deduplicate"):
+            data, shared = self._deduplicate(data)
+            self._set_shared(shared)
         bytes_data = self._encode(data)
         self.set_bytes(item_id, bytes_data, ttl=ttl)
         # set cache only after encoding and write to nodestore has succeeded
         if options.get("nodestore.set-subkeys.enable-set-cache-item"):
             self._set_cache_item(item_id, cache_item)
+        else:
+            local_node_cache.delete_many([item_id])
+
+    def _set_bytes_many(self, items: list[tuple[str, bytes]], ttl: timedelta | None = None) -> None:
+        """
+        >>> nodestore._set_bytes_many([('key1', b"{'foo': 'bar'}"), ('key2', b"{'foo': 'baz'}")])
+        """
+        for item_id, data in items:
+            self._set_bytes(item_id, data, ttl)
+
+    @sentry_sdk.tracing.trace
+    def set_many(
+        self,
+        items: Mapping[str, dict[str | None, Mapping[str, Any]]],
+        ttl: timedelta | None = None,
+    ) -> None:
+        """
+        Set values and subkeys for multiple items at once. Each value is the
+        same as the `data` argument of `set_subkeys`. Backends write all items
+        in as few round trips as they can.
+
+        Note: This is not guaranteed to be atomic and may result in a partial
+        write.
+
+        >>> nodestore.set_many({
+        ...    'key1': {None: {'foo': 'bar'}},
+        ...    'key2': {None: {'foo': 'baz'}, "unprocessed": {'foo': 'bam'}},
+        ... })
+        """
+        with sentry_sdk.start_span(op="nodestore.set_many") as span:
+            span.set_tag("num_ids", len(items))
+
+            deduplicate = ttl is None and options.get("nodestore.deduplicate")
+            cache_items = {}
+            encoded = []
+            shared: dict[str, bytes] = {}
+            for item_id, data in items.items():
+                cache_items[item_id] = data.get(None)
+                if deduplicate:
+                    data, item_shared = self._deduplicate(data)
+                    shared.update(item_shared)
+                # `_encode` consumes the dict it is given
+                bytes_data = self._encode(dict(data))
+                metrics.distribution("nodestore.set_bytes", len(bytes_data))
+                encoded.append((item_id, bytes_data))
+
+            self._set_shared(shared)
+            self._set_bytes_many(encoded, ttl=ttl)
+            # set cache only after encoding and write to nodestore has succeeded
+            if options.get("nodestore.set-subkeys.enable-set-cache-item"):
+                self._set_cache_items({k: v for k, v in cache_items.items() if v})
+            else:
+                local_node_cache.delete_many(items.keys())
+
+    def _deduplicate(
+        self, data: Mapping[str | None, Mapping[str, Any]]
+    ) -> tuple[dict[str | None, Mapping[str, Any]], dict[str, bytes]]:
+        """
+        Pulls the deduplicated parts of every subkey out into shared nodes.
+        Returns the subkeys to write, and the encoded shared nodes by their id.
+        `data` itself is left untouched.
+
+        Only values written with the default TTL are deduplicated, so that
+        all values referencing a shared node are kept for the same time.
+        """
+        # Imported here, as `sentry.eventstore` imports nodestore
+        from sentry.eventstore import compressor
+
+        deduplicated: dict[str | None, Mapping[str, Any]] = {}
+        shared = {}
+        for key, value in data.items():
+            if isinstance(value, Mapping):
+                # The compressor pops what it deduplicates
+                value, extra_keys = compressor.deduplicate(dict(value))
+                for checksum, part in extra_keys.items():
+                    shared[_shared_node_id(checksum)] = self._encode({None: part})
+            deduplicated[key] = value
+        return deduplicated, shared
+
+    def _set_shared(self, shared: dict[str, bytes]) -> None:
+        if not shared:
+            return
+
+        metrics.distribution(
+            "nodestore.shared_bytes", sum(len(value) for value in shared.values()), unit="byte"
+        )
+        # Written before the values referencing them, and again with every one of them, which
+        # keeps them from expiring as long as anything that was written references them.
+        self._set_bytes_many(list(shared.items()))
+
+    def _assemble(self, items: dict[str, Any]) -> dict[str, Any]:
+        """
+        Puts the shared parts of deduplicated values back in, in place. Values
+        of which a shared part is missing are returned as `None`, the same as
+        if they had expired.
+        """
+        from sentry.eventstore import compressor
+
+        checksums = {
+            id: [checksum for _, checksum, _ in value[compressor.PATCHSETS_KEY]]
+            for id, value in items.items()
+            if isinstance(value, dict) and value.get(compressor.PATCHSETS_KEY)
+        }
+        if not checksums:
+            return items
+
+        shared = self._get_shared(
+            list({_shared_node_id(c) for id_checksums in checksums.values() for c in id_checksums})
+        )
+        used: set[str] = set()
+
+        def get_extra_keys(id_checksums: list[str]) -> dict[str, Any]:
+            rv = {}
+            for checksum in id_checksums:
+                value = shared[_shared_node_id(checksum)]
+                # Values are handed out to callers which may modify them, so they can't share
+                # the same objects
+                rv[checksum] = copy.deepcopy(value) if checksum in used else value
+                used.add(checksum)
+            return rv
+
+        for id, id_checksums in checksums.items():
+            if any(_shared_node_id(checksum) not in shared for checksum in id_checksums):
+                metrics.incr("nodestore.missing_shared")
+                items[id] = None
+            else:
+                items[id] = compressor.assemble(items[id], get_extra_keys)
+
+        return items
+
+    def _get_shared(self, shared_ids: list[str]) -> dict[str, Any]:
+        # Shared nodes never change once written, so they can always be served from the caches
+        shared = self._get_cache_items(shared_ids)
+        missing = [id for id in shared_ids if id not in shared]
+        if missing:
+            fetched = {
+                id: self._decode(value, subkey=None)
+                for id, value in self._get_bytes_multi(missing).items()
+                if value is not None
+            }
+            self._set_cache_items({id: value for id, value in fetched.items() if value is not None})
+            shared.update(fetched)
+        return shared
 
     def cleanup(self, cutoff_timestamp: datetime) -> None:
         raise NotImplementedError
@@ -273,30 +451,46 @@ class NodeStorage(local, Service):
         raise NotImplementedError
 
     def _get_cache_item(self, item_id: str) -> Any | None:
+        rv = local_node_cache.get(item_id)
+        if rv is not None:
+            return rv
+
         if self.cache:
-            return self.cache.get(item_id)
+            rv = self.cache.get(item_id)
+            local_node_cache.set(item_id, rv)
+            return rv
         return None
 
     @sentry_sdk.tracing.trace
     def _get_cache_items(self, id_list: list[str]) -> dict[str, Any]:
+        items = local_node_cache.get_many(id_list)
+        if len(items) == len(id_list):
+            return items
+
         if self.cache:
-            return self.cache.get_many(id_list)
-        return {}
+            shared_items = self.cache.get_many([id for id in id_list if id not in items])
+            local_node_cache.set_many(shared_items)
+            items.update(shared_items)
+        return items
 
     def _set_cache_item(self, item_id: str, data: Any) -> None:
+        local_node_cache.set(item_id, data)
         if self.cache and data:
             self.cache.set(item_id, data)
 
     @sentry_sdk.tracing.trace
     def _set_cache_items(self, items: dict[Any, Any]) -> None:
+        local_node_cache.set_many(items)
         if self.cache:
             self.cache.set_many(items)
 
     def _delete_cache_item(self, item_id: str) -> None:
+        local_node_cache.delete_many([item_id])
         if self.cache:
             self.cache.delete(item_id)
 
     def _delete_cache_items(self, id_list: list[str]) -> None:
+        local_node_cache.delete_many(id_list)
         if self.cache:
             self.cache.delete_many([item_id for item_id in id_list])
 
@@ -75,6 +75,10 @@ class BigtableNodeStorage(NodeStorage):
     def _set_bytes(self, id: str, data: Any, ttl: timedelta | None = None) -> None:
         self.store.set(id, data, ttl)
 
+    @sentry_sdk.tracing.trace
+    def _set_bytes_many(self, items: list[tuple[str, bytes]], ttl: timedelta | None = None) -> None:
+        self.store.set_many(items, ttl)
+
     def delete(self, id: str) -> None:
         if self.skip_deletes:
             return
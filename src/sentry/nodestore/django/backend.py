@@ -9,7 +9,9 @@ from typing import Any
 from django.utils import timezone
 
 from sentry.db.models.query import create_or_update
+from sentry.nodestore import encoding
 from sentry.nodestore.base import NodeStorage
+from sentry.nodestore.local_cache import local_node_cache
 from sentry.utils.strings import compress, decompress
 
 from .models import Node
@@ -27,7 +29,7 @@ class DjangoNodeStorage(NodeStorage):
             return None
 
         try:
-            if value.startswith(b"{"):
+            if value.startswith(b"{") or encoding.is_container(value):
                 return NodeStorage._decode(self, value, subkey=subkey)
 
             if subkey is None:
@@ -55,6 +57,15 @@ class DjangoNodeStorage(NodeStorage):
     def _set_bytes(self, id: str, data: Any, ttl: timedelta | None = None) -> None:
         create_or_update(Node, id=id, values={"data": compress(data), "timestamp": timezone.now()})
 
+    def _set_bytes_many(self, items: list[tuple[str, bytes]], ttl: timedelta | None = None) -> None:
+        timestamp = timezone.now()
+        Node.objects.bulk_create(
+            [Node(id=id, data=compress(data), timestamp=timestamp) for id, data in items],
+            update_conflicts=True,
+            unique_fields=["id"],
+            update_fields=["data", "timestamp"],
+        )
+
     def cleanup(self, cutoff_timestamp: datetime) -> None:
         from sentry.db.deletion import BulkDeleteQuery
 
@@ -62,6 +73,7 @@ class DjangoNodeStorage(NodeStorage):
         days = math.floor(total_seconds / 86400)
 
         BulkDeleteQuery(model=Node, dtfield="timestamp", days=days).execute()
+        local_node_cache.clear()
         if self.cache:
             self.cache.clear()
 
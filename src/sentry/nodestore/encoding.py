@@ -0,0 +1,133 @@
+"""
+Versioned container format for nodestore payloads.
+
+The legacy format is newline-separated: the default payload as JSON, followed by
+alternating subkey/JSON lines. Reading a single subkey requires splitting the whole
+blob. The container format instead starts with a small header that indexes every
+subkey, so that one subkey can be sliced out and decoded without touching the others:
+
+    magic (4 bytes) | version (1 byte) | entry count (uint16)
+    entry count * [subkey length (uint8) | codec (uint8) | offset (uint32) | length (uint32)
+                   | subkey (ascii)]
+    payloads
+
+Offsets are relative to the start of the payload section. The default (``None``)
+subkey is stored with an empty name. Each payload is compressed on its own with zstd
+once it is larger than ``COMPRESSION_THRESHOLD``.
+"""
+
+from __future__ import annotations
+
+import struct
+from collections.abc import Mapping
+
+import zstandard
+
+MAGIC = b"\xffNSC"
+VERSION = 1
+
+CODEC_RAW = 0
+CODEC_ZSTD = 1
+
+COMPRESSION_LEVEL = 3
+# Payloads smaller than this are stored raw, zstd framing overhead isn't worth it.
+COMPRESSION_THRESHOLD = 128
+
+_PREAMBLE = struct.Struct("<4sBH")
+_ENTRY = struct.Struct("<BBII")
+
+Index = dict[str | None, tuple[int, int, int]]
+
+
+class InvalidContainer(ValueError):
+    pass
+
+
+def is_container(value: bytes) -> bool:
+    return value[: len(MAGIC)] == MAGIC
+
+
+def encode(items: Mapping[str | None, bytes]) -> bytes:
+    r"""
+    Packs already serialized payloads into a container.
+
+    >>> value = encode({None: b'{"foo":"bar"}', "unprocessed": b"{}"})
+    >>> value[:7]  # magic, version and entry count
+    b'\xffNSC\x01\x02\x00'
+    >>> value[-15:]  # payloads, too small to be compressed
+    b'{"foo":"bar"}{}'
+    """
+    header = [_PREAMBLE.pack(MAGIC, VERSION, len(items))]
+    payloads = []
+    offset = 0
+    for subkey, data in items.items():
+        name = subkey.encode("ascii") if subkey is not None else b""
+        if subkey is not None and not 0 < len(name) < 256:
+            raise ValueError(f"invalid nodestore subkey: {subkey!r}")
+
+        codec = CODEC_RAW
+        if len(data) > COMPRESSION_THRESHOLD:
+            compressed = zstandard.compress(data, level=COMPRESSION_LEVEL)
+            if len(compressed) < len(data):
+                codec = CODEC_ZSTD
+                data = compressed
+
+        header.append(_ENTRY.pack(len(name), codec, offset, len(data)))
+        header.append(name)
+        payloads.append(data)
+        offset += len(data)
+
+    return b"".join(header + payloads)
+
+
+def read_index(value: bytes) -> tuple[Index, int]:
+    """
+    Parses the container header. Returns the index of ``subkey -> (codec, offset, length)``
+    and the position at which the payload section starts.
+    """
+    try:
+        magic, version, count = _PREAMBLE.unpack_from(value, 0)
+    except struct.error as e:
+        raise InvalidContainer("truncated container header") from e
+
+    if magic != MAGIC:
+        raise InvalidContainer("not a nodestore container")
+    if version != VERSION:
+        raise InvalidContainer(f"unsupported container version: {version}")
+
+    index: Index = {}
+    pos = _PREAMBLE.size
+    try:
+        for _ in range(count):
+            name_length, codec, offset, length = _ENTRY.unpack_from(value, pos)
+            pos += _ENTRY.size
+            name = bytes(value[pos : pos + name_length]).decode("ascii")
+            pos += name_length
+            index[name or None] = (codec, offset, length)
+    except (struct.error, UnicodeDecodeError) as e:
+        raise InvalidContainer("corrupted container header") from e
+
+    return index, pos
+
+
+def decode_subkey(value: bytes, subkey: str | None) -> bytes | None:
+    """
+    Returns the serialized payload stored for ``subkey``, or ``None`` if the container
+    has no such subkey. Only the requested payload is decompressed.
+    """
+    index, start = read_index(value)
+    try:
+        codec, offset, length = index[subkey]
+    except KeyError:
+        return None
+
+    data = memoryview(value)[start + offset : start + offset + length]
+    if len(data) != length:
+        raise InvalidContainer("truncated container payload")
+
+    if codec == CODEC_RAW:
+        return bytes(data)
+    elif codec == CODEC_ZSTD:
+        return zstandard.decompress(data)
+    else:
+        raise InvalidContainer(f"unknown codec: {codec}")
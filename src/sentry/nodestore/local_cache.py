@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from sentry import options
+from sentry.utils import metrics
+
+
+class LocalNodeCache:
+    """
+    A bounded, process-wide LRU in front of the shared `nodedata` cache.
+
+    The same event is usually fetched several times by one worker (post
+    processing, rule processing, delayed rule processing), and every fetch
+    would otherwise go over the network and deserialize the payload again.
+
+    Payloads are kept pickled: every read hands out a fresh object, so callers
+    mutating the payload (e.g. `NodeData.bind_data`) cannot leak changes into
+    the cache, and the pickled size is what is accounted against
+    `nodestore.local-cache.max-bytes`. Unpickling is considerably cheaper than
+    decompressing and parsing the JSON stored in nodestore.
+
+    Entries live for at most `nodestore.local-cache.ttl-seconds`. Deletes and
+    writes through this process invalidate entries immediately, writes from
+    other processes are only picked up once the entry expires.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._items: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._size = 0
+
+    @property
+    def max_bytes(self) -> int:
+        return options.get("nodestore.local-cache.max-bytes")
+
+    def get(self, item_id: str) -> Any | None:
+        return self.get_many([item_id]).get(item_id)
+
+    def get_many(self, id_list: Iterable[str]) -> dict[str, Any]:
+        if not self.max_bytes:
+            return {}
+
+        now = time.monotonic()
+        found = {}
+        hits = misses = 0
+        with self._lock:
+            for item_id in id_list:
+                try:
+                    expires, data = self._items[item_id]
+                except KeyError:
+                    misses += 1
+                    continue
+                if expires < now:
+                    self._pop(item_id)
+                    misses += 1
+                    continue
+                self._items.move_to_end(item_id)
+                found[item_id] = data
+                hits += 1
+
+        if hits:
+            metrics.incr("nodestore.local_cache", amount=hits, tags={"result": "hit"})
+        if misses:
+            metrics.incr("nodestore.local_cache", amount=misses, tags={"result": "miss"})
+
+        return {item_id: pickle.loads(data) for item_id, data in found.items()}
+
+    def set(self, item_id: str, data: Any) -> None:
+        self.set_many({item_id: data})
+
+    def set_many(self, items: Mapping[str, Any]) -> None:
+        max_bytes = self.max_bytes
+        if not max_bytes:
+            return
+
+        expires = time.monotonic() + options.get("nodestore.local-cache.ttl-seconds")
+        pickled = {
+            item_id: pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+            for item_id, data in items.items()
+            if data
+        }
+        evicted = 0
+        with self._lock:
+            for item_id, data in pickled.items():
+                self._pop(item_id)
+                # A single payload must not be able to flush the whole cache.
+                if len(data) > max_bytes // 8:
+                    continue
+                self._items[item_id] = (expires, data)
+                self._size += len(data)
+
+            while self._size > max_bytes:
+                _, (_, data) = self._items.popitem(last=False)
+                self._size -= len(data)
+                evicted += 1
+
+        if evicted:
+            metrics.incr("nodestore.local_cache.evicted", amount=evicted)
+
+    def delete_many(self, id_list: Iterable[str]) -> None:
+        with self._lock:
+            for item_id in id_list:
+                self._pop(item_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._size = 0
+
+    def _pop(self, item_id: str) -> None:
+        item = self._items.pop(item_id, None)
+        if item is not None:
+            self._size -= len(item[1])
+
+
+local_node_cache = LocalNodeCache()
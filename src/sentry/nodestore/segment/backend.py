@@ -0,0 +1,427 @@
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import time
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+import sentry_sdk
+
+from sentry.nodestore.base import NodeStorage
+from sentry.utils import metrics
+
+__all__ = ("SegmentNodeStorage",)
+
+DATA_SUFFIX = ".data"
+INDEX_SUFFIX = ".index"
+TABLE_SUFFIX = ".table"
+
+FLAG_TOMBSTONE = 1 << 0
+
+# Data file record: key length, value length, key, value.
+_RECORD_HEADER = struct.Struct("<HI")
+# Index log entry: key digest, offset of the value in the data file, value
+# length, expiry as a unix timestamp (0 if the node does not expire), flags.
+_INDEX_ENTRY = struct.Struct("<16sQIIB")
+# Hash table of a sealed segment: a header followed by open-addressing slots
+# with the same fields as an index entry. Empty slots have an all-zero digest.
+_TABLE_MAGIC = b"SEGTBL01"
+_TABLE_HEADER = struct.Struct("<8sQ")
+_TABLE_SLOT = struct.Struct("<16sQIIB3x")
+_EMPTY_DIGEST = b"\x00" * 16
+
+
+class IndexEntry(NamedTuple):
+    offset: int
+    length: int
+    expires: int
+    flags: int
+
+
+def _digest(id: str) -> bytes:
+    return hashlib.blake2b(id.encode("utf-8"), digest_size=16).digest()
+
+
+def _read_index_entries(buf: bytes) -> dict[bytes, IndexEntry]:
+    entries = {}
+    for digest, offset, length, expires, flags in _INDEX_ENTRY.iter_unpack(
+        buf[: len(buf) - len(buf) % _INDEX_ENTRY.size]
+    ):
+        entries[digest] = IndexEntry(offset, length, expires, flags)
+    return entries
+
+
+def _build_table(entries: dict[bytes, IndexEntry]) -> bytes:
+    slots = 16
+    while slots < len(entries) * 2:
+        slots *= 2
+    mask = slots - 1
+
+    buf = bytearray(_TABLE_HEADER.size + slots * _TABLE_SLOT.size)
+    _TABLE_HEADER.pack_into(buf, 0, _TABLE_MAGIC, slots)
+    for digest, entry in entries.items():
+        slot = int.from_bytes(digest[:8], "little") & mask
+        while True:
+            pos = _TABLE_HEADER.size + slot * _TABLE_SLOT.size
+            if buf[pos : pos + 16] == _EMPTY_DIGEST:
+                break
+            slot = (slot + 1) & mask
+        _TABLE_SLOT.pack_into(buf, pos, digest, *entry)
+    return bytes(buf)
+
+
+def _lookup_table(table: mmap.mmap, digest: bytes) -> IndexEntry | None:
+    magic, slots = _TABLE_HEADER.unpack_from(table, 0)
+    assert magic == _TABLE_MAGIC
+    mask = slots - 1
+    slot = int.from_bytes(digest[:8], "little") & mask
+    while True:
+        slot_digest, offset, length, expires, flags = _TABLE_SLOT.unpack_from(
+            table, _TABLE_HEADER.size + slot * _TABLE_SLOT.size
+        )
+        if slot_digest == digest:
+            return IndexEntry(offset, length, expires, flags)
+        if slot_digest == _EMPTY_DIGEST:
+            return None
+        slot = (slot + 1) & mask
+
+
+class Segment:
+    """
+    One time bucket of nodes: an append-only data file, an append-only index
+    log and, once the segment no longer receives writes, a hash table built
+    from the index log. Data files are memory-mapped for reads.
+
+    Other processes may append to the same segment, so the index of an active
+    segment is followed incrementally from where this process last read it.
+    """
+
+    def __init__(self, path: str, segment_id: int):
+        self.segment_id = segment_id
+        base = os.path.join(path, str(segment_id))
+        self.data_path = base + DATA_SUFFIX
+        self.index_path = base + INDEX_SUFFIX
+        self.table_path = base + TABLE_SUFFIX
+
+        self._entries: dict[bytes, IndexEntry] = {}
+        self._index_pos = 0
+        self._data: mmap.mmap | None = None
+        self._table: mmap.mmap | None = None
+
+    def lookup(self, digest: bytes, sealed: bool) -> IndexEntry | None:
+        if sealed:
+            table = self._get_table()
+            if table is not None:
+                return _lookup_table(table, digest)
+
+        self._follow_index()
+        return self._entries.get(digest)
+
+    def read(self, entry: IndexEntry) -> bytes:
+        end = entry.offset + entry.length
+        if self._data is None or len(self._data) < end:
+            # The data file grew since it was mapped (or was never mapped).
+            self._close_data()
+            with open(self.data_path, "rb") as f:
+                self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._data[entry.offset : end]
+
+    def _follow_index(self) -> None:
+        try:
+            size = os.stat(self.index_path).st_size
+        except FileNotFoundError:
+            return
+        if size - self._index_pos < _INDEX_ENTRY.size:
+            return
+
+        with open(self.index_path, "rb") as f:
+            f.seek(self._index_pos)
+            buf = f.read(size - self._index_pos)
+        consumed = len(buf) - len(buf) % _INDEX_ENTRY.size
+        self._entries.update(_read_index_entries(buf[:consumed]))
+        self._index_pos += consumed
+
+    def _get_table(self) -> mmap.mmap | None:
+        if self._table is None:
+            if not os.path.exists(self.table_path):
+                self._write_table()
+            try:
+                with open(self.table_path, "rb") as f:
+                    self._table = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except FileNotFoundError:
+                return None
+            # The in-memory index of the active segment is no longer needed.
+            self._entries = {}
+        return self._table
+
+    def _write_table(self) -> None:
+        try:
+            index_file = open(self.index_path, "rb")
+        except FileNotFoundError:
+            return
+
+        with index_file:
+            fcntl.flock(index_file, fcntl.LOCK_EX)
+            try:
+                if os.path.exists(self.table_path):
+                    return
+                with sentry_sdk.start_span(op="nodestore.segment.build_table"):
+                    table = _build_table(_read_index_entries(index_file.read()))
+                tmp_path = f"{self.table_path}.{os.getpid()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(table)
+                os.replace(tmp_path, self.table_path)
+            finally:
+                fcntl.flock(index_file, fcntl.LOCK_UN)
+
+    def _close_data(self) -> None:
+        if self._data is not None:
+            self._data.close()
+            self._data = None
+
+    def close(self) -> None:
+        self._close_data()
+        if self._table is not None:
+            self._table.close()
+            self._table = None
+
+
+class SegmentNodeStorage(NodeStorage):
+    """
+    A local-disk backend that appends nodes to time-bucketed segment files.
+
+    Every ``segment_duration`` a new segment is started. Writes (and deletes,
+    which are written as tombstones) are appended to the current segment's data
+    file and index log under a file lock, so multiple processes can share the
+    same directory. Reads look up the node in the newest segment first. Once a
+    segment stops receiving writes, its index log is compacted into an on-disk
+    hash table that is memory-mapped instead of being held in memory.
+
+    Expiry works on whole segments: ``cleanup`` and ``default_ttl`` drop every
+    segment that ended before the cutoff by unlinking its files. TTLs passed on
+    write are therefore capped at ``default_ttl``.
+
+    :param path: Directory the segment files are written to.
+    :param segment_duration: Time span covered by a single segment.
+    :param default_ttl: How long nodes are kept when no TTL is passed on write,
+        and the longest any node is kept.
+    :param fsync: Whether to fsync data and index after every write.
+
+    >>> from datetime import timedelta
+    >>> SegmentNodeStorage(
+    ...     path='/data/nodestore',
+    ...     segment_duration=timedelta(hours=6),
+    ...     default_ttl=timedelta(days=90),
+    ... )
+    """
+
+    # Writers may still append to a segment for a short while after it ended
+    # (e.g. slightly skewed clocks), so it is only sealed after this grace period.
+    seal_grace_seconds = 60
+    # Lookups of missing nodes rescan the directory for segments started by other processes at
+    # most this often, in seconds.
+    refresh_interval_seconds = 1
+
+    def __init__(
+        self,
+        path: str,
+        segment_duration: timedelta = timedelta(days=1),
+        default_ttl: timedelta | None = None,
+        fsync: bool = False,
+    ):
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self.segment_duration = int(segment_duration.total_seconds())
+        assert self.segment_duration > 0
+        self.default_ttl = default_ttl
+        self.fsync = fsync
+
+        self._segments: dict[int, Segment] = {}
+        self._segment_ids: list[int] = []
+        self._segment_ids_loaded_at = 0.0
+
+    def _current_segment_id(self, now: float) -> int:
+        return int(now) // self.segment_duration * self.segment_duration
+
+    def _is_sealed(self, segment_id: int, now: float) -> bool:
+        return segment_id + self.segment_duration + self.seal_grace_seconds < now
+
+    def _refresh_segment_ids(self) -> bool:
+        """
+        Reloads the list of segments on disk, newest first. Returns whether
+        it changed.
+        """
+        segment_ids = []
+        for filename in self._listdir():
+            name, ext = os.path.splitext(filename)
+            if ext == INDEX_SUFFIX and name.isdigit():
+                segment_ids.append(int(name))
+        segment_ids.sort(reverse=True)
+
+        changed = segment_ids != self._segment_ids
+        self._segment_ids = segment_ids
+        self._segment_ids_loaded_at = time.time()
+        for segment_id in set(self._segments) - set(segment_ids):
+            self._segments.pop(segment_id).close()
+        return changed
+
+    def _listdir(self) -> list[str]:
+        try:
+            return os.listdir(self.path)
+        except FileNotFoundError:
+            raise self._not_bootstrapped() from None
+
+    def _not_bootstrapped(self) -> RuntimeError:
+        return RuntimeError(
+            f"Nodestore directory {self.path} does not exist, "
+            "it has to be created with `bootstrap()` first"
+        )
+
+    def _get_segment(self, segment_id: int) -> Segment:
+        try:
+            return self._segments[segment_id]
+        except KeyError:
+            segment = self._segments[segment_id] = Segment(self.path, segment_id)
+            return segment
+
+    def _lookup(self, id: str, now: float) -> tuple[Segment, IndexEntry] | None:
+        digest = _digest(id)
+        oldest = now - self.default_ttl.total_seconds() if self.default_ttl else None
+        for segment_id in self._segment_ids:
+            if oldest is not None and segment_id + self.segment_duration <= oldest:
+                break
+            segment = self._get_segment(segment_id)
+            entry = segment.lookup(digest, sealed=self._is_sealed(segment_id, now))
+            if entry is not None:
+                return segment, entry
+        return None
+
+    def _get_bytes(self, id: str) -> bytes | None:
+        now = time.time()
+        can_refresh = now - self._segment_ids_loaded_at > self.refresh_interval_seconds
+        if can_refresh and self._current_segment_id(now) not in self._segment_ids:
+            self._refresh_segment_ids()
+            can_refresh = False
+
+        found = self._lookup(id, now)
+        if found is None and can_refresh and self._refresh_segment_ids():
+            # Another process may have started a segment we don't know about yet.
+            found = self._lookup(id, now)
+
+        if found is None:
+            return None
+        segment, entry = found
+        if entry.flags & FLAG_TOMBSTONE or (entry.expires and entry.expires < now):
+            return None
+        return segment.read(entry)
+
+    def _append_many(self, items: Sequence[tuple[str, bytes, int, int]]) -> None:
+        """
+        Appends ``(id, data, expires, flags)`` records to the current segment.
+        """
+        now = time.time()
+        segment_id = self._current_segment_id(now)
+        segment = self._get_segment(segment_id)
+        try:
+            index_file = open(segment.index_path, "ab", buffering=0)
+        except FileNotFoundError:
+            if not os.path.isdir(self.path):
+                raise self._not_bootstrapped() from None
+            raise
+
+        with index_file:
+            fcntl.flock(index_file, fcntl.LOCK_EX)
+            try:
+                with open(segment.data_path, "ab", buffering=0) as data_file:
+                    offset = data_file.seek(0, os.SEEK_END)
+                    records = []
+                    entries = []
+                    for id, data, expires, flags in items:
+                        key = id.encode("utf-8")
+                        records.append(_RECORD_HEADER.pack(len(key), len(data)))
+                        records.append(key)
+                        records.append(data)
+                        offset += _RECORD_HEADER.size + len(key)
+                        entries.append(
+                            _INDEX_ENTRY.pack(_digest(id), offset, len(data), expires, flags)
+                        )
+                        offset += len(data)
+
+                    # Data has to be on disk before the index entries pointing to it.
+                    data_file.write(b"".join(records))
+                    if self.fsync:
+                        os.fsync(data_file.fileno())
+                index_file.write(b"".join(entries))
+                if self.fsync:
+                    os.fsync(index_file.fileno())
+            finally:
+                fcntl.flock(index_file, fcntl.LOCK_UN)
+
+        if segment_id not in self._segment_ids:
+            self._on_new_segment(now)
+        metrics.distribution("nodestore.segment.append", len(items))
+
+    def _on_new_segment(self, now: float) -> None:
+        self._refresh_segment_ids()
+        if self.default_ttl:
+            self.cleanup_before(now - self.default_ttl.total_seconds())
+
+    def _expires(self, ttl: timedelta | None) -> int:
+        ttl = ttl or self.default_ttl
+        if ttl and self.default_ttl and ttl > self.default_ttl:
+            # Segments are dropped once they are older than the default TTL, so a longer TTL
+            # could not be honored.
+            metrics.incr("nodestore.segment.ttl_clamped")
+            ttl = self.default_ttl
+        return int(time.time() + ttl.total_seconds()) if ttl else 0
+
+    def _set_bytes(self, id: str, data: bytes, ttl: timedelta | None = None) -> None:
+        self._append_many([(id, data, self._expires(ttl), 0)])
+
+    def _set_bytes_many(self, items: list[tuple[str, bytes]], ttl: timedelta | None = None) -> None:
+        expires = self._expires(ttl)
+        self._append_many([(id, data, expires, 0) for id, data in items])
+
+    def delete(self, id: str) -> None:
+        self.delete_multi([id])
+
+    def delete_multi(self, id_list: list[str]) -> None:
+        try:
+            self._append_many([(id, b"", 0, FLAG_TOMBSTONE) for id in id_list])
+        finally:
+            self._delete_cache_items(id_list)
+
+    def cleanup(self, cutoff_timestamp: datetime) -> None:
+        self.cleanup_before(cutoff_timestamp.timestamp())
+
+    def cleanup_before(self, cutoff: float) -> None:
+        """
+        Drops every segment that ended before ``cutoff`` (a unix timestamp).
+        """
+        self._refresh_segment_ids()
+        dropped = 0
+        for segment_id in self._segment_ids:
+            if segment_id + self.segment_duration > cutoff:
+                continue
+            segment = self._segments.pop(segment_id, None)
+            if segment is not None:
+                segment.close()
+            base = os.path.join(self.path, str(segment_id))
+            # The index goes first so that readers stop considering the segment.
+            for suffix in (INDEX_SUFFIX, TABLE_SUFFIX, DATA_SUFFIX):
+                try:
+                    os.unlink(base + suffix)
+                except FileNotFoundError:
+                    pass
+            dropped += 1
+
+        if dropped:
+            self._refresh_segment_ids()
+        metrics.incr("nodestore.segment.dropped", amount=dropped)
+
+    def bootstrap(self) -> None:
+        os.makedirs(self.path, exist_ok=True)
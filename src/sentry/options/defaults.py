@@ -645,8 +645,36 @@ register("snuba.search.chunk-growth-rate", default=1.5, flags=FLAG_AUTOMATOR_MOD
 register("snuba.search.max-chunk-size", default=2000, flags=FLAG_AUTOMATOR_MODIFIABLE)
 register("snuba.search.max-total-chunk-time-seconds", default=30.0, flags=FLAG_AUTOMATOR_MODIFIABLE)
 register("snuba.search.hits-sample-size", default=100, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Issue search: size the post-filter chunks from the observed selectivity and query them
+# concurrently, and cache candidates and selectivity for the pages of a search
+register("snuba.search.adaptive-chunking.enabled", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+register(
+    "snuba.search.adaptive-chunking.max-parallel-chunks", default=4, flags=FLAG_AUTOMATOR_MODIFIABLE
+)
+register("snuba.search.candidate-cache-ttl", default=60, flags=FLAG_AUTOMATOR_MODIFIABLE)
 register("snuba.track-outcomes-sample-rate", default=0.0, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
+# Snuba query cache (`use_cache=True` queries)
+# Store cached results as msgpack instead of JSON. Only enable once every process can read it.
+register("snuba.query-cache.binary-encoding", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Refresh cached results ahead of their expiry, proportionally to how long their query took.
+# Higher values refresh earlier, 0 disables it.
+register("snuba.query-cache.early-refresh-beta", default=0.0, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Let only one process run identical queries at a time, the others wait for its result.
+register("snuba.query-cache.coalesce.enabled", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+register("snuba.query-cache.coalesce.lock-seconds", default=30, flags=FLAG_AUTOMATOR_MODIFIABLE)
+register("snuba.query-cache.coalesce.wait-seconds", default=10.0, flags=FLAG_AUTOMATOR_MODIFIABLE)
+
+# Time-series partial result cache (`sentry.snuba.timeseries_cache`)
+register("snuba.timeseries-cache.enabled", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Minimum size of the cached chunks, rounded up to a multiple of the rollup
+register(
+    "snuba.timeseries-cache.chunk-seconds", default=6 * 60 * 60, flags=FLAG_AUTOMATOR_MODIFIABLE
+)
+# How long after it ended a chunk is considered complete, to account for late events
+register("snuba.timeseries-cache.settle-seconds", default=60 * 60, flags=FLAG_AUTOMATOR_MODIFIABLE)
+register("snuba.timeseries-cache.ttl", default=24 * 60 * 60, flags=FLAG_AUTOMATOR_MODIFIABLE)
+
 # The percentage of tagkeys that we want to cache. Set to 1.0 in order to cache everything, <=0.0 to stop caching
 register(
     "snuba.tagstore.cache-tagkeys-rate",
@@ -1054,6 +1082,21 @@ register("relay.drop-transaction-metrics", default=[], flags=FLAG_AUTOMATOR_MODI
 # Relay should emit a usage metric to track total spans.
 register("relay.span-usage-metric", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
+# Build the organization level sections of project configs once per organization when
+# recomputing all of its configs
+register(
+    "relay.config.share-organization-fragments", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE
+)
+
+# Write project configs to the Redis project config cache with the dictionary encoding, which
+# stores shared sections once and compresses with the trained dictionary of the cache. Only to be
+# enabled once every Relay reading the cache understands the encoding.
+register(
+    "relay.projectconfig-cache.dictionary-encoding",
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 # Killswitch for the Relay cardinality limiter, one of `enabled`, `disabled`, `passive`.
 # In `passive` mode Relay's cardinality limiter is active but it does not enforce the limits.
 register("relay.cardinality-limiter.mode", default="enabled", flags=FLAG_AUTOMATOR_MODIFIABLE)
@@ -1246,6 +1289,15 @@ register(
 # Brownout duration to be stored in ISO8601 format for durations (See https://en.wikipedia.org/wiki/ISO_8601#Durations)
 register("api.deprecation.brownout-duration", default="PT1M", flags=FLAG_AUTOMATOR_MODIFIABLE)
 
+# Reuse the serialized users, teams and projects within an API request
+register("api.serializers.memoize", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+
+# Reuse the result of feature checks within an API request or a task
+register("features.evaluation-cache.enabled", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+
+# Paginate the audit log, member and release lists by their sort keys rather than an offset
+register("api.pagination.keyset.enabled", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+
 # Option to disable misbehaving use case IDs
 register("sentry-metrics.indexer.disabled-namespaces", default=[], flags=FLAG_AUTOMATOR_MODIFIABLE)
 
@@ -1890,6 +1942,21 @@ register("span_descs.bump-lifetime-sample-rate", default=0.25, flags=FLAG_AUTOMA
 register(
     "nodestore.set-subkeys.enable-set-cache-item", default=True, flags=FLAG_AUTOMATOR_MODIFIABLE
 )
+# Size in bytes of the in-process nodestore cache in front of the `nodedata` cache, 0 disables it.
+register("nodestore.local-cache.max-bytes", default=0, flags=FLAG_AUTOMATOR_MODIFIABLE)
+register("nodestore.local-cache.ttl-seconds", default=60, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Write nodestore payloads in the indexed, per-subkey compressed container format.
+register("nodestore.encoding.write-container", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Store the parts of node payloads which `sentry.eventstore.compressor` deduplicates (debug images,
+# SDK modules) once, in content-addressed shared nodes. Reads always put shared parts back in. This
+# saves storage, not writes: shared nodes are rewritten with every node referencing them.
+register("nodestore.deduplicate", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+
+# Write events to the processing store as zstd compressed JSON.
+register("eventstore.processing.compress", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Store the debug images and modules of events in the processing store once, shared between all
+# events containing the same ones.
+register("eventstore.processing.deduplicate", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
 # === Backpressure related runtime options ===
 
@@ -2385,6 +2452,30 @@ register(
     flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
 )
 
+# Redis cache of grouphash -> group resolution used during ingest. Grouphashes which
+# point at a group are cached for `ttl` seconds, grouphashes without a group for
+# `negative-ttl` seconds.
+register("grouping.grouphash-cache.enabled", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Invalidate cached grouphashes while the cache is disabled. Turned on before `enabled`, and off
+# after it, so that no stale entries are left behind when the cache is toggled.
+register("grouping.grouphash-cache.invalidate", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+register(
+    "grouping.grouphash-cache.ttl",
+    type=Int,
+    default=3600,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
+register(
+    "grouping.grouphash-cache.negative-ttl",
+    type=Int,
+    default=60,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
+
+# Share frame grouping components between the primary, secondary and background grouping configs
+# of an event while the project transitions between configs.
+register("grouping.shared-component-cache.enabled", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+
 # Rates controlling the rollout of grouping parameterization experiments
 register(
     "grouping.experiments.parameterization.uniq_id",
@@ -2473,6 +2564,13 @@ register(
     default=300,  # 5 minutes
     flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
 )
+# Number of buckets the unprocessed segments of a single partition are spread over, at most 32.
+register(
+    "standalone-spans.buffer-shards",
+    type=Int,
+    default=1,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
 register(
     "standalone-spans.detect-performance-issues-consumer.enable",
     default=True,
@@ -5,6 +5,7 @@ import logging
 from random import random
 from time import time
 from typing import Any
+from uuid import uuid4
 
 from django.conf import settings
 from django.db.utils import OperationalError, ProgrammingError
@@ -16,6 +17,12 @@ from sentry.options.manager import UpdateChannel
 CACHE_FETCH_ERR = "Unable to fetch option cache for %s"
 CACHE_UPDATE_ERR = "Unable to update option cache for %s"
 
+# Every stored option, as one value in the shared cache, and the version it was loaded for
+SNAPSHOT_CACHE_KEY = "o:snapshot"
+SNAPSHOT_VERSION_KEY = "o:snapshot:version"
+# How often a process checks whether the snapshot it holds is still current
+SNAPSHOT_CHECK_INTERVAL = 1
+
 logger = logging.getLogger("sentry")
 
 
@@ -66,11 +73,19 @@ class OptionsStore:
     to the right place. If using the OptionsStore directly, it's your
     job to do validation of the data. You should probably go through
     OptionsManager instead, unless you need raw access to something.
+
+    In snapshot mode, every stored option is loaded at once into an
+    immutable dict, which is swapped out whenever the snapshot version
+    in the shared cache changes. Writes bump that version, so reads are
+    a plain dict lookup plus a version check at most every
+    ``SNAPSHOT_CHECK_INTERVAL`` seconds per process, rather than
+    a round trip per option each time its TTL expires.
     """
 
-    def __init__(self, cache=None, ttl=None):
+    def __init__(self, cache=None, ttl=None, snapshot=False):
         self.cache = cache
         self.ttl = ttl
+        self.snapshot = snapshot
         self.flush_local_cache()
 
     @property
@@ -90,6 +105,13 @@ class OptionsStore:
         """
         Fetches a value from the options store.
         """
+        if self.snapshot and self.cache is not None:
+            values = self.get_snapshot(silent=silent)
+            if values is not None:
+                return values.get(key.name)
+            # The per key cache isn't kept up to date in snapshot mode
+            return self.get_store(key, silent=silent)
+
         result = self.get_cache(key, silent=silent)
         if result is not None:
             return result
@@ -102,6 +124,94 @@ class OptionsStore:
         # in local cache that's possibly stale
         return self.get_local_cache(key, force_grace=True)
 
+    def get_snapshot(self, silent=False):
+        """
+        Returns the current snapshot of stored options, checking its version
+        once every ``SNAPSHOT_CHECK_INTERVAL`` seconds. Returns ``None`` if no
+        snapshot could be loaded, in which case options are read one by one.
+        """
+        now = time()
+        if self._snapshot is not None and now < self._snapshot_checked_at + SNAPSHOT_CHECK_INTERVAL:
+            return self._snapshot
+
+        self._snapshot_checked_at = now
+        try:
+            version = self.cache.get(SNAPSHOT_VERSION_KEY)
+        except Exception:
+            if not silent:
+                logger.warning(CACHE_FETCH_ERR, SNAPSHOT_VERSION_KEY, exc_info=True)
+            # Keep using the snapshot we hold until the cache is back
+            return self._snapshot
+
+        if version is not None and version == self._snapshot_version:
+            return self._snapshot
+
+        values = self._load_snapshot(version, silent=silent)
+        if values is not None:
+            self._snapshot, self._snapshot_version = values
+        return self._snapshot
+
+    def _load_snapshot(self, version, silent=False):
+        if version is None:
+            # The version was evicted or never set, start a new one
+            version = uuid4().hex
+            try:
+                if not self.cache.add(SNAPSHOT_VERSION_KEY, version, None):
+                    version = self.cache.get(SNAPSHOT_VERSION_KEY) or version
+            except Exception:
+                if not silent:
+                    logger.warning(CACHE_UPDATE_ERR, SNAPSHOT_VERSION_KEY, exc_info=True)
+
+        try:
+            cached = self.cache.get(SNAPSHOT_CACHE_KEY)
+        except Exception:
+            cached = None
+        if cached is not None and cached[0] == version:
+            return cached[1], version
+
+        # NOTE: The version is read before the options, so that a snapshot
+        # missing a concurrent write is never stored under the version that
+        # write published.
+        try:
+            with in_test_hide_transaction_boundary():
+                values = dict(self.model.objects.values_list("key", "value"))
+        except Exception:
+            if settings.SENTRY_OPTIONS_COMPLAIN_ON_ERRORS:
+                raise
+            elif not silent:
+                logger.exception("option.failed-snapshot")
+            return None
+
+        try:
+            self.cache.set(SNAPSHOT_CACHE_KEY, (version, values), self.ttl)
+        except Exception:
+            if not silent:
+                logger.warning(CACHE_UPDATE_ERR, SNAPSHOT_CACHE_KEY, exc_info=True)
+        return values, version
+
+    def publish_snapshot(self, key, value=None, deleted=False):
+        """
+        Invalidates the snapshot of every process after ``key`` was written to
+        the database. Our own snapshot is updated right away, and still
+        reloaded on its next check in case it missed other writes.
+        """
+        if self._snapshot is not None:
+            values = dict(self._snapshot)
+            if deleted:
+                values.pop(key.name, None)
+            else:
+                values[key.name] = value
+            self._snapshot = values
+
+        version = uuid4().hex
+        try:
+            self.cache.set(SNAPSHOT_VERSION_KEY, version, None)
+            self.cache.delete(SNAPSHOT_CACHE_KEY)
+        except Exception:
+            logger.warning(CACHE_UPDATE_ERR, SNAPSHOT_VERSION_KEY, exc_info=True)
+            return False
+        return True
+
     def get_cache(self, key, silent=False):
         """
         First check against our local in-process cache, falling
@@ -234,6 +344,8 @@ class OptionsStore:
         assert self.cache is not None, "cache must be configured before mutating options"
 
         self.set_store(key, value, channel)
+        if self.snapshot:
+            return self.publish_snapshot(key, value)
         return self.set_cache(key, value)
 
     def set_store(self, key, value, channel: UpdateChannel):
@@ -250,7 +362,7 @@ class OptionsStore:
         )
 
     def set_cache(self, key, value):
-        if self.cache is None:
+        if self.cache is None or self.snapshot:
             return None
 
         cache_key = key.cache_key
@@ -275,6 +387,8 @@ class OptionsStore:
         assert self.cache is not None, "cache must be configured before mutating options"
 
         self.delete_store(key)
+        if self.snapshot:
+            return self.publish_snapshot(key, deleted=True)
         return self.delete_cache(key)
 
     def delete_store(self, key):
@@ -327,6 +441,9 @@ class OptionsStore:
         Empty store's local in-process cache.
         """
         self._local_cache = {}
+        self._snapshot = None
+        self._snapshot_version = None
+        self._snapshot_checked_at = 0.0
 
     def maybe_clean_local_cache(self, **kwargs):
         # Periodically force an expire on the local cache.
@@ -345,3 +462,7 @@ class OptionsStore:
 
     def set_cache_impl(self, cache) -> None:
         self.cache = cache
+
+    def set_snapshot_mode(self, snapshot: bool) -> None:
+        self.snapshot = snapshot
+        self.flush_local_cache()
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import logging
 import uuid
 from collections.abc import Iterable, Mapping, MutableMapping, Sequence
@@ -41,6 +42,7 @@ from sentry.models.organization import Organization
 from sentry.models.project import Project
 from sentry.models.projectkey import ProjectKey
 from sentry.relay.config.experimental import TimeChecker, add_experimental_config
+from sentry.relay.config.fragments import get_organization_fragment, timed_section
 from sentry.relay.config.metric_extraction import (
     get_metric_conditional_tagging_rules,
     get_metric_extraction_config,
@@ -88,11 +90,25 @@ MIN_CLUSTERER_RUNS = 10
 logger = logging.getLogger(__name__)
 
 
+def _get_exposed_organization_features(organization: Organization) -> frozenset[str]:
+    return frozenset(
+        feature
+        for feature in EXPOSABLE_FEATURES
+        if feature.startswith("organizations:") and features.has(feature, organization)
+    )
+
+
 def get_exposed_features(project: Project) -> Sequence[str]:
+    organization_features = get_organization_fragment(
+        project.organization_id,
+        "features",
+        lambda: _get_exposed_organization_features(project.organization),
+    )
+
     active_features = []
     for feature in EXPOSABLE_FEATURES:
         if feature.startswith("organizations:"):
-            has_feature = features.has(feature, project.organization)
+            has_feature = feature in organization_features
         elif feature.startswith("projects:"):
             has_feature = features.has(feature, project)
         else:
@@ -220,6 +236,7 @@ class GenericFiltersConfig(TypedDict):
     filters: Sequence[GenericFilter]
 
 
+@functools.cache
 def _get_generic_project_filters() -> GenericFiltersConfig:
     return {
         "version": 1,
@@ -259,17 +276,13 @@ class CardinalityLimitOption(TypedDict):
     limit: CardinalityLimit
 
 
-def get_metrics_config(timeout: TimeChecker, project: Project) -> Mapping[str, Any] | None:
-    metrics_config = {}
-
+def _get_organization_cardinality_limits(organization_id: int) -> list[CardinalityLimit]:
     passive_limits = options.get("relay.cardinality-limiter.passive-limits-by-org").get(
-        str(project.organization.id), []
+        str(organization_id), []
     )
 
-    existing_ids: set[str] = set()
     cardinality_limits: list[CardinalityLimit] = []
     for namespace in CARDINALITY_LIMIT_USE_CASES:
-        timeout.check()
         option = options.get(f"sentry-metrics.cardinality-limiter.limits.{namespace.value}.per-org")
         if not option or not len(option) == 1:
             # Multiple quotas are not supported
@@ -291,7 +304,22 @@ def get_metrics_config(timeout: TimeChecker, project: Project) -> Mapping[str, A
         if id in passive_limits:
             limit["passive"] = True
         cardinality_limits.append(limit)
-        existing_ids.add(id)
+
+    return cardinality_limits
+
+
+def get_metrics_config(timeout: TimeChecker, project: Project) -> Mapping[str, Any] | None:
+    metrics_config = {}
+
+    cardinality_limits = list(
+        get_organization_fragment(
+            project.organization_id,
+            "cardinality_limits",
+            lambda: _get_organization_cardinality_limits(project.organization_id),
+        )
+    )
+    existing_ids = {limit["id"] for limit in cardinality_limits}
+    timeout.check()
 
     project_limit_options: list[CardinalityLimitOption] = project.get_option(
         "relay.cardinality-limiter.limits", []
@@ -422,7 +450,8 @@ def _should_extract_abnormal_mechanism(project: Project) -> bool:
     )
 
 
-def _get_desktop_browser_performance_profiles(organization: Organization) -> list[dict[str, Any]]:
+@functools.cache
+def _get_desktop_browser_performance_profiles() -> list[dict[str, Any]]:
     return [
         {
             "name": "Chrome",
@@ -678,7 +707,8 @@ def _get_desktop_browser_performance_profiles(organization: Organization) -> lis
     ]
 
 
-def _get_mobile_browser_performance_profiles(organization: Organization) -> list[dict[str, Any]]:
+@functools.cache
+def _get_mobile_browser_performance_profiles() -> list[dict[str, Any]]:
     return [
         {
             "name": "Chrome Mobile",
@@ -986,6 +1016,19 @@ def _get_mobile_performance_profiles(organization: Organization) -> list[dict[st
     ]
 
 
+def _get_performance_score_profiles(organization: Organization) -> list[dict[str, Any]]:
+    # The browser profiles are the same for everyone, and only built once
+    return [
+        *_get_desktop_browser_performance_profiles(),
+        *_get_mobile_browser_performance_profiles(),
+        *_get_mobile_performance_profiles(organization),
+    ]
+
+
+def _get_trusted_relays(organization: Organization) -> list[str]:
+    return [r["public_key"] for r in organization.get_option("sentry:trusted-relays", []) if r]
+
+
 def _get_project_config(
     project: Project, project_keys: Iterable[ProjectKey] | None = None
 ) -> ProjectConfig:
@@ -994,7 +1037,7 @@ def _get_project_config(
 
     public_keys = get_public_key_configs(project_keys=project_keys)
 
-    with sentry_sdk.start_span(op="get_public_config"):
+    with timed_section("get_public_config"):
         now = datetime.now(timezone.utc)
         cfg = {
             "disabled": False,
@@ -1005,11 +1048,13 @@ def _get_project_config(
             "publicKeys": public_keys,
             "config": {
                 "allowedDomains": list(get_origins(project)),
-                "trustedRelays": [
-                    r["public_key"]
-                    for r in project.organization.get_option("sentry:trusted-relays", [])
-                    if r
-                ],
+                "trustedRelays": list(
+                    get_organization_fragment(
+                        project.organization_id,
+                        "trusted_relays",
+                        lambda: _get_trusted_relays(project.organization),
+                    )
+                ),
                 "piiConfig": get_pii_config(project),
                 "datascrubbingSettings": get_datascrubbing_settings(project),
             },
@@ -1019,7 +1064,7 @@ def _get_project_config(
 
     config = cfg["config"]
 
-    with sentry_sdk.start_span(op="get_exposed_features"):
+    with timed_section("get_exposed_features"):
         if exposed_features := get_exposed_features(project):
             config["features"] = exposed_features
 
@@ -1066,26 +1111,31 @@ def _get_project_config(
         ),
     }
 
-    performance_score_profiles = [
-        *_get_desktop_browser_performance_profiles(project.organization),
-        *_get_mobile_browser_performance_profiles(project.organization),
-        *_get_mobile_performance_profiles(project.organization),
-    ]
-    if performance_score_profiles:
-        config["performanceScore"] = {"profiles": performance_score_profiles}
+    with timed_section("get_performance_score_profiles"):
+        performance_score_profiles = get_organization_fragment(
+            project.organization_id,
+            "performance_score_profiles",
+            lambda: _get_performance_score_profiles(project.organization),
+        )
+        if performance_score_profiles:
+            config["performanceScore"] = {"profiles": list(performance_score_profiles)}
 
-    with sentry_sdk.start_span(op="get_filter_settings"):
+    with timed_section("get_filter_settings"):
         if filter_settings := get_filter_settings(project):
             config["filterSettings"] = filter_settings
-    with sentry_sdk.start_span(op="get_grouping_config_dict_for_project"):
+    with timed_section("get_grouping_config_dict_for_project"):
         grouping_config = get_grouping_config_dict_for_project(project)
         if grouping_config is not None:
             config["groupingConfig"] = grouping_config
-    with sentry_sdk.start_span(op="get_event_retention"):
-        event_retention = quotas.backend.get_event_retention(project.organization)
+    with timed_section("get_event_retention"):
+        event_retention = get_organization_fragment(
+            project.organization_id,
+            "event_retention",
+            lambda: quotas.backend.get_event_retention(project.organization),
+        )
         if event_retention is not None:
             config["eventRetention"] = event_retention
-    with sentry_sdk.start_span(op="get_all_quotas"):
+    with timed_section("get_all_quotas"):
         if quotas_config := get_quotas(project, keys=project_keys):
             config["quotas"] = quotas_config
 
@@ -3,7 +3,7 @@ from collections.abc import MutableMapping
 from datetime import datetime, timedelta, timezone
 from typing import Any, Protocol
 
-import sentry_sdk
+from sentry.relay.config.fragments import timed_section
 
 logger = logging.getLogger(__name__)
 
@@ -62,7 +62,7 @@ def add_experimental_config(
     """
     timeout = TimeChecker(_FEATURE_BUILD_TIMEOUT)
 
-    with sentry_sdk.start_span(op=f"project_config.experimental_config.{key}"):
+    with timed_section(f"project_config.experimental_config.{key}"):
         try:
             subconfig = function(timeout, *args, **kwargs)
         except TimeoutException as e:
@@ -0,0 +1,84 @@
+"""
+Sharing of the organization scoped parts of project configs.
+
+Recomputing every project config of an organization derives the same organization level sections
+(features, trusted relays, quotas, performance profiles, ...) once per project key. Within
+`shared_organization_fragments`, each of them is built once per organization and reused for every
+project of it.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, TypeVar
+
+import sentry_sdk
+
+from sentry import options
+from sentry.utils import metrics
+
+T = TypeVar("T")
+
+SECTION_METRICS_SAMPLE_RATE = 0.1
+
+_fragments: ContextVar[dict[tuple[int, str], Any] | None] = ContextVar(
+    "relay_config_organization_fragments", default=None
+)
+
+
+@contextmanager
+def shared_organization_fragments() -> Generator[None, None, None]:
+    """
+    Disabled unless `relay.config.share-organization-fragments` is set.
+    """
+    if _fragments.get() is not None or not options.get("relay.config.share-organization-fragments"):
+        yield
+        return
+
+    token = _fragments.set({})
+    try:
+        yield
+    finally:
+        _fragments.reset(token)
+
+
+def get_organization_fragment(organization_id: int, section: str, build: Callable[[], T]) -> T:
+    """
+    Returns the `section` of the organization's configs, built with `build` unless it already was
+    for another project. Fragments are shared, and must not be mutated.
+    """
+    fragments = _fragments.get()
+    if fragments is None:
+        return build()
+
+    key = (organization_id, section)
+    try:
+        value = fragments[key]
+    except KeyError:
+        value = fragments[key] = build()
+        metrics.incr(
+            "relay.config.organization_fragment", tags={"section": section, "result": "miss"}
+        )
+    else:
+        metrics.incr(
+            "relay.config.organization_fragment", tags={"section": section, "result": "hit"}
+        )
+    return value
+
+
+@contextmanager
+def timed_section(section: str) -> Generator[None, None, None]:
+    """
+    Traces and times building one section of a project config.
+    """
+    with (
+        sentry_sdk.start_span(op=section),
+        metrics.timer(
+            "relay.config.get_project_config.section",
+            tags={"section": section},
+            sample_rate=SECTION_METRICS_SAMPLE_RATE,
+        ),
+    ):
+        yield
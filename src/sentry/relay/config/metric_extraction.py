@@ -30,6 +30,7 @@ from sentry.models.transaction_threshold import (
     TransactionMetric,
 )
 from sentry.relay.config.experimental import TimeChecker
+from sentry.relay.config.fragments import get_organization_fragment
 from sentry.search.events import fields
 from sentry.search.events.builder.discover import DiscoverQueryBuilder
 from sentry.search.events.types import ParamsType, QueryBuilderConfig
@@ -158,7 +159,11 @@ def get_on_demand_metric_specs(
     timeout: TimeChecker, project: Project
 ) -> tuple[list[HashedMetricSpec], list[HashedMetricSpec]]:
     with sentry_sdk.start_span(op="on_demand_metrics_feature_flags"):
-        enabled_features = on_demand_metrics_feature_flags(project.organization)
+        enabled_features = get_organization_fragment(
+            project.organization_id,
+            "on_demand_metrics_features",
+            lambda: on_demand_metrics_feature_flags(project.organization),
+        )
     timeout.check()
 
     prefilling = "organizations:on-demand-metrics-prefill" in enabled_features
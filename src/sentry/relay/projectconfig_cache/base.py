@@ -2,7 +2,7 @@ from sentry.utils.services import Service
 
 
 class ProjectConfigCache(Service):
-    __all__ = ("set_many", "delete_many", "get")
+    __all__ = ("set_many", "delete_many", "get", "publish_dictionary")
 
     def __init__(self, **options):
         pass
@@ -15,3 +15,6 @@ class ProjectConfigCache(Service):
 
     def get(self, public_key):
         raise NotImplementedError()
+
+    def publish_dictionary(self, dictionary):
+        raise NotImplementedError()
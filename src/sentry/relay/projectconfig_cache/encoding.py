@@ -0,0 +1,221 @@
+"""
+Compact encoding of project configs in the Redis project config cache.
+
+Project configs of an organization, and to a large extent of all organizations, share most of
+their bytes: performance score profiles, generic inbound filters, metric extraction and tagging
+rules. Compressing every config on its own at the default zstd level leaves all of that on the
+table. This encoding does two things:
+
+- Large sections which are commonly shared between configs (see `SHARED_SECTIONS`) are replaced
+  by a reference to the hash of their content, and stored once under their own key.
+- Configs and shared sections are compressed with a zstd dictionary trained on a representative
+  set of configs. Dictionaries are versioned by their zstd dictionary id, which is written in
+  front of every encoded value, so that values compressed with a previous dictionary stay
+  readable while it is rotated.
+
+Encoded values start with `ENVELOPE_MAGIC`, which neither plain zstd frames nor raw JSON do, so
+they can be told apart from values written with the plain encoding.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import struct
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from typing import Any
+
+import zstandard
+
+from sentry.utils import json
+
+ENVELOPE_MAGIC = b"rcd1"
+_ENVELOPE_HEADER = struct.Struct(">4sI")
+
+# Key under which a shared section is referenced in place of its content
+SHARED_REFERENCE_KEY = "$shared"
+
+# Sections which are replaced by a reference when they're at least `MIN_SHARED_SIZE` bytes
+SHARED_SECTIONS: tuple[tuple[str, ...], ...] = (
+    ("config", "performanceScore"),
+    ("config", "metrics"),
+    ("config", "transactionMetrics"),
+    ("config", "metricConditionalTagging"),
+    ("config", "filterSettings", "generic"),
+)
+MIN_SHARED_SIZE = 256
+
+DICTIONARY_SIZE = 112 * 1024
+COMPRESSION_LEVEL = 3
+
+
+def train_dictionary(
+    configs: Iterable[Mapping[str, Any]], dict_size: int = DICTIONARY_SIZE
+) -> zstandard.ZstdCompressionDict:
+    """
+    Trains a dictionary on the given configs, as they're stored: with their shared sections
+    split out, and the shared sections on their own.
+
+    Raises `zstandard.ZstdError` if there are too few samples to train on.
+    """
+    samples = []
+    seen = set()
+    for config in configs:
+        stripped, shared = extract_shared_sections(config)
+        samples.append(json.dumps(stripped).encode())
+        for digest, section in shared.items():
+            if digest not in seen:
+                seen.add(digest)
+                samples.append(section)
+    return zstandard.train_dictionary(dict_size, samples)
+
+
+def _section_digest(serialized: bytes) -> str:
+    return hashlib.sha1(serialized).hexdigest()
+
+
+def extract_shared_sections(config: Any) -> tuple[Any, dict[str, bytes]]:
+    """
+    Returns a copy of the config with its shared sections replaced by references, and the
+    serialized shared sections by their digest. The config itself is left untouched.
+    """
+    if not isinstance(config, dict):
+        return config, {}
+
+    shared: dict[str, bytes] = {}
+    stripped = dict(config)
+    for path in SHARED_SECTIONS:
+        parent = stripped
+        for key in path[:-1]:
+            child = parent.get(key)
+            if not isinstance(child, dict):
+                break
+            # Copy on the way down, so that the original config isn't modified
+            parent[key] = parent = dict(child)
+        else:
+            section = parent.get(path[-1])
+            if section is None:
+                continue
+            serialized = json.dumps(section).encode()
+            if len(serialized) < MIN_SHARED_SIZE:
+                continue
+            digest = _section_digest(serialized)
+            shared[digest] = serialized
+            parent[path[-1]] = {SHARED_REFERENCE_KEY: digest}
+
+    return stripped, shared
+
+
+def find_shared_references(config: Any) -> list[str]:
+    """
+    Returns the digests of the shared sections referenced by a config.
+    """
+    digests = []
+    for path in SHARED_SECTIONS:
+        value = config
+        for key in path:
+            value = value.get(key) if isinstance(value, dict) else None
+        if isinstance(value, dict) and SHARED_REFERENCE_KEY in value:
+            digests.append(value[SHARED_REFERENCE_KEY])
+    return digests
+
+
+def restore_shared_sections(config: Any, sections: Mapping[str, Any]) -> Any:
+    """
+    Replaces the references of a config with the content of the shared sections, in place.
+    """
+    for path in SHARED_SECTIONS:
+        parent = config
+        for key in path[:-1]:
+            parent = parent.get(key) if isinstance(parent, dict) else None
+        if not isinstance(parent, dict):
+            continue
+        value = parent.get(path[-1])
+        if isinstance(value, dict) and SHARED_REFERENCE_KEY in value:
+            parent[path[-1]] = sections[value[SHARED_REFERENCE_KEY]]
+    return config
+
+
+def is_encoded(value: bytes) -> bool:
+    return value[: len(ENVELOPE_MAGIC)] == ENVELOPE_MAGIC
+
+
+def compress(
+    serialized: bytes,
+    dictionary: zstandard.ZstdCompressionDict | None,
+    level: int = COMPRESSION_LEVEL,
+) -> bytes:
+    """
+    Compresses a serialized config or shared section, and prefixes it with the id of the
+    dictionary it was compressed with (0 for none).
+    """
+    if dictionary is None:
+        compressor = zstandard.ZstdCompressor(level=level)
+        dict_id = 0
+    else:
+        compressor = zstandard.ZstdCompressor(level=level, dict_data=dictionary)
+        dict_id = dictionary.dict_id()
+    return _ENVELOPE_HEADER.pack(ENVELOPE_MAGIC, dict_id) + compressor.compress(serialized)
+
+
+def decompress(
+    value: bytes, get_dictionary: Callable[[int], zstandard.ZstdCompressionDict | None]
+) -> bytes | None:
+    """
+    Decompresses a value written by `compress`. Returns `None` if the dictionary it was
+    compressed with is not available anymore.
+    """
+    _, dict_id = _ENVELOPE_HEADER.unpack_from(value)
+    frame = value[_ENVELOPE_HEADER.size :]
+    if not dict_id:
+        return zstandard.ZstdDecompressor().decompress(frame)
+
+    dictionary = get_dictionary(dict_id)
+    if dictionary is None:
+        return None
+    return zstandard.ZstdDecompressor(dict_data=dictionary).decompress(frame)
+
+
+def encode(
+    config: Any, dictionary: zstandard.ZstdCompressionDict | None
+) -> tuple[bytes, dict[str, bytes]]:
+    """
+    Encodes a config. Returns the encoded config and its encoded shared sections by digest.
+    """
+    stripped, shared = extract_shared_sections(config)
+    return (
+        compress(json.dumps(stripped).encode(), dictionary),
+        {digest: compress(section, dictionary) for digest, section in shared.items()},
+    )
+
+
+def decode(
+    value: bytes,
+    get_dictionary: Callable[[int], zstandard.ZstdCompressionDict | None],
+    get_sections: Callable[[Sequence[str]], Mapping[str, bytes | None]],
+) -> Any | None:
+    """
+    Decodes a config written by `encode`, fetching its shared sections with `get_sections`.
+    Returns `None` if a shared section or a dictionary is missing, in which case the config has
+    to be computed again.
+    """
+    serialized = decompress(value, get_dictionary)
+    if serialized is None:
+        return None
+    config = json.loads(serialized)
+
+    digests = find_shared_references(config)
+    if not digests:
+        return config
+
+    sections = {}
+    for digest, encoded in get_sections(digests).items():
+        if encoded is None:
+            return None
+        section = decompress(encoded, get_dictionary)
+        if section is None:
+            return None
+        sections[digest] = json.loads(section)
+    if len(sections) < len(set(digests)):
+        return None
+
+    return restore_shared_sections(config, sections)
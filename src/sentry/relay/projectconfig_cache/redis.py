@@ -1,7 +1,10 @@
 import logging
+import time
 
 import zstandard
 
+from sentry import options
+from sentry.relay.projectconfig_cache import encoding
 from sentry.relay.projectconfig_cache.base import ProjectConfigCache
 from sentry.utils import json, metrics, redis
 from sentry.utils.redis import validate_dynamic_cluster
@@ -9,6 +12,10 @@ from sentry.utils.redis import validate_dynamic_cluster
 REDIS_CACHE_TIMEOUT = 3600  # 1 hr
 COMPRESSION_LEVEL = 3  # 3 is the default level of compression
 
+# How often the id of the current dictionary is read again, in seconds
+DICTIONARY_CHECK_INTERVAL = 60
+CURRENT_DICTIONARY_KEY = "relayconfig-dict:current"
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,6 +27,11 @@ class RedisProjectConfigCache(ProjectConfigCache):
         read_cluster_key = options.get("read_cluster", cluster_key)
         self.cluster_read = redis.redis_clusters.get_binary(read_cluster_key)
 
+        # Dictionaries never change once published, so they're kept for the process lifetime
+        self._dictionaries: dict[int, zstandard.ZstdCompressionDict] = {}
+        self._current_dictionary_id: int | None = None
+        self._current_dictionary_checked = float("-inf")
+
         super().__init__(**options)
 
     def validate(self):
@@ -28,9 +40,66 @@ class RedisProjectConfigCache(ProjectConfigCache):
     def __get_redis_key(self, public_key):
         return f"relayconfig:{public_key}"
 
+    def __get_shared_section_redis_key(self, digest):
+        return f"relayconfig-shared:{digest}"
+
+    def __get_dictionary_redis_key(self, dict_id):
+        return f"relayconfig-dict:{dict_id}"
+
+    def get_dictionary(self, dict_id):
+        dictionary = self._dictionaries.get(dict_id)
+        if dictionary is None:
+            data = self.cluster_read.get(self.__get_dictionary_redis_key(dict_id))
+            if data is None:
+                return None
+            dictionary = self._dictionaries[dict_id] = zstandard.ZstdCompressionDict(data)
+        return dictionary
+
+    def get_current_dictionary(self):
+        now = time.monotonic()
+        if now - self._current_dictionary_checked >= DICTIONARY_CHECK_INTERVAL:
+            self._current_dictionary_checked = now
+            dict_id = self.cluster_read.get(CURRENT_DICTIONARY_KEY)
+            self._current_dictionary_id = int(dict_id) if dict_id is not None else None
+
+        if self._current_dictionary_id is None:
+            return None
+        return self.get_dictionary(self._current_dictionary_id)
+
+    def publish_dictionary(self, dictionary):
+        """
+        Makes `dictionary` the one new configs are compressed with. The previous dictionary is
+        kept until every config compressed with it has expired.
+        """
+        dict_id = dictionary.dict_id()
+        previous = self.cluster.get(CURRENT_DICTIONARY_KEY)
+
+        self.cluster.set(self.__get_dictionary_redis_key(dict_id), dictionary.as_bytes())
+        self.cluster.set(CURRENT_DICTIONARY_KEY, dict_id)
+        if previous is not None and int(previous) != dict_id:
+            # Other processes keep writing with the previous dictionary until they check again
+            self.cluster.expire(
+                self.__get_dictionary_redis_key(int(previous)),
+                REDIS_CACHE_TIMEOUT + DICTIONARY_CHECK_INTERVAL,
+            )
+
+        self._dictionaries[dict_id] = dictionary
+        self._current_dictionary_id = dict_id
+        self._current_dictionary_checked = time.monotonic()
+
+    def _get_shared_sections(self, digests):
+        with self.cluster_read.pipeline() as p:
+            for digest in digests:
+                p.get(self.__get_shared_section_redis_key(digest))
+            return dict(zip(digests, p.execute()))
+
     def set_many(self, configs):
         metrics.incr("relay.projectconfig_cache.write", amount=len(configs), tags={"action": "set"})
 
+        if options.get("relay.projectconfig-cache.dictionary-encoding"):
+            self._set_many_encoded(configs)
+            return
+
         # Note: Those are multiple pipelines, one per cluster node
         p = self.cluster.pipeline()
         for public_key, config in configs.items():
@@ -39,12 +108,46 @@ class RedisProjectConfigCache(ProjectConfigCache):
             metrics.distribution(
                 "relay.projectconfig_cache.uncompressed_size", len(serialized), unit="byte"
             )
-            metrics.distribution("relay.projectconfig_cache.size", len(compressed), unit="byte")
+            metrics.distribution(
+                "relay.projectconfig_cache.size",
+                len(compressed),
+                tags={"encoding": "zstd"},
+                unit="byte",
+            )
 
             p.setex(self.__get_redis_key(public_key), REDIS_CACHE_TIMEOUT, compressed)
 
         p.execute()
 
+    def _set_many_encoded(self, configs):
+        dictionary = self.get_current_dictionary()
+
+        encoded_configs = {}
+        shared_sections = {}
+        for public_key, config in configs.items():
+            encoded_configs[public_key], sections = encoding.encode(config, dictionary)
+            shared_sections.update(sections)
+            metrics.distribution(
+                "relay.projectconfig_cache.size",
+                len(encoded_configs[public_key]),
+                tags={"encoding": "dictionary"},
+                unit="byte",
+            )
+
+        # Note: Those are multiple pipelines, one per cluster node
+        p = self.cluster.pipeline()
+        # Shared sections are written again with every config referencing them, so that they
+        # never expire before the configs do
+        for digest, section in shared_sections.items():
+            metrics.distribution(
+                "relay.projectconfig_cache.shared_section_size", len(section), unit="byte"
+            )
+            p.setex(self.__get_shared_section_redis_key(digest), REDIS_CACHE_TIMEOUT, section)
+        for public_key, encoded in encoded_configs.items():
+            p.setex(self.__get_redis_key(public_key), REDIS_CACHE_TIMEOUT, encoded)
+
+        p.execute()
+
     def delete_many(self, public_keys):
         # Note: Those are multiple pipelines, one per cluster node
         with self.cluster.pipeline() as p:
@@ -59,10 +162,13 @@ class RedisProjectConfigCache(ProjectConfigCache):
     def get(self, public_key):
         rv_b = self.cluster_read.get(self.__get_redis_key(public_key))
         if rv_b is not None:
+            if encoding.is_encoded(rv_b):
+                return encoding.decode(rv_b, self.get_dictionary, self._get_shared_sections)
+
             try:
                 rv = zstandard.decompress(rv_b).decode()
             except (TypeError, zstandard.ZstdError):
                 # assume raw json
-                pass
+                rv = rv_b
             return json.loads(rv)
         return None
@@ -104,3 +104,363 @@ def timeit(filename: str, detector_class: str, n: int) -> None:
 
     result = timeit.timeit(stmt=detect, number=n)
     click.echo(f"Average runtime: {result * 1000 / n} ms")
+
+
+@performance.command("benchmark-save")
+@click.argument("paths", nargs=-1, required=True, type=click.Path(exists=True))
+@click.option("--project", "project_id", type=int, required=True, help="Project to save into.")
+@click.option(
+    "-n", "--iterations", type=int, default=1, help="Number of passes over the event corpus."
+)
+@click.option(
+    "--warmup", type=int, default=1, help="Number of unrecorded passes made before measuring."
+)
+@click.option("-o", "--output", type=click.Path(), help="Write the results as JSON to this file.")
+@configuration
+def benchmark_save(
+    paths: tuple[str, ...], project_id: int, iterations: int, warmup: int, output: str | None
+) -> None:
+    """
+    Benchmarks saving error events. Every event JSON file in PATHS (files or
+    directories) is normalized and saved into the given project, and the
+    throughput and per-stage timings of EventManager.save are reported.
+
+    This writes real events, groups and releases. Use a throwaway project.
+    """
+    from sentry.utils.performance.save_benchmark import load_corpus, run_benchmark
+
+    corpus = load_corpus(paths)
+    if not corpus:
+        raise click.ClickException("No error events found")
+
+    total = len(corpus) * (iterations + warmup)
+    with click.progressbar(length=total, label="Saving events") as bar:
+        result = run_benchmark(
+            project_id, corpus, iterations=iterations, warmup=warmup, on_event=lambda: bar.update(1)
+        )
+
+    click.echo(
+        f"{result['events']} events in {result['duration']:.2f}s "
+        f"({result['events_per_second']:.1f} events/s, {result['errors']} errors)"
+    )
+    click.echo(f"{'stage':<30} {'count':>7} {'mean':>9} {'p50':>9} {'p95':>9} {'max':>9}")
+    for name, stats in result["stages"].items():
+        click.echo(
+            f"{name:<30} {stats['count']:>7} {stats['mean']:>9.2f} {stats['p50']:>9.2f} "
+            f"{stats['p95']:>9.2f} {stats['max']:>9.2f}"
+        )
+
+    if output:
+        with open(output, "w") as f:
+            json.dump(result, f)
+
+
+@performance.command("compare")
+@click.argument("baseline", type=click.Path(exists=True))
+@click.argument("candidate", type=click.Path(exists=True))
+@configuration
+def compare(baseline: str, candidate: str) -> None:
+    """
+    Compares two result files written by `sentry performance benchmark-save`.
+    """
+    from sentry.utils.performance import save_benchmark
+
+    with open(baseline) as f:
+        before = json.load(f)
+    with open(candidate) as f:
+        after = json.load(f)
+
+    click.echo(f"{'stage':<30} {'metric':<11} {'baseline':>10} {'candidate':>10} {'change':>8}")
+    for name, metric, old, new, change in save_benchmark.compare(before, after):
+        change_str = f"{change:+.1%}" if change is not None else "n/a"
+        click.echo(f"{name:<30} {metric:<11} {old:>10.2f} {new:>10.2f} {change_str:>8}")
+
+
+@performance.command("benchmark-parameterization")
+@click.argument("paths", nargs=-1, required=True, type=click.Path(exists=True))
+@click.option(
+    "-n", "--iterations", type=int, default=1, help="Number of passes over the message corpus."
+)
+@configuration
+def benchmark_parameterization(paths: tuple[str, ...], iterations: int) -> None:
+    """
+    Benchmarks the message parameterization used for grouping against a single
+    combined regex, and verifies that both give the same output. PATHS are event
+    JSON files, text files with one message per line, or directories of these.
+    """
+    from sentry.utils.performance.parameterization_benchmark import load_messages, run_benchmark
+
+    messages = load_messages(paths)
+    if not messages:
+        raise click.ClickException("No messages found")
+
+    result = run_benchmark(messages, iterations=iterations)
+
+    click.echo(f"{result['messages']} messages, {iterations} iterations")
+    click.echo(f"{'variant':<12} {'total':>10} {'mean':>9} {'p50':>9} {'p95':>9} {'max':>9}")
+    for name, stats in result["timings"].items():
+        click.echo(
+            f"{name:<12} {stats['total']:>10.2f} {stats['mean']:>9.4f} {stats['p50']:>9.4f} "
+            f"{stats['p95']:>9.4f} {stats['max']:>9.4f}"
+        )
+
+    for mismatch in result["mismatches"]:
+        click.echo(json.dumps(mismatch))
+    if result["mismatch_count"]:
+        raise click.ClickException(f"{result['mismatch_count']} messages differ from the reference")
+
+
+@performance.command("benchmark-grouping")
+@click.argument("paths", nargs=-1, required=True, type=click.Path(exists=True))
+@click.option("--config", "config_id", help="Grouping config to use instead of the default.")
+@click.option("-n", "--iterations", type=int, default=1, help="Number of timed passes.")
+@configuration
+def benchmark_grouping(paths: tuple[str, ...], config_id: str | None, iterations: int) -> None:
+    """
+    Benchmarks building and hashing grouping components. Every event JSON file
+    in PATHS (files or directories) is grouped, and the time taken as well as the
+    number of components and the memory allocated per event are reported.
+    """
+    from sentry.utils.performance.grouping_benchmark import run_benchmark
+    from sentry.utils.performance.save_benchmark import load_corpus
+
+    corpus = load_corpus(paths)
+    if not corpus:
+        raise click.ClickException("No error events found")
+
+    result = run_benchmark(corpus, config_id=config_id, iterations=iterations)
+
+    stats = result["timings"]
+    click.echo(
+        f"{result['config']}: {stats['count']} runs, mean {stats['mean']:.2f}ms, "
+        f"p50 {stats['p50']:.2f}ms, p95 {stats['p95']:.2f}ms, max {stats['max']:.2f}ms"
+    )
+    click.echo(f"{'event':<34} {'components':>10} {'blocks':>9} {'bytes':>11} {'peak':>11}")
+    for event in result["events"]:
+        click.echo(
+            f"{event['event_id'] or '':<34} {event['components']:>10} "
+            f"{event['allocated_blocks']:>9} {event['allocated_bytes']:>11} "
+            f"{event['peak_bytes']:>11}"
+        )
+
+
+@performance.command("benchmark-serializers")
+@click.option("--organization", "organization_slug", required=True, help="Organization slug.")
+@click.option(
+    "--sizes",
+    default="100,1000",
+    show_default=True,
+    help="Comma separated page sizes, pages are filled by repeating the organization's projects.",
+)
+@click.option("-n", "--iterations", type=int, default=5, help="Number of passes per page.")
+@configuration
+def benchmark_serializers(organization_slug: str, sizes: str, iterations: int) -> None:
+    """
+    Benchmarks serializing pages of projects one at a time against serializing
+    them as columns, and verifies that both give the same output.
+    """
+    from django.contrib.auth.models import AnonymousUser
+
+    from sentry.api.serializers.models.project import ProjectSerializer
+    from sentry.models.organization import Organization
+    from sentry.models.project import Project
+    from sentry.utils.performance.serializer_benchmark import run_benchmark
+
+    try:
+        organization = Organization.objects.get(slug=organization_slug)
+    except Organization.DoesNotExist:
+        raise click.ClickException(f"Organization {organization_slug!r} not found")
+    projects = list(Project.objects.filter(organization=organization))
+    if not projects:
+        raise click.ClickException("The organization has no projects")
+
+    result = run_benchmark(
+        ProjectSerializer(),
+        projects,
+        AnonymousUser(),
+        page_sizes=[int(size) for size in sizes.split(",")],
+        iterations=iterations,
+    )
+
+    click.echo(result["serializer"])
+    click.echo(f"{'size':>6} {'variant':<12} {'mean':>9} {'p50':>9} {'p95':>9} {'max':>9}")
+    for page in result["pages"]:
+        for name, stats in page["timings"].items():
+            click.echo(
+                f"{page['size']:>6} {name:<12} {stats['mean']:>9.3f} {stats['p50']:>9.3f} "
+                f"{stats['p95']:>9.3f} {stats['max']:>9.3f}"
+            )
+    mismatched = [str(page["size"]) for page in result["pages"] if not page["matches"]]
+    if mismatched:
+        raise click.ClickException(f"Outputs differ for page sizes {', '.join(mismatched)}")
+
+
+@performance.command("benchmark-pagination")
+@click.option("--organization", "organization_slug", required=True, help="Organization slug.")
+@click.option(
+    "--seed",
+    type=int,
+    default=0,
+    show_default=True,
+    help="Number of audit log entries to create for the organization before benchmarking.",
+)
+@click.option(
+    "--depths",
+    default="1,100,1000,10000",
+    show_default=True,
+    help="Comma separated page numbers to fetch.",
+)
+@click.option("--limit", type=int, default=100, show_default=True, help="Page size.")
+@click.option("-n", "--iterations", type=int, default=5, help="Number of fetches per page.")
+@configuration
+def benchmark_pagination(
+    organization_slug: str, seed: int, depths: str, limit: int, iterations: int
+) -> None:
+    """
+    Benchmarks fetching deep pages of an organization's audit log with the
+    offset paginator against the keyset paginator. Use --seed 1000000 to
+    benchmark over a million rows.
+    """
+    from sentry.models.auditlogentry import AuditLogEntry
+    from sentry.models.organizationmapping import OrganizationMapping
+    from sentry.utils.performance.pagination_benchmark import run_benchmark, seed_audit_log
+
+    try:
+        organization = OrganizationMapping.objects.get(slug=organization_slug)
+    except OrganizationMapping.DoesNotExist:
+        raise click.ClickException(f"Organization {organization_slug!r} not found")
+
+    if seed:
+        created = seed_audit_log(organization.organization_id, seed)
+        click.echo(f"Created {created} audit log entr{pluralize(created, 'y,ies')}")
+
+    result = run_benchmark(
+        AuditLogEntry.objects.filter(organization_id=organization.organization_id),
+        order_by=["-datetime"],
+        limit=limit,
+        depths=[int(depth) for depth in depths.split(",")],
+        iterations=iterations,
+    )
+
+    click.echo(f"{result['rows']} rows, {result['limit']} per page")
+    click.echo(f"{'depth':>6} {'variant':<8} {'mean':>9} {'p50':>9} {'p95':>9} {'max':>9}")
+    for page in result["pages"]:
+        for name, stats in page["timings"].items():
+            click.echo(
+                f"{page['depth']:>6} {name:<8} {stats['mean']:>9.3f} {stats['p50']:>9.3f} "
+                f"{stats['p95']:>9.3f} {stats['max']:>9.3f}"
+            )
+    mismatched = [str(page["depth"]) for page in result["pages"] if not page["matches"]]
+    if mismatched:
+        raise click.ClickException(f"Pages differ at depths {', '.join(mismatched)}")
+
+
+@performance.command("benchmark-projectconfig-cache")
+@click.option(
+    "--limit",
+    type=int,
+    default=1000,
+    show_default=True,
+    help="Number of project keys to compute configs for.",
+)
+@click.option(
+    "--dict-size",
+    type=int,
+    default=112 * 1024,
+    show_default=True,
+    help="Size of the trained dictionary, in bytes.",
+)
+@click.option("-n", "--iterations", type=int, default=5, help="Number of passes per variant.")
+@click.option(
+    "--publish",
+    is_flag=True,
+    help="Train a dictionary on all configs and publish it to the project config cache.",
+)
+@configuration
+def benchmark_projectconfig_cache(
+    limit: int, dict_size: int, iterations: int, publish: bool
+) -> None:
+    """
+    Benchmarks the size of project configs in the project config cache, and
+    the time to encode and decode them, with the plain zstd encoding and the
+    dictionary encoding.
+    """
+    from sentry.models.projectkey import ProjectKey, ProjectKeyStatus
+    from sentry.relay import projectconfig_cache
+    from sentry.relay.projectconfig_cache.encoding import train_dictionary
+    from sentry.tasks.relay import compute_projectkey_config
+    from sentry.utils.performance.projectconfig_cache_benchmark import run_benchmark
+
+    keys = ProjectKey.objects.filter(status=ProjectKeyStatus.ACTIVE).select_related(
+        "project__organization"
+    )[:limit]
+    configs = [compute_projectkey_config(key) for key in keys]
+    if len(configs) < 10:
+        raise click.ClickException("At least 10 active project keys are needed")
+
+    result = run_benchmark(configs, dict_size=dict_size, iterations=iterations)
+
+    click.echo(
+        f"{result['configs']} configs, {result['uncompressed_bytes']} bytes uncompressed, "
+        f"{result['dictionary_bytes']} bytes of dictionary"
+    )
+    click.echo(
+        f"{'variant':<11} {'bytes':>10} {'shared':>10} {'encode p50':>11} {'decode p50':>11} "
+        f"{'decode p95':>11}"
+    )
+    for name, variant in result["variants"].items():
+        click.echo(
+            f"{name:<11} {variant['config_bytes']:>10} {variant['shared_bytes']:>10} "
+            f"{variant['encode']['p50']:>11.3f} {variant['decode']['p50']:>11.3f} "
+            f"{variant['decode']['p95']:>11.3f}"
+        )
+    mismatched = [name for name, variant in result["variants"].items() if not variant["matches"]]
+    if mismatched:
+        raise click.ClickException(f"Configs differ after decoding with {', '.join(mismatched)}")
+
+    if publish:
+        dictionary = train_dictionary(configs, dict_size)
+        projectconfig_cache.backend.publish_dictionary(dictionary)
+        click.echo(f"Published dictionary {dictionary.dict_id()}")
+
+
+@performance.command("benchmark-nodestore-dedup")
+@click.argument("paths", nargs=-1, required=True, type=click.Path(exists=True))
+@click.option("-n", "--iterations", type=int, default=5, help="Number of read passes per variant.")
+@configuration
+def benchmark_nodestore_dedup(paths: tuple[str, ...], iterations: int) -> None:
+    """
+    Benchmarks deduplicating events in nodestore. Every event JSON file in
+    PATHS (files or directories) is written to the configured nodestore with
+    and without deduplication, and the bytes written and the time to read the
+    events back are reported.
+
+    The events are deleted again afterwards, shared nodes are left to expire.
+    """
+    from sentry import nodestore
+    from sentry.utils.performance.nodestore_dedup_benchmark import run_benchmark
+    from sentry.utils.performance.save_benchmark import load_corpus
+
+    events = load_corpus(paths)
+    if not events:
+        raise click.ClickException("No error events found")
+
+    result = run_benchmark(nodestore.backend, events, iterations=iterations)
+
+    click.echo(
+        f"{result['events']} events, {result['bytes_saved']} bytes saved "
+        f"({result['compressed_bytes_saved']} compressed)"
+    )
+    click.echo(
+        f"{'variant':<13} {'bytes':>10} {'compressed':>10} {'shared':>10} {'shared nodes':>12} "
+        f"{'get p50':>9} {'get p95':>9}"
+    )
+    for name, variant in result["variants"].items():
+        click.echo(
+            f"{name:<13} {variant['node_bytes']:>10} {variant['node_compressed_bytes']:>10} "
+            f"{variant['shared_bytes']:>10} {variant['shared_nodes']:>12} "
+            f"{variant['get']['p50']:>9.3f} {variant['get']['p95']:>9.3f}"
+        )
+    mismatched = [name for name, variant in result["variants"].items() if not variant["matches"]]
+    if mismatched:
+        raise click.ClickException(f"Events differ after reading with {', '.join(mismatched)}")
@@ -520,11 +520,13 @@ def bind_cache_to_option_store() -> None:
     # settings and/or configuration values. Those options should have been
     # loaded at this point, so we can plug in the cache backend before
     # continuing to initialize the remainder of the application.
+    from django.conf import settings
     from django.core.cache import cache as default_cache
 
     from sentry.options import default_store
 
     default_store.set_cache_impl(default_cache)
+    default_store.set_snapshot_mode(getattr(settings, "SENTRY_OPTIONS_SNAPSHOT", False))
 
 
 def apply_legacy_settings(settings: Any) -> None:
@@ -0,0 +1,15 @@
+-- Pop all segments that are ready to be processed from a bucket of unprocessed
+-- segments. The bucket is a sorted set of segment keys scored by the timestamp
+-- the segment was first seen at.
+assert(#KEYS == 1, "provide exactly one bucket key")
+assert(#ARGV == 1, "provide the maximum first-seen timestamp of a ready segment")
+
+local bucket = KEYS[1]
+local max_timestamp = ARGV[1]
+
+local ready = redis.call("ZRANGEBYSCORE", bucket, "-inf", max_timestamp, "WITHSCORES")
+if #ready > 0 then
+    redis.call("ZREMRANGEBYSCORE", bucket, "-inf", max_timestamp)
+end
+
+return ready
@@ -9,10 +9,12 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum, auto
 from hashlib import md5
-from math import floor
+from math import ceil, floor
 from typing import Any, TypedDict, cast
 
 import sentry_sdk
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
 from django.db.models import Q
 from django.utils import timezone
 from snuba_sdk import (
@@ -106,6 +108,10 @@ POSTGRES_ONLY_SEARCH_FIELDS = [
     "for_review",
 ]
 
+# Lower bound on the estimated share of Snuba results passing the Postgres post-filter, which
+# bounds how many rows adaptive chunking asks for at once
+MIN_SEARCH_SELECTIVITY = 0.01
+
 
 ENTITY_EVENTS = "events"
 ENTITY_GROUP_ATTRIBUTES = "group_attributes"
@@ -438,6 +444,46 @@ class AbstractQueryExecutor(metaclass=ABCMeta):
             * a sorted list of (group_id, group_score) tuples sorted descending by score,
             * the count of total results (rows) available for this query.
         """
+        (result,) = self.snuba_search_chunks(
+            chunks=[(limit, offset)],
+            start=start,
+            end=end,
+            project_ids=project_ids,
+            environment_ids=environment_ids,
+            sort_field=sort_field,
+            organization=organization,
+            cursor=cursor,
+            group_ids=group_ids,
+            get_sample=get_sample,
+            search_filters=search_filters,
+            referrer=referrer,
+            actor=actor,
+            aggregate_kwargs=aggregate_kwargs,
+        )
+        return result
+
+    def snuba_search_chunks(
+        self,
+        chunks: Sequence[tuple[int | None, int]],
+        start: datetime,
+        end: datetime,
+        project_ids: Sequence[int],
+        environment_ids: Sequence[int] | None,
+        sort_field: str,
+        organization: Organization,
+        cursor: Cursor | None = None,
+        group_ids: Sequence[int] | None = None,
+        get_sample: bool = False,
+        search_filters: Sequence[SearchFilter] | None = None,
+        referrer: str | None = None,
+        actor: Any | None = None,
+        aggregate_kwargs: TrendsSortWeights | None = None,
+    ) -> list[tuple[list[tuple[int, Any]], int]]:
+        """Like `snuba_search`, but for several (limit, offset) windows of the same query. The
+        queries of every window are sent in a single bulk request, so that they run concurrently.
+
+        Returns the results of `snuba_search` for every window, in order.
+        """
         filters = {"project_id": project_ids}
 
         environments = None
@@ -459,94 +505,97 @@ class AbstractQueryExecutor(metaclass=ABCMeta):
             if not (sf.key.name in self.postgres_only_fields.union(["date", "timestamp"]))
         ]
 
-        # common pinned parameters that won't change based off datasource
-        query_partial: IntermediateSearchQueryPartial = cast(
-            IntermediateSearchQueryPartial,
-            functools.partial(
-                aliased_query_params,
-                start=start,
-                end=end,
-                limit=limit,
-                offset=offset,
-                referrer=referrer,
-                totals=True,  # Needs to have totals_mode=after_having_exclusive so we get groups matching HAVING only
-                turbo=get_sample,  # Turn off FINAL when in sampling mode
-                sample=1,  # Don't use clickhouse sampling, even when in turbo mode.
-            ),
-        )
-
         group_categories = group_categories_from_search_filters(search_filters, organization, actor)
 
-        query_params_for_categories = {}
-
-        for gc in group_categories:
-            try:
-                query_params_for_categories[gc] = self._prepare_params_for_category(
-                    gc,
-                    query_partial,
-                    organization,
-                    project_ids,
-                    environments,
-                    group_ids,
-                    filters,
-                    snuba_search_filters,
-                    sort_field,
-                    start,
-                    end,
-                    cursor,
-                    get_sample,
-                    actor,
-                    aggregate_kwargs,
-                )
-            except UnsupportedSearchQuery:
-                pass
-        query_params_for_categories = {
-            gc: query_params
-            for gc, query_params in query_params_for_categories.items()
-            if query_params is not None
-        }
+        # [(chunk index, group category, query params), ...]
+        chunk_query_params: list[tuple[int, int, SnubaQueryParams]] = []
+        for chunk_index, (limit, offset) in enumerate(chunks):
+            # common pinned parameters that won't change based off datasource
+            query_partial: IntermediateSearchQueryPartial = cast(
+                IntermediateSearchQueryPartial,
+                functools.partial(
+                    aliased_query_params,
+                    start=start,
+                    end=end,
+                    limit=limit,
+                    offset=offset,
+                    referrer=referrer,
+                    totals=True,  # Needs to have totals_mode=after_having_exclusive so we get groups matching HAVING only
+                    turbo=get_sample,  # Turn off FINAL when in sampling mode
+                    sample=1,  # Don't use clickhouse sampling, even when in turbo mode.
+                ),
+            )
+
+            for gc in group_categories:
+                try:
+                    query_params = self._prepare_params_for_category(
+                        gc,
+                        query_partial,
+                        organization,
+                        project_ids,
+                        environments,
+                        group_ids,
+                        filters,
+                        snuba_search_filters,
+                        sort_field,
+                        start,
+                        end,
+                        cursor,
+                        get_sample,
+                        actor,
+                        aggregate_kwargs,
+                    )
+                except UnsupportedSearchQuery:
+                    continue
+                if query_params is not None:
+                    chunk_query_params.append((chunk_index, gc, query_params))
 
         try:
             bulk_query_results = bulk_raw_query(
-                list(query_params_for_categories.values()), referrer=referrer
+                [query_params for _, _, query_params in chunk_query_params], referrer=referrer
             )
         except Exception:
             metrics.incr(
                 "snuba.search.group_category_bulk",
                 tags={
-                    GroupCategory(gc_val).name.lower(): True
-                    for gc_val, _ in query_params_for_categories.items()
+                    GroupCategory(gc_val).name.lower(): True for _, gc_val, _ in chunk_query_params
                 },
             )
             # one of the parallel bulk raw queries failed (maybe the issue platform dataset),
             # we'll fallback to querying for errors only
-            if GroupCategory.ERROR.value in query_params_for_categories.keys():
+            chunk_query_params = [
+                item for item in chunk_query_params if item[1] == GroupCategory.ERROR.value
+            ]
+            if chunk_query_params:
                 bulk_query_results = bulk_raw_query(
-                    [query_params_for_categories[GroupCategory.ERROR.value]], referrer=referrer
+                    [query_params for _, _, query_params in chunk_query_params], referrer=referrer
                 )
             else:
                 raise
 
-        rows: list[MergeableRow] = []
-        total = 0
-        row_length = 0
-        for bulk_result in bulk_query_results:
+        chunk_rows: list[list[MergeableRow]] = [[] for _ in chunks]
+        chunk_totals = [0 for _ in chunks]
+        chunk_row_lengths = [0 for _ in chunks]
+        for (chunk_index, _, _), bulk_result in zip(chunk_query_params, bulk_query_results):
             if bulk_result:
                 if bulk_result["data"]:
-                    rows.extend(bulk_result["data"])
+                    chunk_rows[chunk_index].extend(bulk_result["data"])
                 if bulk_result["totals"]["total"]:
-                    total += bulk_result["totals"]["total"]
-                row_length += len(bulk_result)
-
-        rows.sort(key=lambda row: row["group_id"])
-
-        if not get_sample:
-            metrics.distribution("snuba.search.num_result_groups", row_length)
+                    chunk_totals[chunk_index] += bulk_result["totals"]["total"]
+                chunk_row_lengths[chunk_index] += len(bulk_result)
 
         if get_sample:
             sort_field = "sample"
 
-        return [(row["group_id"], row[sort_field]) for row in rows], total  # type: ignore[literal-required]
+        results = []
+        for rows, total, row_length in zip(chunk_rows, chunk_totals, chunk_row_lengths):
+            rows.sort(key=lambda row: row["group_id"])
+
+            if not get_sample:
+                metrics.distribution("snuba.search.num_result_groups", row_length)
+
+            results.append(([(row["group_id"], row[sort_field]) for row in rows], total))  # type: ignore[literal-required]
+        return results
 
     def has_sort_strategy(self, sort_by: str) -> bool:
         return sort_by in self.sort_strategies.keys()
@@ -888,13 +937,44 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
         # to something that we can send down to Snuba in a `group_id IN (...)`
         # clause.
         max_candidates = options.get("snuba.search.max-pre-snuba-candidates")
+        sort_field = self.sort_strategies[sort_by]
 
-        with sentry_sdk.start_span(op="snuba_group_query") as span:
-            group_ids = list(
-                group_queryset.using_replica().values_list("id", flat=True)[: max_candidates + 1]
+        # In adaptive chunking mode, the candidates and the selectivity of the post-filter are
+        # cached for the pages of the same search. The first page always fetches fresh
+        # candidates, so that a reload reflects groups that were just resolved or assigned.
+        adaptive_chunking = options.get("snuba.search.adaptive-chunking.enabled")
+        search_session_key = (
+            self._get_search_session_key(
+                projects, environments, group_queryset, sort_field, search_filters, max_candidates
             )
-            span.set_data("Max Candidates", max_candidates)
-            span.set_data("Result Size", len(group_ids))
+            if adaptive_chunking
+            else None
+        )
+        search_session = cache.get(search_session_key) if search_session_key else None
+        if search_session is not None and cursor is not None:
+            metrics.incr("snuba.search.candidate_cache", tags={"result": "hit"})
+            group_ids = search_session["group_ids"]
+        else:
+            if search_session_key and cursor is not None:
+                metrics.incr("snuba.search.candidate_cache", tags={"result": "miss"})
+            with sentry_sdk.start_span(op="snuba_group_query") as span:
+                group_ids = list(
+                    group_queryset.using_replica().values_list("id", flat=True)[
+                        : max_candidates + 1
+                    ]
+                )
+                span.set_data("Max Candidates", max_candidates)
+                span.set_data("Result Size", len(group_ids))
+            search_session = {
+                "group_ids": group_ids,
+                "selectivity": search_session["selectivity"] if search_session else None,
+            }
+            if search_session_key:
+                cache.set(
+                    search_session_key,
+                    search_session,
+                    options.get("snuba.search.candidate-cache-ttl"),
+                )
         metrics.distribution("snuba.search.num_candidates", len(group_ids))
         too_many_candidates = False
         if not group_ids:
@@ -914,7 +994,6 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
             too_many_candidates = True
             group_ids = []
 
-        sort_field = self.sort_strategies[sort_by]
         chunk_growth = options.get("snuba.search.chunk-growth-rate")
         max_chunk_size = options.get("snuba.search.max-chunk-size")
         chunk_limit = limit
@@ -955,17 +1034,34 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
         # sorted by `last_seen`, and we want to avoid returning all of
         # a project's groups and then post-sorting them all in Postgres
         # when typically the first N results will do.
-        while (time.time() - time_start) < max_time:
-            num_chunks += 1
-
-            # grow the chunk size on each iteration to account for huge projects
-            # and weird queries, up to a max size
-            chunk_limit = min(int(chunk_limit * chunk_growth), max_chunk_size)
-            # but if we have group_ids always query for at least that many items
-            chunk_limit = max(chunk_limit, len(group_ids))
+        # Observed share of the Snuba results which pass the post-filter, only tracked in adaptive
+        # chunking mode
+        selectivity = search_session["selectivity"] or 1.0
+        scanned_count = 0
+        passed_count = 0
 
-            # {group_id: group_score, ...}
-            snuba_groups, total = self.snuba_search(
+        while (time.time() - time_start) < max_time:
+            if adaptive_chunking and not group_ids:
+                # Concurrently query as many rows as the post-filter is expected to need
+                chunks = self._plan_chunks(
+                    offset=offset,
+                    needed=limit - len(result_groups),
+                    limit=limit,
+                    selectivity=selectivity,
+                    chunk_growth=chunk_growth,
+                    max_chunk_size=max_chunk_size,
+                )
+            else:
+                # grow the chunk size on each iteration to account for huge projects
+                # and weird queries, up to a max size
+                chunk_limit = min(int(chunk_limit * chunk_growth), max_chunk_size)
+                # but if we have group_ids always query for at least that many items
+                chunk_limit = max(chunk_limit, len(group_ids))
+                chunks = [(chunk_limit, offset)]
+
+            # [({group_id: group_score, ...}, total), ...]
+            chunk_results = self.snuba_search_chunks(
+                chunks=chunks,
                 start=start,
                 end=end,
                 project_ids=[p.id for p in projects],
@@ -974,62 +1070,86 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
                 sort_field=sort_field,
                 cursor=cursor,
                 group_ids=group_ids,
-                limit=chunk_limit,
-                offset=offset,
                 search_filters=search_filters,
                 referrer=referrer,
                 actor=actor,
                 aggregate_kwargs=aggregate_kwargs,
             )
-            metrics.distribution("snuba.search.num_snuba_results", len(snuba_groups))
-            count = len(snuba_groups)
-            more_results = count >= limit and (offset + limit) < total
-            offset += len(snuba_groups)
 
-            if not snuba_groups:
+            done = False
+            for (window_limit, window_offset), (snuba_groups, total) in zip(chunks, chunk_results):
+                num_chunks += 1
+                metrics.distribution("snuba.search.num_snuba_results", len(snuba_groups))
+                count = len(snuba_groups)
+                more_results = count >= limit and (window_offset + limit) < total
+                if adaptive_chunking and not group_ids:
+                    # the windows of a round are contiguous
+                    offset = window_offset + window_limit
+                else:
+                    offset += len(snuba_groups)
+
+                if not snuba_groups:
+                    done = True
+                    break
+
+                if group_ids:
+                    # pre-filtered candidates were passed down to Snuba, so we're
+                    # finished with filtering and these are the only results. Note
+                    # that because we set the chunk size to at least the size of
+                    # the group_ids, we know we got all of them (ie there are
+                    # no more chunks after the first)
+                    result_groups = snuba_groups
+                    if count_hits and hits is None:
+                        hits = len(snuba_groups)
+                else:
+                    # pre-filtered candidates were *not* passed down to Snuba,
+                    # so we need to do post-filtering to verify Sentry DB predicates
+                    filtered_group_ids = group_queryset.filter(
+                        id__in=[gid for gid, _ in snuba_groups]
+                    ).values_list("id", flat=True)
+
+                    group_to_score = dict(snuba_groups)
+                    scanned_count += len(snuba_groups)
+                    for group_id in filtered_group_ids:
+                        passed_count += 1
+                        if group_id in result_group_ids:
+                            # because we're doing multiple Snuba queries, which
+                            # happen outside of a transaction, there is a small possibility
+                            # of groups moving around in the sort scoring underneath us,
+                            # so we at least want to protect against duplicates
+                            continue
+
+                        group_score = group_to_score[group_id]
+                        result_group_ids.add(group_id)
+                        result_groups.append((group_id, group_score))
+
+                # break the query loop for one of three reasons:
+                # * we started with Postgres candidates and so only do one Snuba query max
+                # * the paginator is returning enough results to satisfy the query (>= the limit)
+                # * there are no more groups in Snuba to post-filter
+                # TODO do we actually have to rebuild this SequencePaginator every time
+                # or can we just make it after we've broken out of the loop?
+                paginator_results = SequencePaginator(
+                    [(score, id) for (id, score) in result_groups],
+                    reverse=True,
+                    **paginator_options,
+                ).get_result(limit, cursor, known_hits=hits, max_hits=max_hits)
+
+                if group_ids or len(paginator_results.results) >= limit or not more_results:
+                    # Results of the remaining chunks of this round aren't needed
+                    done = True
+                    break
+
+            if scanned_count:
+                selectivity = max(passed_count / scanned_count, MIN_SEARCH_SELECTIVITY)
+            if done:
                 break
 
-            if group_ids:
-                # pre-filtered candidates were passed down to Snuba, so we're
-                # finished with filtering and these are the only results. Note
-                # that because we set the chunk size to at least the size of
-                # the group_ids, we know we got all of them (ie there are
-                # no more chunks after the first)
-                result_groups = snuba_groups
-                if count_hits and hits is None:
-                    hits = len(snuba_groups)
-            else:
-                # pre-filtered candidates were *not* passed down to Snuba,
-                # so we need to do post-filtering to verify Sentry DB predicates
-                filtered_group_ids = group_queryset.filter(
-                    id__in=[gid for gid, _ in snuba_groups]
-                ).values_list("id", flat=True)
-
-                group_to_score = dict(snuba_groups)
-                for group_id in filtered_group_ids:
-                    if group_id in result_group_ids:
-                        # because we're doing multiple Snuba queries, which
-                        # happen outside of a transaction, there is a small possibility
-                        # of groups moving around in the sort scoring underneath us,
-                        # so we at least want to protect against duplicates
-                        continue
-
-                    group_score = group_to_score[group_id]
-                    result_group_ids.add(group_id)
-                    result_groups.append((group_id, group_score))
-
-            # break the query loop for one of three reasons:
-            # * we started with Postgres candidates and so only do one Snuba query max
-            # * the paginator is returning enough results to satisfy the query (>= the limit)
-            # * there are no more groups in Snuba to post-filter
-            # TODO do we actually have to rebuild this SequencePaginator every time
-            # or can we just make it after we've broken out of the loop?
-            paginator_results = SequencePaginator(
-                [(score, id) for (id, score) in result_groups], reverse=True, **paginator_options
-            ).get_result(limit, cursor, known_hits=hits, max_hits=max_hits)
-
-            if group_ids or len(paginator_results.results) >= limit or not more_results:
-                break
+        if search_session_key and scanned_count:
+            search_session["selectivity"] = selectivity
+            cache.set(
+                search_session_key, search_session, options.get("snuba.search.candidate-cache-ttl")
+            )
 
         # HACK: We're using the SequencePaginator to mask the complexities of going
         # back and forth between two databases. This causes a problem with pagination
@@ -1062,6 +1182,51 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
         )
         return paginator_results
 
+    def _get_search_session_key(
+        self,
+        projects: Sequence[Project],
+        environments: Sequence[Environment] | None,
+        group_queryset: BaseQuerySet,
+        sort_field: str,
+        search_filters: Sequence[SearchFilter] | None,
+        max_candidates: int,
+    ) -> str | None:
+        try:
+            sql = str(group_queryset.query)
+        except EmptyResultSet:
+            return None
+
+        hashable = json.dumps(
+            [
+                sorted(project.id for project in projects),
+                sorted(environment.id for environment in environments or ()),
+                sql,
+                sort_field,
+                [str(search_filter) for search_filter in search_filters or ()],
+                max_candidates,
+            ]
+        )
+        return f"search:session:{md5(hashable.encode('utf-8')).hexdigest()}"
+
+    def _plan_chunks(
+        self,
+        offset: int,
+        needed: int,
+        limit: int,
+        selectivity: float,
+        chunk_growth: float,
+        max_chunk_size: int,
+    ) -> list[tuple[int, int]]:
+        """
+        Returns the (limit, offset) windows to query next, so that they cover enough Snuba results
+        for `needed` of them to pass the post-filter at the given selectivity.
+        """
+        max_chunks = options.get("snuba.search.adaptive-chunking.max-parallel-chunks")
+        rows = ceil(max(needed, 1) * chunk_growth / selectivity)
+        chunk_size = min(max(ceil(rows / max_chunks), limit), max_chunk_size)
+        num_chunks = max(min(ceil(rows / chunk_size), max_chunks), 1)
+        return [(chunk_size, offset + i * chunk_size) for i in range(num_chunks)]
+
     def calculate_hits(
         self,
         group_ids: Sequence[int],
@@ -28,6 +28,7 @@ from sentry.search.events.fields import (
 )
 from sentry.search.events.types import HistogramParams, ParamsType, QueryBuilderConfig
 from sentry.snuba.dataset import Dataset
+from sentry.snuba.timeseries_cache import bulk_timeseries_queries
 from sentry.tagstore.base import TOP_VALUES_DEFAULT_LIMIT
 from sentry.utils.math import nice_int
 from sentry.utils.snuba import (
@@ -286,7 +287,7 @@ def _timeseries_query(
             )
             query_list.append(comparison_builder)
 
-        query_results = bulk_snuba_queries(
+        query_results = bulk_timeseries_queries(
             [query.get_snql_query() for query in query_list], referrer
         )
 
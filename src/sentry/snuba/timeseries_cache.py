@@ -0,0 +1,243 @@
+"""
+Partial result caching for time-series queries.
+
+A rolled-up time-series query is split at fixed, rollup aligned chunk boundaries. Chunks which
+ended more than `snuba.timeseries-cache.settle-seconds` ago are not expected to change anymore,
+and are cached for `snuba.timeseries-cache.ttl` seconds. Only the uncached chunks, the partial
+chunk at the start of the range and the live tail at its end are queried from Snuba, and the rows
+of every slice are concatenated back together in time order.
+
+Only queries grouped by time alone are split: every row then belongs to exactly one time bucket,
+and a bucket never spans two slices since chunk boundaries are multiples of the rollup. Anything
+else is passed through to `bulk_snuba_queries` unchanged.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from collections.abc import Sequence
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta, timezone
+from hashlib import sha1
+from typing import Any
+
+from django.core.cache import cache
+from snuba_sdk import Column, Condition, Op, Query, Request
+
+from sentry import options
+from sentry.snuba.query_sources import QuerySource
+from sentry.utils import metrics
+from sentry.utils.snuba import (
+    ResultSet,
+    _decode_cached_result,
+    _set_cached_result,
+    bulk_snuba_queries,
+)
+
+logger = logging.getLogger(__name__)
+
+TIME_COLUMN = Column("time")
+
+
+@dataclass(frozen=True)
+class TimeseriesSlice:
+    request: Request
+    # Only set for slices which are settled, and can be cached
+    cache_key: str | None
+
+
+def _find_time_range(query: Query) -> tuple[int, int] | None:
+    """
+    Returns the position of the start and end conditions of the query, if it has exactly one of
+    each on the same column.
+    """
+    starts, ends = [], []
+    for index, condition in enumerate(query.where or ()):
+        if not isinstance(condition, Condition) or not isinstance(condition.rhs, datetime):
+            continue
+        if condition.op == Op.GTE:
+            starts.append(index)
+        elif condition.op == Op.LT:
+            ends.append(index)
+
+    if len(starts) != 1 or len(ends) != 1:
+        return None
+    if query.where[starts[0]].lhs != query.where[ends[0]].lhs:
+        return None
+    return starts[0], ends[0]
+
+
+def _to_datetime(timestamp: float, like: datetime) -> datetime:
+    value = datetime.fromtimestamp(timestamp, timezone.utc)
+    return value if like.tzinfo is not None else value.replace(tzinfo=None)
+
+
+def _with_time_range(
+    request: Request, time_range: tuple[int, int], start: datetime, end: datetime
+) -> Request:
+    where = list(request.query.where)
+    start_index, end_index = time_range
+    where[start_index] = Condition(where[start_index].lhs, Op.GTE, start)
+    where[end_index] = Condition(where[end_index].lhs, Op.LT, end)
+    return replace(request, query=request.query.set_where(where))
+
+
+def get_chunk_cache_key(request: Request) -> str:
+    # Tenant ids and the referrer don't change the result, so chunks are shared between them
+    hashable = f"{request.dataset}:{request.query}"
+    # sqtc - Snuba Query Timeseries Cache
+    return f"sqtc:{sha1(hashable.encode('utf-8')).hexdigest()}"
+
+
+def split_request(request: Request, now: datetime) -> list[TimeseriesSlice] | None:
+    """
+    Splits a time-series request into slices, in time order. Returns `None` for requests which
+    can't be split, or don't cover any settled chunk.
+    """
+    query = request.query
+    if not isinstance(query, Query) or query.granularity is None:
+        return None
+    if list(query.groupby or ()) != [TIME_COLUMN] or query.limitby is not None:
+        return None
+    if query.offset is not None and query.offset.offset:
+        return None
+    if query.totals is not None and query.totals.totals:
+        return None
+
+    time_range = _find_time_range(query)
+    if time_range is None:
+        return None
+    start: datetime = query.where[time_range[0]].rhs
+    end: datetime = query.where[time_range[1]].rhs
+
+    rollup = query.granularity.granularity
+    if rollup <= 0:
+        return None
+    # Slicing must not let the limit cut off buckets the original query would have returned
+    if query.limit is not None and query.limit.limit <= (end - start).total_seconds() // rollup:
+        return None
+
+    chunk_size = math.ceil(options.get("snuba.timeseries-cache.chunk-seconds") / rollup) * rollup
+    settled = min(
+        end, now - timedelta(seconds=options.get("snuba.timeseries-cache.settle-seconds"))
+    )
+    first_chunk = math.ceil(start.timestamp() / chunk_size) * chunk_size
+    last_chunk = math.floor(settled.timestamp() / chunk_size) * chunk_size
+    if last_chunk <= first_chunk:
+        return None
+
+    slices = []
+    if start.timestamp() < first_chunk:
+        head = _with_time_range(request, time_range, start, _to_datetime(first_chunk, start))
+        slices.append(TimeseriesSlice(head, None))
+    for chunk_start in range(first_chunk, last_chunk, chunk_size):
+        chunk = _with_time_range(
+            request,
+            time_range,
+            _to_datetime(chunk_start, start),
+            _to_datetime(chunk_start + chunk_size, start),
+        )
+        slices.append(TimeseriesSlice(chunk, get_chunk_cache_key(chunk)))
+    if last_chunk < end.timestamp():
+        tail = _with_time_range(request, time_range, _to_datetime(last_chunk, start), end)
+        slices.append(TimeseriesSlice(tail, None))
+    return slices
+
+
+def _get_cached_chunks(cache_keys: list[str]) -> dict[str, Any]:
+    if not cache_keys:
+        return {}
+
+    found = {}
+    for cache_key, value in cache.get_many(cache_keys).items():
+        if value is None:
+            continue
+        try:
+            found[cache_key] = _decode_cached_result(value)[0]
+        except Exception:
+            logger.warning("snuba.timeseries_cache.decode_failed", exc_info=True)
+    return found
+
+
+def bulk_timeseries_queries(
+    requests: Sequence[Request],
+    referrer: str | None = None,
+    query_source: QuerySource | None = None,
+) -> ResultSet:
+    """
+    Runs time-series requests like `bulk_snuba_queries`, serving their settled chunks from the
+    cache. Every slice that has to be queried is sent in a single bulk request.
+    """
+    if not options.get("snuba.timeseries-cache.enabled"):
+        return bulk_snuba_queries(list(requests), referrer, query_source=query_source)
+
+    now = datetime.now(timezone.utc)
+    plans = [split_request(request, now) for request in requests]
+    cached = _get_cached_chunks(
+        [
+            timeseries_slice.cache_key
+            for plan in plans
+            if plan is not None
+            for timeseries_slice in plan
+            if timeseries_slice.cache_key is not None
+        ]
+    )
+
+    to_query = []
+    for request, plan in zip(requests, plans):
+        if plan is None:
+            to_query.append(request)
+            continue
+        to_query.extend(
+            timeseries_slice.request
+            for timeseries_slice in plan
+            if timeseries_slice.cache_key not in cached
+        )
+    query_results = iter(
+        bulk_snuba_queries(to_query, referrer, query_source=query_source) if to_query else ()
+    )
+
+    ttl = options.get("snuba.timeseries-cache.ttl")
+    metric_tags = {"referrer": referrer or "unknown"}
+    results = []
+    for plan in plans:
+        if plan is None:
+            metrics.incr("snuba.timeseries_cache.skipped", tags=metric_tags)
+            results.append(next(query_results))
+            continue
+
+        slice_results = []
+        hits = misses = 0
+        for timeseries_slice in plan:
+            if timeseries_slice.cache_key in cached:
+                slice_results.append(cached[timeseries_slice.cache_key])
+                hits += 1
+                continue
+
+            result = next(query_results)
+            if timeseries_slice.cache_key is not None:
+                _set_cached_result(
+                    timeseries_slice.cache_key,
+                    {"data": result["data"], "meta": result["meta"]},
+                    0.0,
+                    ttl,
+                )
+                misses += 1
+            slice_results.append(result)
+
+        metrics.incr("snuba.timeseries_cache.chunks", hits, tags={**metric_tags, "result": "hit"})
+        metrics.incr(
+            "snuba.timeseries_cache.chunks", misses, tags={**metric_tags, "result": "miss"}
+        )
+        metrics.distribution(
+            "snuba.timeseries_cache.hit_ratio", hits / (hits + misses), tags=metric_tags
+        )
+        results.append(
+            {
+                **slice_results[-1],
+                "data": [row for result in slice_results for row in result["data"]],
+            }
+        )
+
+    return results
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import dataclasses
+import zlib
 from collections.abc import Mapping
 from typing import NamedTuple
 
@@ -12,6 +13,16 @@ from sentry import options
 from sentry.utils import redis
 from sentry.utils.iterators import chunked
 
+pop_ready_segments = redis.load_redis_script("spans/pop_ready_segments.lua")
+
+# Upper bound of `standalone-spans.buffer-shards`. Shards above the configured number are still
+# drained up to this bound, so that lowering the option doesn't strand segments.
+MAX_SHARDS = 32
+
+# Buckets which aren't written to anymore are checked at most once per interval, in seconds,
+# unless they still held segments at the last check.
+INACTIVE_BUCKETS_CHECK_INTERVAL = 60
+
 
 @dataclasses.dataclass
 class ProcessSegmentsContext:
@@ -38,10 +49,34 @@ def get_last_processed_timestamp_key(partition_index: int) -> str:
     return f"performance-issues:last-processed-timestamp:partition:{partition_index}"
 
 
-def get_unprocessed_segments_key(partition_index: int) -> str:
+def get_unprocessed_segments_key(partition_index: int, shard: int = 0) -> str:
+    return f"performance-issues:unprocessed-segments:partition-3:{partition_index}:{shard}"
+
+
+def get_legacy_unprocessed_segments_key(partition_index: int) -> str:
+    """
+    Buckets used to be lists of alternating timestamps and segment keys. They're drained until
+    they're empty, but nothing is added to them anymore.
+    """
     return f"performance-issues:unprocessed-segments:partition-2:{partition_index}"
 
 
+def get_inactive_buckets_check_key(partition_index: int) -> str:
+    return f"performance-issues:unprocessed-segments:inactive-check:{partition_index}"
+
+
+def get_num_shards() -> int:
+    return max(1, min(options.get("standalone-spans.buffer-shards"), MAX_SHARDS))
+
+
+def get_segment_shard(segment_id: str, num_shards: int) -> int:
+    """
+    Segments of a partition are spread over ``num_shards`` buckets so that a
+    single hot partition is not served by a single Redis key.
+    """
+    return zlib.crc32(segment_id.encode("utf-8")) % num_shards
+
+
 class RedisSpansBuffer:
     def __init__(self):
         self.client: RedisCluster | StrictRedis = get_redis_client()
@@ -53,31 +88,18 @@ class RedisSpansBuffer:
         latest_ts_by_partition: Mapping[int, int],
     ) -> list[ProcessSegmentsContext]:
         """
-        1. Pushes batches of spans to redis
-        2. Check if number of spans pushed == to the number of elements that exist on the key. This
-            tells us if it was the first time we see the key. This works fine because RPUSH is atomic.
-        3. If it is the first time we see a particular segment, push the segment id and first seen
-            timestamp to a bucket so we know when it is ready to be processed.
+        In a single pipeline:
+        1. Pushes batches of spans to redis.
+        2. Adds every segment to its partition's bucket of unprocessed segments, scored by its
+            first seen timestamp. ZADD NX keeps the first timestamp if the segment is already
+            waiting to be processed, and re-adds it if it was processed already.
         3. Checks if 1 second has passed since the last time segments were processed for a partition.
         """
-        keys = list(spans_map.keys())
-        spans_written_per_segment = []
         ttl = options.get("standalone-spans.buffer-ttl.seconds")
-
-        # Batch write spans in a segment
-        with self.client.pipeline() as p:
-            for key in keys:
-                segment_id, project_id, partition = key
-                spans = spans_map[key]
-                segment_key = get_segment_key(project_id, segment_id)
-                # RPUSH is atomic
-                p.rpush(segment_key, *spans)
-                spans_written_per_segment.append(len(spans))
-
-            results = p.execute()
-
+        num_shards = get_num_shards()
         partitions = list(latest_ts_by_partition.keys())
-        with self.client.pipeline() as p:
+
+        with self.client.pipeline(transaction=False) as p:
             # Get last processed timestamp for each partition processed
             # by consumer
             for partition in partitions:
@@ -86,17 +108,17 @@ class RedisSpansBuffer:
                 # GETSET is atomic
                 p.getset(timestamp_key, timestamp)
 
-            for result in zip(keys, spans_written_per_segment, results):
-                # Check if this is a new segment, if yes, add to bucket to be processed
-                key, num_written, num_total = result
-                if num_written == num_total:
-                    segment_id, project_id, partition = key
-                    segment_key = get_segment_key(project_id, segment_id)
-                    bucket = get_unprocessed_segments_key(partition)
-
-                    timestamp = segment_first_seen_ts[key]
-                    p.expire(segment_key, ttl)
-                    p.rpush(bucket, timestamp, segment_key)
+            # Batch write spans in a segment
+            for key, spans in spans_map.items():
+                segment_id, project_id, partition = key
+                segment_key = get_segment_key(project_id, segment_id)
+                bucket = get_unprocessed_segments_key(
+                    partition, get_segment_shard(segment_id, num_shards)
+                )
+                # RPUSH is atomic
+                p.rpush(segment_key, *spans)
+                p.expire(segment_key, ttl)
+                p.zadd(bucket, {segment_key: segment_first_seen_ts[key]}, nx=True)
 
             timestamp_results = p.execute()
 
@@ -130,30 +152,98 @@ class RedisSpansBuffer:
         return values
 
     def get_unprocessed_segments_and_prune_bucket(self, now: int, partition: int) -> list[str]:
-        key = get_unprocessed_segments_key(partition)
-        results = self.client.lrange(key, 0, -1) or []
+        """
+        Pops the segments of a partition which were first seen at least the buffer window ago,
+        oldest first. Only ready segments are read from Redis, the rest of the backlog is left
+        untouched.
+        """
+        max_timestamp = now - options.get("standalone-spans.buffer-window.seconds")
+        num_shards = get_num_shards()
+
+        # The shards are popped in a single pipeline. Scripts are sent with EVAL, as EVALSHA can't
+        # fall back to loading the script from within a cluster pipeline.
+        with self.client.pipeline(transaction=False) as p:
+            p.set(
+                get_inactive_buckets_check_key(partition),
+                now,
+                nx=True,
+                ex=INACTIVE_BUCKETS_CHECK_INTERVAL,
+            )
+            for shard in range(num_shards):
+                key = get_unprocessed_segments_key(partition, shard)
+                p.eval(pop_ready_segments.script, 1, key, max_timestamp)
+            check_inactive_buckets, *results = p.execute()
 
-        buffer_window = options.get("standalone-spans.buffer-window.seconds")
+        ready = self._parse_popped_segments(results)
+        if check_inactive_buckets:
+            ready.extend(self._pop_inactive_ready_segments(partition, num_shards, max_timestamp))
 
-        segment_keys = []
-        processed_segment_ts = None
+        ready.sort()
+        processed_segment_ts = ready[-1][0] if ready else None
+
+        segment_context = {"current_timestamp": now, "segment_timestamp": processed_segment_ts}
+        sentry_sdk.set_context("processed_segment", segment_context)
+
+        return [segment_key for _, segment_key in ready]
+
+    def _pop_inactive_ready_segments(
+        self, partition: int, num_shards: int, max_timestamp: int
+    ) -> list[tuple[int, str]]:
+        """
+        Pops the ready segments of the shards above the configured number and of the legacy
+        bucket. As long as any of them still holds segments, they're checked again on the next
+        processing tick.
+        """
+        legacy_key = get_legacy_unprocessed_segments_key(partition)
+        inactive_keys = [
+            get_unprocessed_segments_key(partition, shard)
+            for shard in range(num_shards, MAX_SHARDS)
+        ]
+        with self.client.pipeline(transaction=False) as p:
+            for key in inactive_keys:
+                p.eval(pop_ready_segments.script, 1, key, max_timestamp)
+            for key in [legacy_key, *inactive_keys]:
+                p.exists(key)
+            response = p.execute()
+        results = response[: len(inactive_keys)]
+        legacy_exists, *inactive_exist = response[len(inactive_keys) :]
+
+        ready = self._parse_popped_segments(results)
+        if legacy_exists:
+            ready.extend(self._pop_legacy_ready_segments(legacy_key, max_timestamp))
+
+        if legacy_exists or any(inactive_exist):
+            self.client.delete(get_inactive_buckets_check_key(partition))
+
+        return ready
+
+    def _parse_popped_segments(self, results: list[list[bytes] | None]) -> list[tuple[int, str]]:
+        ready = []
+        for result in results:
+            for segment_key, segment_timestamp in chunked(result or [], 2):
+                try:
+                    ready.append((int(float(segment_timestamp)), segment_key.decode("utf-8")))
+                except Exception:
+                    # Just in case something funky happens here
+                    sentry_sdk.capture_exception()
+        return ready
+
+    def _pop_legacy_ready_segments(self, key: str, max_timestamp: int) -> list[tuple[int, str]]:
+        results = self.client.lrange(key, 0, -1) or []
+
+        ready = []
         for result in chunked(results, 2):
             try:
                 segment_timestamp, segment_key = result
                 segment_timestamp = int(segment_timestamp)
-                if now - segment_timestamp < buffer_window:
+                if segment_timestamp > max_timestamp:
                     break
 
-                processed_segment_ts = segment_timestamp
-                segment_keys.append(segment_key.decode("utf-8"))
+                ready.append((segment_timestamp, segment_key.decode("utf-8")))
             except Exception:
                 # Just in case something funky happens here
                 sentry_sdk.capture_exception()
                 break
 
-        self.client.ltrim(key, len(segment_keys) * 2, -1)
-
-        segment_context = {"current_timestamp": now, "segment_timestamp": processed_segment_ts}
-        sentry_sdk.set_context("processed_segment", segment_context)
-
-        return segment_keys
+        self.client.ltrim(key, len(ready) * 2, -1)
+        return ready
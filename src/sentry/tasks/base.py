@@ -121,9 +121,12 @@ def instrumented_task(name, stat_suffix=None, silo_mode=None, record_timing=Fals
             scope.set_tag("task_name", name)
             scope.set_tag("transaction_id", transaction_id)
 
+            from sentry.features.manager import feature_evaluation_cache
+
             with (
                 metrics.timer(key, instance=instance),
                 track_memory_usage("jobs.memory_change", instance=instance),
+                feature_evaluation_cache(),
             ):
                 result = func(*args, **kwargs)
 
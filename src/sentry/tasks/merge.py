@@ -35,6 +35,7 @@ def merge_groups(
     **kwargs,
 ):
     # TODO(mattrobenolt): Write tests for all of this
+    from sentry.grouping.ingest import grouphash_cache
     from sentry.models.activity import Activity
     from sentry.models.environment import Environment
     from sentry.models.eventattachment import EventAttachment
@@ -103,10 +104,22 @@ def merge_groups(
             GroupMeta,
         )
 
+        invalidate_grouphashes = grouphash_cache.is_invalidation_enabled()
+        if invalidate_grouphashes:
+            merged_hashes = list(
+                GroupHash.objects.filter(
+                    project_id=group.project_id, group_id=group.id
+                ).values_list("hash", flat=True)
+            )
+
         has_more = merge_objects(
             model_list, group, new_group, logger=logger, transaction_id=transaction_id
         )
 
+        # Hashes that were moved over must no longer resolve to the old group from the cache
+        if invalidate_grouphashes:
+            grouphash_cache.delete_many(group.project_id, merged_hashes)
+
         if not has_more:
             # There are no more objects to merge for *this* "from" group, remove it
             # from the list of "from" groups that are being merged, and finish the
@@ -113,6 +113,7 @@ def compute_configs(organization_id=None, project_id=None, public_key=None):
     """
     from sentry.models.project import Project
     from sentry.models.projectkey import ProjectKey
+    from sentry.relay.config.fragments import shared_organization_fragments
 
     validate_args(organization_id, project_id, public_key)
     configs = {}
@@ -124,23 +125,27 @@ def compute_configs(organization_id=None, project_id=None, public_key=None):
         # which might cause the key to disappear and trigger the task again.  Without this behavior
         # it could be possible that refrequent invalidations cause the task to take excessive time
         # to complete.
-        for organization in Organization.objects.filter(id=organization_id):
-            for project in Project.objects.filter(organization_id=organization_id):
-                project.set_cached_field_value("organization", organization)
-                for key in ProjectKey.objects.filter(project_id=project.id):
-                    key.set_cached_field_value("project", project)
-                    # If we find the config in the cache it means it was active.  As such we want to
-                    # recalculate it.  If the config was not there at all, we leave it and avoid the
-                    # cost of re-computation.
-                    if projectconfig_cache.backend.get(key.public_key) is not None:
-                        configs[key.public_key] = compute_projectkey_config(key)
-                        action = "recompute"
-                    else:
-                        action = "not-cached"
-                    metrics.incr(
-                        "relay.projectconfig_cache.invalidation.recompute",
-                        tags={"action": action, "scope": "organization"},
-                    )
+        #
+        # The sections of the configs which only depend on the organization are built once and
+        # shared by all of its projects.
+        with shared_organization_fragments():
+            for organization in Organization.objects.filter(id=organization_id):
+                for project in Project.objects.filter(organization_id=organization_id):
+                    project.set_cached_field_value("organization", organization)
+                    for key in ProjectKey.objects.filter(project_id=project.id):
+                        key.set_cached_field_value("project", project)
+                        # If we find the config in the cache it means it was active.  As such we
+                        # want to recalculate it.  If the config was not there at all, we leave it
+                        # and avoid the cost of re-computation.
+                        if projectconfig_cache.backend.get(key.public_key) is not None:
+                            configs[key.public_key] = compute_projectkey_config(key)
+                            action = "recompute"
+                        else:
+                            action = "not-cached"
+                        metrics.incr(
+                            "relay.projectconfig_cache.invalidation.recompute",
+                            tags={"action": action, "scope": "organization"},
+                        )
     elif project_id:
         for project in Project.objects.filter(id=project_id):
             for key in ProjectKey.objects.filter(project_id=project_id):
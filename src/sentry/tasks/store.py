@@ -424,7 +424,7 @@ def do_process_event(
         # - store event timestamps that are older than our retention window
         #   (also happening with minidumps)
         data = normalize_event(data)
-        cache_key = processing.event_processing_store.store(data)
+        cache_key = processing.event_processing_store.store(data, stage="process")
 
     return _continue_to_save_event()
 
@@ -626,7 +626,7 @@ def _do_save_event(
             data = manager.get_data()
             if not isinstance(data, dict):
                 data = dict(data.items())
-            processing.event_processing_store.store(data)
+            processing.event_processing_store.store(data, stage="save")
         except HashDiscarded:
             # Delete the event payload from cache since it won't show up in post-processing.
             if cache_key:
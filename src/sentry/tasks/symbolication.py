@@ -321,7 +321,7 @@ def _do_symbolicate_event(
         data = dict(data.items())
 
     if has_changed:
-        cache_key = processing.event_processing_store.store(data)
+        cache_key = processing.event_processing_store.store(data, stage="symbolicate")
 
     return _continue_to_process_event()
 
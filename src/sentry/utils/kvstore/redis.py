@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Iterator, Sequence
 from datetime import timedelta
 from typing import TypeVar
 
@@ -23,9 +24,25 @@ class RedisKVStorage(KVStorage[str, T]):
     def get(self, key: str) -> T | None:
         return self.client.get(key.encode("utf8"))
 
+    def get_many(self, keys: Sequence[str]) -> Iterator[tuple[str, T]]:
+        with self.client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.get(key.encode("utf8"))
+            values = pipe.execute()
+
+        for key, value in zip(keys, values):
+            if value is not None:
+                yield key, value
+
     def set(self, key: str, value: T, ttl: timedelta | None = None) -> None:
         self.client.set(key.encode("utf8"), value, ex=ttl)
 
+    def set_many(self, items: Sequence[tuple[str, T]], ttl: timedelta | None = None) -> None:
+        with self.client.pipeline(transaction=False) as pipe:
+            for key, value in items:
+                pipe.set(key.encode("utf8"), value, ex=ttl)
+            pipe.execute()
+
     def delete(self, key: str) -> None:
         self.client.delete(key.encode("utf8"))
 
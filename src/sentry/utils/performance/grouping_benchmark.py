@@ -0,0 +1,109 @@
+"""
+Measures time and memory spent building grouping components and hashing them, for a corpus of
+events. Big native crashes, with many threads and frames, are the interesting case: every frame
+turns into a handful of components per variant.
+"""
+
+from __future__ import annotations
+
+import time
+import tracemalloc
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+from sentry.utils.performance.save_benchmark import summarize
+
+
+def count_components(component: Any) -> int:
+    from sentry.grouping.component import GroupingComponent
+
+    return 1 + sum(
+        count_components(value)
+        for value in component.values
+        if isinstance(value, GroupingComponent)
+    )
+
+
+def prepare_event(data: Mapping[str, Any], config: Mapping[str, Any]) -> Any:
+    """
+    Normalizes the event like ingestion does before grouping it.
+    """
+    from sentry import eventstore
+    from sentry.event_manager import EventManager
+    from sentry.grouping.api import load_grouping_config
+    from sentry.stacktraces.processing import normalize_stacktraces_for_grouping
+
+    manager = EventManager(data=dict(data), grouping_config=dict(config))
+    manager.normalize()
+    normalized = manager.get_data()
+    normalize_stacktraces_for_grouping(normalized, load_grouping_config(config))
+    return eventstore.backend.create_event(data=normalized)
+
+
+def group_event(event: Any, config: Mapping[str, Any]) -> dict[str, Any]:
+    """
+    Does what grouping does with the components of an event: computing the hash of every variant,
+    and serializing the variants for the grouping info.
+    """
+    variants = event.get_grouping_variants(force_config=config)
+    for variant in variants.values():
+        variant.get_hash()
+    for variant in variants.values():
+        variant.as_dict()
+    return variants
+
+
+def run_benchmark(
+    corpus: Sequence[Mapping[str, Any]], config_id: str | None = None, iterations: int = 1
+) -> dict[str, Any]:
+    """
+    Groups every event of ``corpus`` ``iterations`` times with the given grouping config (or the
+    default one). Timings are taken without tracing allocations, and a separate traced pass
+    records the memory allocated while grouping each event.
+    """
+    from sentry.grouping.api import get_default_grouping_config_dict
+    from sentry.grouping.variants import ComponentVariant
+
+    config = get_default_grouping_config_dict(config_id)
+    events = [prepare_event(data, config) for data in corpus]
+
+    timings = []
+    for _ in range(iterations):
+        for event in events:
+            start = time.perf_counter()
+            group_event(event, config)
+            timings.append(time.perf_counter() - start)
+
+    results = []
+    for data, event in zip(corpus, events):
+        tracemalloc.start()
+        try:
+            before = tracemalloc.take_snapshot()
+            tracemalloc.reset_peak()
+            start_bytes, _ = tracemalloc.get_traced_memory()
+            variants = group_event(event, config)
+            _, peak_bytes = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+
+        allocated = after.compare_to(before, "filename")
+        results.append(
+            {
+                "event_id": data.get("event_id"),
+                "components": sum(
+                    count_components(variant.component)
+                    for variant in variants.values()
+                    if isinstance(variant, ComponentVariant)
+                ),
+                "allocated_blocks": sum(stat.count_diff for stat in allocated),
+                "allocated_bytes": sum(stat.size_diff for stat in allocated),
+                "peak_bytes": peak_bytes - start_bytes,
+            }
+        )
+
+    return {
+        "config": config["id"],
+        "events": results,
+        "timings": summarize(timings),
+    }
@@ -0,0 +1,93 @@
+"""
+Measures what deduplicating node payloads with `nodestore.deduplicate` saves in bytes, and what it
+costs when reading them back. Every event is written to the given nodestore twice, once as is and
+once deduplicated, under ids of its own which are deleted again afterwards. Shared nodes are left to
+expire, as events stored for real may reference them too.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Mapping, Sequence
+from typing import Any
+from uuid import uuid4
+
+import zstandard
+
+from sentry.nodestore.base import NodeStorage
+from sentry.utils.performance.save_benchmark import summarize
+
+VARIANTS = ("plain", "deduplicated")
+COMPRESSION_LEVEL = 3
+
+
+def _compressed_size(value: bytes) -> int:
+    # Backends compress values on their own, differently, so this only approximates their size
+    return len(zstandard.compress(value, level=COMPRESSION_LEVEL))
+
+
+def _write(
+    storage: NodeStorage, variant: str, events: Sequence[Mapping[str, Any]]
+) -> tuple[list[str], dict[str, Any]]:
+    ids = [f"bench-{uuid4().hex}" for _ in events]
+    items = []
+    shared: dict[str, bytes] = {}
+    for node_id, event in zip(ids, events):
+        data: Mapping[str | None, Mapping[str, Any]] = {None: event}
+        if variant == "deduplicated":
+            data, event_shared = storage._deduplicate(data)
+            shared.update(event_shared)
+        items.append((node_id, storage._encode(dict(data))))
+
+    storage._set_shared(shared)
+    storage._set_bytes_many(items)
+
+    return ids, {
+        "node_bytes": sum(len(value) for _, value in items),
+        "node_compressed_bytes": sum(_compressed_size(value) for _, value in items),
+        "shared_bytes": sum(len(value) for value in shared.values()),
+        "shared_compressed_bytes": sum(_compressed_size(value) for value in shared.values()),
+        "shared_nodes": len(shared),
+    }
+
+
+def run_benchmark(
+    storage: NodeStorage, events: Sequence[Mapping[str, Any]], iterations: int = 5
+) -> dict[str, Any]:
+    """
+    Writes every event once per variant, and reads it back ``iterations``
+    times. The cached values of the events are cleared before every pass, so
+    that each read goes to the backend. Shared nodes stay cached after the
+    first pass, as they would in production. Sizes count every shared node
+    once, as it is stored once.
+    """
+    results = {}
+    for variant in VARIANTS:
+        ids, sizes = _write(storage, variant, events)
+        try:
+            timings = []
+            matches = True
+            for _ in range(iterations):
+                storage._delete_cache_items(ids)
+                for node_id, event in zip(ids, events):
+                    start = time.perf_counter()
+                    data = storage.get(node_id)
+                    timings.append(time.perf_counter() - start)
+                    matches = matches and data == event
+        finally:
+            storage.delete_multi(ids)
+
+        results[variant] = {**sizes, "matches": matches, "get": summarize(timings)}
+
+    plain = results["plain"]
+    deduplicated = results["deduplicated"]
+    return {
+        "events": len(events),
+        "bytes_saved": plain["node_bytes"]
+        - deduplicated["node_bytes"]
+        - deduplicated["shared_bytes"],
+        "compressed_bytes_saved": plain["node_compressed_bytes"]
+        - deduplicated["node_compressed_bytes"]
+        - deduplicated["shared_compressed_bytes"],
+        "variants": results,
+    }
@@ -0,0 +1,107 @@
+"""
+Compares fetching pages at increasing depths of a large queryset with `OffsetPaginator` against
+`KeysetPaginator`. The offset paginator scans every row before the page, while the keyset
+paginator seeks to the first row of the page through the index of its sort keys.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Sequence
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from django.db.models import QuerySet
+
+from sentry.api.paginator import KeysetPaginator, OffsetPaginator
+from sentry.utils.cursors import Cursor
+from sentry.utils.performance.save_benchmark import summarize
+
+PAGE_DEPTHS = (1, 100, 1000, 10000)
+
+
+def seed_audit_log(organization_id: int, rows: int, batch_size: int = 10000) -> int:
+    """
+    Inserts ``rows`` audit log entries for the organization, one second apart and ending now. A
+    tenth of them share their timestamp with the previous entry, so that ties have to be broken.
+    """
+    from sentry.models.auditlogentry import AuditLogEntry
+
+    now = datetime.now(timezone.utc)
+    created = 0
+    while created < rows:
+        batch = []
+        for index in range(created, min(created + batch_size, rows)):
+            batch.append(
+                AuditLogEntry(
+                    organization_id=organization_id,
+                    event=1,
+                    actor_label="benchmark",
+                    datetime=now - timedelta(seconds=index - index // 10),
+                    data={},
+                )
+            )
+        AuditLogEntry.objects.bulk_create(batch)
+        created += len(batch)
+    return created
+
+
+def _keyset_cursor(paginator: KeysetPaginator, queryset: QuerySet[Any], offset: int) -> Cursor:
+    # The cursor a client would have been handed on the page before, found without being timed
+    ordered = queryset.order_by(*(f"-{name}" if desc else name for name, desc in paginator.keys))
+    row = ordered[offset - 1]
+    return Cursor(paginator.encode_cursor_value(paginator.get_item_key(row)), 0, False, True)
+
+
+def run_benchmark(
+    queryset: QuerySet[Any],
+    order_by: Sequence[str],
+    limit: int = 100,
+    depths: Sequence[int] = PAGE_DEPTHS,
+    iterations: int = 5,
+) -> dict[str, Any]:
+    """
+    Fetches the page at every depth in ``depths`` (a page number, starting at 0) ``iterations``
+    times with both paginators. Depths past the end of the queryset are skipped, and pages for
+    which the paginators return different rows are reported.
+    """
+    rows = queryset.count()
+    keyset_paginator = KeysetPaginator(queryset, order_by=order_by, max_limit=limit)
+    # The offset paginator must break ties the same way to return the same pages
+    offset_paginator = OffsetPaginator(
+        queryset,
+        order_by=[f"-{name}" if desc else name for name, desc in keyset_paginator.keys],
+        max_limit=limit,
+    )
+
+    results = []
+    for depth in depths:
+        if depth * limit >= rows:
+            continue
+        cursors = {
+            "offset": Cursor(limit, depth, False),
+            "keyset": (
+                _keyset_cursor(keyset_paginator, queryset, depth * limit) if depth else None
+            ),
+        }
+        paginators = {"offset": offset_paginator, "keyset": keyset_paginator}
+
+        timings: dict[str, list[float]] = {name: [] for name in paginators}
+        pages = {}
+        for _ in range(iterations):
+            for name, paginator in paginators.items():
+                start = time.perf_counter()
+                pages[name] = [
+                    item.id for item in paginator.get_result(limit=limit, cursor=cursors[name])
+                ]
+                timings[name].append(time.perf_counter() - start)
+
+        results.append(
+            {
+                "depth": depth,
+                "matches": pages["offset"] == pages["keyset"],
+                "timings": {name: summarize(durations) for name, durations in timings.items()},
+            }
+        )
+
+    return {"rows": rows, "limit": limit, "pages": results}
@@ -0,0 +1,138 @@
+"""
+Runs a corpus of messages through the message parameterization used for grouping, and compares
+both the output and the time taken against a single regex combining every pattern, which is how
+messages used to be parameterized.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import time
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+from sentry.grouping.parameterization import (
+    DEFAULT_PARAMETERIZATION_REGEXES_MAP,
+    Parameterizer,
+    _parametrize_w_regex,
+)
+from sentry.utils import json
+from sentry.utils.performance.save_benchmark import summarize
+from sentry.utils.safe import get_path
+
+PATTERN_KEYS = tuple(DEFAULT_PARAMETERIZATION_REGEXES_MAP)
+
+# Number of differing messages included in the results
+MAX_MISMATCHES = 20
+
+
+def _event_messages(data: Any) -> list[str]:
+    if not isinstance(data, dict):
+        return []
+    messages = [
+        get_path(data, "logentry", "formatted") or get_path(data, "logentry", "message"),
+        data.get("message") if isinstance(data.get("message"), str) else None,
+    ]
+    messages.extend(
+        exception.get("value")
+        for exception in get_path(data, "exception", "values", filter=True) or ()
+        if isinstance(exception, dict)
+    )
+    return [message for message in messages if isinstance(message, str) and message]
+
+
+def load_messages(paths: Iterable[str]) -> list[str]:
+    """
+    Loads messages from the given files, or the files in the given directories. Messages are taken
+    from the log entry and exception values of ``*.json`` event payloads, every other file is read
+    as one message per line.
+    """
+    filenames: list[str] = []
+    for path in paths:
+        if os.path.isdir(path):
+            filenames.extend(os.path.join(path, name) for name in sorted(os.listdir(path)))
+        else:
+            filenames.append(path)
+
+    messages = []
+    for filename in filenames:
+        if not os.path.isfile(filename):
+            continue
+        with open(filename, encoding="utf-8", errors="replace") as f:
+            if filename.endswith(".json"):
+                try:
+                    messages.extend(_event_messages(json.loads(f.read())))
+                except json.JSONDecodeError:
+                    continue
+            else:
+                messages.extend(line.rstrip("\n") for line in f if line.strip())
+
+    return messages
+
+
+def parameterize_reference(pattern: re.Pattern[str], content: str) -> tuple[str, dict[str, int]]:
+    matches: defaultdict[str, int] = defaultdict(int)
+
+    def _handle_regex_match(match: re.Match[str]) -> str:
+        for key, value in match.groupdict().items():
+            if value is not None:
+                matches[key] += 1
+                return f"<{key}>"
+        return ""
+
+    return pattern.sub(_handle_regex_match, content), dict(matches)
+
+
+def parameterize_uncached(content: str) -> tuple[str, dict[str, int]]:
+    parameterized, matches = _parametrize_w_regex.__wrapped__(PATTERN_KEYS, content)
+    return parameterized, dict(matches)
+
+
+def parameterize_cached(content: str) -> tuple[str, dict[str, int]]:
+    parameterizer = Parameterizer(regex_pattern_keys=PATTERN_KEYS)
+    return parameterizer.parametrize_w_regex(content), dict(parameterizer.matches_counter)
+
+
+def run_benchmark(messages: Sequence[str], iterations: int = 1) -> dict[str, Any]:
+    """
+    Parameterizes every message ``iterations`` times with the reference regex, the engine without
+    its result cache and the engine as used during grouping. Messages for which the output or the
+    replacement counts differ from the reference are reported as mismatches.
+    """
+    reference_pattern = Parameterizer._make_regex_from_patterns(PATTERN_KEYS)
+    _parametrize_w_regex.cache_clear()
+
+    variants = {
+        "reference": lambda content: parameterize_reference(reference_pattern, content),
+        "uncached": parameterize_uncached,
+        "cached": parameterize_cached,
+    }
+    timings: dict[str, list[float]] = {name: [] for name in variants}
+    mismatches = []
+    mismatch_count = 0
+
+    for _ in range(iterations):
+        for message in messages:
+            results = {}
+            for name, parameterize in variants.items():
+                start = time.perf_counter()
+                results[name] = parameterize(message)
+                timings[name].append(time.perf_counter() - start)
+
+            expected = results["reference"]
+            if any(result != expected for result in results.values()):
+                mismatch_count += 1
+                if len(mismatches) < MAX_MISMATCHES:
+                    mismatches.append(
+                        {"message": message, **{name: r[0] for name, r in results.items()}}
+                    )
+
+    return {
+        "messages": len(messages),
+        "iterations": iterations,
+        "mismatch_count": mismatch_count,
+        "mismatches": mismatches,
+        "timings": {name: summarize(durations) for name, durations in timings.items()},
+    }
@@ -0,0 +1,94 @@
+"""
+Compares the size and the encoding and decoding time of project configs in the Redis project
+config cache, between compressing every config on its own, splitting out shared sections, and
+splitting out shared sections with a trained dictionary. The dictionary is trained on half of the
+configs and measured on all of them, so that it isn't only measured on what it has seen.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+import zstandard
+
+from sentry.relay.projectconfig_cache import encoding
+from sentry.relay.projectconfig_cache.redis import COMPRESSION_LEVEL
+from sentry.utils import json
+from sentry.utils.performance.save_benchmark import summarize
+
+
+def encode_plain(config: Any) -> tuple[bytes, dict[str, bytes]]:
+    return zstandard.compress(json.dumps(config).encode(), level=COMPRESSION_LEVEL), {}
+
+
+def decode_plain(value: bytes, get_sections: Any) -> Any:
+    return json.loads(zstandard.decompress(value))
+
+
+def run_benchmark(
+    configs: Sequence[Mapping[str, Any]],
+    dict_size: int = encoding.DICTIONARY_SIZE,
+    iterations: int = 5,
+) -> dict[str, Any]:
+    """
+    Encodes and decodes every config ``iterations`` times per variant. Sizes count every shared
+    section once, as it is stored once in Redis. Variants for which a config doesn't decode back
+    to itself are reported.
+    """
+    dictionary = encoding.train_dictionary(configs[::2], dict_size)
+
+    def get_dictionary(dict_id: int) -> zstandard.ZstdCompressionDict | None:
+        return dictionary if dict_id == dictionary.dict_id() else None
+
+    variants = {
+        "zstd": (encode_plain, decode_plain),
+        "shared": (
+            lambda config: encoding.encode(config, None),
+            lambda value, get_sections: encoding.decode(value, get_dictionary, get_sections),
+        ),
+        "dictionary": (
+            lambda config: encoding.encode(config, dictionary),
+            lambda value, get_sections: encoding.decode(value, get_dictionary, get_sections),
+        ),
+    }
+
+    results = {}
+    for name, (encode, decode) in variants.items():
+        encode_timings = []
+        decode_timings = []
+        matches = True
+        for _ in range(iterations):
+            encoded = []
+            sections: dict[str, bytes] = {}
+            for config in configs:
+                start = time.perf_counter()
+                value, config_sections = encode(config)
+                encode_timings.append(time.perf_counter() - start)
+                encoded.append(value)
+                sections.update(config_sections)
+
+            for config, value in zip(configs, encoded):
+                start = time.perf_counter()
+                decoded = decode(
+                    value, lambda digests: {digest: sections.get(digest) for digest in digests}
+                )
+                decode_timings.append(time.perf_counter() - start)
+                matches = matches and decoded == config
+
+        results[name] = {
+            "config_bytes": sum(len(value) for value in encoded),
+            "shared_bytes": sum(len(section) for section in sections.values()),
+            "shared_sections": len(sections),
+            "matches": matches,
+            "encode": summarize(encode_timings),
+            "decode": summarize(decode_timings),
+        }
+
+    return {
+        "configs": len(configs),
+        "uncompressed_bytes": sum(len(json.dumps(config).encode()) for config in configs),
+        "dictionary_bytes": len(dictionary.as_bytes()),
+        "variants": results,
+    }
@@ -0,0 +1,229 @@
+"""
+Replays a corpus of error events through ``EventManager.normalize`` and
+``EventManager.save`` and records throughput along with per-stage timings of the
+save path. Results are plain dicts so that they can be written to disk and
+diffed against a later run with ``compare``.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import functools
+import os
+import time
+import uuid
+from collections.abc import Callable, Generator, Iterable, Mapping, Sequence
+from datetime import datetime, timezone
+from typing import Any
+from unittest import mock
+
+from sentry.utils import json
+
+# Module level functions of `sentry.event_manager` that are timed individually.
+# They are looked up as globals by `EventManager.save`, so patching the module
+# attribute is enough to observe every call.
+STAGES = (
+    "_pull_out_data",
+    "_get_or_create_release_many",
+    "assign_event_to_group",
+    "_nodestore_save_many",
+    "_eventstream_insert_many",
+)
+
+TOTAL = "save"
+
+RESULT_VERSION = 1
+
+# (name, metric, baseline, candidate, relative change)
+ComparisonRow = tuple[str, str, float, float, float | None]
+
+
+def load_corpus(paths: Iterable[str]) -> list[dict[str, Any]]:
+    """
+    Loads event payloads from JSON files. Directories are searched (non
+    recursively) for ``*.json`` files. Transactions and files which do not
+    contain a single event are skipped, as they take a different save path.
+    """
+    filenames: list[str] = []
+    for path in paths:
+        if os.path.isdir(path):
+            filenames.extend(
+                os.path.join(path, name)
+                for name in sorted(os.listdir(path))
+                if name.endswith(".json")
+            )
+        else:
+            filenames.append(path)
+
+    corpus = []
+    for filename in filenames:
+        with open(filename, "rb") as f:
+            try:
+                data = json.loads(f.read())
+            except json.JSONDecodeError:
+                continue
+        if not isinstance(data, dict) or data.get("type") in ("transaction", "generic"):
+            continue
+        corpus.append(data)
+
+    return corpus
+
+
+def prepare_event(data: Mapping[str, Any]) -> dict[str, Any]:
+    """
+    Returns a copy of ``data`` which looks like a freshly received event, so
+    that replays are neither deduplicated nor dropped for being too old.
+    """
+    event = json.loads(json.dumps(data))
+    event["event_id"] = uuid.uuid4().hex
+    event["timestamp"] = datetime.now(timezone.utc).isoformat()
+    event.pop("received", None)
+    event.pop("project", None)
+    return event
+
+
+class StageTimer:
+    def __init__(self) -> None:
+        self.timings: dict[str, list[float]] = {name: [] for name in (TOTAL,) + STAGES}
+
+    def record(self, name: str, duration: float) -> None:
+        self.timings[name].append(duration)
+
+    def wrap(self, name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(name, time.perf_counter() - start)
+
+        return wrapper
+
+    @contextlib.contextmanager
+    def patch(self) -> Generator[None, None, None]:
+        from sentry import event_manager
+
+        with contextlib.ExitStack() as stack:
+            for name in STAGES:
+                stack.enter_context(
+                    mock.patch.object(
+                        event_manager, name, self.wrap(name, getattr(event_manager, name))
+                    )
+                )
+            yield
+
+    def clear(self) -> None:
+        for timings in self.timings.values():
+            timings.clear()
+
+
+def summarize(timings: Sequence[float]) -> dict[str, float]:
+    """
+    Summarizes durations (in seconds) as milliseconds.
+    """
+    if not timings:
+        return {"count": 0, "total": 0.0, "mean": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+
+    ordered = sorted(timings)
+
+    def percentile(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000
+
+    total = sum(ordered)
+    return {
+        "count": len(ordered),
+        "total": total * 1000,
+        "mean": total * 1000 / len(ordered),
+        "p50": percentile(0.5),
+        "p95": percentile(0.95),
+        "max": ordered[-1] * 1000,
+    }
+
+
+def run_benchmark(
+    project_id: int,
+    corpus: Sequence[Mapping[str, Any]],
+    iterations: int = 1,
+    warmup: int = 1,
+    on_event: Callable[[], None] | None = None,
+) -> dict[str, Any]:
+    """
+    Saves every event of ``corpus`` ``iterations`` times into ``project_id``.
+    ``warmup`` additional passes over the corpus are made up front and not
+    recorded, so that caches and lazily imported modules are populated.
+    """
+    from sentry.event_manager import EventManager
+    from sentry.models.project import Project
+
+    project = Project.objects.get(id=project_id)
+    timer = StageTimer()
+    errors = 0
+
+    def replay(data: Mapping[str, Any]) -> None:
+        nonlocal errors
+        manager = EventManager(prepare_event(data), project=project)
+        start = time.perf_counter()
+        try:
+            manager.normalize()
+            manager.save(project.id)
+        except Exception:
+            errors += 1
+        else:
+            timer.record(TOTAL, time.perf_counter() - start)
+        if on_event is not None:
+            on_event()
+
+    with timer.patch():
+        for _ in range(warmup):
+            for data in corpus:
+                replay(data)
+        timer.clear()
+        errors = 0
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for data in corpus:
+                replay(data)
+        duration = time.perf_counter() - start
+
+    events = len(corpus) * iterations
+    return {
+        "version": RESULT_VERSION,
+        "corpus_size": len(corpus),
+        "iterations": iterations,
+        "events": events,
+        "errors": errors,
+        "duration": duration,
+        "events_per_second": events / duration if duration else 0.0,
+        "stages": {name: summarize(timings) for name, timings in timer.timings.items()},
+    }
+
+
+def compare(baseline: Mapping[str, Any], candidate: Mapping[str, Any]) -> list[ComparisonRow]:
+    """
+    Returns a row for throughput and the p50/p95 of every stage. The relative change is ``None``
+    if the baseline is zero.
+    """
+
+    def row(name: str, metric: str, before: float, after: float) -> ComparisonRow:
+        change = (after - before) / before if before else None
+        return (name, metric, before, after, change)
+
+    rows = [
+        row(
+            "events",
+            "per second",
+            baseline["events_per_second"],
+            candidate["events_per_second"],
+        )
+    ]
+    for name in (TOTAL,) + STAGES:
+        before = baseline["stages"].get(name)
+        after = candidate["stages"].get(name)
+        if not before or not after:
+            continue
+        for metric in ("p50", "p95"):
+            rows.append(row(name, f"{metric} ms", before[metric], after[metric]))
+
+    return rows
@@ -0,0 +1,70 @@
+"""
+Compares serializing pages of objects one object at a time against serializing them as columns,
+for serializers which implement `serialize_columns`. Attributes are fetched once per page size
+and shared by both, so that only the serialization itself is measured.
+"""
+
+from __future__ import annotations
+
+import itertools
+import time
+from collections.abc import Sequence
+from typing import Any
+
+from sentry.api.serializers.base import _serialize_columns
+from sentry.utils.performance.save_benchmark import summarize
+
+PAGE_SIZES = (100, 1000)
+
+
+def make_page(objects: Sequence[Any], size: int) -> list[Any]:
+    """
+    Repeats `objects` up to `size` items, as the page of a large organization would contain.
+    """
+    return list(itertools.islice(itertools.cycle(objects), size))
+
+
+def serialize_per_object(serializer: Any, page: Sequence[Any], attrs: Any, user: Any) -> list[Any]:
+    return [serializer(o, attrs=attrs.get(o, {}), user=user) for o in page]
+
+
+def serialize_batch(serializer: Any, page: Sequence[Any], attrs: Any, user: Any) -> list[Any]:
+    return _serialize_columns(page, page, attrs, user, serializer)
+
+
+def run_benchmark(
+    serializer: Any,
+    objects: Sequence[Any],
+    user: Any,
+    page_sizes: Sequence[int] = PAGE_SIZES,
+    iterations: int = 5,
+) -> dict[str, Any]:
+    """
+    Serializes pages of every size in `page_sizes` made of `objects`, ``iterations`` times per
+    variant. Pages for which the two variants give a different output are reported.
+    """
+    results = []
+    for size in page_sizes:
+        page = make_page(objects, size)
+        attrs = serializer.get_attrs(item_list=page, user=user)
+
+        timings: dict[str, list[float]] = {"per_object": [], "batch": []}
+        outputs = {}
+        for _ in range(iterations):
+            for name, serialize in (
+                ("per_object", serialize_per_object),
+                ("batch", serialize_batch),
+            ):
+                start = time.perf_counter()
+                outputs[name] = serialize(serializer, page, attrs, user)
+                timings[name].append(time.perf_counter() - start)
+
+        results.append(
+            {
+                "size": size,
+                "matches": outputs["per_object"] == outputs["batch"],
+                "timings": {name: summarize(durations) for name, durations in timings.items()},
+            }
+        )
+
+    return {"serializer": type(serializer).__name__, "pages": results}
@@ -2,28 +2,35 @@ from __future__ import annotations
 
 import functools
 import logging
+import math
 import os
+import random
 import re
+import struct
 import time
 from collections import namedtuple
 from collections.abc import Callable, Collection, Mapping, MutableMapping, Sequence
 from concurrent.futures import ThreadPoolExecutor
-from contextlib import contextmanager
+from contextlib import ExitStack, contextmanager
 from copy import deepcopy
 from datetime import datetime, timedelta, timezone
 from hashlib import sha1
 from typing import Any, Union
 from urllib.parse import urlparse
 
+import msgpack
 import sentry_sdk
 import sentry_sdk.scope
 import urllib3
+import zstandard
 from dateutil.parser import parse as parse_datetime
 from django.conf import settings
 from django.core.cache import cache
 from snuba_sdk import MetricsQuery, Request
 from snuba_sdk.legacy import json_to_snql
 
+from sentry import options
+from sentry.locks import locks
 from sentry.models.environment import Environment
 from sentry.models.group import Group
 from sentry.models.grouprelease import GroupRelease
@@ -39,6 +46,7 @@ from sentry.snuba.query_sources import QuerySource
 from sentry.snuba.referrer import validate_referrer
 from sentry.utils import json, metrics
 from sentry.utils.dates import outside_retention_with_modified_start
+from sentry.utils.locking import UnableToAcquireLock
 
 logger = logging.getLogger(__name__)
 
@@ -932,6 +940,133 @@ def get_cache_key(query: SnubaQuery) -> str:
     return f"sqc:{sha1(hashable.encode('utf-8')).hexdigest()}"
 
 
+# Cached query results are stored as a small header followed by the encoded result. The header
+# carries what is needed to refresh the entry before it expires: when it expires, and how long the
+# query took to compute.
+#
+#     version (1 byte) | expiry (float64) | compute time (float64) | codec (uint8) | payload
+#
+# Entries written before this format existed are JSON strings, and are still read.
+_QUERY_CACHE_VERSION = 1
+_QUERY_CACHE_HEADER = struct.Struct("<BddB")
+
+_QUERY_CACHE_CODEC_MSGPACK = 0
+_QUERY_CACHE_CODEC_MSGPACK_ZSTD = 1
+_QUERY_CACHE_CODEC_JSON = 2
+
+# Payloads smaller than this are stored uncompressed.
+_QUERY_CACHE_COMPRESSION_THRESHOLD = 1024
+_QUERY_CACHE_COMPRESSION_LEVEL = 3
+
+# How often waiters look for the result of a query that another process is running.
+_QUERY_CACHE_POLL_INTERVAL = 0.05
+
+
+def _encode_cached_result(result: Mapping[str, Any], expiry: float, delta: float) -> bytes:
+    try:
+        payload = msgpack.packb(result, use_bin_type=True)
+        codec = _QUERY_CACHE_CODEC_MSGPACK
+    except (OverflowError, TypeError, ValueError):
+        # msgpack has no representation for integers outside of 64 bits
+        payload = json.dumps(result).encode("utf-8")
+        codec = _QUERY_CACHE_CODEC_JSON
+
+    if codec == _QUERY_CACHE_CODEC_MSGPACK and len(payload) > _QUERY_CACHE_COMPRESSION_THRESHOLD:
+        payload = zstandard.compress(payload, level=_QUERY_CACHE_COMPRESSION_LEVEL)
+        codec = _QUERY_CACHE_CODEC_MSGPACK_ZSTD
+
+    return _QUERY_CACHE_HEADER.pack(_QUERY_CACHE_VERSION, expiry, delta, codec) + payload
+
+
+def _decode_cached_result(value: str | bytes) -> tuple[Any, float | None, float]:
+    """
+    Returns the cached result, along with the time at which the entry expires and how long the
+    query took to compute. Legacy entries carry neither, and are never refreshed early.
+    """
+    if isinstance(value, str):
+        return json.loads(value), None, 0.0
+
+    version, expiry, delta, codec = _QUERY_CACHE_HEADER.unpack_from(value)
+    if version != _QUERY_CACHE_VERSION:
+        raise ValueError(f"unknown snuba query cache version: {version}")
+
+    payload = value[_QUERY_CACHE_HEADER.size :]
+    if codec == _QUERY_CACHE_CODEC_JSON:
+        return json.loads(payload.decode("utf-8")), expiry, delta
+    if codec == _QUERY_CACHE_CODEC_MSGPACK_ZSTD:
+        payload = zstandard.decompress(payload)
+    elif codec != _QUERY_CACHE_CODEC_MSGPACK:
+        raise ValueError(f"unknown snuba query cache codec: {codec}")
+    return msgpack.unpackb(payload, raw=False, strict_map_key=False), expiry, delta
+
+
+def _set_cached_result(
+    cache_key: str, result: Mapping[str, Any], delta: float, ttl: int | None = None
+) -> None:
+    if ttl is None:
+        ttl = settings.SENTRY_SNUBA_CACHE_TTL_SECONDS
+    if options.get("snuba.query-cache.binary-encoding"):
+        value: str | bytes = _encode_cached_result(result, time.time() + ttl, delta)
+    else:
+        value = json.dumps(result)
+    cache.set(cache_key, value, ttl)
+
+
+def _should_refresh_early(expiry: float | None, delta: float) -> bool:
+    """
+    Probabilistic early expiration: the closer an entry is to expiring, and the longer its query
+    took, the more likely a read is to refresh it. Under load this spreads the refresh of a hot
+    entry over a single reader instead of having every reader miss once it expires.
+    """
+    beta = options.get("snuba.query-cache.early-refresh-beta")
+    if expiry is None or beta <= 0:
+        return False
+    # `1 - random()` is in (0, 1], which keeps the logarithm finite
+    return time.time() - delta * beta * math.log(1.0 - random.random()) >= expiry
+
+
+def _acquire_query_locks(
+    stack: ExitStack, cache_keys: Collection[str]
+) -> tuple[list[str], list[str]]:
+    """
+    Tries to take the lock of every cache key without waiting, and returns the keys that were
+    locked and the keys another process is already computing. Locks are released when ``stack``
+    is closed.
+    """
+    duration = options.get("snuba.query-cache.coalesce.lock-seconds")
+    acquired, contended = [], []
+    for cache_key in cache_keys:
+        lock = locks.get(f"{cache_key}:lock", duration=duration, name="snuba_query_cache")
+        try:
+            stack.enter_context(lock.acquire())
+        except UnableToAcquireLock:
+            contended.append(cache_key)
+        except Exception:
+            # The query cache is best effort, don't fail queries over the lock backend
+            logger.warning("snuba.query_cache.lock_failed", exc_info=True)
+            acquired.append(cache_key)
+        else:
+            acquired.append(cache_key)
+    return acquired, contended
+
+
+def _wait_for_cached_results(cache_keys: Collection[str]) -> dict[str, Any]:
+    """
+    Polls the cache for the results of queries which other processes are running, until all of
+    them are filled or `snuba.query-cache.coalesce.wait-seconds` is up.
+    """
+    deadline = time.monotonic() + options.get("snuba.query-cache.coalesce.wait-seconds")
+    pending = set(cache_keys)
+    found = {}
+    while pending and time.monotonic() < deadline:
+        time.sleep(_QUERY_CACHE_POLL_INTERVAL)
+        for cache_key, value in cache.get_many(list(pending)).items():
+            if value is not None:
+                found[cache_key] = _decode_cached_result(value)[0]
+                pending.discard(cache_key)
+    return found
+
+
 def _apply_cache_and_build_results(
     snuba_param_list: Sequence[RequestQueryBody],
     referrer: str | None = None,
@@ -942,38 +1077,73 @@ def _apply_cache_and_build_results(
     if referrer:
         headers["referer"] = referrer
 
+    if not use_cache:
+        return _bulk_snuba_query(snuba_param_list, headers)
+
     # Store the original position of the query so that we can maintain the order
     query_param_list = list(enumerate(snuba_param_list))
 
-    results = []
+    results: list[tuple[int, Any]] = []
+    metric_tags = {"referrer": referrer} if referrer else None
+
+    cache_keys = [get_cache_key(query_params[0]) for _, query_params in query_param_list]
+    cache_data = cache.get_many(cache_keys)
+    to_query: list[tuple[int, RequestQueryBody, str]] = []
+    # Hits chosen for an early refresh, which are served from the cache if another process is
+    # already refreshing them.
+    stale: dict[str, Any] = {}
+    for (query_pos, query_params), cache_key in zip(query_param_list, cache_keys):
+        cached_value = cache_data.get(cache_key)
+        cached_result = None
+        if cached_value is not None:
+            try:
+                cached_result, expiry, delta = _decode_cached_result(cached_value)
+            except Exception:
+                logger.warning("snuba.query_cache.decode_failed", exc_info=True)
+            else:
+                if _should_refresh_early(expiry, delta):
+                    metrics.incr("snuba.query_cache.early_refresh", tags=metric_tags)
+                    stale[cache_key] = cached_result
+                    cached_result = None
 
-    if use_cache:
-        cache_keys = [get_cache_key(query_params[0]) for _, query_params in query_param_list]
-        cache_data = cache.get_many(cache_keys)
-        to_query: list[tuple[int, RequestQueryBody, str | None]] = []
-        for (query_pos, query_params), cache_key in zip(query_param_list, cache_keys):
-            cached_result = cache_data.get(cache_key)
-            metric_tags = {"referrer": referrer} if referrer else None
-            if cached_result is None:
+        if cached_result is None:
+            if cache_key not in stale:
                 metrics.incr("snuba.query_cache.miss", tags=metric_tags)
-                to_query.append((query_pos, query_params, cache_key))
-            else:
-                metrics.incr("snuba.query_cache.hit", tags=metric_tags)
-                results.append((query_pos, json.loads(cached_result)))
-    else:
-        to_query = [(query_pos, query_params, None) for query_pos, query_params in query_param_list]
-
-    if to_query:
-        query_results = _bulk_snuba_query([item[1] for item in to_query], headers)
-        for result, (query_pos, _, opt_cache_key) in zip(query_results, to_query):
-            if opt_cache_key:
-                cache.set(
-                    opt_cache_key, json.dumps(result), settings.SENTRY_SNUBA_CACHE_TTL_SECONDS
+            to_query.append((query_pos, query_params, cache_key))
+        else:
+            metrics.incr("snuba.query_cache.hit", tags=metric_tags)
+            results.append((query_pos, cached_result))
+
+    with ExitStack() as stack:
+        if to_query and options.get("snuba.query-cache.coalesce.enabled"):
+            acquired, contended = _acquire_query_locks(stack, {key for _, _, key in to_query})
+            filled = {key: stale[key] for key in contended if key in stale}
+            filled.update(_wait_for_cached_results(set(contended) - filled.keys()))
+            metrics.incr("snuba.query_cache.coalesced", amount=len(filled), tags=metric_tags)
+            if len(filled) < len(contended):
+                metrics.incr(
+                    "snuba.query_cache.coalesce_timeout",
+                    amount=len(contended) - len(filled),
+                    tags=metric_tags,
                 )
-            results.append((query_pos, result))
+            remaining = []
+            for query_pos, query_params, cache_key in to_query:
+                if cache_key in filled:
+                    results.append((query_pos, filled[cache_key]))
+                else:
+                    remaining.append((query_pos, query_params, cache_key))
+            to_query = remaining
+
+        if to_query:
+            start = time.monotonic()
+            query_results = _bulk_snuba_query([item[1] for item in to_query], headers)
+            delta = time.monotonic() - start
+            for result, (query_pos, _, cache_key) in zip(query_results, to_query):
+                _set_cached_result(cache_key, result, delta)
+                results.append((query_pos, result))
 
     # Sort so that we get the results back in the original param list order
-    results.sort()
+    results.sort(key=lambda item: item[0])
     # Drop the sort order val
     return [result[1] for result in results]
 
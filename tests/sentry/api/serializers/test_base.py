@@ -1,5 +1,9 @@
+from unittest import mock
+
 from sentry.api.serializers import Serializer, serialize
+from sentry.api.serializers.base import OMIT, memoized_serialization
 from sentry.testutils.cases import TestCase
+from sentry.testutils.helpers import override_options
 from sentry.testutils.silo import control_silo_test
 
 
@@ -33,6 +37,38 @@ class ParentSerializer(Serializer):
         }
 
 
+class Bar:
+    def __init__(self, id):
+        self.id = id
+
+
+class BarSerializer(Serializer):
+    def serialize(self, obj, attrs, user, **kwargs):
+        return {"id": obj.id, "odd": obj.id % 2 == 1} if obj.id % 2 else {"id": obj.id}
+
+
+class ColumnarBarSerializer(BarSerializer):
+    def serialize_columns(self, item_list, attrs, user, **kwargs):
+        return {
+            "id": [obj.id for obj in item_list],
+            "odd": [True if obj.id % 2 else OMIT for obj in item_list],
+        }
+
+
+class PerObjectBarSerializer(ColumnarBarSerializer):
+    def serialize(self, obj, attrs, user, **kwargs):
+        return {"id": str(obj.id)}
+
+
+class FailingColumnarBarSerializer(BarSerializer):
+    def serialize_columns(self, item_list, attrs, user, **kwargs):
+        raise Exception
+
+
+class MemoizedBarSerializer(BarSerializer):
+    memoize = True
+
+
 @control_silo_test
 class BaseSerializerTest(TestCase):
     def test_serialize(self):
@@ -78,3 +114,44 @@ class BaseSerializerTest(TestCase):
         result = serialize(foo, serializer=ParentSerializer())
         assert result["parent"] == "something"
         assert result["child"] is None
+
+    def test_columnar(self):
+        bars = [Bar(1), None, Bar(2)]
+        expected = [{"id": 1, "odd": True}, None, {"id": 2}]
+        assert serialize(bars, serializer=BarSerializer()) == expected
+        assert serialize(bars, serializer=ColumnarBarSerializer()) == expected
+        assert serialize(bars, serializer=FailingColumnarBarSerializer()) == expected
+
+        # Subclasses overriding `serialize` aren't columnar anymore
+        assert serialize(bars, serializer=PerObjectBarSerializer()) == [
+            {"id": "1"},
+            None,
+            {"id": "2"},
+        ]
+
+    @override_options({"api.serializers.memoize": True})
+    def test_memoized(self):
+        serializer = MemoizedBarSerializer()
+        with mock.patch.object(
+            MemoizedBarSerializer, "serialize", autospec=True, side_effect=BarSerializer.serialize
+        ) as serialize_mock:
+            with memoized_serialization():
+                assert serialize([Bar(1), Bar(2)], serializer=serializer) == [
+                    {"id": 1, "odd": True},
+                    {"id": 2},
+                ]
+                first = serialize(Bar(1), serializer=serializer)
+                assert first == {"id": 1, "odd": True}
+                assert serialize_mock.call_count == 2
+
+                # Results are copies
+                first["id"] = 3
+                assert serialize(Bar(1), serializer=serializer) == {"id": 1, "odd": True}
+                assert serialize_mock.call_count == 2
+
+                # A different user is a different result
+                serialize(Bar(1), user=self.create_user(), serializer=serializer)
+                assert serialize_mock.call_count == 3
+
+            serialize(Bar(1), serializer=serializer)
+            assert serialize_mock.call_count == 4
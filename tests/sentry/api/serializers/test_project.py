@@ -11,8 +11,10 @@ from sentry import features
 from sentry.api.serializers import serialize
 from sentry.api.serializers.models.project import (
     PROJECT_FEATURES_NOT_USED_ON_FRONTEND,
+    PROJECT_FLAG_KEYS,
     UNUSED_ON_FRONTEND_FEATURES,
     DetailedProjectSerializer,
+    ProjectSerializer,
     ProjectSummarySerializer,
     ProjectWithOrganizationSerializer,
     ProjectWithTeamSerializer,
@@ -262,6 +264,52 @@ class ProjectSerializerTest(TestCase):
         assert_has_features(late_red, [red_flag])
         assert_has_features(late_blue, [blue_flag])
 
+    def test_columns_match_per_object(self):
+        self.create_member(user=self.user, organization=self.organization, role="owner")
+        other = self.create_project(organization=self.organization)
+        other.update(flags=F("flags").bitor(Project.flags.has_replays))
+        other.refresh_from_db()
+        projects = [self.project, other]
+
+        serializer = ProjectSerializer()
+        attrs = serializer.get_attrs(projects, self.user)
+        per_object = [
+            serializer.serialize(project, attrs[project], self.user) for project in projects
+        ]
+
+        with mock.patch.object(ProjectSerializer, "serialize") as serialize_mock:
+            assert serialize(projects, self.user, serializer) == per_object
+        assert not serialize_mock.called
+
+    def test_subclasses_match_columns(self):
+        self.create_member(user=self.user, organization=self.organization, role="owner")
+        other = self.create_project(organization=self.organization)
+        other.update(flags=F("flags").bitor(Project.flags.has_insights_db))
+        other.refresh_from_db()
+        projects = [self.project, other]
+
+        for serializer in (ProjectSerializer(), ProjectSerializer(stats_period="24h")):
+            attrs = serializer.get_attrs(projects, self.user)
+            per_object = [
+                serializer.serialize(project, attrs[project], self.user) for project in projects
+            ]
+            assert serialize(projects, self.user, serializer) == per_object
+
+        columns = serialize(projects, self.user, ProjectSerializer())
+        for serializer in (
+            ProjectWithOrganizationSerializer(),
+            ProjectWithTeamSerializer(),
+            DetailedProjectSerializer(),
+        ):
+            for result, expected in zip(serialize(projects, self.user, serializer), columns):
+                assert {key: result[key] for key in expected} == expected
+
+        for result, expected in zip(
+            serialize(projects, self.user, ProjectSummarySerializer()), columns
+        ):
+            for key, _ in PROJECT_FLAG_KEYS:
+                assert result[key] == expected[key]
+
 
 class ProjectWithTeamSerializerTest(TestCase):
     def test_simple(self):
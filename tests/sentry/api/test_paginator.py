@@ -26,6 +26,7 @@ from sentry.api.paginator import (
     CombinedQuerysetPaginator,
     DateTimePaginator,
     GenericOffsetPaginator,
+    KeysetPaginator,
     OffsetPaginator,
     Paginator,
     SequencePaginator,
@@ -38,7 +39,7 @@ from sentry.models.user import User
 from sentry.testutils.cases import APITestCase, SnubaTestCase, TestCase
 from sentry.testutils.helpers.datetime import iso_format
 from sentry.testutils.silo import control_silo_test
-from sentry.utils.cursors import Cursor
+from sentry.utils.cursors import Cursor, StringCursor
 from sentry.utils.snuba import raw_snql_query
 
 
@@ -198,6 +199,99 @@ class OffsetPaginatorTest(TestCase):
             paginator.get_result()
 
 
+@control_silo_test
+class KeysetPaginatorTest(TestCase):
+    def test_simple(self):
+        res1 = self.create_user("foo@example.com")
+        res2 = self.create_user("bar@example.com")
+        res3 = self.create_user("baz@example.com")
+
+        paginator = KeysetPaginator(User.objects.all(), "id")
+        result1 = paginator.get_result(limit=1, cursor=None)
+        assert list(result1) == [res1]
+        assert result1.next
+        assert not result1.prev
+
+        result2 = paginator.get_result(limit=1, cursor=result1.next)
+        assert list(result2) == [res2]
+        assert result2.next
+        assert result2.prev
+
+        result3 = paginator.get_result(limit=1, cursor=result2.next)
+        assert list(result3) == [res3]
+        assert not result3.next
+        assert result3.prev
+
+        result4 = paginator.get_result(limit=1, cursor=result3.next)
+        assert list(result4) == []
+        assert not result4.next
+        assert result4.prev
+
+        # The empty page goes back to the last row
+        result5 = paginator.get_result(limit=1, cursor=result4.prev)
+        assert list(result5) == [res3]
+        assert result5.prev
+
+        result6 = paginator.get_result(limit=1, cursor=result5.prev)
+        assert list(result6) == [res2]
+        assert result6.next
+        assert result6.prev
+
+        result7 = paginator.get_result(limit=1, cursor=result6.prev)
+        assert list(result7) == [res1]
+        assert result7.next
+        assert not result7.prev
+
+    def test_ties_are_broken_by_id(self):
+        joined = timezone.now()
+        users = [self.create_user(f"user{i}@example.com", date_joined=joined) for i in range(3)]
+        older = self.create_user("older@example.com", date_joined=joined - timedelta(days=1))
+
+        paginator = KeysetPaginator(User.objects.all(), "-date_joined")
+        seen = []
+        cursor = None
+        while True:
+            result = paginator.get_result(limit=2, cursor=cursor)
+            seen.extend(result)
+            if not result.next:
+                break
+            cursor = result.next
+        assert seen == sorted(users, key=lambda u: u.id, reverse=True) + [older]
+
+        # Going back from the second page
+        result = paginator.get_result(limit=2, cursor=Cursor(cursor.value, 0, True))
+        assert list(result) == sorted(users, key=lambda u: u.id, reverse=True)[:1]
+        assert not result.prev
+
+    def test_cursor_round_trip(self):
+        self.create_user("foo@example.com")
+        self.create_user("bar@example.com")
+
+        paginator = KeysetPaginator(User.objects.all(), ("-date_joined", "email"))
+        result = paginator.get_result(limit=1)
+        cursor = StringCursor.from_string(str(result.next))
+        assert list(paginator.get_result(limit=1, cursor=cursor)) == list(
+            User.objects.order_by("-date_joined", "email", "id")[1:2]
+        )
+
+    def test_invalid_cursor(self):
+        paginator = KeysetPaginator(User.objects.all(), "id")
+        with pytest.raises(BadPaginationError):
+            paginator.get_result(cursor=StringCursor("100", 1, False))
+
+    def test_fallback(self):
+        self.create_user("foo@example.com")
+        res2 = self.create_user("bar@example.com")
+
+        queryset = User.objects.all()
+        paginator = KeysetPaginator(
+            queryset, "id", fallback=OffsetPaginator(queryset, order_by="id")
+        )
+        # A cursor handed out by the offset paginator, for its second page
+        result = paginator.get_result(limit=1, cursor=StringCursor.from_string("1:1:0"))
+        assert list(result) == [res2]
+
+
 @control_silo_test
 class DateTimePaginatorTest(TestCase):
     def test_ascending(self):
@@ -3,7 +3,7 @@ from unittest import mock
 
 from django.utils import timezone
 
-from sentry.buffer.base import Buffer
+from sentry.buffer.base import Buffer, BufferedIncr
 from sentry.db import models
 from sentry.models.group import Group
 from sentry.models.organization import Organization
@@ -77,3 +77,48 @@ class BufferTest(TestCase):
         self.buf.process(Group, columns, filters, {"last_seen": the_date}, signal_only=True)
         group.refresh_from_db()
         assert group.times_seen == prev_times_seen
+
+    def test_process_many_bulk_updates_groups(self):
+        project = Project(id=1)
+        group = Group.objects.create(project=project)
+        other_group = Group.objects.create(project=project)
+        the_date = timezone.now() + timedelta(days=5)
+        self.buf.process_many(
+            [
+                BufferedIncr(Group, {"times_seen": 2}, {"id": group.id}, {"last_seen": the_date}),
+                BufferedIncr(Group, {"times_seen": 3}, {"pk": group.id}),
+                BufferedIncr(Group, {"times_seen": 1}, {"id": other_group.id}),
+                # deleted groups are ignored
+                BufferedIncr(Group, {"times_seen": 1}, {"id": other_group.id + 1000}),
+            ]
+        )
+        group_ = Group.objects.get(id=group.id)
+        assert group_.times_seen == group.times_seen + 5
+        assert group_.last_seen == the_date
+        assert group_.score == Group.calculate_score(group.times_seen + 5, the_date)
+        assert Group.objects.get(id=other_group.id).times_seen == other_group.times_seen + 1
+        # the group cache is refreshed like it is for `process`
+        assert Group.objects.get_from_cache(id=group.id).times_seen == group.times_seen + 5
+
+    def test_process_many_falls_back_to_process(self):
+        org = Organization.objects.create(slug="test-org")
+        project = Project.objects.create(organization=org, slug="test-project")
+        release = Release.objects.create(organization=org, version="abcdefg")
+        filters = {"project_id": project.id, "release_id": release.id}
+        with mock.patch.object(self.buf, "process", wraps=self.buf.process) as process:
+            self.buf.process_many([BufferedIncr(ReleaseProject, {"new_groups": 1}, filters)])
+        process.assert_called_once_with(ReleaseProject, {"new_groups": 1}, filters, None, None)
+        assert ReleaseProject.objects.filter(new_groups=1, **filters).exists()
+
+    @mock.patch("sentry.buffer.base.buffer_incr_complete")
+    def test_process_many_sends_signals(self, buffer_incr_complete):
+        group = Group.objects.create(project=Project(id=1))
+        self.buf.process_many([BufferedIncr(Group, {"times_seen": 1}, {"id": group.id})])
+        buffer_incr_complete.send_robust.assert_called_once_with(
+            model=Group,
+            columns={"times_seen": 1},
+            filters={"id": group.id},
+            extra=None,
+            created=False,
+            sender=Group,
+        )
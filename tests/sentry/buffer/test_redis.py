@@ -8,6 +8,7 @@ import pytest
 from django.utils import timezone
 
 from sentry import options
+from sentry.buffer.base import BufferedIncr
 from sentry.buffer.redis import BufferHookEvent, RedisBuffer, redis_buffer_registry
 from sentry.models.group import Group
 from sentry.models.project import Project
@@ -367,6 +368,35 @@ class TestRedisBuffer:
         self.buf.process("foo")
         process.assert_called_once_with(mock.Mock, {"times_seen": 1}, {"pk": 1}, {}, True)
 
+    @mock.patch("sentry.buffer.base.Buffer.process_many")
+    def test_process_batch_flush(self, process_many):
+        self.buf.batch_flush = True
+        client = get_cluster_routing_client(self.buf.cluster, self.buf.is_redis_cluster)
+        self.buf.incr(Group, {"times_seen": 1}, {"pk": 1})
+        self.buf.incr(Group, {"times_seen": 2}, {"pk": 2}, {"message": "foo"})
+        keys = [self.buf._make_key(Group, {"pk": 1}), self.buf._make_key(Group, {"pk": 2})]
+        # a key that is being processed elsewhere is left alone
+        locked_key = self.buf._make_key(Group, {"pk": 3})
+        self.buf.incr(Group, {"times_seen": 3}, {"pk": 3})
+        client.set(self.buf._make_lock_key(locked_key), "1")
+
+        self.buf.process(batch_keys=[*keys, locked_key, "b:k:missing"])
+
+        process_many.assert_called_once_with(
+            [
+                BufferedIncr(Group, {"times_seen": 1}, {"pk": 1}, {}, None),
+                BufferedIncr(Group, {"times_seen": 2}, {"pk": 2}, {"message": "foo"}, None),
+            ]
+        )
+        for key in keys:
+            assert not client.exists(key)
+            assert not client.exists(self.buf._make_lock_key(key))
+        assert client.exists(locked_key)
+        pending = client.zrange("b:p", 0, -1)
+        if not self.buf.is_redis_cluster:
+            pending = [k.decode() for k in pending]
+        assert pending == [locked_key]
+
 
 #    @mock.patch("sentry.buffer.redis.RedisBuffer._make_key", mock.Mock(return_value="foo"))
 #    def test_incr_uses_signal_only(self):
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+from typing import Any
+from unittest import mock
+
+from sentry import event_manager
+from sentry.event_manager import EventManager, _pull_out_data, save_error_events_batch
+from sentry.exceptions import HashDiscarded
+from sentry.models.environment import Environment
+from sentry.models.group import Group
+from sentry.models.groupenvironment import GroupEnvironment
+from sentry.models.grouphash import GroupHash
+from sentry.models.grouprelease import GroupRelease
+from sentry.models.grouptombstone import GroupTombstone
+from sentry.models.project import Project
+from sentry.models.releaseenvironment import ReleaseEnvironment
+from sentry.models.releaseprojectenvironment import ReleaseProjectEnvironment
+from sentry.models.releases.release_project import ReleaseProject
+from sentry.testutils.cases import TestCase
+from sentry.testutils.helpers.datetime import before_now, iso_format
+from tests.sentry.event_manager.test_event_manager import make_event
+
+
+class SaveErrorEventsBatchTest(TestCase):
+    def make_jobs(self, *events: dict[str, Any]) -> list[dict[str, Any]]:
+        jobs = []
+        for data in events:
+            manager = EventManager(make_event(**data), project=self.project)
+            manager.normalize()
+            jobs.append(
+                {
+                    "data": manager.get_data(),
+                    "project_id": self.project.id,
+                    "raw": False,
+                    "start_time": None,
+                }
+            )
+        _pull_out_data(jobs, self.projects)
+        return jobs
+
+    @property
+    def projects(self) -> dict[int, Project]:
+        return {self.project.id: self.project}
+
+    @mock.patch("sentry.event_manager.eventstream.backend.insert")
+    def test_shares_lookups_across_batch(self, eventstream_insert: mock.MagicMock) -> None:
+        jobs = self.make_jobs(
+            *(
+                {
+                    "message": "foo",
+                    "fingerprint": ["group-1"],
+                    "release": "1.0",
+                    "environment": "prod",
+                    "timestamp": iso_format(before_now(seconds=i)),
+                }
+                for i in range(3)
+            ),
+            {"message": "bar", "fingerprint": ["group-2"], "release": "1.0", "environment": "prod"},
+        )
+
+        with (
+            mock.patch(
+                "sentry.event_manager.Environment.get_or_create", wraps=Environment.get_or_create
+            ) as environment_get_or_create,
+            mock.patch(
+                "sentry.event_manager.GroupRelease.get_or_create",
+                wraps=GroupRelease.get_or_create,
+            ) as group_release_get_or_create,
+        ):
+            saved_jobs = save_error_events_batch(jobs, self.projects).saved
+
+        assert len(saved_jobs) == 4
+        assert environment_get_or_create.call_count == 1
+        assert group_release_get_or_create.call_count == 2
+        assert eventstream_insert.call_count == 4
+
+        groups = [job["groups"][0] for job in saved_jobs]
+        assert groups[0].group.id == groups[1].group.id == groups[2].group.id
+        assert groups[3].group.id != groups[0].group.id
+        assert [group_info.is_new for group_info in groups] == [True, False, False, True]
+        assert [group_info.is_new_group_environment for group_info in groups] == [
+            True,
+            False,
+            False,
+            True,
+        ]
+        assert groups[0].group_release is groups[1].group_release
+        assert Group.objects.filter(project=self.project).count() == 2
+        assert GroupEnvironment.objects.filter(group_id=groups[0].group.id).count() == 1
+
+        for job in saved_jobs:
+            event = job["event"]
+            assert event.group_id == job["groups"][0].group.id
+            assert event.data.get("nodestore_insert")
+
+    @mock.patch("sentry.event_manager.eventstream.backend.insert")
+    def test_discarded_event_is_dropped(self, eventstream_insert: mock.MagicMock) -> None:
+        (job,) = self.make_jobs({"message": "foo", "fingerprint": ["discarded"]})
+        (saved_job,) = save_error_events_batch([job], self.projects).saved
+
+        group = saved_job["groups"][0].group
+        tombstone = GroupTombstone.objects.create(
+            project_id=group.project_id,
+            level=group.level,
+            message=group.message,
+            culprit=group.culprit,
+            data=group.data,
+            previous_group_id=group.id,
+        )
+        GroupHash.objects.filter(group=group).update(group=None, group_tombstone_id=tombstone.id)
+        eventstream_insert.reset_mock()
+
+        jobs = self.make_jobs(
+            {"message": "foo", "fingerprint": ["discarded"]},
+            {"message": "bar", "fingerprint": ["kept"]},
+        )
+        saved_jobs = save_error_events_batch(jobs, self.projects).saved
+
+        assert [job["event"].event_id for job in saved_jobs] == [jobs[1]["event"].event_id]
+        assert eventstream_insert.call_count == 1
+
+    @mock.patch("sentry.event_manager.eventstream.backend.insert")
+    def test_release_models_span_batch(self, eventstream_insert: mock.MagicMock) -> None:
+        newer = before_now(minutes=1).replace(microsecond=0)
+        older = before_now(minutes=10).replace(microsecond=0)
+        jobs = self.make_jobs(
+            *(
+                {
+                    "message": "foo",
+                    "fingerprint": ["group-1"],
+                    "release": "1.0",
+                    "environment": "prod",
+                    "timestamp": iso_format(timestamp),
+                }
+                for timestamp in (newer, older)
+            )
+        )
+        (saved_job, _) = save_error_events_batch(jobs, self.projects).saved
+
+        # Rows are created with the oldest event of the batch, and bumped to its newest one
+        release_environment = ReleaseEnvironment.objects.get(release_id=saved_job["release"].id)
+        assert release_environment.first_seen == older
+        assert release_environment.last_seen == newer
+        release_project_environment = ReleaseProjectEnvironment.objects.get(
+            release_id=saved_job["release"].id
+        )
+        assert release_project_environment.first_seen == older
+        assert release_project_environment.last_seen == newer
+        assert saved_job["groups"][0].group_release.first_seen == older
+        assert saved_job["groups"][0].group_release.last_seen == newer
+
+    @mock.patch("sentry.event_manager.logger")
+    @mock.patch("sentry.event_manager.eventstream.backend.insert")
+    def test_discarded_event_is_logged(
+        self, eventstream_insert: mock.MagicMock, logger: mock.MagicMock
+    ) -> None:
+        (job,) = self.make_jobs({"message": "foo"})
+        with mock.patch(
+            "sentry.event_manager.assign_event_to_group",
+            side_effect=HashDiscarded("Load shedding group creation", reason="load_shed"),
+        ):
+            assert save_error_events_batch([job], self.projects).saved == []
+
+        logger.info.assert_any_call(
+            "save_error_events_batch.discarded",
+            extra={
+                "event_id": job["event"].event_id,
+                "project_id": self.project.id,
+                "reason": "load_shed",
+                "tombstone_id": None,
+            },
+        )
+        assert not eventstream_insert.called
+
+    @mock.patch("sentry.event_manager.eventstream.backend.insert")
+    def test_failed_event_is_saved_again_alone(self, eventstream_insert: mock.MagicMock) -> None:
+        jobs = self.make_jobs(
+            *(
+                {"message": "foo", "fingerprint": [fingerprint], "release": "1.0"}
+                for fingerprint in ("group-1", "group-2", "group-1")
+            )
+        )
+        failing_event_id = jobs[1]["event"].event_id
+
+        def assign_event_to_group(event, job, metric_tags):
+            if event.event_id == failing_event_id:
+                raise ValueError("grouping failed")
+            return original_assign_event_to_group(event=event, job=job, metric_tags=metric_tags)
+
+        original_assign_event_to_group = event_manager.assign_event_to_group
+        with mock.patch(
+            "sentry.event_manager.assign_event_to_group", side_effect=assign_event_to_group
+        ):
+            result = save_error_events_batch(jobs, self.projects)
+
+        assert [job["event"].event_id for job in result.saved] == [
+            jobs[0]["event"].event_id,
+            jobs[2]["event"].event_id,
+        ]
+        assert result.failed == [jobs[1]]
+
+        # Only the failed event is saved again, so nothing is counted twice
+        retried = save_error_events_batch(result.failed, self.projects)
+        assert retried.saved == [jobs[1]]
+        assert retried.failed == []
+
+        group_1 = result.saved[0]["groups"][0].group
+        group_2 = jobs[1]["groups"][0].group
+        assert Group.objects.get(id=group_1.id).times_seen == 2
+        assert Group.objects.get(id=group_2.id).times_seen == 1
+        assert ReleaseProject.objects.get(release_id=jobs[1]["release"].id).new_groups == 2
+        assert eventstream_insert.call_count == 3
+
+    @mock.patch("sentry.event_manager.logger")
+    @mock.patch("sentry.event_manager.eventstream.backend.insert")
+    def test_errors_after_grouping_are_not_retried(
+        self, eventstream_insert: mock.MagicMock, logger: mock.MagicMock
+    ) -> None:
+        jobs = self.make_jobs({"message": "foo"}, {"message": "bar"})
+        with mock.patch(
+            "sentry.event_manager._nodestore_save_many", side_effect=ValueError("nodestore down")
+        ):
+            result = save_error_events_batch(jobs, self.projects)
+
+        assert result.saved == []
+        assert result.failed == []
+        logger.exception.assert_any_call("save_error_events_batch.save_failed", extra={"events": 2})
+        assert not eventstream_insert.called
@@ -0,0 +1,65 @@
+import pytest
+
+from sentry.eventstore.compressor import deduplicate
+from sentry.eventstore.processing.base import EventProcessingStore
+from sentry.testutils.helpers import override_options
+from sentry.testutils.pytest.fixtures import django_db_all
+from sentry.utils.kvstore.memory import MemoryKVStorage
+
+
+def make_event(event_id):
+    return {
+        "event_id": event_id,
+        "project": 1,
+        "modules": {"foo": "1.0", "bar": "2.0"},
+        "debug_meta": {
+            "images": [
+                {
+                    "type": "macho",
+                    "image_addr": "0x1000",
+                    "code_file": "/usr/lib/libfoo.dylib",
+                    "debug_id": "e2f6bc5e-0d9f-4a9e-b0d1-2e8f7b1c6a11",
+                }
+            ]
+        },
+    }
+
+
+@pytest.mark.parametrize("compress", [True, False])
+@django_db_all
+def test_roundtrip(compress):
+    store = EventProcessingStore(MemoryKVStorage())
+    event = make_event("a" * 32)
+
+    with override_options({"eventstore.processing.compress": compress}):
+        key = store.store(event)
+
+    assert key == f"e:{'a' * 32}:1"
+    assert store.get(key) == event
+    assert store.exists(event)
+
+    # Events written with either encoding are read the same
+    with override_options({"eventstore.processing.compress": not compress}):
+        assert store.get(key) == event
+
+
+@django_db_all
+@override_options({"eventstore.processing.deduplicate": True})
+def test_deduplicate():
+    inner = MemoryKVStorage()
+    store = EventProcessingStore(inner)
+    events = [make_event("a" * 32), make_event("b" * 32)]
+
+    keys = store.store_many(events)
+
+    # The events passed in are left untouched
+    assert events == [make_event("a" * 32), make_event("b" * 32)]
+    assert [store.get(key) for key in keys] == events
+
+    # Both events share their debug images and modules
+    checksums = list(deduplicate(make_event("c" * 32))[1])
+    assert len(checksums) == 2
+    assert all(inner.get(f"e:shared:{checksum}") is not None for checksum in checksums)
+
+    inner.delete(f"e:shared:{checksums[0]}")
+    assert store.get(keys[0]) is None
@@ -52,3 +52,21 @@ def test_basic():
             }
         },
     )
+
+
+def test_modules():
+    data = {"modules": {"foo": "1.0", "bar": "2.0"}, "platform": "python"}
+    new_data, extra_keys = deduplicate(dict(data))
+
+    assert "modules" not in new_data
+    assert list(extra_keys.values()) == [data["modules"]]
+    _assert_roundtrip(data)
+    _assert_roundtrip({"modules": None})
+
+
+def test_input_not_modified():
+    data = {"debug_meta": {"images": [{"image_addr": "0xdeadbeef", "debug_id": "1234abcdef"}]}}
+    deduplicate(dict(data))
+    assert data == {
+        "debug_meta": {"images": [{"image_addr": "0xdeadbeef", "debug_id": "1234abcdef"}]}
+    }
@@ -16,6 +16,7 @@ from sentry.features.base import (
 )
 from sentry.models.user import User
 from sentry.testutils.cases import TestCase
+from sentry.testutils.helpers import override_options
 from sentry.users.services.user import RpcUser
 
 
@@ -343,3 +344,87 @@ class FeatureManagerTest(TestCase):
         manager = features.FeatureManager()
         with pytest.raises(NotImplementedError):
             manager.add("users:some-test", OrganizationFeature, FeatureHandlerStrategy.OPTIONS)
+
+
+class FeatureEvaluationCacheTest(TestCase):
+    def create_counting_handler(self, flags, result=True):
+        class CountingHandler(features.BatchFeatureHandler):
+            features = set(flags)
+
+            def __init__(self):
+                self.calls = 0
+
+            def _check_for_batch(self, feature_name, organization, actor):
+                self.calls += 1
+                return result
+
+            def batch_has(self, *a, **k):
+                raise NotImplementedError("unreachable")
+
+        return CountingHandler()
+
+    def setUp(self):
+        super().setUp()
+        self.manager = features.FeatureManager()
+        self.manager.add("organizations:cached", OrganizationFeature)
+        self.manager.add("projects:first", ProjectFeature)
+        self.manager.add("projects:second", ProjectFeature)
+        self.handler = self.create_counting_handler(
+            ["organizations:cached", "projects:first", "projects:second"]
+        )
+        self.manager.add_handler(self.handler)
+
+    def test_disabled(self):
+        with features.feature_evaluation_cache():
+            assert self.manager.has("organizations:cached", self.organization, actor=self.user)
+            assert self.manager.has("organizations:cached", self.organization, actor=self.user)
+        assert self.handler.calls == 2
+
+    @override_options({"features.evaluation-cache.enabled": True})
+    def test_reuses_results(self):
+        with features.feature_evaluation_cache():
+            assert self.manager.has("organizations:cached", self.organization, actor=self.user)
+            assert self.manager.has("organizations:cached", self.organization, actor=self.user)
+            assert self.handler.calls == 1
+
+            # Another actor is checked again
+            assert self.manager.has("organizations:cached", self.organization)
+            assert self.handler.calls == 2
+
+        assert self.manager.has("organizations:cached", self.organization, actor=self.user)
+        assert self.handler.calls == 3
+
+    @override_options({"features.evaluation-cache.enabled": True})
+    def test_batches_projects(self):
+        projects = [self.create_project(organization=self.organization) for _ in range(3)]
+
+        with features.feature_evaluation_cache():
+            assert self.manager.has_for_batch(
+                "projects:first", self.organization, projects, actor=self.user
+            ) == {project: True for project in projects}
+            assert self.handler.calls == 1
+
+            for project in projects:
+                assert self.manager.has("projects:first", project, actor=self.user)
+            assert self.handler.calls == 1
+
+            # The projects seen so far are checked together
+            for project in projects:
+                assert self.manager.has("projects:second", project, actor=self.user)
+            assert self.handler.calls == 2
+
+    @override_options({"features.evaluation-cache.enabled": True})
+    def test_undecided_projects_are_batched_once(self):
+        self.manager.add("projects:undecided", ProjectFeature)
+        undecided = self.create_counting_handler(["projects:undecided"], result=None)
+        self.manager.add_handler(undecided)
+        projects = [self.create_project(organization=self.organization) for _ in range(3)]
+
+        with features.feature_evaluation_cache():
+            for project in projects:
+                assert self.manager.has("projects:first", project, actor=self.user)
+
+            # One batch for every seen project, then the undecided ones go through `_has`
+            for project in projects:
+                assert not self.manager.has("projects:undecided", project, actor=self.user)
+            assert undecided.calls == 1 + len(projects)
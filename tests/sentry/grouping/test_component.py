@@ -0,0 +1,69 @@
+from sentry.grouping.component import GroupingComponent
+from sentry.grouping.utils import hash_from_values
+
+
+def make_stacktrace() -> tuple[GroupingComponent, GroupingComponent]:
+    module = GroupingComponent(id="module", values=["foo.bar"])
+    frames = [
+        GroupingComponent(
+            id="frame", values=[module, GroupingComponent(id="function", values=["baz"])]
+        ),
+        GroupingComponent(id="frame", values=[GroupingComponent(id="function", values=["qux"])]),
+    ]
+    return GroupingComponent(id="stacktrace", values=frames), module
+
+
+def test_get_hash():
+    stacktrace, _ = make_stacktrace()
+
+    assert list(stacktrace.iter_values()) == ["foo.bar", "baz", "qux"]
+    assert stacktrace.get_hash() == hash_from_values(["foo.bar", "baz", "qux"])
+    assert stacktrace.get_hash() == hash_from_values(["foo.bar", "baz", "qux"])
+    assert stacktrace.description == "stack-trace"
+
+
+def test_update_invalidates_ancestors():
+    stacktrace, module = make_stacktrace()
+    stacktrace.get_hash()
+
+    module.update(contributes=False)
+
+    assert list(stacktrace.iter_values()) == ["baz", "qux"]
+    assert stacktrace.get_hash() == hash_from_values(["baz", "qux"])
+
+
+def test_update_invalidates_description():
+    stacktrace, _ = make_stacktrace()
+    exception = GroupingComponent(id="exception", values=[stacktrace])
+    assert exception.description == "exception stack-trace"
+
+    stacktrace.update(contributes=False)
+
+    assert exception.description == "exception"
+    assert exception.get_hash() is not None
+    assert list(exception.iter_values()) == []
+
+
+def test_shallow_copy():
+    stacktrace, _ = make_stacktrace()
+    copy = stacktrace.shallow_copy()
+
+    assert copy.values == stacktrace.values
+    assert copy.values is not stacktrace.values
+    assert copy.get_hash() == stacktrace.get_hash()
+
+    copy.update(values=copy.values[:1])
+
+    assert copy.get_hash() == hash_from_values(["foo.bar", "baz"])
+    assert stacktrace.get_hash() == hash_from_values(["foo.bar", "baz", "qux"])
+
+
+def test_deep_copy():
+    stacktrace, module = make_stacktrace()
+    copy = stacktrace.deep_copy()
+
+    copy.values[0].values[0].update(contributes=False)
+
+    assert module.contributes
+    assert copy.get_hash() == hash_from_values(["baz", "qux"])
+    assert stacktrace.get_hash() == hash_from_values(["foo.bar", "baz", "qux"])
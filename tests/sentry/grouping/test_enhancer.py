@@ -6,7 +6,7 @@ from unittest import mock
 import pytest
 
 from sentry.grouping.component import GroupingComponent
-from sentry.grouping.enhancer import Enhancements
+from sentry.grouping.enhancer import MATCH_CACHE, Enhancements, MatchCache
 from sentry.grouping.enhancer.exceptions import InvalidEnhancerConfig
 from sentry.grouping.enhancer.matchers import _cached, create_match_frame
 
@@ -511,3 +511,113 @@ def test_cached_with_kwargs():
     # Call with different kwargs order - call_count is still one:
     _cached(cache, foo, kw2=2, kw1=1)
     assert foo.call_count == 1
+
+
+def test_loads_is_cached():
+    enhancements = Enhancements.from_config_string("function:foo -app")
+    serialized = enhancements.dumps()
+
+    loaded = Enhancements.loads(serialized)
+    assert Enhancements.loads(serialized) is loaded
+    assert Enhancements.loads(serialized.encode("ascii")) is loaded
+    assert loaded._match_cache_key == enhancements._match_cache_key
+
+
+def test_match_cache():
+    enhancements = Enhancements.from_config_string(
+        """
+        function:foo -app
+        function:bar +app category=telemetry
+        """
+    )
+
+    def make_frames():
+        return [
+            {"function": "foo", "in_app": True},
+            {"function": "bar", "in_app": False},
+            {"function": "baz"},
+        ]
+
+    MATCH_CACHE.clear()
+    uncached_frames = make_frames()
+    enhancements.apply_modifications_to_frame(uncached_frames, "native", {})
+
+    with mock.patch.object(
+        enhancements, "rust_enhancements", wraps=enhancements.rust_enhancements
+    ) as rust_enhancements:
+        cached_frames = make_frames()
+        enhancements.apply_modifications_to_frame(cached_frames, "native", {})
+        assert not rust_enhancements.apply_modifications_to_frames.called
+
+        # The exception isn't part of the key, as no rule matches on it
+        enhancements.apply_modifications_to_frame(make_frames(), "native", {"type": "Error"})
+        assert not rust_enhancements.apply_modifications_to_frames.called
+
+    assert cached_frames == uncached_frames
+    assert [frame.get("in_app") for frame in cached_frames] == [False, True, None]
+    assert cached_frames[1]["data"]["category"] == "telemetry"
+
+
+def test_match_cache_assemble_stacktrace_component():
+    enhancements = Enhancements.from_config_string("function:foo -group")
+    frames = [{"function": "foo"}, {"function": "bar"}]
+
+    def assemble():
+        components = [
+            GroupingComponent(id="frame", values=[frame["function"]], contributes=True)
+            for frame in frames
+        ]
+        component, invert_stacktrace = enhancements.assemble_stacktrace_component(
+            components, frames, "native"
+        )
+        return component.as_dict(), invert_stacktrace
+
+    MATCH_CACHE.clear()
+    uncached = assemble()
+    with mock.patch.object(
+        enhancements, "rust_enhancements", wraps=enhancements.rust_enhancements
+    ) as rust_enhancements:
+        assert assemble() == uncached
+        assert not rust_enhancements.assemble_stacktrace_component.called
+
+    assert [value["contributes"] for value in uncached[0]["values"]] == [False, True]
+
+
+def test_match_cache_exception_keys():
+    enhancements = Enhancements.from_config_string(
+        """
+        error.type:ValueError -app
+        [ error.mechanism:generic ] | function:foo -group
+        """
+    )
+    assert enhancements._match_cache_exception_keys == ("mechanism", "ty")
+    assert Enhancements.from_config_string("function:foo -app")._match_cache_exception_keys == ()
+
+    frames = [{"function": "foo"}]
+    MATCH_CACHE.clear()
+    enhancements.apply_modifications_to_frame(frames, "native", {"type": "Error", "value": "a"})
+    with mock.patch.object(
+        enhancements, "rust_enhancements", wraps=enhancements.rust_enhancements
+    ) as rust_enhancements:
+        # Exception values aren't matched on, so they share a cache entry
+        enhancements.apply_modifications_to_frame(frames, "native", {"type": "Error", "value": "b"})
+        assert not rust_enhancements.apply_modifications_to_frames.called
+
+        # A different exception type is a different cache entry
+        enhancements.apply_modifications_to_frame(frames, "native", {"type": "ValueError"})
+        assert rust_enhancements.apply_modifications_to_frames.call_count == 1
+
+
+def test_match_cache_is_bounded_by_size():
+    cache = MatchCache(max_bytes=100_000)
+    value = ((None, None),)
+    for i in range(100):
+        cache.set(("config", "modifications", (), (b"x" * 10_000 + str(i).encode(),)), value)
+
+    assert cache.currsize <= 100_000
+    assert cache.get(("config", "modifications", (), (b"x" * 10_000 + b"99",))) == value
+    assert cache.get(("config", "modifications", (), (b"x" * 10_000 + b"0",))) is None
+
+    # Entries larger than the whole cache aren't stored
+    cache.set(("config", "modifications", (), (b"x" * 200_000,)), value)
+    assert cache.get(("config", "modifications", (), (b"x" * 200_000,))) is None
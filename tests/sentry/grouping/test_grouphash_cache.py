@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from typing import Any
+from unittest import mock
+
+from django.db import connections, router
+from django.test.utils import CaptureQueriesContext
+
+from sentry.event_manager import EventManager
+from sentry.eventstore.models import Event
+from sentry.grouping.ingest import grouphash_cache
+from sentry.models.group import Group
+from sentry.models.grouphash import GroupHash
+from sentry.tasks.merge import merge_groups
+from sentry.testutils.cases import TestCase
+from sentry.testutils.helpers import apply_feature_flag_on_cls, override_options
+from sentry.unmerge import PrimaryHashUnmergeReplacement
+
+
+@override_options({"grouping.grouphash-cache.enabled": True})
+@apply_feature_flag_on_cls("organizations:grouping-suppress-unnecessary-secondary-hash")
+class GrouphashCacheTest(TestCase):
+    def save_event(self, **data: Any) -> Event:
+        manager = EventManager({"message": "foo", "fingerprint": ["cached"], **data})
+        manager.normalize()
+        # Invalidation only happens once the transaction commits
+        with self.capture_on_commit_callbacks(execute=True):
+            return manager.save(self.project.id)
+
+    def test_roundtrip(self) -> None:
+        grouphash = GroupHash.objects.create(project=self.project, hash="a" * 32)
+        assert grouphash_cache.get_many(self.project.id, ["a" * 32]) == {}
+
+        grouphash_cache.set_many([grouphash])
+        cached = grouphash_cache.get_many(self.project.id, ["a" * 32, "b" * 32])
+        assert list(cached) == ["a" * 32]
+        assert cached["a" * 32].id == grouphash.id
+        assert cached["a" * 32].group_id is None
+
+        with self.capture_on_commit_callbacks(execute=True):
+            grouphash_cache.delete_many(self.project.id, ["a" * 32])
+            # Not invalidated before the commit
+            assert list(grouphash_cache.get_many(self.project.id, ["a" * 32])) == ["a" * 32]
+        assert grouphash_cache.get_many(self.project.id, ["a" * 32]) == {}
+
+    def test_disabled(self) -> None:
+        grouphash = GroupHash.objects.create(project=self.project, hash="a" * 32)
+        with override_options({"grouping.grouphash-cache.enabled": False}):
+            grouphash_cache.set_many([grouphash])
+        assert grouphash_cache.get_many(self.project.id, ["a" * 32]) == {}
+
+    def test_invalidate_while_disabled(self) -> None:
+        grouphash = GroupHash.objects.create(project=self.project, hash="a" * 32)
+        grouphash_cache.set_many([grouphash])
+
+        with override_options({"grouping.grouphash-cache.enabled": False}):
+            with mock.patch.object(grouphash_cache, "_get_cluster") as get_cluster:
+                with self.capture_on_commit_callbacks(execute=True) as callbacks:
+                    grouphash_cache.delete_many(self.project.id, ["a" * 32])
+                assert not callbacks
+                assert not get_cluster.called
+
+            with override_options({"grouping.grouphash-cache.invalidate": True}):
+                with self.capture_on_commit_callbacks(execute=True):
+                    grouphash_cache.delete_many(self.project.id, ["a" * 32])
+
+        assert grouphash_cache.get_many(self.project.id, ["a" * 32]) == {}
+
+    def test_delete_failure_is_logged(self) -> None:
+        with mock.patch.object(grouphash_cache, "_get_cluster", side_effect=Exception("down")):
+            with mock.patch.object(grouphash_cache.logger, "exception") as log_exception:
+                with self.capture_on_commit_callbacks(execute=True):
+                    grouphash_cache.delete_many(self.project.id, ["a" * 32])
+        log_exception.assert_called_once_with("grouphash_cache.delete_failed")
+
+    def test_existing_group_does_not_query_grouphashes(self) -> None:
+        event = self.save_event()
+        # The cache entry written while creating the group is invalidated once it gets a group
+        assert grouphash_cache.get_many(self.project.id, event.get_hashes().hashes) == {}
+
+        self.save_event()
+        cached = grouphash_cache.get_many(self.project.id, event.get_hashes().hashes)
+        assert [grouphash.group_id for grouphash in cached.values()] == [event.group_id]
+
+        with CaptureQueriesContext(connections[router.db_for_read(GroupHash)]) as queries:
+            assert self.save_event().group_id == event.group_id
+        assert not [q for q in queries.captured_queries if "sentry_grouphash" in q["sql"]]
+
+    def test_stale_entry_for_deleted_group(self) -> None:
+        event = self.save_event()
+        self.save_event()
+
+        # Simulate a merge which the cache did not learn about
+        new_group = self.create_group(project=self.project)
+        GroupHash.objects.filter(group_id=event.group_id).update(group=new_group)
+        Group.objects.filter(id=event.group_id).delete()
+
+        assert self.save_event().group_id == new_group.id
+        cached = grouphash_cache.get_many(self.project.id, event.get_hashes().hashes)
+        assert cached == {}
+
+    def test_unmerge_invalidates(self) -> None:
+        event = self.save_event()
+        self.save_event()
+        hashes = event.get_hashes().hashes
+        assert grouphash_cache.get_many(self.project.id, hashes)
+
+        new_group = self.create_group(project=self.project)
+        with self.capture_on_commit_callbacks(execute=True):
+            PrimaryHashUnmergeReplacement(fingerprints=hashes).run_postgres_replacement(
+                self.project, new_group.id, hashes
+            )
+
+        assert grouphash_cache.get_many(self.project.id, hashes) == {}
+        assert self.save_event().group_id == new_group.id
+
+    def test_merge_invalidates_only_when_enabled(self) -> None:
+        event = self.save_event()
+        self.save_event()
+        hashes = event.get_hashes().hashes
+        new_group = self.create_group(project=self.project)
+
+        with override_options({"grouping.grouphash-cache.enabled": False}):
+            with mock.patch.object(grouphash_cache, "delete_many") as delete_many:
+                with self.tasks():
+                    merge_groups([event.group_id], new_group.id)
+        assert not delete_many.called
+
+        other_group = self.create_group(project=self.project)
+        with self.capture_on_commit_callbacks(execute=True), self.tasks():
+            merge_groups([new_group.id], other_group.id)
+        assert grouphash_cache.get_many(self.project.id, hashes) == {}
+        assert self.save_event().group_id == other_group.id
@@ -1,16 +1,22 @@
 from __future__ import annotations
 
+import copy
 from time import time
 from unittest.mock import MagicMock, patch
 
+from sentry import eventstore
 from sentry.event_manager import EventManager
+from sentry.eventstore.models import Event
 from sentry.grouping.ingest.hashing import (
     _calculate_background_grouping,
     _calculate_event_grouping,
     _calculate_secondary_hash,
 )
+from sentry.grouping.strategies.base import ComponentCache
+from sentry.interfaces.stacktrace import Frame
 from sentry.models.group import Group
 from sentry.testutils.cases import TestCase
+from sentry.testutils.helpers import override_options
 from sentry.testutils.skips import requires_snuba
 
 pytestmark = [requires_snuba]
@@ -142,13 +148,13 @@ class SecondaryGroupingTest(TestCase):
         secondary_grouping_error = Exception("nope")
         secondary_grouping_config = "legacy:2019-03-12"
 
-        def mock_calculate_event_grouping(project, event, grouping_config):
+        def mock_calculate_event_grouping(project, event, grouping_config, **kwargs):
             # We only want `_calculate_event_grouping` to error inside of `_calculate_secondary_hash`,
             # not anywhere else it's called
             if grouping_config["id"] == secondary_grouping_config:
                 raise secondary_grouping_error
             else:
-                return _calculate_event_grouping(project, event, grouping_config)
+                return _calculate_event_grouping(project, event, grouping_config, **kwargs)
 
         project = self.project
         project.update_option("sentry:grouping_config", "newstyle:2023-01-11")
@@ -167,3 +173,90 @@ class SecondaryGroupingTest(TestCase):
             mock_capture_exception.assert_called_with(secondary_grouping_error)
             # This proves the secondary grouping crash didn't crash the overall grouping process
             assert event.group
+
+
+@override_options({"grouping.shared-component-cache.enabled": True})
+class SharedComponentCacheTest(TestCase):
+    def save_event(self) -> Event:
+        manager = EventManager(
+            {
+                "platform": "python",
+                "exception": {
+                    "values": [
+                        {
+                            "type": "ValueError",
+                            "value": "bad value",
+                            "stacktrace": {
+                                "frames": [
+                                    {"module": "app.views", "function": "handle", "in_app": True},
+                                    {"module": "app.models", "function": "save", "in_app": True},
+                                ]
+                            },
+                        }
+                    ]
+                },
+            }
+        )
+        manager.normalize()
+        return manager.save(self.project.id)
+
+    def test_shares_frames_with_secondary_grouping(self) -> None:
+        self.project.update_option("sentry:grouping_config", "newstyle:2023-01-11")
+        self.project.update_option("sentry:secondary_grouping_config", "newstyle:2019-10-29")
+        self.project.update_option("sentry:secondary_grouping_expiry", time() + 3600)
+
+        with patch(
+            "sentry.grouping.ingest.hashing._calculate_event_grouping",
+            wraps=_calculate_event_grouping,
+        ) as mock_calculate_event_grouping:
+            event = self.save_event()
+
+        calls = mock_calculate_event_grouping.call_args_list
+        assert [call.args[2]["id"] for call in calls] == [
+            "newstyle:2023-01-11",
+            "newstyle:2019-10-29",
+        ]
+        component_cache = calls[0].kwargs["component_cache"]
+        assert component_cache is calls[1].kwargs["component_cache"]
+        # Both frames of both the system and app variant are computed once
+        assert component_cache.misses == 4
+        assert component_cache.hits == 4
+
+        # The shared components don't change the result
+        secondary_event = calls[1].args[1]
+        uncached_hashes = _calculate_event_grouping(
+            self.project,
+            eventstore.backend.create_event(data=copy.deepcopy(secondary_event.data.data)),
+            calls[1].args[2],
+        )
+        assert secondary_event.get_hashes().hashes == uncached_hashes.hashes
+        assert event.group_id is not None
+
+    def test_not_used_outside_of_transition(self) -> None:
+        with patch(
+            "sentry.grouping.ingest.hashing._calculate_event_grouping",
+            wraps=_calculate_event_grouping,
+        ) as mock_calculate_event_grouping:
+            self.save_event()
+
+        (call,) = mock_calculate_event_grouping.call_args_list
+        assert call.kwargs["component_cache"] is None
+
+    def test_key_ignores_unused_frame_fields(self) -> None:
+        cache = ComponentCache()
+        strategy = MagicMock(id="frame:v1")
+        event = MagicMock(platform="python")
+
+        def get_key(datapath=("frames", 0), **data):
+            frame = Frame.to_python(
+                {"module": "app.views", "function": "handle", **data}, datapath=list(datapath)
+            )
+            return cache.get_key(strategy, frame, event, {})
+
+        key = get_key()
+        assert key is not None
+        assert get_key(vars={"request": "x" * 1000}, pre_context=["a"], post_context=["b"]) == key
+        assert get_key(data={"symbolicator_status": "symbolicated"}) == key
+        assert get_key(data={"sourcemap": "app.js.map"}) != key
+        assert get_key(datapath=("frames", 1)) != key
+        assert get_key(function="save") != key
@@ -301,3 +301,35 @@ def test_fail_parameterize(name, input, expected, parameterizer):
 )
 def test_too_aggressive_parameterize(name, input, expected, parameterizer):
     assert expected == parameterizer.parameterize_all(input), f"Case {name} Failed"
+
+
+@pytest.mark.parametrize(
+    "input",
+    [
+        "A quick brown fox jumped over the lazy dog",
+        "blah 0x9af8c3b had a problem at 2024-02-20T22:16:36 on www.time.co",
+        "Error running query: SELECT a FROM b WHERE c = 'd' AND e=true LIMIT 1000",
+        "datetime.datetime(2024, 1, 1) from test@email.com via http://some.email.com",
+    ],
+)
+def test_prefilter_matches_combined_regex(input, parameterizer):
+    combined_regex = Parameterizer._make_regex_from_patterns(parameterizer._regex_pattern_keys)
+
+    def _handle_regex_match(match):
+        return next(f"<{key}>" for key, value in match.groupdict().items() if value is not None)
+
+    assert parameterizer.parametrize_w_regex(input) == combined_regex.sub(
+        _handle_regex_match, input
+    )
+
+
+def test_parametrize_w_regex_counts_cached_matches(parameterizer):
+    input = "blah 23 0x9af8c3b had 42 problems"
+    assert parameterizer.parametrize_w_regex(input) == "blah <int> <hex> had <int> problems"
+    assert parameterizer.parametrize_w_regex(input) == "blah <int> <hex> had <int> problems"
+    assert parameterizer.matches_counter == {"int": 4, "hex": 2}
+
+
+def test_unknown_pattern_key():
+    with pytest.raises(KeyError):
+        Parameterizer(regex_pattern_keys=("int", "foo"))
@@ -1,5 +1,6 @@
 import time
 from datetime import datetime
+from unittest import mock
 from unittest.mock import Mock
 
 import msgpack
@@ -7,11 +8,17 @@ import orjson
 import pytest
 from arroyo.backends.kafka import KafkaPayload
 from arroyo.dlq import InvalidMessage
-from arroyo.types import BrokerValue, Message, Partition, Topic
+from arroyo.processing.strategies import MessageRejected
+from arroyo.types import BrokerValue, Message, Partition, Topic, Value
 
 from sentry.conf.types.kafka_definition import Topic as TopicNames
 from sentry.event_manager import EventManager
 from sentry.ingest.consumer.factory import IngestStrategyFactory
+from sentry.ingest.consumer.simple_event import (
+    ForwardInvalidMessages,
+    UnpackedEventMessage,
+    process_simple_event_batch,
+)
 from sentry.ingest.types import ConsumerType
 from sentry.testutils.pytest.fixtures import django_db_all
 
@@ -86,3 +93,102 @@ def test_dlq_invalid_messages(factories, topic_name, consumer_type) -> None:
 
         assert exc_info.value.partition == partition
         assert exc_info.value.offset == offset
+
+
+@django_db_all
+def test_dlq_invalid_messages_micro_batched(factories) -> None:
+    project = factories.create_project(organization=factories.create_organization())
+    unsupported_message_type_payload = msgpack.packb(
+        {
+            "type": "unsupported type",
+            "project_id": project.id,
+            "payload": b"{}",
+            "start_time": int(time.time()),
+            "event_id": "aaa",
+        }
+    )
+
+    partition = Partition(Topic(TopicNames.INGEST_EVENTS.value), 0)
+    factory = IngestStrategyFactory(
+        ConsumerType.Events,
+        reprocess_only_stuck_events=False,
+        num_processes=1,
+        max_batch_size=1,
+        max_batch_time=1,
+        input_block_size=None,
+        output_block_size=None,
+        micro_batch_size=10,
+    )
+    strategy = factory.create_with_partitions(Mock(), Mock())
+
+    # Invalid messages are rejected one at a time, before they're batched
+    for offset, payload in enumerate([b"bogus message", unsupported_message_type_payload]):
+        with pytest.raises(InvalidMessage) as exc_info:
+            strategy.submit(make_message(payload, partition, offset))
+
+        assert exc_info.value.partition == partition
+        assert exc_info.value.offset == offset
+
+
+@django_db_all
+def test_dlq_invalid_payload_in_micro_batch(factories) -> None:
+    project = factories.create_project(organization=factories.create_organization())
+    partition = Partition(Topic(TopicNames.INGEST_EVENTS.value), 0)
+
+    def make_item(payload: bytes, offset: int) -> Value:
+        message = {
+            "type": "event",
+            "project_id": project.id,
+            "payload": payload,
+            "start_time": int(time.time()),
+            "event_id": "a" * 32,
+        }
+        return Value(UnpackedEventMessage(message, partition, offset), {})
+
+    batch = Message(
+        Value(
+            [
+                make_item(orjson.dumps({"event_id": "a" * 32, "project": project.id}), 1),
+                make_item(b"bogus payload", 2),
+                make_item(b"also bogus", 3),
+            ],
+            {},
+        )
+    )
+
+    # The payloads are only parsed in the batch, which processes the valid events and returns
+    # the invalid ones
+    with mock.patch("sentry.ingest.consumer.simple_event.process_event_batch") as process_batch:
+        invalid = process_simple_event_batch(batch, reprocess_only_stuck_events=False)
+
+    assert [(e.partition, e.offset) for e in invalid] == [(partition, 2), (partition, 3)]
+    ((events, _), _) = process_batch.call_args
+    assert [event.event_id for event in events] == ["a" * 32]
+
+
+def test_forward_invalid_messages() -> None:
+    partition = Partition(Topic(TopicNames.INGEST_EVENTS.value), 0)
+    next_step = Mock()
+    strategy = ForwardInvalidMessages(next_step)
+
+    valid_batch = Message(Value([], {partition: 2}))
+    strategy.submit(valid_batch)
+    next_step.submit.assert_called_once_with(valid_batch)
+    next_step.reset_mock()
+
+    batch = Message(
+        Value([InvalidMessage(partition, 3), InvalidMessage(partition, 5)], {partition: 6})
+    )
+    strategy.submit(batch)
+    with pytest.raises(MessageRejected):
+        strategy.submit(Message(Value([], {partition: 7})))
+
+    # Every invalid message is sent to the DLQ before the batch is committed
+    for offset in (3, 5):
+        with pytest.raises(InvalidMessage) as exc_info:
+            strategy.poll()
+        assert (exc_info.value.partition, exc_info.value.offset) == (partition, offset)
+        assert not next_step.submit.called
+
+    strategy.poll()
+    next_step.submit.assert_called_once_with(batch)
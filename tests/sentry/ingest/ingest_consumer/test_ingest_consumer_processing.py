@@ -18,9 +18,13 @@ from django.conf import settings
 
 from sentry import eventstore
 from sentry.event_manager import EventManager
+from sentry.eventstore.processing import event_processing_store
 from sentry.ingest.consumer.processors import (
+    Retriable,
+    parse_event_message,
     process_attachment_chunk,
     process_event,
+    process_event_batch,
     process_individual_attachment,
     process_userreport,
 )
@@ -107,6 +111,78 @@ def test_deduplication_works(default_project, task_runner, preprocess_event):
     }
 
 
+def make_event_message(payload, project):
+    return {
+        "payload": orjson.dumps(payload).decode(),
+        "start_time": time.time() - 3600,
+        "event_id": payload["event_id"],
+        "project_id": project.id,
+        "remote_addr": "127.0.0.1",
+    }
+
+
+@django_db_all
+def test_batch_deduplication_works(default_project, task_runner, preprocess_event):
+    payloads = [
+        get_normalized_event({"message": f"hello world {i}"}, default_project) for i in range(2)
+    ]
+    first, second = (
+        parse_event_message(make_event_message(payload, default_project), default_project)
+        for payload in payloads
+    )
+
+    # Duplicates are skipped within a batch, and across batches
+    process_event_batch([first, second, first])
+    process_event_batch([second, first])
+
+    assert [kwargs["data"] for kwargs in preprocess_event] == payloads
+    for kwargs, payload in zip(preprocess_event, payloads):
+        assert kwargs["cache_key"] == f"e:{payload['event_id']}:{default_project.id}"
+        assert event_processing_store.get(kwargs["cache_key"]) == payload
+
+
+@django_db_all
+def test_batch_failure_remembers_dispatched_events(default_project, task_runner, monkeypatch):
+    calls = []
+
+    def preprocess_event(**kwargs):
+        calls.append(kwargs["event_id"])
+        if len(calls) == 2:
+            raise ValueError("failed")
+
+    monkeypatch.setattr("sentry.ingest.consumer.processors.preprocess_event", preprocess_event)
+
+    events = [
+        parse_event_message(
+            make_event_message(
+                get_normalized_event({"message": f"hello world {i}"}, default_project),
+                default_project,
+            ),
+            default_project,
+        )
+        for i in range(3)
+    ]
+
+    with pytest.raises(Retriable):
+        process_event_batch(events)
+
+    # The batch is retried, and the first event was already handed over
+    process_event_batch(events)
+    assert calls == [events[0].event_id, events[1].event_id, events[1].event_id, events[2].event_id]
+
+
+@django_db_all
+def test_parse_event_message_without_event_id(default_project):
+    message = {
+        "payload": b"{}",
+        "start_time": time.time(),
+        "event_id": "aaa",
+        "project_id": default_project.id,
+    }
+    with pytest.raises(KeyError):
+        parse_event_message(message, default_project)
+
+
 @django_db_all
 def test_transactions_spawn_save_event_transaction(
     default_project,
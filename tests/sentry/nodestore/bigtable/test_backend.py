@@ -8,7 +8,7 @@ from google.cloud.bigtable import table
 from google.rpc.status_pb2 import Status
 
 from sentry.nodestore.bigtable.backend import BigtableNodeStorage
-from sentry.utils.kvstore.bigtable import BigtableKVStorage
+from sentry.utils.kvstore.bigtable import BigtableError, BigtableKVStorage
 
 
 class MockedBigtableKVStorage(BigtableKVStorage):
@@ -164,3 +164,13 @@ def test_compression() -> None:
     assert ns.store.compression == "zlib"
     ns = BigtableNodeStorage(compression=False)
     assert ns.store.compression is None
+
+
+def test_set_many_errors():
+    ns = MockedBigtableNodeStorage(project="test")
+    table = ns.store._get_table()
+    statuses = [Status(code=0), Status(code=14, message="unavailable")]
+
+    with mock.patch.object(table, "mutate_rows", return_value=statuses):
+        with pytest.raises(BigtableError, match=r"1 of 2 rows: node_2: 14 unavailable$"):
+            ns._set_bytes_many([("node_1", b"a"), ("node_2", b"b")])
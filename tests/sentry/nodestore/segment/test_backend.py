@@ -0,0 +1,137 @@
+import os
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+import pytest
+
+from sentry.nodestore.segment.backend import SegmentNodeStorage
+from sentry.testutils.helpers.datetime import freeze_time
+
+
+@pytest.fixture
+def ns(tmp_path):
+    ns = SegmentNodeStorage(path=str(tmp_path), segment_duration=timedelta(hours=1))
+    ns.bootstrap()
+    return ns
+
+
+def _files(ns):
+    return sorted(os.listdir(ns.path))
+
+
+def test_get_from_sealed_segment(ns):
+    with freeze_time("2024-01-01 00:10:00"):
+        ns.set_bytes("node_1", b'{"foo":"a"}')
+        ns.set_bytes("node_2", b'{"foo":"b"}')
+
+    with freeze_time("2024-01-01 02:00:00"):
+        ns.set_bytes("node_2", b'{"foo":"c"}')
+        assert ns.get_bytes("node_1") == b'{"foo":"a"}'
+        # the newest segment wins
+        assert ns.get_bytes("node_2") == b'{"foo":"c"}'
+        assert ns.get_bytes("node_3") is None
+
+    # the first segment is sealed and got a hash table
+    assert _files(ns) == [
+        "1704067200.data",
+        "1704067200.index",
+        "1704067200.table",
+        "1704074400.data",
+        "1704074400.index",
+    ]
+
+
+def test_delete_writes_tombstone(ns):
+    with freeze_time("2024-01-01 00:10:00"):
+        ns.set_bytes("node_1", b'{"foo":"a"}')
+
+    with freeze_time("2024-01-01 01:10:00"):
+        ns.delete_multi(["node_1"])
+        assert ns.get_bytes("node_1") is None
+
+    with freeze_time("2024-01-01 03:00:00"):
+        assert ns.get_bytes("node_1") is None
+
+
+def test_writes_from_other_instances_are_visible(ns):
+    other = SegmentNodeStorage(path=ns.path, segment_duration=timedelta(hours=1))
+    with freeze_time("2024-01-01 00:10:00"):
+        ns.set_bytes("node_1", b'{"foo":"a"}')
+        assert other.get_bytes("node_1") == b'{"foo":"a"}'
+        other.set_bytes("node_2", b'{"foo":"b"}')
+        assert ns.get_bytes("node_2") == b'{"foo":"b"}'
+
+
+def test_ttl(ns):
+    with freeze_time("2024-01-01 00:10:00"):
+        ns.set_bytes("node_1", b'{"foo":"a"}', ttl=timedelta(minutes=5))
+        ns.set_bytes("node_2", b'{"foo":"b"}')
+
+    with freeze_time("2024-01-01 00:20:00"):
+        assert ns.get_bytes("node_1") is None
+        assert ns.get_bytes("node_2") == b'{"foo":"b"}'
+
+
+def test_cleanup_drops_whole_segments(ns):
+    with freeze_time("2024-01-01 00:10:00"):
+        ns.set_bytes("node_1", b'{"foo":"a"}')
+    with freeze_time("2024-01-01 01:10:00"):
+        ns.set_bytes("node_2", b'{"foo":"b"}')
+
+    with freeze_time("2024-01-01 02:00:00"):
+        ns.cleanup(datetime(2024, 1, 1, 1, 30, tzinfo=timezone.utc))
+        assert _files(ns) == ["1704070800.data", "1704070800.index"]
+        assert ns.get_bytes("node_1") is None
+        assert ns.get_bytes("node_2") == b'{"foo":"b"}'
+
+
+def test_default_ttl_drops_segments_on_rollover(tmp_path):
+    ns = SegmentNodeStorage(
+        path=str(tmp_path), segment_duration=timedelta(hours=1), default_ttl=timedelta(hours=2)
+    )
+    ns.bootstrap()
+    with freeze_time("2024-01-01 00:10:00"):
+        ns.set_bytes("node_1", b'{"foo":"a"}')
+    with freeze_time("2024-01-01 03:10:00"):
+        ns.set_bytes("node_2", b'{"foo":"b"}')
+        assert _files(ns) == ["1704078000.data", "1704078000.index"]
+        assert ns.get_bytes("node_1") is None
+
+
+def test_ttl_is_capped_at_default_ttl(tmp_path):
+    ns = SegmentNodeStorage(
+        path=str(tmp_path), segment_duration=timedelta(hours=1), default_ttl=timedelta(hours=2)
+    )
+    ns.bootstrap()
+    with freeze_time("2024-01-01 00:10:00"):
+        ns.set_bytes("node_1", b'{"foo":"a"}', ttl=timedelta(hours=5))
+        ns.set_bytes("node_2", b'{"foo":"b"}', ttl=timedelta(hours=1))
+
+    with freeze_time("2024-01-01 02:00:00"):
+        assert ns.get_bytes("node_1") == b'{"foo":"a"}'
+        assert ns.get_bytes("node_2") is None
+
+    # the node expires with its segment instead of outliving it
+    with freeze_time("2024-01-01 02:20:00"):
+        assert ns.get_bytes("node_1") is None
+
+
+def test_misses_rescan_directory_at_most_once_a_second(ns):
+    with freeze_time("2024-01-01 00:10:00") as frozen_time:
+        ns.set_bytes("node_1", b'{"foo":"a"}')
+        with mock.patch("os.listdir", wraps=os.listdir) as listdir:
+            assert ns.get_bytes("node_2") is None
+            assert ns.get_bytes("node_3") is None
+            assert listdir.call_count == 0
+
+            frozen_time.shift(timedelta(seconds=2))
+            assert ns.get_bytes("node_2") is None
+            assert listdir.call_count == 1
+
+
+def test_not_bootstrapped(tmp_path):
+    ns = SegmentNodeStorage(path=str(tmp_path / "missing"))
+    with pytest.raises(RuntimeError, match="bootstrap"):
+        ns.get_bytes("node_1")
+    with pytest.raises(RuntimeError, match="bootstrap"):
+        ns.set_bytes("node_1", b'{"foo":"a"}')
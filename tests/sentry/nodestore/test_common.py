@@ -3,10 +3,13 @@ Testsuite of backend-independent nodestore tests. Add your backend to the
 `ns` fixture to have it tested.
 """
 from contextlib import nullcontext
+from datetime import timedelta
+from unittest import mock
 
 import pytest
 
 from sentry.nodestore.django.backend import DjangoNodeStorage
+from sentry.nodestore.segment.backend import SegmentNodeStorage
 from sentry.testutils.helpers import override_options
 from tests.sentry.nodestore.bigtable.test_backend import (
     MockedBigtableNodeStorage,
@@ -15,7 +18,12 @@ from tests.sentry.nodestore.bigtable.test_backend import (
 
 
 @pytest.fixture(
-    params=["bigtable-mocked", "bigtable-real", pytest.param("django", marks=pytest.mark.django_db)]
+    params=[
+        "bigtable-mocked",
+        "bigtable-real",
+        pytest.param("django", marks=pytest.mark.django_db),
+        "segment",
+    ]
 )
 def ns(request):
     # backends are returned from context managers to support teardown when required
@@ -23,6 +31,9 @@ def ns(request):
         "bigtable-mocked": lambda: nullcontext(MockedBigtableNodeStorage(project="test")),
         "bigtable-real": lambda: get_temporary_bigtable_nodestorage(),
         "django": lambda: nullcontext(DjangoNodeStorage()),
+        "segment": lambda: nullcontext(
+            SegmentNodeStorage(path=str(request.getfixturevalue("tmp_path")))
+        ),
     }
 
     ctx = backends[request.param]()
@@ -50,6 +61,19 @@ def test_set(ns):
     assert ns.get(node_id) == data
 
 
+@override_options({"nodestore.set-subkeys.enable-set-cache-item": False})
+def test_set_many(ns):
+    ns.set("node_1", {"foo": "old"})
+    ns.set_many(
+        {
+            "node_1": {None: {"foo": "a"}},
+            "node_2": {None: {"foo": "b"}, "other": {"foo": "c"}},
+        }
+    )
+    assert ns.get_multi(["node_1", "node_2"]) == {"node_1": {"foo": "a"}, "node_2": {"foo": "b"}}
+    assert ns.get("node_2", subkey="other") == {"foo": "c"}
+
+
 @override_options({"nodestore.set-subkeys.enable-set-cache-item": False})
 def test_delete(ns):
     node_id = "d2502ebbd7df41ceba8d3275595cac33"
@@ -97,3 +121,118 @@ def test_set_subkeys(ns):
     ns.delete("node_1")
     assert ns.get("node_1") is None
     assert ns.get("node_1", subkey="other") is None
+
+
+@override_options(
+    {
+        "nodestore.set-subkeys.enable-set-cache-item": False,
+        "nodestore.encoding.write-container": True,
+    }
+)
+def test_set_subkeys_container_encoding(ns):
+    big = {"frames": [{"function": f"fn_{i}", "lineno": i} for i in range(100)]}
+    ns.set_subkeys("node_1", {None: big, "other": {"foo": "b"}})
+    assert ns.get("node_1") == big
+    assert ns.get("node_1", subkey="other") == {"foo": "b"}
+    assert ns.get("node_1", subkey="missing") is None
+    assert ns.get_multi(["node_1"], subkey="other") == {"node_1": {"foo": "b"}}
+
+    # payloads written in the legacy format are still readable
+    with override_options({"nodestore.encoding.write-container": False}):
+        ns.set_subkeys("node_2", {None: {"foo": "a"}, "other": {"foo": "b"}})
+    assert ns.get("node_2") == {"foo": "a"}
+    assert ns.get("node_2", subkey="other") == {"foo": "b"}
+
+
+@override_options(
+    {
+        "nodestore.set-subkeys.enable-set-cache-item": False,
+        "nodestore.local-cache.max-bytes": 1024 * 1024,
+    }
+)
+def test_local_cache_invalidation(ns):
+    from sentry.nodestore.local_cache import local_node_cache
+
+    local_node_cache.clear()
+    ns.set("node_1", {"foo": "a"})
+    assert ns.get("node_1") == {"foo": "a"}
+    assert local_node_cache.get("node_1") == {"foo": "a"}
+
+    ns.set("node_1", {"foo": "b"})
+    assert local_node_cache.get("node_1") is None
+    assert ns.get("node_1") == {"foo": "b"}
+
+    ns.delete("node_1")
+    assert local_node_cache.get("node_1") is None
+    assert ns.get("node_1") is None
+
+
+def _native_event(message):
+    return {
+        "message": message,
+        "debug_meta": {
+            "images": [
+                {"type": "macho", "debug_id": f"{i:032x}", "code_file": f"/usr/lib/lib{i}.dylib"}
+                for i in range(20)
+            ]
+        },
+        "modules": {"foo": "1.0"},
+    }
+
+
+@override_options(
+    {"nodestore.set-subkeys.enable-set-cache-item": False, "nodestore.deduplicate": True}
+)
+def test_deduplicate(ns):
+    ns.set("node_1", _native_event("a"))
+    ns.set_many(
+        {
+            "node_2": {None: _native_event("b"), "unprocessed": _native_event("c")},
+            "node_3": {None: {"foo": "bar"}},
+        }
+    )
+
+    assert ns.get("node_1") == _native_event("a")
+    assert ns.get("node_2", subkey="unprocessed") == _native_event("c")
+    assert ns.get_multi(["node_1", "node_2", "node_3"]) == {
+        "node_1": _native_event("a"),
+        "node_2": _native_event("b"),
+        "node_3": {"foo": "bar"},
+    }
+    # The debug images are only stored in the shared nodes
+    assert b"/usr/lib/lib1.dylib" not in ns.get_bytes("node_1")
+
+    # Values read together don't share objects
+    result = ns.get_multi(["node_1", "node_2"])
+    result["node_1"]["modules"]["foo"] = "2.0"
+    assert result["node_2"]["modules"] == {"foo": "1.0"}
+
+    # Shared nodes are not deleted together with the values referencing them
+    ns.delete("node_1")
+    assert ns.get("node_2") == _native_event("b")
+
+    # Values with a custom TTL are not deduplicated
+    ns.set("node_4", _native_event("d"), ttl=timedelta(days=1))
+    assert b"/usr/lib/lib1.dylib" in ns.get_bytes("node_4")
+
+
+@override_options(
+    {"nodestore.set-subkeys.enable-set-cache-item": False, "nodestore.deduplicate": True}
+)
+def test_deduplicate_missing_shared(ns):
+    data, shared = ns._deduplicate({None: _native_event("a")})
+    ns._set_bytes_many([("node_1", ns._encode(data))])
+
+    assert ns.get("node_1") is None
+    assert ns.get_multi(["node_1"]) == {"node_1": None}
+
+    ns._set_shared(shared)
+    assert ns.get("node_1") == _native_event("a")
+
+
+def test_empty_shared_values_are_cached(ns):
+    ns._set_shared({"shared_1": ns._encode({None: {}})})
+
+    with mock.patch.object(ns, "_set_cache_items") as set_cache_items:
+        assert ns._get_shared(["shared_1"]) == {"shared_1": {}}
+    set_cache_items.assert_called_once_with({"shared_1": {}})
@@ -0,0 +1,34 @@
+import pytest
+
+from sentry.nodestore import encoding
+
+
+def test_roundtrip():
+    big = b'{"frames":[' + b",".join(b'{"lineno":1}' for _ in range(100)) + b"]}"
+    value = encoding.encode({None: big, "unprocessed": b"{}"})
+
+    assert encoding.is_container(value)
+    index, _ = encoding.read_index(value)
+    assert index[None][0] == encoding.CODEC_ZSTD
+    assert index["unprocessed"][0] == encoding.CODEC_RAW
+
+    assert encoding.decode_subkey(value, None) == big
+    assert encoding.decode_subkey(value, "unprocessed") == b"{}"
+    assert encoding.decode_subkey(value, "missing") is None
+
+
+def test_legacy_payload_is_not_a_container():
+    assert not encoding.is_container(b'{"foo":"bar"}\nunprocessed\n{}')
+
+
+def test_invalid_subkey():
+    with pytest.raises(ValueError):
+        encoding.encode({None: b"{}", "": b"{}"})
+
+
+def test_truncated():
+    value = encoding.encode({None: b'{"foo":"bar"}'})
+    with pytest.raises(encoding.InvalidContainer):
+        encoding.decode_subkey(value[:-1], None)
+    with pytest.raises(encoding.InvalidContainer):
+        encoding.read_index(value[:6])
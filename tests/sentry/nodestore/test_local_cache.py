@@ -0,0 +1,68 @@
+from unittest import mock
+
+from sentry.nodestore.local_cache import LocalNodeCache
+from sentry.testutils.helpers import override_options
+
+
+@override_options({"nodestore.local-cache.max-bytes": 0})
+def test_disabled():
+    cache = LocalNodeCache()
+    cache.set("a", {"foo": "bar"})
+    assert cache.get("a") is None
+
+
+@override_options({"nodestore.local-cache.max-bytes": 10_000})
+def test_returns_copies():
+    cache = LocalNodeCache()
+    cache.set("a", {"foo": "bar", "_ref": 1})
+    data = cache.get("a")
+    assert data == {"foo": "bar", "_ref": 1}
+    data.pop("_ref")
+    assert cache.get("a") == {"foo": "bar", "_ref": 1}
+
+
+@override_options({"nodestore.local-cache.max-bytes": 10_000})
+def test_lru_eviction():
+    cache = LocalNodeCache()
+    payload = {"foo": "x" * 1000}
+    for i in range(20):
+        cache.set(str(i), payload)
+        # keep the first item hot
+        assert cache.get("0") == payload
+
+    assert cache._size <= 10_000
+    assert cache.get("0") == payload
+    assert cache.get("1") is None
+    assert cache.get("19") == payload
+
+
+@override_options({"nodestore.local-cache.max-bytes": 10_000})
+def test_large_payloads_are_skipped():
+    cache = LocalNodeCache()
+    cache.set("a", {"foo": "x" * 5_000})
+    assert cache.get("a") is None
+
+
+@override_options(
+    {"nodestore.local-cache.max-bytes": 10_000, "nodestore.local-cache.ttl-seconds": 60}
+)
+def test_ttl():
+    cache = LocalNodeCache()
+    with mock.patch("time.monotonic", return_value=100.0):
+        cache.set("a", {"foo": "bar"})
+    with mock.patch("time.monotonic", return_value=150.0):
+        assert cache.get("a") == {"foo": "bar"}
+    with mock.patch("time.monotonic", return_value=200.0):
+        assert cache.get("a") is None
+    assert cache._size == 0
+
+
+@override_options({"nodestore.local-cache.max-bytes": 10_000})
+def test_delete_and_get_many():
+    cache = LocalNodeCache()
+    cache.set_many({"a": {"foo": "a"}, "b": {"foo": "b"}, "c": None})
+    assert cache.get_many(["a", "b", "c"]) == {"a": {"foo": "a"}, "b": {"foo": "b"}}
+    cache.delete_many(["a"])
+    assert cache.get_many(["a", "b"]) == {"b": {"foo": "b"}}
+    cache.clear()
+    assert cache.get_many(["b"]) == {}
@@ -9,7 +9,7 @@ from django.test import override_settings
 
 from sentry.models.options.option import Option
 from sentry.options.manager import OptionsManager, UpdateChannel
-from sentry.options.store import OptionsStore
+from sentry.options.store import SNAPSHOT_CHECK_INTERVAL, OptionsStore
 from sentry.testutils.cases import TestCase
 from sentry.testutils.silo import no_silo_test
 
@@ -164,3 +164,81 @@ class OptionsStoreTest(TestCase):
         mocked_time.return_value = 26
         store.clean_local_cache()
         assert not store._local_cache
+
+
+@no_silo_test
+class OptionsStoreSnapshotTest(TestCase):
+    @cached_property
+    def cache(self):
+        c = LocMemCache("test", settings.CACHES["default"])
+        c.clear()
+        return c
+
+    def make_store(self):
+        return OptionsStore(cache=self.cache, snapshot=True)
+
+    @cached_property
+    def store(self):
+        return self.make_store()
+
+    @cached_property
+    def manager(self):
+        return OptionsManager(store=self.store)
+
+    def make_key(self):
+        return self.manager.make_key(uuid1().hex, "", object, 0, 10, 10, None)
+
+    def test_simple(self):
+        store, key = self.store, self.make_key()
+
+        assert store.get(key) is None
+        assert store.set(key, "bar", UpdateChannel.CLI)
+        assert store.get(key) == "bar"
+        assert store.delete(key)
+        assert store.get(key) is None
+
+    def test_single_load(self):
+        first, second = self.make_key(), self.make_key()
+        self.store.set(first, "foo", UpdateChannel.CLI)
+        self.store.set(second, "bar", UpdateChannel.CLI)
+
+        store = self.make_store()
+        with self.assertNumQueries(1):
+            assert store.get(first) == "foo"
+            assert store.get(second) == "bar"
+            assert store.get(self.make_key()) is None
+
+        # Other processes read the snapshot from the shared cache
+        with self.assertNumQueries(0):
+            assert self.make_store().get(first) == "foo"
+
+    @patch("sentry.options.store.time")
+    def test_invalidation(self, mocked_time):
+        mocked_time.return_value = 1000
+        key = self.make_key()
+        self.store.set(key, "foo", UpdateChannel.CLI)
+
+        other = self.make_store()
+        assert other.get(key) == "foo"
+
+        self.store.set(key, "bar", UpdateChannel.CLI)
+        assert self.store.get(key) == "bar"
+        # Not checked before the interval is over
+        with self.assertNumQueries(0):
+            assert other.get(key) == "foo"
+
+        mocked_time.return_value = 1000 + SNAPSHOT_CHECK_INTERVAL
+        assert other.get(key) == "bar"
+
+    @override_settings(SENTRY_OPTIONS_COMPLAIN_ON_ERRORS=False)
+    @patch("sentry.options.store.time")
+    def test_cache_unavailable(self, mocked_time):
+        mocked_time.return_value = 1000
+        key = self.make_key()
+        self.store.set(key, "foo", UpdateChannel.CLI)
+        assert self.store.get(key) == "foo"
+
+        mocked_time.return_value = 1000 + SNAPSHOT_CHECK_INTERVAL
+        with patch.object(self.cache, "get", side_effect=RuntimeError()):
+            with patch.object(Option.objects, "get_queryset", side_effect=RuntimeError()):
+                assert self.store.get(key) == "foo"
@@ -0,0 +1,47 @@
+from unittest.mock import Mock
+
+from sentry.relay.config import get_project_config
+from sentry.relay.config.fragments import get_organization_fragment, shared_organization_fragments
+from sentry.testutils.factories import Factories
+from sentry.testutils.helpers.options import override_options
+from sentry.testutils.pytest.fixtures import django_db_all
+
+
+def test_not_shared_by_default():
+    build = Mock(return_value=[1])
+    with shared_organization_fragments():
+        assert get_organization_fragment(1, "section", build) == [1]
+        assert get_organization_fragment(1, "section", build) == [1]
+    assert build.call_count == 2
+
+
+@override_options({"relay.config.share-organization-fragments": True})
+def test_shared_per_organization_and_section():
+    build = Mock(return_value=[1])
+    with shared_organization_fragments():
+        assert get_organization_fragment(1, "section", build) == [1]
+        assert get_organization_fragment(1, "section", build) == [1]
+        assert build.call_count == 1
+
+        get_organization_fragment(2, "section", build)
+        get_organization_fragment(1, "other", build)
+        assert build.call_count == 3
+
+    # Fragments don't outlive the block
+    get_organization_fragment(1, "section", build)
+    assert build.call_count == 4
+
+
+@django_db_all
+def test_same_project_configs(default_project):
+    projects = [
+        default_project,
+        Factories.create_project(organization=default_project.organization),
+    ]
+
+    expected = [get_project_config(project).to_dict()["config"] for project in projects]
+    with override_options({"relay.config.share-organization-fragments": True}):
+        with shared_organization_fragments():
+            shared = [get_project_config(project).to_dict()["config"] for project in projects]
+
+    assert shared == expected
@@ -1,6 +1,7 @@
 from unittest import mock
 
-from sentry.relay.projectconfig_cache import redis
+from sentry.relay.projectconfig_cache import encoding, redis
+from sentry.testutils.helpers import override_options
 from sentry.testutils.pytest.fixtures import django_db_all
 from sentry.utils import metrics
 
@@ -24,3 +25,96 @@ def test_read_write():
     my_key = "fake-dsn-1"
     cache.set_many({my_key: "my-value"})
     assert cache.get(my_key) == "my-value"
+
+
+def make_config(i):
+    return {
+        "projectId": i,
+        "slug": f"project-{i}",
+        "publicKeys": [{"publicKey": f"{i:032x}", "numericId": i}],
+        "config": {
+            "allowedDomains": ["*"],
+            "trustedRelays": [],
+            "performanceScore": {
+                "profiles": [
+                    {
+                        "name": f"profile-{n}",
+                        "scoreComponents": [
+                            {"measurement": m, "weight": 0.25, "p10": 1200.0, "p50": 2400.0}
+                            for m in ("fcp", "lcp", "cls", "ttfb")
+                        ],
+                    }
+                    for n in range(4)
+                ]
+            },
+            "filterSettings": {"browserExtensions": {"isEnabled": i % 2 == 0}},
+        },
+    }
+
+
+def test_extract_shared_sections():
+    config = make_config(1)
+    stripped, shared = encoding.extract_shared_sections(config)
+
+    (digest,) = shared
+    assert stripped["config"]["performanceScore"] == {"$shared": digest}
+    assert stripped["config"]["filterSettings"] == config["config"]["filterSettings"]
+    # The config itself is left untouched
+    assert config == make_config(1)
+    assert encoding.find_shared_references(stripped) == [digest]
+
+    # Identical sections are shared between configs
+    assert encoding.extract_shared_sections(make_config(2))[1] == shared
+
+
+@django_db_all
+@override_options({"relay.projectconfig-cache.dictionary-encoding": True})
+def test_read_write_dictionary_encoding():
+    cache = redis.RedisProjectConfigCache()
+    configs = {f"fake-dsn-{i}": make_config(i) for i in range(3)}
+
+    # Without a published dictionary, shared sections are still split out
+    cache.set_many(configs)
+    assert encoding.is_encoded(cache.cluster.get("relayconfig:fake-dsn-0"))
+    assert cache.get("fake-dsn-0") == configs["fake-dsn-0"]
+
+    dictionary = encoding.train_dictionary([make_config(i) for i in range(50)], 4096)
+    cache.publish_dictionary(dictionary)
+    cache.set_many(configs)
+    for public_key, config in configs.items():
+        assert cache.get(public_key) == config
+
+    # Readers fetch the dictionary from Redis
+    assert redis.RedisProjectConfigCache().get("fake-dsn-1") == configs["fake-dsn-1"]
+
+    # Configs written with the plain encoding are still readable
+    with override_options({"relay.projectconfig-cache.dictionary-encoding": False}):
+        cache.set_many({"fake-dsn-plain": make_config(4)})
+    assert cache.get("fake-dsn-plain") == make_config(4)
+
+
+@django_db_all
+@override_options({"relay.projectconfig-cache.dictionary-encoding": True})
+def test_dictionary_encoding_missing_shared_section():
+    cache = redis.RedisProjectConfigCache()
+    cache.set_many({"fake-dsn-1": make_config(1)})
+
+    (digest,) = encoding.extract_shared_sections(make_config(1))[1]
+    cache.cluster.delete(f"relayconfig-shared:{digest}")
+
+    assert cache.get("fake-dsn-1") is None
+
+
+@django_db_all
+def test_publish_dictionary_expires_previous():
+    cache = redis.RedisProjectConfigCache()
+    first = encoding.train_dictionary([make_config(i) for i in range(50)], 4096)
+    second = encoding.train_dictionary([make_config(i) for i in range(50, 100)], 4096)
+
+    cache.publish_dictionary(first)
+    assert cache.cluster.ttl(f"relayconfig-dict:{first.dict_id()}") == -1
+
+    cache.publish_dictionary(second)
+    assert cache.cluster.get("relayconfig-dict:current") == str(second.dict_id()).encode()
+    assert cache.cluster.ttl(f"relayconfig-dict:{first.dict_id()}") > 0
+    assert cache.cluster.ttl(f"relayconfig-dict:{second.dict_id()}") == -1
@@ -0,0 +1,181 @@
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from snuba_sdk import (
+    Column,
+    Condition,
+    Entity,
+    Function,
+    Granularity,
+    Limit,
+    Op,
+    OrderBy,
+    Query,
+    Request,
+)
+from snuba_sdk.orderby import Direction
+
+from sentry.snuba.timeseries_cache import bulk_timeseries_queries, split_request
+from sentry.testutils.cases import TestCase
+from sentry.testutils.helpers import override_options
+from sentry.testutils.helpers.datetime import freeze_time
+
+NOW = datetime(2024, 5, 20, 12, 30, tzinfo=timezone.utc)
+HOUR = 60 * 60
+
+
+def make_request(start: datetime, end: datetime, rollup: int = HOUR, **kwargs) -> Request:
+    query = Query(
+        match=Entity("events"),
+        select=[Function("count", [], "count")],
+        where=[
+            Condition(Column("project_id"), Op.IN, [1]),
+            Condition(Column("timestamp"), Op.GTE, start),
+            Condition(Column("timestamp"), Op.LT, end),
+        ],
+        groupby=[Column("time")],
+        orderby=[OrderBy(Column("time"), Direction.ASC)],
+        granularity=Granularity(rollup),
+        limit=Limit(10000),
+    )
+    for key, value in kwargs.items():
+        query = getattr(query, f"set_{key}")(value)
+    return Request(
+        dataset="events",
+        app_id="default",
+        query=query,
+        tenant_ids={"referrer": "test", "organization_id": 1},
+    )
+
+
+def time_range(request: Request) -> tuple[datetime, datetime]:
+    where = request.query.where
+    return where[1].rhs, where[2].rhs
+
+
+def fake_bulk_snuba_queries(requests, referrer=None, query_source=None):
+    """
+    Returns one row per hour of every request.
+    """
+    results = []
+    for request in requests:
+        start, end = time_range(request)
+        rows = []
+        bucket = start.replace(minute=0, second=0, microsecond=0)
+        while bucket < end:
+            rows.append({"time": bucket.isoformat(), "count": 1})
+            bucket += timedelta(hours=1)
+        results.append({"data": rows, "meta": [{"name": "count", "type": "UInt64"}]})
+    return results
+
+
+@override_options(
+    {
+        "snuba.timeseries-cache.chunk-seconds": 6 * HOUR,
+        "snuba.timeseries-cache.settle-seconds": HOUR,
+    }
+)
+class SplitRequestTest(TestCase):
+    def test_split(self):
+        start = datetime(2024, 5, 19, 10, 15, tzinfo=timezone.utc)
+        slices = split_request(make_request(start, NOW), NOW)
+        assert slices is not None
+
+        assert [time_range(s.request) for s in slices] == [
+            (start, datetime(2024, 5, 19, 12, tzinfo=timezone.utc)),
+            (
+                datetime(2024, 5, 19, 12, tzinfo=timezone.utc),
+                datetime(2024, 5, 19, 18, tzinfo=timezone.utc),
+            ),
+            (
+                datetime(2024, 5, 19, 18, tzinfo=timezone.utc),
+                datetime(2024, 5, 20, 0, tzinfo=timezone.utc),
+            ),
+            (
+                datetime(2024, 5, 20, 0, tzinfo=timezone.utc),
+                datetime(2024, 5, 20, 6, tzinfo=timezone.utc),
+            ),
+            # The chunk ending at 12:00 isn't settled yet
+            (datetime(2024, 5, 20, 6, tzinfo=timezone.utc), NOW),
+        ]
+        assert [s.cache_key is not None for s in slices] == [False, True, True, True, False]
+
+    def test_chunks_are_rollup_aligned(self):
+        start = NOW - timedelta(days=14)
+        slices = split_request(make_request(start, NOW, rollup=24 * HOUR), NOW)
+        assert slices is not None
+        for s in slices[1:-1]:
+            chunk_start, chunk_end = time_range(s.request)
+            assert chunk_end - chunk_start == timedelta(days=1)
+            assert chunk_start.timestamp() % (24 * HOUR) == 0
+
+    def test_same_chunk_same_key(self):
+        first = split_request(make_request(NOW - timedelta(days=2), NOW), NOW)
+        later = split_request(
+            make_request(NOW - timedelta(days=2, minutes=-5), NOW + timedelta(minutes=5)),
+            NOW + timedelta(minutes=5),
+        )
+        assert first is not None and later is not None
+        assert {s.cache_key for s in first[1:-1]} == {s.cache_key for s in later[1:-1]}
+
+    def test_not_split(self):
+        start = NOW - timedelta(days=2)
+        # Grouped by something else than time
+        assert (
+            split_request(
+                make_request(start, NOW, groupby=[Column("time"), Column("transaction")]), NOW
+            )
+            is None
+        )
+        # The limit could cut off buckets
+        assert split_request(make_request(start, NOW, limit=Limit(10)), NOW) is None
+        # Too short to cover a settled chunk
+        assert split_request(make_request(NOW - timedelta(hours=2), NOW), NOW) is None
+
+
+@override_options(
+    {
+        "snuba.timeseries-cache.enabled": True,
+        "snuba.timeseries-cache.chunk-seconds": 6 * HOUR,
+        "snuba.timeseries-cache.settle-seconds": HOUR,
+    }
+)
+class BulkTimeseriesQueriesTest(TestCase):
+    @mock.patch(
+        "sentry.snuba.timeseries_cache.bulk_snuba_queries", side_effect=fake_bulk_snuba_queries
+    )
+    def test_caches_settled_chunks(self, bulk_snuba_queries):
+        request = make_request(NOW - timedelta(days=1), NOW)
+        expected = fake_bulk_snuba_queries([make_request(NOW - timedelta(days=1), NOW)])
+
+        with freeze_time(NOW):
+            assert bulk_timeseries_queries([request], "test") == expected
+            # Head, 2 chunks and tail
+            assert len(bulk_snuba_queries.call_args[0][0]) == 4
+
+            assert bulk_timeseries_queries([request], "test") == expected
+            # Only the head and tail are queried again
+            assert len(bulk_snuba_queries.call_args[0][0]) == 2
+
+    @mock.patch(
+        "sentry.snuba.timeseries_cache.bulk_snuba_queries", side_effect=fake_bulk_snuba_queries
+    )
+    def test_passes_through_unsplittable(self, bulk_snuba_queries):
+        short = make_request(NOW - timedelta(hours=2), NOW)
+        long = make_request(NOW - timedelta(days=1), NOW)
+
+        with freeze_time(NOW):
+            results = bulk_timeseries_queries([short, long], "test")
+
+        assert results == fake_bulk_snuba_queries([short, long])
+        assert bulk_snuba_queries.call_count == 1
+        assert bulk_snuba_queries.call_args[0][0][0] is short
+
+    @mock.patch(
+        "sentry.snuba.timeseries_cache.bulk_snuba_queries", side_effect=fake_bulk_snuba_queries
+    )
+    def test_disabled(self, bulk_snuba_queries):
+        request = make_request(NOW - timedelta(days=1), NOW)
+        with override_options({"snuba.timeseries-cache.enabled": False}):
+            bulk_timeseries_queries([request], "test")
+        assert bulk_snuba_queries.call_args[0][0] == [request]
@@ -1,4 +1,12 @@
-from sentry.spans.buffer.redis import ProcessSegmentsContext, RedisSpansBuffer, SegmentKey
+from sentry.spans.buffer.redis import (
+    ProcessSegmentsContext,
+    RedisSpansBuffer,
+    SegmentKey,
+    get_inactive_buckets_check_key,
+    get_legacy_unprocessed_segments_key,
+    get_unprocessed_segments_key,
+)
+from sentry.testutils.helpers import override_options
 from sentry.testutils.pytest.fixtures import django_db_all
 
 
@@ -26,13 +34,11 @@ class TestRedisSpansBuffer:
             ProcessSegmentsContext(timestamp=1710280889, partition=1, should_process_segments=True)
         ]
         assert buffer.client.ttl("segment:segment_1:1:process-segment") == 300
-        assert buffer.client.lrange(
-            "performance-issues:unprocessed-segments:partition-2:1", 0, -1
+        assert buffer.client.zrange(
+            "performance-issues:unprocessed-segments:partition-3:1:0", 0, -1, withscores=True
         ) == [
-            b"1710280889",
-            b"segment:segment_1:1:process-segment",
-            b"1710280889",
-            b"segment:segment_2:1:process-segment",
+            (b"segment:segment_1:1:process-segment", 1710280889),
+            (b"segment:segment_2:1:process-segment", 1710280889),
         ]
 
         assert buffer.read_and_expire_many_segments(
@@ -89,13 +95,11 @@ class TestRedisSpansBuffer:
         ]
 
         assert buffer.client.ttl("segment:segment_1:1:process-segment") == 300
-        assert buffer.client.lrange(
-            "performance-issues:unprocessed-segments:partition-2:1", 0, -1
+        assert buffer.client.zrange(
+            "performance-issues:unprocessed-segments:partition-3:1:0", 0, -1, withscores=True
         ) == [
-            b"1710280889",
-            b"segment:segment_1:1:process-segment",
-            b"1710280891",
-            b"segment:segment_3:1:process-segment",
+            (b"segment:segment_1:1:process-segment", 1710280889),
+            (b"segment:segment_3:1:process-segment", 1710280891),
         ]
         assert buffer.read_and_expire_many_segments(["segment:segment_1:1:process-segment"]) == [
             [b"span data", b"span data 2", b"span data 3", b"span data 4", b"span data 5"]
@@ -125,15 +129,12 @@ class TestRedisSpansBuffer:
             latest_ts_by_partition=last_seen_map,
         )
 
-        assert buffer.client.lrange(
-            "performance-issues:unprocessed-segments:partition-2:1", 0, -1
+        assert buffer.client.zrange(
+            "performance-issues:unprocessed-segments:partition-3:1:0", 0, -1, withscores=True
         ) == [
-            b"1710280890",
-            b"segment:segment_1:1:process-segment",
-            b"1710280891",
-            b"segment:segment_2:1:process-segment",
-            b"1710280892",
-            b"segment:segment_3:1:process-segment",
+            (b"segment:segment_1:1:process-segment", 1710280890),
+            (b"segment:segment_2:1:process-segment", 1710280891),
+            (b"segment:segment_3:1:process-segment", 1710280892),
         ]
 
         segment_keys = buffer.get_unprocessed_segments_and_prune_bucket(1710281011, 1)
@@ -142,9 +143,107 @@ class TestRedisSpansBuffer:
             "segment:segment_2:1:process-segment",
         ]
 
-        assert buffer.client.lrange(
-            "performance-issues:unprocessed-segments:partition-2:1", 0, -1
+        assert buffer.client.zrange(
+            "performance-issues:unprocessed-segments:partition-3:1:0", 0, -1, withscores=True
         ) == [
-            b"1710280892",
-            b"segment:segment_3:1:process-segment",
+            (b"segment:segment_3:1:process-segment", 1710280892),
         ]
+
+    @django_db_all
+    def test_sharded_buckets(self):
+        buffer = RedisSpansBuffer()
+        segment_ids = [f"segment_{i}" for i in range(20)]
+        spans_map = {SegmentKey(segment_id, 1, 1): [b"span data"] for segment_id in segment_ids}
+        timestamp_map = {
+            SegmentKey(segment_id, 1, 1): 1710280890 + i for i, segment_id in enumerate(segment_ids)
+        }
+
+        with override_options({"standalone-spans.buffer-shards": 4}):
+            buffer.batch_write_and_check_processing(
+                spans_map=spans_map,
+                segment_first_seen_ts=timestamp_map,
+                latest_ts_by_partition={1: 1710280909},
+            )
+            shard_sizes = [
+                buffer.client.zcard(get_unprocessed_segments_key(1, shard)) for shard in range(4)
+            ]
+            assert sum(shard_sizes) == 20
+            assert len([size for size in shard_sizes if size]) > 1
+
+            # 1710280900 - 120 seconds buffer window: the first 11 segments are ready
+            segment_keys = buffer.get_unprocessed_segments_and_prune_bucket(1710281020, 1)
+
+        assert segment_keys == [
+            f"segment:{segment_id}:1:process-segment" for segment_id in segment_ids[:11]
+        ]
+        assert (
+            sum(buffer.client.zcard(get_unprocessed_segments_key(1, shard)) for shard in range(4))
+            == 9
+        )
+
+    @django_db_all
+    def test_lowering_shards_drains_higher_shards(self):
+        buffer = RedisSpansBuffer()
+        segment_ids = [f"segment_{i}" for i in range(20)]
+        spans_map = {SegmentKey(segment_id, 1, 1): [b"span data"] for segment_id in segment_ids}
+        timestamp_map = {SegmentKey(segment_id, 1, 1): 1710280890 for segment_id in segment_ids}
+
+        with override_options({"standalone-spans.buffer-shards": 4}):
+            buffer.batch_write_and_check_processing(
+                spans_map=spans_map,
+                segment_first_seen_ts=timestamp_map,
+                latest_ts_by_partition={1: 1710280890},
+            )
+
+        with override_options({"standalone-spans.buffer-shards": 1}):
+            segment_keys = buffer.get_unprocessed_segments_and_prune_bucket(1710281020, 1)
+
+        assert sorted(segment_keys) == sorted(
+            f"segment:{segment_id}:1:process-segment" for segment_id in segment_ids
+        )
+
+    @django_db_all
+    def test_legacy_bucket_is_drained(self):
+        buffer = RedisSpansBuffer()
+        legacy_key = get_legacy_unprocessed_segments_key(1)
+        buffer.client.rpush(
+            legacy_key,
+            1710280880,
+            "segment:segment_1:1:process-segment",
+            1710280950,
+            "segment:segment_2:1:process-segment",
+        )
+
+        assert buffer.get_unprocessed_segments_and_prune_bucket(1710281020, 1) == [
+            "segment:segment_1:1:process-segment"
+        ]
+        assert buffer.get_unprocessed_segments_and_prune_bucket(1710281080, 1) == [
+            "segment:segment_2:1:process-segment"
+        ]
+        assert not buffer.client.exists(legacy_key)
+
+    @django_db_all
+    def test_inactive_buckets_are_checked_periodically(self):
+        buffer = RedisSpansBuffer()
+        inactive_key = get_unprocessed_segments_key(1, 3)
+        assert buffer.get_unprocessed_segments_and_prune_bucket(1710281020, 1) == []
+
+        # The inactive buckets were empty, they aren't checked again within the interval
+        buffer.client.zadd(
+            inactive_key,
+            {
+                "segment:segment_1:1:process-segment": 1710280890,
+                "segment:segment_2:1:process-segment": 1710280950,
+            },
+        )
+        assert buffer.get_unprocessed_segments_and_prune_bucket(1710281021, 1) == []
+
+        buffer.client.delete(get_inactive_buckets_check_key(1))
+        assert buffer.get_unprocessed_segments_and_prune_bucket(1710281022, 1) == [
+            "segment:segment_1:1:process-segment"
+        ]
+        # A segment was left in an inactive bucket, so it's checked again on the next tick
+        assert buffer.get_unprocessed_segments_and_prune_bucket(1710281080, 1) == [
+            "segment:segment_2:1:process-segment"
+        ]
+        assert not buffer.client.exists(inactive_key)
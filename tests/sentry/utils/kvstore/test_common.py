@@ -128,3 +128,16 @@ def test_multiple_key_operations(properties: Properties) -> None:
     store.delete_many(all_keys)
 
     assert dict(store.get_many(all_keys)) == {}
+
+
+def test_set_many(properties: Properties) -> None:
+    store = properties.store
+
+    items = list(itertools.islice(properties.items, 10))
+    store.set_many(items)
+    assert dict(store.get_many([key for key, _ in items])) == dict(items)
+
+    # Test overwriting existing keys with a TTL.
+    new_items = [(key, next(properties.values)) for key, _ in items]
+    store.set_many(new_items, ttl=timedelta(seconds=30))
+    assert dict(store.get_many([key for key, _ in items])) == dict(new_items)
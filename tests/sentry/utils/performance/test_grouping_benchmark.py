@@ -0,0 +1,29 @@
+import os
+
+from sentry.grouping.strategies.configurations import CONFIGURATIONS
+from sentry.utils.performance.grouping_benchmark import run_benchmark
+from sentry.utils.performance.save_benchmark import load_corpus
+
+GROUPING_INPUTS = os.path.join(
+    os.path.dirname(__file__), os.pardir, os.pardir, "grouping", "grouping_inputs"
+)
+
+
+def test_run_benchmark_native_crashes():
+    corpus = load_corpus(
+        os.path.join(GROUPING_INPUTS, filename)
+        for filename in ("native-driver-crash1.json", "native-unlimited-frames.json")
+    )
+    for data in corpus:
+        data.pop("_grouping", None)
+
+    config_id = sorted(CONFIGURATIONS)[-1]
+    result = run_benchmark(corpus, config_id=config_id, iterations=2)
+
+    assert result["config"] == config_id
+    assert result["timings"]["count"] == 4
+    assert len(result["events"]) == 2
+    for event in result["events"]:
+        assert event["components"] > 1
+        assert event["allocated_blocks"] > 0
+        assert event["peak_bytes"] > 0
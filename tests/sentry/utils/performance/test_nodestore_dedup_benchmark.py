@@ -0,0 +1,32 @@
+from sentry.nodestore.django.backend import DjangoNodeStorage
+from sentry.testutils.pytest.fixtures import django_db_all
+from sentry.utils.performance.nodestore_dedup_benchmark import run_benchmark
+
+
+def make_event(i):
+    return {
+        "message": f"event {i}",
+        "debug_meta": {
+            "images": [
+                {"type": "macho", "debug_id": f"{n:032x}", "code_file": f"/usr/lib/lib{n}.dylib"}
+                for n in range(50)
+            ]
+        },
+    }
+
+
+@django_db_all
+def test_run_benchmark():
+    storage = DjangoNodeStorage()
+    result = run_benchmark(storage, [make_event(i) for i in range(20)], iterations=2)
+
+    assert result["events"] == 20
+    assert set(result["variants"]) == {"plain", "deduplicated"}
+    for variant in result["variants"].values():
+        assert variant["matches"]
+        assert variant["get"]["count"] == 40
+
+    assert result["variants"]["plain"]["shared_nodes"] == 0
+    # Every event has the same debug images
+    assert result["variants"]["deduplicated"]["shared_nodes"] == 1
+    assert result["bytes_saved"] > 0
@@ -0,0 +1,22 @@
+from sentry.models.auditlogentry import AuditLogEntry
+from sentry.testutils.cases import TestCase
+from sentry.testutils.silo import control_silo_test
+from sentry.utils.performance.pagination_benchmark import run_benchmark, seed_audit_log
+
+
+@control_silo_test
+class PaginationBenchmarkTest(TestCase):
+    def test_run_benchmark(self):
+        assert seed_audit_log(self.organization.id, 25, batch_size=10) == 25
+        queryset = AuditLogEntry.objects.filter(organization_id=self.organization.id)
+        assert queryset.count() == 25
+
+        result = run_benchmark(queryset, ["-datetime"], limit=5, depths=[0, 2, 4, 5], iterations=2)
+
+        assert result["rows"] == 25
+        # The page at depth 5 starts past the last row
+        assert [page["depth"] for page in result["pages"]] == [0, 2, 4]
+        for page in result["pages"]:
+            assert page["matches"]
+            assert page["timings"]["offset"]["count"] == 2
+            assert page["timings"]["keyset"]["count"] == 2
@@ -0,0 +1,31 @@
+from sentry.utils import json
+from sentry.utils.performance.parameterization_benchmark import load_messages, run_benchmark
+
+
+def test_load_messages(tmp_path):
+    (tmp_path / "event.json").write_text(
+        json.dumps(
+            {
+                "logentry": {"formatted": "hello 42"},
+                "exception": {"values": [{"type": "ValueError", "value": "bad 0x1f"}, None]},
+            }
+        )
+    )
+    (tmp_path / "messages.txt").write_text("first 1\n\nsecond 2\n")
+
+    assert load_messages([str(tmp_path)]) == ["hello 42", "bad 0x1f", "first 1", "second 2"]
+
+
+def test_run_benchmark():
+    messages = [
+        "blah 0.23 had a problem",
+        "blah 7c1811ed-e98f-4c9c-a9f9-58c757ff494f had a problem",
+        "A quick brown fox jumped over the lazy dog",
+    ]
+    result = run_benchmark(messages, iterations=2)
+
+    assert result["messages"] == 3
+    assert result["mismatch_count"] == 0
+    assert result["mismatches"] == []
+    assert result["timings"]["reference"]["count"] == 6
+    assert result["timings"]["cached"]["count"] == 6
@@ -0,0 +1,43 @@
+from sentry.utils.performance.projectconfig_cache_benchmark import run_benchmark
+
+
+def make_config(i):
+    return {
+        "projectId": i,
+        "slug": f"project-{i}",
+        "config": {
+            "performanceScore": {
+                "profiles": [
+                    {
+                        "name": f"profile-{n}",
+                        "scoreComponents": [
+                            {"measurement": m, "weight": 0.25, "p10": 1200.0, "p50": 2400.0}
+                            for m in ("fcp", "lcp", "cls", "ttfb")
+                        ],
+                    }
+                    for n in range(4)
+                ]
+            },
+            "filterSettings": {"browserExtensions": {"isEnabled": i % 2 == 0}},
+        },
+    }
+
+
+def test_run_benchmark():
+    configs = [make_config(i) for i in range(100)]
+    result = run_benchmark(configs, dict_size=4096, iterations=2)
+
+    assert result["configs"] == 100
+    assert set(result["variants"]) == {"zstd", "shared", "dictionary"}
+    for variant in result["variants"].values():
+        assert variant["matches"]
+        assert variant["encode"]["count"] == 200
+        assert variant["decode"]["count"] == 200
+
+    assert result["variants"]["zstd"]["shared_sections"] == 0
+    # Every config has the same performance score profiles
+    assert result["variants"]["shared"]["shared_sections"] == 1
+    assert (
+        result["variants"]["dictionary"]["config_bytes"]
+        < result["variants"]["zstd"]["config_bytes"]
+    )
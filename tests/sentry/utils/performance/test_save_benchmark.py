@@ -0,0 +1,80 @@
+import os
+
+from sentry.constants import DATA_ROOT
+from sentry.models.group import Group
+from sentry.testutils.cases import TestCase
+from sentry.utils import json
+from sentry.utils.performance.save_benchmark import (
+    STAGES,
+    TOTAL,
+    compare,
+    load_corpus,
+    prepare_event,
+    run_benchmark,
+    summarize,
+)
+
+SAMPLES_ROOT = os.path.join(DATA_ROOT, "samples")
+
+
+def test_load_corpus_skips_transactions(tmp_path):
+    (tmp_path / "error.json").write_text(json.dumps({"message": "hello"}))
+    (tmp_path / "transaction.json").write_text(json.dumps({"type": "transaction"}))
+    (tmp_path / "broken.json").write_text("{")
+    (tmp_path / "notes.txt").write_text("{}")
+
+    assert load_corpus([str(tmp_path)]) == [{"message": "hello"}]
+
+
+def test_prepare_event():
+    data = {"event_id": "a" * 32, "received": 1, "message": "hello"}
+    event = prepare_event(data)
+
+    assert event["event_id"] != data["event_id"]
+    assert "received" not in event
+    assert "timestamp" in event
+    assert data == {"event_id": "a" * 32, "received": 1, "message": "hello"}
+
+
+def test_summarize():
+    stats = summarize([0.001 * i for i in range(1, 101)])
+
+    assert stats["count"] == 100
+    assert round(stats["mean"], 2) == 50.5
+    assert round(stats["p50"], 2) == 51
+    assert round(stats["p95"], 2) == 96
+    assert round(stats["max"], 2) == 100
+
+    assert summarize([])["count"] == 0
+
+
+def test_compare():
+    baseline = {
+        "events_per_second": 100.0,
+        "stages": {TOTAL: summarize([0.01, 0.02]), "assign_event_to_group": summarize([])},
+    }
+    candidate = {
+        "events_per_second": 150.0,
+        "stages": {TOTAL: summarize([0.005, 0.01]), "assign_event_to_group": summarize([0.1])},
+    }
+
+    rows = compare(baseline, candidate)
+
+    assert rows[0] == ("events", "per second", 100.0, 150.0, 0.5)
+    assert rows[1] == (TOTAL, "p50 ms", 20.0, 10.0, -0.5)
+    assert ("assign_event_to_group", "p50 ms", 0.0, 100.0, None) in rows
+
+
+class RunBenchmarkTest(TestCase):
+    def test_saves_events(self):
+        corpus = load_corpus([os.path.join(SAMPLES_ROOT, "python.json")])
+
+        result = run_benchmark(self.project.id, corpus, iterations=2, warmup=1)
+
+        assert result["events"] == 2
+        assert result["errors"] == 0
+        assert result["events_per_second"] > 0
+        assert result["stages"][TOTAL]["count"] == 2
+        for name in STAGES:
+            assert result["stages"][name]["count"] == 2
+        assert Group.objects.filter(project=self.project).count() == 1
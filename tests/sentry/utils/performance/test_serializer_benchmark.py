@@ -0,0 +1,21 @@
+from sentry.api.serializers.models.project import ProjectSerializer
+from sentry.testutils.cases import TestCase
+from sentry.utils.performance.serializer_benchmark import make_page, run_benchmark
+
+
+class SerializerBenchmarkTest(TestCase):
+    def test_make_page(self):
+        assert make_page([1, 2, 3], 7) == [1, 2, 3, 1, 2, 3, 1]
+
+    def test_run_benchmark(self):
+        projects = [self.project, self.create_project(organization=self.organization)]
+        result = run_benchmark(
+            ProjectSerializer(), projects, self.user, page_sizes=[10], iterations=2
+        )
+
+        assert result["serializer"] == "ProjectSerializer"
+        (page,) = result["pages"]
+        assert page["size"] == 10
+        assert page["matches"]
+        assert page["timings"]["per_object"]["count"] == 2
+        assert page["timings"]["batch"]["count"] == 2
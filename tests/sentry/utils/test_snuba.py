@@ -3,21 +3,29 @@ from datetime import datetime, timedelta
 from unittest import mock
 
 import pytest
+from django.core.cache import cache
 from django.utils import timezone
 from urllib3 import HTTPConnectionPool
 from urllib3.exceptions import HTTPError, ReadTimeoutError
 
+from sentry.locks import locks
 from sentry.models.grouprelease import GroupRelease
 from sentry.models.project import Project
 from sentry.models.release import Release
 from sentry.snuba.dataset import Dataset
 from sentry.testutils.cases import TestCase
+from sentry.testutils.helpers import override_options
+from sentry.utils import json
 from sentry.utils.snuba import (
     ROUND_UP,
     RetrySkipTimeout,
     SnubaQueryParams,
     UnqualifiedQueryError,
+    _apply_cache_and_build_results,
+    _decode_cached_result,
+    _encode_cached_result,
     _prepare_query_params,
+    get_cache_key,
     get_json_type,
     get_query_params_to_update_for_projects,
     get_snuba_column_name,
@@ -412,6 +420,133 @@ class QuantizeTimeTest(unittest.TestCase):
         assert i != j
 
 
+class QueryCacheTest(TestCase):
+    def query(self, name: str) -> tuple[dict[str, str], None, None]:
+        return ({"query": name}, None, None)
+
+    def test_encoding_roundtrip(self):
+        small = {"data": [{"count": 1, "name": "foo"}], "meta": []}
+        large = {"data": [{"count": i, "name": "foo" * 10} for i in range(500)], "meta": []}
+        huge_int = {"data": [{"sum": 2**70}]}
+
+        for result in (small, large, huge_int):
+            value = _encode_cached_result(result, 100.0, 0.5)
+            assert isinstance(value, bytes)
+            assert _decode_cached_result(value) == (result, 100.0, 0.5)
+
+        assert len(_encode_cached_result(large, 100.0, 0.5)) < len(json.dumps(large))
+        assert _decode_cached_result(json.dumps(small)) == (small, None, 0.0)
+
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    def test_reads_legacy_entries(self, bulk_snuba_query):
+        cache.set(get_cache_key(self.query("a")[0]), json.dumps({"data": [1]}), 60)
+        with override_options({"snuba.query-cache.binary-encoding": True}):
+            results = _apply_cache_and_build_results([self.query("a")], use_cache=True)
+        assert results == [{"data": [1]}]
+        assert bulk_snuba_query.call_count == 0
+
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    def test_binary_encoding(self, bulk_snuba_query):
+        bulk_snuba_query.return_value = [{"data": [1]}]
+        with override_options({"snuba.query-cache.binary-encoding": True}):
+            assert _apply_cache_and_build_results([self.query("a")], use_cache=True) == [
+                {"data": [1]}
+            ]
+            assert _apply_cache_and_build_results([self.query("a")], use_cache=True) == [
+                {"data": [1]}
+            ]
+        assert bulk_snuba_query.call_count == 1
+        assert isinstance(cache.get(get_cache_key(self.query("a")[0])), bytes)
+
+    @override_options({"snuba.query-cache.coalesce.enabled": True})
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    def test_waits_for_concurrent_query(self, bulk_snuba_query):
+        bulk_snuba_query.side_effect = lambda queries, headers: [
+            {"data": [query[0]["query"]]} for query in queries
+        ]
+        key_a = get_cache_key(self.query("a")[0])
+
+        def fill_cache(seconds):
+            cache.set(key_a, json.dumps({"data": ["filled"]}), 60)
+
+        # Another process is running the query for "a"
+        lock = locks.get(f"{key_a}:lock", duration=10, name="snuba_query_cache")
+        with lock.acquire(), mock.patch("sentry.utils.snuba.time.sleep", side_effect=fill_cache):
+            results = _apply_cache_and_build_results(
+                [self.query("a"), self.query("b")], use_cache=True
+            )
+
+        assert results == [{"data": ["filled"]}, {"data": ["b"]}]
+        assert bulk_snuba_query.call_count == 1
+        assert bulk_snuba_query.call_args[0][0] == [self.query("b")]
+
+    @override_options(
+        {
+            "snuba.query-cache.coalesce.enabled": True,
+            "snuba.query-cache.coalesce.wait-seconds": 0.0,
+        }
+    )
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    def test_wait_timeout_runs_query(self, bulk_snuba_query):
+        bulk_snuba_query.return_value = [{"data": ["a"]}]
+        key_a = get_cache_key(self.query("a")[0])
+
+        lock = locks.get(f"{key_a}:lock", duration=10, name="snuba_query_cache")
+        with lock.acquire():
+            results = _apply_cache_and_build_results([self.query("a")], use_cache=True)
+
+        assert results == [{"data": ["a"]}]
+        assert bulk_snuba_query.call_count == 1
+
+    @override_options(
+        {
+            "snuba.query-cache.binary-encoding": True,
+            "snuba.query-cache.early-refresh-beta": 1.0,
+        }
+    )
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    def test_early_refresh(self, bulk_snuba_query):
+        bulk_snuba_query.return_value = [{"data": ["fresh"]}]
+        key_a = get_cache_key(self.query("a")[0])
+        now = 1000.0
+
+        # Expires in 1s, and took 1s to compute
+        cache.set(key_a, _encode_cached_result({"data": ["cached"]}, now + 1, 1.0), 60)
+        with mock.patch("sentry.utils.snuba.time.time", return_value=now):
+            # -log(1 - 0.1) is ~0.1, too far from the expiry to refresh
+            with mock.patch("sentry.utils.snuba.random.random", return_value=0.1):
+                results = _apply_cache_and_build_results([self.query("a")], use_cache=True)
+            assert results == [{"data": ["cached"]}]
+            assert bulk_snuba_query.call_count == 0
+
+            # -log(1 - 0.9) is ~2.3, which refreshes
+            with mock.patch("sentry.utils.snuba.random.random", return_value=0.9):
+                results = _apply_cache_and_build_results([self.query("a")], use_cache=True)
+            assert results == [{"data": ["fresh"]}]
+            assert bulk_snuba_query.call_count == 1
+
+        assert _decode_cached_result(cache.get(key_a))[0] == {"data": ["fresh"]}
+
+    @override_options(
+        {
+            "snuba.query-cache.binary-encoding": True,
+            "snuba.query-cache.early-refresh-beta": 1.0,
+            "snuba.query-cache.coalesce.enabled": True,
+        }
+    )
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    def test_early_refresh_in_progress_serves_cached(self, bulk_snuba_query):
+        key_a = get_cache_key(self.query("a")[0])
+        cache.set(key_a, _encode_cached_result({"data": ["cached"]}, 0.0, 1.0), 60)
+
+        lock = locks.get(f"{key_a}:lock", duration=10, name="snuba_query_cache")
+        with lock.acquire():
+            results = _apply_cache_and_build_results([self.query("a")], use_cache=True)
+
+        assert results == [{"data": ["cached"]}]
+        assert bulk_snuba_query.call_count == 0
+
+
 class FakeConnectionPool(HTTPConnectionPool):
     def __init__(self, connection, **kwargs):
         self.connection = connection
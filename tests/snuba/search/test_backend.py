@@ -30,10 +30,10 @@ from sentry.models.grouphistory import GroupHistoryStatus, record_group_history
 from sentry.models.groupowner import GroupOwner
 from sentry.models.groupsubscription import GroupSubscription
 from sentry.search.snuba.backend import EventsDatasetSnubaSearchBackend, SnubaSearchBackendBase
-from sentry.search.snuba.executors import TrendsSortWeights
+from sentry.search.snuba.executors import PostgresSnubaQueryExecutor, TrendsSortWeights
 from sentry.snuba.dataset import Dataset
 from sentry.testutils.cases import SnubaTestCase, TestCase, TransactionTestCase
-from sentry.testutils.helpers import Feature, apply_feature_flag_on_cls
+from sentry.testutils.helpers import Feature, apply_feature_flag_on_cls, override_options
 from sentry.testutils.helpers.datetime import before_now, iso_format
 from sentry.testutils.skips import xfail_if_not_postgres
 from sentry.types.group import GroupSubStatus, PriorityLevel
@@ -2562,7 +2562,40 @@ class EventsSnubaSearchTestCases(EventsDatasetTestSetup):
 
 
 class EventsSnubaSearchTest(TestCase, EventsSnubaSearchTestCases):
-    pass
+    @override_options(
+        {
+            "snuba.search.adaptive-chunking.enabled": True,
+            "snuba.search.adaptive-chunking.max-parallel-chunks": 2,
+            "snuba.search.max-pre-snuba-candidates": 1,
+        }
+    )
+    def test_adaptive_chunking(self):
+        # pre-filtering still works as expected
+        results = self.make_query(search_filter_query="foo")
+        assert set(results) == {self.group1}
+
+        # too many candidates, the post-filtered chunks are queried concurrently
+        with mock.patch.object(
+            PostgresSnubaQueryExecutor,
+            "snuba_search_chunks",
+            autospec=True,
+            side_effect=PostgresSnubaQueryExecutor.snuba_search_chunks,
+        ) as snuba_search_chunks:
+            results = self.make_query(limit=1)
+        assert len(results) == 1
+        assert snuba_search_chunks.call_args_list[0].kwargs["chunks"] == [(1, 0), (1, 1)]
+
+        # the candidates of a search are cached for its next pages
+        with mock.patch("sentry.search.snuba.executors.metrics.incr") as incr:
+            next_results = self.make_query(limit=1, cursor=results.next)
+        assert len(next_results) == 1
+        assert set(results) | set(next_results) == {self.group1, self.group2}
+        incr.assert_any_call("snuba.search.candidate_cache", tags={"result": "hit"})
+
+        # but the first page always sees status changes made in the meantime
+        assert list(self.make_query(search_filter_query="is:unresolved")) == [self.group1]
+        self.group1.update(status=GroupStatus.RESOLVED, substatus=None)
+        assert list(self.make_query(search_filter_query="is:unresolved")) == []
 
 
 @apply_feature_flag_on_cls("organizations:issue-search-group-attributes-side-query")